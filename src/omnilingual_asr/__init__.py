@@ -11,6 +11,9 @@ __version__ = "0.2.0"
 # Export main components
 from omnilingual_asr.diarization import GeminiDiarizedTranscriptionPipeline
 from omnilingual_asr.models.inference import (
+    AsyncGeminiASRPipeline,
+    FakeBackend,
+    FakeLatency,
     GeminiASRPipeline,
     GeminiTranscriptionResult,
     GeminiTranscriptSegment,
@@ -18,6 +21,9 @@ from omnilingual_asr.models.inference import (
 
 __all__ = [
     "__version__",
+    "AsyncGeminiASRPipeline",
+    "FakeBackend",
+    "FakeLatency",
     "GeminiASRPipeline",
     "GeminiTranscriptionResult",
     "GeminiTranscriptSegment",
@@ -7,13 +7,17 @@
 """Gemini-based diarization and transcription pipeline."""
 
 from omnilingual_asr.diarization.pipeline import (
+    DiarizedTranscription,
     DiarizedTranscriptSegment,
     GeminiDiarizedTranscriptionPipeline,
     WordTimestamp,
+    segment_to_dict,
 )
 
 __all__ = [
     "DiarizedTranscriptSegment",
+    "DiarizedTranscription",
     "GeminiDiarizedTranscriptionPipeline",
     "WordTimestamp",
+    "segment_to_dict",
 ]
\ No newline at end of file
@@ -8,8 +8,34 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Callable, List, Optional
+import concurrent.futures
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+)
+
+if TYPE_CHECKING:
+    from omnilingual_asr.models.inference.backends import TranscriptionBackend
+    from omnilingual_asr.models.inference.cache import TranscriptionCache
+    from omnilingual_asr.models.inference.gemini_pipeline import (
+        ChunkFailure,
+        GeminiTranscriptionResult,
+        GeminiTranscriptSegment,
+    )
+    from omnilingual_asr.models.inference.hedging import RequestHedger
+    from omnilingual_asr.models.inference.metrics import TranscriptionMetrics
+    from omnilingual_asr.models.inference.vad import SpeechMap
+    from omnilingual_asr.models.inference.word_timing import WordTimer
 
 
 @dataclass(frozen=True)
@@ -36,85 +62,709 @@ class DiarizedTranscriptSegment:
     translation: str | None = None
 
 
+def segment_to_dict(seg: DiarizedTranscriptSegment) -> Dict[str, Any]:
+    """Serialize a segment to JSON-ready data, e.g. for the web frontend.
+
+    Word timestamps are always present (possibly empty); the Gemini fields
+    are only included when set.
+    """
+    segment_dict: Dict[str, Any] = {
+        "start": seg.start,
+        "end": seg.end,
+        "speaker": seg.speaker,
+        "text": seg.text,
+        "words": [
+            {"word": w.word, "start": w.start, "end": w.end}
+            for w in (seg.words or [])
+        ],
+    }
+    if seg.language:
+        segment_dict["language"] = seg.language
+    if seg.language_code:
+        segment_dict["language_code"] = seg.language_code
+    if seg.languages:
+        segment_dict["languages"] = seg.languages
+    if seg.emotion:
+        segment_dict["emotion"] = seg.emotion
+    if seg.translation:
+        segment_dict["translation"] = seg.translation
+    return segment_dict
+
+
+@dataclass
+class DiarizedTranscription:
+    """Everything one transcription produced.
+
+    Returned by :meth:`GeminiDiarizedTranscriptionPipeline.transcribe_result`,
+    and filled in by the iterators and enrichment when passed as their
+    ``transcription``, so concurrent calls on one pipeline never see each
+    other's metadata.
+    """
+
+    segments: List[DiarizedTranscriptSegment] = field(default_factory=list)
+    summary: Optional[str] = None
+    detected_languages: Optional[List[dict]] = None
+    failed_chunks: List[ChunkFailure] = field(default_factory=list)
+    # Timings, tokens and bytes sent, including any enrichment pass; None if
+    # every result came from the cache
+    metrics: Optional[TranscriptionMetrics] = None
+    speech_map: Optional[SpeechMap] = None  # Set if silence was stripped
+
+
+def _to_gemini_result(segments: List[DiarizedTranscriptSegment]) -> GeminiTranscriptionResult:
+    """Rebuild a Gemini result from converted segments, e.g. for enrichment."""
+    from omnilingual_asr.models.inference.gemini_pipeline import (
+        GeminiTranscriptionResult,
+        GeminiTranscriptSegment,
+    )
+    from omnilingual_asr.models.inference.gemini_pipeline import (
+        WordTimestamp as GeminiWordTimestamp,
+    )
+
+    return GeminiTranscriptionResult(
+        segments=[
+            GeminiTranscriptSegment(
+                start=seg.start,
+                end=seg.end,
+                speaker=seg.speaker,
+                text=seg.text,
+                language=seg.language,
+                language_code=seg.language_code,
+                languages=seg.languages,
+                emotion=seg.emotion,
+                translation=seg.translation,
+                words=(
+                    [GeminiWordTimestamp(w.word, w.start, w.end) for w in seg.words]
+                    if seg.words is not None
+                    else None
+                ),
+            )
+            for seg in segments
+        ]
+    )
+
+
+def _start_word_timer(audio_path: str) -> concurrent.futures.Future[WordTimer]:
+    """Compute the audio's energy envelope for word timing in the background."""
+    from omnilingual_asr.models.inference.word_timing import WordTimer
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(WordTimer.for_audio, audio_path)
+    # The worker exits once the envelope is done
+    executor.shutdown(wait=False)
+    return future
+
+
+def _check_chunked_result(result: GeminiTranscriptionResult) -> GeminiTranscriptionResult:
+    """Raise if no chunk of a chunked transcription succeeded."""
+    if result.failed_chunks and not result.segments:
+        raise RuntimeError(
+            f"Failed to transcribe any chunk: {result.failed_chunks[0].error}"
+        )
+    return result
+
+
 class GeminiDiarizedTranscriptionPipeline:
     """Gemini API-based transcription pipeline with built-in diarization.
 
     This pipeline uses the Gemini Speech API for transcription with speaker
     diarization, language detection, emotion analysis, and translation.
+
+    One instance can serve concurrent calls from many threads or tasks. Each
+    call's metadata is in the :class:`DiarizedTranscription` it returns or
+    fills in; the ``summary``, ``detected_languages``, ``failed_chunks``,
+    ``metrics`` and ``speech_map`` properties only describe whichever call
+    finished last.
     """
 
     def __init__(
         self,
         *,
-        api_key: Optional[str] = None,
+        api_key: Optional[str | Sequence[str]] = None,
         model: str = "gemini-3-flash-preview",
+        cache: Optional[TranscriptionCache] = None,
+        checkpoint_dir: Optional[str | Path] = None,
+        transcode: Optional[str] = None,
+        backend: Optional[TranscriptionBackend] = None,
+        strip_silence: bool = False,
+        hedging: Optional[RequestHedger] = None,
     ) -> None:
         """Initialize the Gemini transcription pipeline.
 
         Args:
-            api_key: Gemini API key. If not provided, uses GEMINI_API_KEY env var.
+            api_key: Gemini API key, or several (a sequence or comma-separated
+                string) to spread requests over. If not provided, uses
+                GEMINI_API_KEY env var.
             model: Gemini model to use (default: gemini-3-flash-preview)
+            cache: Optional result cache shared with the underlying Gemini pipeline
+            checkpoint_dir: Optional directory for resumable long-file jobs
+            transcode: Optional preset ("lossless", "balanced", "compact") for
+                shrinking audio before it is sent
+            backend: Backend that answers requests, e.g. a FakeBackend for
+                load tests. Defaults to the Gemini API.
+            strip_silence: Send only the speech detected locally; timestamps
+                still refer to the original audio
+            hedging: Duplicate chunk requests that run slower than most,
+                using whichever answers first
         """
+        from omnilingual_asr.models.inference.async_pipeline import (
+            AsyncGeminiASRPipeline,
+        )
         from omnilingual_asr.models.inference.gemini_pipeline import GeminiASRPipeline
 
-        self.gemini = GeminiASRPipeline(api_key=api_key, model=model)
-        self._summary: Optional[str] = None
-        self._detected_languages: Optional[List[dict]] = None
+        self.gemini = GeminiASRPipeline(
+            api_key=api_key,
+            model=model,
+            cache=cache,
+            checkpoint_dir=checkpoint_dir,
+            transcode=transcode,
+            backend=backend,
+            strip_silence=strip_silence,
+            hedging=hedging,
+        )
+        self.gemini_async = AsyncGeminiASRPipeline(pipeline=self.gemini)
+        # Replaced as a whole when a call finishes, so the properties never
+        # mix two calls' metadata
+        self._last = DiarizedTranscription()
 
     @property
     def summary(self) -> Optional[str]:
         """Get the summary from the last transcription."""
-        return self._summary
+        return self._last.summary
 
     @property
     def detected_languages(self) -> Optional[List[dict]]:
         """Get detected languages from the last transcription."""
-        return self._detected_languages
+        return self._last.detected_languages
 
-    def transcribe(
+    @property
+    def failed_chunks(self) -> List[ChunkFailure]:
+        """Get chunks of long audio that failed in the last transcription."""
+        return self._last.failed_chunks
+
+    @property
+    def metrics(self) -> Optional[TranscriptionMetrics]:
+        """Get timings, token usage and bytes sent for the last transcription.
+
+        Includes any enrichment pass over it. None if every result came from
+        the cache.
+        """
+        return self._last.metrics
+
+    @property
+    def speech_map(self) -> Optional[SpeechMap]:
+        """Get the speech regions sent for the last transcription.
+
+        None unless silence was stripped; ``removed_seconds`` is the audio
+        that wasn't sent.
+        """
+        return self._last.speech_map
+
+    def warmup(self) -> None:
+        """Construct the API client and open connections before the first request.
+
+        Call at startup so the first transcription is as fast as later ones.
+        """
+        self.gemini.warmup()
+
+    async def awarmup(self) -> None:
+        """Async version of :meth:`warmup`; warms the connections async calls use.
+
+        Call from the event loop that will run :meth:`atranscribe` and the
+        other async methods.
+        """
+        await self.gemini_async.warmup()
+
+    def close(self) -> None:
+        """Stop the threads hedged chunk requests are sent from."""
+        self.gemini.close()
+
+    def _transcribe(
+        self,
+        audio_path: str,
+        *,
+        word_timestamps: bool,
+        progress_callback: Optional[Callable[[str, int], None]],
+        language: Optional[str],
+        speaker_count: Optional[str],
+        features: Optional[Iterable[str]],
+    ) -> GeminiTranscriptionResult:
+        """Transcribe with retries, adding word timestamps if requested."""
+        from omnilingual_asr.models.inference.word_timing import add_word_timestamps
+
+        result = self.gemini.transcribe_with_retry(
+            audio_path,
+            progress_callback=progress_callback,
+            language=language,
+            speaker_count=speaker_count,
+            features=features,
+        )
+        if word_timestamps:
+            result = add_word_timestamps(result, audio_path)
+        return result
+
+    async def _atranscribe(
         self,
         audio_path: str,
         *,
-        word_timestamps: bool = False,  # Kept for API compatibility
+        word_timestamps: bool,
+        progress_callback: Optional[Callable[[str, int], None]],
+        language: Optional[str],
+        speaker_count: Optional[str],
+        features: Optional[Iterable[str]],
+    ) -> GeminiTranscriptionResult:
+        """Async version of :meth:`_transcribe`; word timing runs off the loop."""
+        import asyncio
+
+        from omnilingual_asr.models.inference.word_timing import add_word_timestamps
+
+        result = await self.gemini_async.transcribe_with_retry(
+            audio_path,
+            progress_callback=progress_callback,
+            language=language,
+            speaker_count=speaker_count,
+            features=features,
+        )
+        if word_timestamps:
+            result = await asyncio.to_thread(add_word_timestamps, result, audio_path)
+        return result
+
+    def transcribe_result(
+        self,
+        audio_path: str,
+        *,
+        word_timestamps: bool = False,
         progress_callback: Optional[Callable[[str, int], None]] = None,
         language: Optional[str] = None,
         speaker_count: Optional[str] = None,
-        **kwargs,  # Accept other args for compatibility but ignore them
-    ) -> List[DiarizedTranscriptSegment]:
-        """Transcribe audio using Gemini API with speaker diarization.
+        features: Optional[Iterable[str]] = None,
+    ) -> DiarizedTranscription:
+        """Transcribe audio, returning the segments together with their metadata.
+
+        Safe to call concurrently on one pipeline; nothing is shared between
+        calls except the caches, limits and uploads of the Gemini pipeline.
 
         Args:
             audio_path: Path to the audio file
-            word_timestamps: Kept for API compatibility (not used)
+            word_timestamps: Estimate word timestamps locally from each
+                segment's span and the audio's energy (see WordTimer)
             progress_callback: Optional callback(step_name, step_index) to report progress.
                 Steps: "uploading" (0), "transcribing" (1), "processing" (2), "done" (3)
             language: Optional language hint (e.g., 'en', 'es', 'fr')
             speaker_count: Optional speaker count hint (e.g., '1', '2', '3')
+            features: Optional subset of TRANSCRIPTION_FEATURES to request
+                (default: all); fields left out are None in the segments
+
+        Returns:
+            Segments, summary, detected languages, failed chunks and metrics
+        """
+        result = self._transcribe(
+            audio_path,
+            word_timestamps=word_timestamps,
+            progress_callback=progress_callback,
+            language=language,
+            speaker_count=speaker_count,
+            features=features,
+        )
+        return self._finish(
+            DiarizedTranscription(segments=self._convert_segments(result.segments)), result
+        )
+
+    async def atranscribe_result(
+        self,
+        audio_path: str,
+        *,
+        word_timestamps: bool = False,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+    ) -> DiarizedTranscription:
+        """Async version of :meth:`transcribe_result` for use inside an event loop.
+
+        ``progress_callback`` is called on the event loop thread.
+        """
+        result = await self._atranscribe(
+            audio_path,
+            word_timestamps=word_timestamps,
+            progress_callback=progress_callback,
+            language=language,
+            speaker_count=speaker_count,
+            features=features,
+        )
+        return self._finish(
+            DiarizedTranscription(segments=self._convert_segments(result.segments)), result
+        )
+
+    def transcribe(
+        self,
+        audio_path: str,
+        *,
+        word_timestamps: bool = False,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+        **kwargs,  # Accept other args for compatibility but ignore them
+    ) -> List[DiarizedTranscriptSegment]:
+        """Transcribe audio using Gemini API with speaker diarization.
+
+        Takes the same arguments as :meth:`transcribe_result`, which also
+        returns the metadata that this method leaves in the properties.
 
         Returns:
             List of transcribed segments with speaker, language, emotion, and translation
         """
-        result = self.gemini.transcribe_with_retry(
+        return self.transcribe_result(
             audio_path,
+            word_timestamps=word_timestamps,
             progress_callback=progress_callback,
             language=language,
             speaker_count=speaker_count,
+            features=features,
+        ).segments
+
+    async def atranscribe(
+        self,
+        audio_path: str,
+        *,
+        word_timestamps: bool = False,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+        **kwargs,  # Accept other args for compatibility but ignore them
+    ) -> List[DiarizedTranscriptSegment]:
+        """Async version of :meth:`transcribe` for use inside an event loop.
+
+        Returns:
+            List of transcribed segments with speaker, language, emotion, and translation
+        """
+        transcription = await self.atranscribe_result(
+            audio_path,
+            word_timestamps=word_timestamps,
+            progress_callback=progress_callback,
+            language=language,
+            speaker_count=speaker_count,
+            features=features,
         )
+        return transcription.segments
 
-        # Store summary and detected languages for access
-        self._summary = result.summary
-        self._detected_languages = result.detected_languages
+    def transcribe_iter(
+        self,
+        audio_path: str,
+        *,
+        word_timestamps: bool = False,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+        transcription: Optional[DiarizedTranscription] = None,
+        **kwargs,  # Accept other args for compatibility but ignore them
+    ) -> Iterator[List[DiarizedTranscriptSegment]]:
+        """Transcribe audio, yielding batches of segments as they become final.
+
+        Long audio yields a batch whenever the next chunks in time order have
+        finished; short audio is streamed and yields each segment as soon as
+        the response contains it.
+
+        Args:
+            audio_path: Path to the audio file
+            word_timestamps: Estimate word timestamps locally; the audio's
+                energy envelope is computed while the requests run
+            progress_callback: Optional callback(step_name, step_index) to report progress
+            language: Optional language hint (e.g., 'en', 'es', 'fr')
+            speaker_count: Optional speaker count hint (e.g., '1', '2', '3')
+            features: Optional subset of TRANSCRIPTION_FEATURES to request
+                (default: all); fields left out are None in the segments
+            transcription: Optional empty transcription that collects the
+                yielded segments and receives the summary, languages, failed
+                chunks and metrics once iteration completes
+
+        Yields:
+            Segments in time order
+        """
+        from omnilingual_asr.models.inference.audio import get_audio_duration
+        from omnilingual_asr.models.inference.gemini_pipeline import (
+            MIN_DURATION_FOR_CHUNKING,
+        )
+        from omnilingual_asr.models.inference.retry import is_retryable_error
+
+        if transcription is None:
+            transcription = DiarizedTranscription()
+        timer = _start_word_timer(audio_path) if word_timestamps else None
+
+        def convert(segments: List[GeminiTranscriptSegment]) -> List[DiarizedTranscriptSegment]:
+            batch = self._convert_segments(segments, timer.result() if timer else None)
+            transcription.segments.extend(batch)
+            return batch
+
+        duration = get_audio_duration(Path(audio_path))
+        if 0 < duration <= MIN_DURATION_FOR_CHUNKING:
+            streamed = False
+            try:
+                for update in self.gemini.iter_transcribe(
+                    audio_path,
+                    progress_callback=progress_callback,
+                    language=language,
+                    speaker_count=speaker_count,
+                    features=features,
+                ):
+                    if update.segments:
+                        streamed = True
+                        yield convert(update.segments)
+                    if update.result is not None:
+                        self._finish(transcription, update.result)
+            except Exception as e:
+                if streamed or not is_retryable_error(e):
+                    raise
+                # Nothing was shown yet; fall back to retrying the whole request
+                result = self._transcribe(
+                    audio_path,
+                    word_timestamps=word_timestamps,
+                    progress_callback=progress_callback,
+                    language=language,
+                    speaker_count=speaker_count,
+                    features=features,
+                )
+                batch = self._convert_segments(result.segments)
+                transcription.segments.extend(batch)
+                self._finish(transcription, result)
+                yield batch
+            return
 
-        # Convert Gemini segments to DiarizedTranscriptSegment
+        for update in self.gemini.iter_transcribe_chunked(
+            audio_path,
+            progress_callback=progress_callback,
+            language=language,
+            speaker_count=speaker_count,
+            features=features,
+        ):
+            if update.segments:
+                yield convert(update.segments)
+            if update.result is not None:
+                self._finish(transcription, _check_chunked_result(update.result))
+
+    async def atranscribe_iter(
+        self,
+        audio_path: str,
+        *,
+        word_timestamps: bool = False,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+        transcription: Optional[DiarizedTranscription] = None,
+        **kwargs,  # Accept other args for compatibility but ignore them
+    ) -> AsyncIterator[List[DiarizedTranscriptSegment]]:
+        """Async version of :meth:`transcribe_iter` for use inside an event loop."""
+        import asyncio
+
+        from omnilingual_asr.models.inference.audio import get_audio_duration
+        from omnilingual_asr.models.inference.gemini_pipeline import (
+            MIN_DURATION_FOR_CHUNKING,
+        )
+        from omnilingual_asr.models.inference.retry import is_retryable_error
+
+        if transcription is None:
+            transcription = DiarizedTranscription()
+        timer = (
+            asyncio.wrap_future(_start_word_timer(audio_path)) if word_timestamps else None
+        )
+
+        async def convert(
+            segments: List[GeminiTranscriptSegment],
+        ) -> List[DiarizedTranscriptSegment]:
+            batch = self._convert_segments(segments, await timer if timer else None)
+            transcription.segments.extend(batch)
+            return batch
+
+        duration = await asyncio.to_thread(get_audio_duration, Path(audio_path))
+        if 0 < duration <= MIN_DURATION_FOR_CHUNKING:
+            streamed = False
+            stream = self.gemini_async.iter_transcribe(
+                audio_path,
+                progress_callback=progress_callback,
+                language=language,
+                speaker_count=speaker_count,
+                features=features,
+            )
+            try:
+                async for update in stream:
+                    if update.segments:
+                        streamed = True
+                        yield await convert(update.segments)
+                    if update.result is not None:
+                        self._finish(transcription, update.result)
+            except Exception as e:
+                if streamed or not is_retryable_error(e):
+                    raise
+                # Nothing was shown yet; fall back to retrying the whole request
+                result = await self._atranscribe(
+                    audio_path,
+                    word_timestamps=word_timestamps,
+                    progress_callback=progress_callback,
+                    language=language,
+                    speaker_count=speaker_count,
+                    features=features,
+                )
+                batch = self._convert_segments(result.segments)
+                transcription.segments.extend(batch)
+                self._finish(transcription, result)
+                yield batch
+            finally:
+                await stream.aclose()
+            return
+
+        updates = self.gemini_async.iter_transcribe_chunked(
+            audio_path,
+            progress_callback=progress_callback,
+            language=language,
+            speaker_count=speaker_count,
+            features=features,
+        )
+        try:
+            async for update in updates:
+                if update.segments:
+                    yield await convert(update.segments)
+                if update.result is not None:
+                    self._finish(transcription, _check_chunked_result(update.result))
+        finally:
+            await updates.aclose()
+
+    def enrich_iter(
+        self,
+        segments: List[DiarizedTranscriptSegment],
+        *,
+        features: Optional[Iterable[str]] = None,
+        language: Optional[str] = None,
+        transcription: Optional[DiarizedTranscription] = None,
+    ) -> Iterator[Dict[int, DiarizedTranscriptSegment]]:
+        """Add features to a transcript from its text, without resending audio.
+
+        Use after transcribing with ``features=[]`` to show the transcript
+        first and fill in translation, emotion and languages as batches of
+        segments come back.
+
+        Args:
+            segments: Transcript to enrich
+            features: Subset of TRANSCRIPTION_FEATURES to add (default: all)
+            language: Optional language hint (e.g., 'en', 'es', 'fr')
+            transcription: Optional transcription ``segments`` came from; its
+                segments are replaced as they are enriched, and the summary,
+                languages and metrics of the pass are added once iteration
+                completes. Without it they only reach the properties.
+
+        Yields:
+            Enriched segments by their position in ``segments``
+        """
+        transcription = self._enrichment_target(segments, transcription)
+        for update in self.gemini.iter_enrich(
+            _to_gemini_result(segments), features=features, language=language
+        ):
+            if update.segments:
+                yield self._convert_enriched(update.segments, transcription)
+            if update.result is not None:
+                self._finish_enrichment(transcription, update.result)
+
+    async def aenrich_iter(
+        self,
+        segments: List[DiarizedTranscriptSegment],
+        *,
+        features: Optional[Iterable[str]] = None,
+        language: Optional[str] = None,
+        transcription: Optional[DiarizedTranscription] = None,
+    ) -> AsyncIterator[Dict[int, DiarizedTranscriptSegment]]:
+        """Async version of :meth:`enrich_iter` for use inside an event loop."""
+        transcription = self._enrichment_target(segments, transcription)
+        updates = self.gemini_async.iter_enrich(
+            _to_gemini_result(segments), features=features, language=language
+        )
+        try:
+            async for update in updates:
+                if update.segments:
+                    yield self._convert_enriched(update.segments, transcription)
+                if update.result is not None:
+                    self._finish_enrichment(transcription, update.result)
+        finally:
+            await updates.aclose()
+
+    def _finish(
+        self, transcription: DiarizedTranscription, result: GeminiTranscriptionResult
+    ) -> DiarizedTranscription:
+        """Record a finished result's metadata on the call's transcription."""
+        transcription.summary = result.summary
+        transcription.detected_languages = result.detected_languages
+        transcription.failed_chunks = result.failed_chunks
+        transcription.metrics = result.metrics
+        transcription.speech_map = result.speech_map
+        self._last = transcription
+        return transcription
+
+    def _enrichment_target(
+        self,
+        segments: List[DiarizedTranscriptSegment],
+        transcription: Optional[DiarizedTranscription],
+    ) -> DiarizedTranscription:
+        """The transcription an enrichment pass over segments updates."""
+        if transcription is not None:
+            return transcription
+        # Callers of the properties expect the pass to extend the last call
+        return replace(self._last, segments=list(segments))
+
+    def _finish_enrichment(
+        self, transcription: DiarizedTranscription, result: GeminiTranscriptionResult
+    ) -> None:
+        """Record the metadata an enrichment pass added."""
+        from omnilingual_asr.models.inference.metrics import TranscriptionMetrics
+
+        transcription.metrics = TranscriptionMetrics.combine(
+            [transcription.metrics, result.metrics]
+        )
+        if result.summary:
+            transcription.summary = result.summary
+        if result.detected_languages:
+            transcription.detected_languages = result.detected_languages
+        self._last = transcription
+
+    def _convert_enriched(
+        self,
+        enriched: Dict[int, GeminiTranscriptSegment],
+        transcription: DiarizedTranscription,
+    ) -> Dict[int, DiarizedTranscriptSegment]:
+        """Convert enriched Gemini segments, keeping their positions."""
+        indices = list(enriched)
+        converted = dict(zip(indices, self._convert_segments([enriched[i] for i in indices])))
+        for index, seg in converted.items():
+            if index < len(transcription.segments):
+                transcription.segments[index] = seg
+        return converted
+
+    @staticmethod
+    def _convert_segments(
+        gemini_segments: List[GeminiTranscriptSegment],
+        timer: Optional[WordTimer] = None,
+    ) -> List[DiarizedTranscriptSegment]:
+        """Convert Gemini segments to DiarizedTranscriptSegment.
+
+        Gemini doesn't provide word-level timestamps; with ``timer`` they are
+        estimated for each segment, otherwise existing ones are kept.
+        """
+        if timer is not None:
+            gemini_segments = timer.segments(gemini_segments)
         segments: List[DiarizedTranscriptSegment] = []
-        for seg in result.segments:
+        for seg in gemini_segments:
             segments.append(
                 DiarizedTranscriptSegment(
                     start=seg.start,
                     end=seg.end,
                     speaker=seg.speaker,
                     text=seg.text,
-                    words=None,  # Gemini doesn't provide word-level timestamps
+                    words=(
+                        [WordTimestamp(w.word, w.start, w.end) for w in seg.words]
+                        if seg.words is not None
+                        else None
+                    ),
                     language=seg.language,
                     language_code=seg.language_code,
                     languages=seg.languages,  # For code-switching support
@@ -6,16 +6,114 @@
 
 """Gemini API-based speech transcription pipeline."""
 
+from omnilingual_asr.models.inference.async_pipeline import AsyncGeminiASRPipeline
+from omnilingual_asr.models.inference.audio import AudioChunk, AudioSplit, split_audio
+from omnilingual_asr.models.inference.backends import (
+    FakeBackend,
+    FakeLatency,
+    GeminiBackend,
+    GeminiClientPool,
+    KeyPoolBackend,
+    TranscriptionBackend,
+    get_client_pool,
+)
+from omnilingual_asr.models.inference.cache import (
+    MemoryTranscriptionCache,
+    SQLiteTranscriptionCache,
+    TranscriptionCache,
+)
 from omnilingual_asr.models.inference.gemini_pipeline import (
+    TRANSCRIPTION_FEATURES,
+    ChunkFailure,
+    EnrichmentUpdate,
     GeminiASRPipeline,
     GeminiTranscriptionResult,
     GeminiTranscriptSegment,
+    TranscriptionUpdate,
     WordTimestamp,
+    build_transcription_prompt,
+    build_transcription_schema,
+    output_token_savings,
+)
+from omnilingual_asr.models.inference.hedging import RequestHedger
+from omnilingual_asr.models.inference.metrics import (
+    MetricsCollector,
+    RequestMetrics,
+    TokenPricing,
+    TranscriptionMetrics,
+    get_metrics_collector,
+)
+from omnilingual_asr.models.inference.probe import (
+    AudioInfo,
+    AudioProbeError,
+    probe_audio,
+    probe_bytes,
+)
+from omnilingual_asr.models.inference.rate_limit import (
+    AdaptiveRateLimiter,
+    get_rate_limiter,
+)
+from omnilingual_asr.models.inference.transcode import (
+    TRANSCODE_PRESETS,
+    TranscodeSettings,
+)
+from omnilingual_asr.models.inference.uploads import (
+    UploadRegistry,
+    get_upload_registry,
+)
+from omnilingual_asr.models.inference.vad import SpeechMap, detect_speech, strip_silence
+from omnilingual_asr.models.inference.word_timing import (
+    WordTimer,
+    add_word_timestamps,
+    load_envelope,
 )
 
 __all__ = [
+    "TRANSCODE_PRESETS",
+    "TRANSCRIPTION_FEATURES",
+    "AdaptiveRateLimiter",
+    "AsyncGeminiASRPipeline",
+    "AudioChunk",
+    "AudioInfo",
+    "AudioProbeError",
+    "AudioSplit",
+    "ChunkFailure",
+    "EnrichmentUpdate",
+    "FakeBackend",
+    "FakeLatency",
     "GeminiASRPipeline",
+    "GeminiBackend",
+    "GeminiClientPool",
     "GeminiTranscriptionResult",
     "GeminiTranscriptSegment",
+    "KeyPoolBackend",
+    "MemoryTranscriptionCache",
+    "MetricsCollector",
+    "RequestHedger",
+    "RequestMetrics",
+    "SQLiteTranscriptionCache",
+    "SpeechMap",
+    "TokenPricing",
+    "TranscodeSettings",
+    "TranscriptionBackend",
+    "TranscriptionCache",
+    "TranscriptionMetrics",
+    "TranscriptionUpdate",
+    "UploadRegistry",
+    "WordTimer",
     "WordTimestamp",
+    "add_word_timestamps",
+    "build_transcription_prompt",
+    "build_transcription_schema",
+    "detect_speech",
+    "get_client_pool",
+    "get_metrics_collector",
+    "get_rate_limiter",
+    "get_upload_registry",
+    "load_envelope",
+    "output_token_savings",
+    "probe_audio",
+    "probe_bytes",
+    "split_audio",
+    "strip_silence",
 ]
@@ -0,0 +1,1276 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""asyncio-native Gemini ASR pipeline built on the backends' async methods."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import shutil
+import subprocess
+import tempfile
+import time
+import weakref
+from dataclasses import replace
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+)
+
+from omnilingual_asr.models.inference.audio import (
+    CHUNK_DURATION_SECONDS,
+    CHUNK_OVERLAP_SECONDS,
+    PlannedChunk,
+    get_audio_duration,
+)
+from omnilingual_asr.models.inference.backends import TranscriptionBackend
+from omnilingual_asr.models.inference.cache import TranscriptionCache
+from omnilingual_asr.models.inference.checkpoint import ChunkCheckpoint
+from omnilingual_asr.models.inference.chunk_source import MemoryChunk, decode_pcm
+from omnilingual_asr.models.inference.gemini_pipeline import (
+    ENRICH_BATCH_SEGMENTS,
+    INLINE_AUDIO_LIMIT_BYTES,
+    MAX_CHUNK_ATTEMPTS,
+    MAX_PARALLEL_CHUNKS,
+    MAX_TRUNCATION_DEPTH,
+    MIN_DURATION_FOR_CHUNKING,
+    ChunkFailure,
+    EnrichmentUpdate,
+    GeminiASRPipeline,
+    GeminiTranscriptionResult,
+    GeminiTranscriptSegment,
+    TranscriptionUpdate,
+    _audio_seconds,
+    _chunk_failure,
+    _ChunkMerger,
+    _continuation_plan,
+    _EnrichBatch,
+    _enrichment_failure,
+    _EnrichmentMerger,
+    _is_missing_file_error,
+    _is_truncated,
+    _join_continuations,
+    _offset_result,
+    _output_tokens,
+    _plan_enrichment,
+    _Prompt,
+    _remap_result,
+    _remap_update,
+    _segment_from_dict,
+    _with_retries,
+    estimate_request_tokens,
+    resolve_features,
+    result_to_dict,
+    split_pack_result,
+)
+from omnilingual_asr.models.inference.metrics import (
+    RequestMetrics,
+    TranscriptionMetrics,
+)
+from omnilingual_asr.models.inference.packing import (
+    PACK_GAP_SECONDS,
+    PACK_TARGET_SECONDS,
+    ClipPack,
+    ClipPacker,
+)
+from omnilingual_asr.models.inference.retry import backoff_delay, is_retryable_error
+from omnilingual_asr.models.inference.stream_json import SegmentStreamParser
+from omnilingual_asr.models.inference.uploads import UploadedAudio, UploadRegistry
+from omnilingual_asr.models.inference.vad import SpeechMap
+
+
+async def _final_result(
+    updates: AsyncGenerator[TranscriptionUpdate, None],
+) -> GeminiTranscriptionResult:
+    """Consume updates until the one carrying the complete result."""
+    try:
+        async for update in updates:
+            if update.result is not None:
+                return update.result
+    finally:
+        await updates.aclose()
+    raise RuntimeError("Chunked transcription ended without a result")
+
+
+class AsyncGeminiASRPipeline:
+    """Async counterpart of :class:`GeminiASRPipeline`.
+
+    Network calls go through the backend's async methods, so a single event
+    loop can keep many chunk requests in flight without a thread per request. Concurrent
+    API calls made through one instance are bounded by ``max_concurrency``.
+    Prompt building, parsing, caching and the upload registry are shared
+    with the wrapped synchronous pipeline.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str | Sequence[str]] = None,
+        model: str = "gemini-3-flash-preview",
+        cache: Optional[TranscriptionCache] = None,
+        upload_registry: Optional[UploadRegistry] = None,
+        *,
+        max_concurrency: int = MAX_PARALLEL_CHUNKS,
+        pipeline: Optional[GeminiASRPipeline] = None,
+        backend: Optional[TranscriptionBackend] = None,
+    ) -> None:
+        """Initialize the async Gemini ASR pipeline.
+
+        Args:
+            api_key: Gemini API key, or several to spread requests over. If not
+                provided, will use GEMINI_API_KEY env var.
+            model: Gemini model to use (default: gemini-3-flash-preview)
+            cache: Optional result cache
+            upload_registry: Registry of Files API uploads to reuse
+            max_concurrency: Maximum concurrent API calls made through this instance
+            pipeline: Existing synchronous pipeline to share a backend and
+                settings with. When given, the other settings are ignored.
+            backend: Backend that answers requests. Defaults to the Gemini API.
+        """
+        self.gemini = pipeline or GeminiASRPipeline(
+            api_key=api_key,
+            model=model,
+            cache=cache,
+            upload_registry=upload_registry,
+            backend=backend,
+        )
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Held by every task uploading or waiting for a key, and dropped with
+        # the last of them, so a new caller never gets a second lock
+        self._upload_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+
+    async def warmup(self, connections: Optional[int] = None) -> None:
+        """Async version of :meth:`GeminiASRPipeline.warmup`.
+
+        Opens ``connections`` connections (default: ``max_concurrency``) on
+        the running event loop, which should be the one sending requests.
+        """
+        gemini = self.gemini
+        await gemini.backend.awarmup(gemini.model, connections or self.max_concurrency)
+
+    @contextlib.asynccontextmanager
+    async def _speech_audio(
+        self, audio_path: Path
+    ) -> AsyncIterator[tuple[Path, Optional[SpeechMap]]]:
+        """Async version of :meth:`GeminiASRPipeline._speech_audio`."""
+        gemini = self.gemini
+        if not gemini.strip_silence:
+            yield audio_path, None
+            return
+        temp_dir = Path(tempfile.mkdtemp(prefix="gemini_speech_"))
+        try:
+            output_path = temp_dir / "speech.wav"
+            speech = await asyncio.to_thread(
+                gemini._strip_silence, audio_path, output_path
+            )
+            yield (audio_path if speech is None else output_path), speech
+        finally:
+            await asyncio.to_thread(shutil.rmtree, temp_dir, True)
+
+    async def _prepare_audio_input(
+        self, audio: Path | MemoryChunk, request: RequestMetrics
+    ) -> Any:
+        """Prepare audio input for Gemini API without blocking the event loop."""
+        gemini = self.gemini
+        with request.stage("prepare"):
+            # Transcoding and disk reads happen off the loop
+            payload = await asyncio.to_thread(gemini._audio_payload, audio)
+            if payload.size < INLINE_AUDIO_LIMIT_BYTES:
+                data = await asyncio.to_thread(payload.read)
+                request.inline_bytes += payload.size
+                return gemini._types.Part.from_bytes(
+                    data=data, mime_type=payload.mime_type
+                )
+            key = await asyncio.to_thread(gemini._upload_key, audio)
+
+        entry = gemini.uploads.get(gemini._upload_account, key)
+        if entry is not None:
+            return entry
+        lock = self._upload_locks.get(key)
+        if lock is None:
+            lock = self._upload_locks[key] = asyncio.Lock()
+        async with lock:
+            entry = gemini.uploads.get(gemini._upload_account, key)
+            if entry is None:
+                with request.stage("upload"):
+                    upload_args = await asyncio.to_thread(gemini._upload_args, payload)
+                    uploaded_file = await gemini.backend.aupload(**upload_args)
+                request.upload_bytes += payload.size
+                entry = gemini.uploads.register(
+                    gemini._upload_account, key, uploaded_file
+                )
+        return entry
+
+    async def _generate_content(
+        self,
+        audio_input: Any,
+        prompt: _Prompt,
+        tokens: float = 0,
+        *,
+        request: RequestMetrics,
+        sending: Optional[asyncio.Event] = None,
+    ) -> Any:
+        """Send one transcription request through the shared rate limiter.
+
+        ``sending`` is set once the request has its slot and is sent.
+        """
+        gemini = self.gemini
+        queued = time.perf_counter()
+        try:
+            async with self._semaphore:
+                async with gemini.rate_limiter.aslot(tokens) as permit:
+                    sent = time.perf_counter()
+                    request.add_stage("queue", sent - queued)
+                    if sending is not None:
+                        sending.set()
+                    response = await gemini.backend.agenerate_content(
+                        **gemini._build_request(audio_input, prompt)
+                    )
+                    request.add_stage("generate", time.perf_counter() - sent)
+                    permit.record_usage(response)
+        except Exception as exc:
+            gemini.metrics_collector.observe_failure(request.kind, exc)
+            raise
+        request.record_usage(response)
+        return response
+
+    async def _generate_hedged(
+        self,
+        audio_input: Any,
+        prompt: _Prompt,
+        tokens: float = 0,
+        *,
+        request: RequestMetrics,
+    ) -> Any:
+        """Async version of :meth:`GeminiASRPipeline._generate_hedged`.
+
+        The request that does not answer first is cancelled.
+        """
+        gemini = self.gemini
+        hedger = gemini.hedging
+        delay = hedger.delay() if hedger is not None else None
+        if hedger is None or delay is None:
+            generated = request.stages.get("generate", 0.0)
+            response = await self._generate_content(
+                audio_input, prompt, tokens, request=request
+            )
+            if hedger is not None:
+                hedger.observe(request.stages["generate"] - generated)
+            return response
+
+        attempts: Dict[asyncio.Task, RequestMetrics] = {}
+
+        def submit(kind: str, sending: Optional[asyncio.Event] = None) -> asyncio.Task:
+            attempt = RequestMetrics(kind)
+            task = asyncio.create_task(
+                self._generate_content(
+                    audio_input, prompt, tokens, request=attempt, sending=sending
+                )
+            )
+            attempts[task] = attempt
+            return task
+
+        winner = hedge = None
+        sending = asyncio.Event()
+        submitted = time.perf_counter()
+        primary = submit(request.kind, sending)
+        primary.add_done_callback(lambda _: sending.set())
+        try:
+            # The delay runs from when the primary is sent
+            await sending.wait()
+            sent = time.perf_counter()
+            done, _ = await asyncio.wait([primary], timeout=delay)
+            if not done:
+                if hedger.allow():
+                    hedged = time.perf_counter()
+                    hedge = submit("hedge")
+                else:
+                    gemini.metrics_collector.observe_hedge_skipped()
+            pending = set(attempts)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next(
+                    (
+                        t
+                        for t in (primary, hedge)
+                        if t in done and t.exception() is None
+                    ),
+                    None,
+                )
+        finally:
+            ended = time.perf_counter()
+            for task in attempts:
+                task.cancel()
+            await asyncio.gather(*attempts, return_exceptions=True)
+
+        if winner is None:
+            if hedge is not None:
+                gemini.metrics_collector.observe_hedge("failed")
+            error = primary.exception()
+            assert error is not None
+            raise error
+        hedger.observe(ended - sent)
+        if hedge is not None:
+            gemini.metrics_collector.observe_hedge("won" if winner is hedge else "lost")
+        if winner is hedge:
+            # The primary's queueing and its delay, before the duplicate was sent
+            request.add_stage("hedge", hedged - submitted)
+        request.add_attempt(attempts[winner])
+        return winner.result()
+
+    async def _generate_content_stream(
+        self,
+        audio_input: Any,
+        prompt: _Prompt,
+        tokens: float = 0,
+        *,
+        request: RequestMetrics,
+    ) -> AsyncGenerator[Any, None]:
+        """Send one transcription request, yielding response pieces as they arrive."""
+        gemini = self.gemini
+        queued = time.perf_counter()
+        try:
+            async with self._semaphore:
+                async with gemini.rate_limiter.aslot(tokens) as permit:
+                    sent = time.perf_counter()
+                    request.add_stage("queue", sent - queued)
+                    last = None
+                    stream = await gemini.backend.agenerate_content_stream(
+                        **gemini._build_request(audio_input, prompt)
+                    )
+                    async for last in stream:
+                        if request.first_response_seconds is None:
+                            request.first_response_seconds = time.perf_counter() - sent
+                        yield last
+                    request.add_stage("generate", time.perf_counter() - sent)
+                    # Usage metadata and the finish reason arrive with the final piece
+                    permit.record_usage(last)
+        except Exception as exc:
+            gemini.metrics_collector.observe_failure(request.kind, exc)
+            raise
+        request.record_usage(last)
+
+    async def _complete_truncated(
+        self,
+        audio: Path | MemoryChunk,
+        prompt: _Prompt,
+        result: GeminiTranscriptionResult,
+        depth: int,
+    ) -> GeminiTranscriptionResult:
+        """Transcribe the audio a truncated response did not cover and merge it in."""
+        duration = await asyncio.to_thread(_audio_seconds, audio)
+        if duration <= 0:
+            # Unknown length; nothing to resume against
+            return result
+        plan = _continuation_plan(result, duration, depth)
+        if not plan:
+            return replace(result, truncated=False)
+
+        parts = []
+        with contextlib.ExitStack() as resources:
+            for planned in plan:
+                span = await asyncio.to_thread(
+                    self.gemini._open_span,
+                    audio,
+                    planned.start,
+                    planned.end - planned.start,
+                    resources,
+                )
+                part = await self._request_transcription(span, prompt, depth=depth + 1)
+                parts.append((planned, _offset_result(part, planned.start)))
+        return _join_continuations(result, parts)
+
+    async def _request_transcription(
+        self,
+        audio: Path | MemoryChunk,
+        prompt: _Prompt,
+        report: Optional[Callable[[str, int], None]] = None,
+        *,
+        depth: int = 0,
+        hedge: bool = False,
+    ) -> GeminiTranscriptionResult:
+        """Async version of :meth:`GeminiASRPipeline._request_transcription`."""
+        result = await self._request_once(
+            audio, prompt, report, continuation=depth > 0, hedge=hedge
+        )
+        if result.truncated and depth < MAX_TRUNCATION_DEPTH:
+            result = await self._complete_truncated(audio, prompt, result, depth)
+        return result
+
+    async def _request_once(
+        self,
+        audio: Path | MemoryChunk,
+        prompt: _Prompt,
+        report: Optional[Callable[[str, int], None]] = None,
+        *,
+        continuation: bool = False,
+        hedge: bool = False,
+    ) -> GeminiTranscriptionResult:
+        """Send one request and parse the response, flagging truncation."""
+        gemini = self.gemini
+
+        def _report(step: str, idx: int) -> None:
+            if report:
+                report(step, idx)
+
+        request = RequestMetrics(
+            "continuation" if continuation else "transcribe",
+            audio_seconds=await asyncio.to_thread(_audio_seconds, audio),
+        )
+
+        # Step 0: Prepare audio
+        _report("uploading", 0)
+        audio_input = await self._prepare_audio_input(audio, request)
+
+        # Step 1: Call Gemini API
+        _report("transcribing", 1)
+        tokens = estimate_request_tokens(audio, prompt.features)
+        generate = self._generate_hedged if hedge else self._generate_content
+        try:
+            response = await generate(audio_input, prompt, tokens, request=request)
+        except Exception as exc:
+            if not (
+                isinstance(audio_input, UploadedAudio) and _is_missing_file_error(exc)
+            ):
+                raise
+            # The registered upload was deleted or expired early; upload again
+            key = await asyncio.to_thread(gemini._upload_key, audio)
+            gemini.uploads.invalidate(gemini._upload_account, key)
+            audio_input = await self._prepare_audio_input(audio, request)
+            response = await generate(audio_input, prompt, tokens, request=request)
+
+        # Step 2: Parse response
+        _report("processing", 2)
+        with request.stage("parse"):
+            result = gemini._parse_response(response.text, prompt.features)
+        gemini.metrics_collector.observe_request(request)
+        return replace(
+            result,
+            truncated=_is_truncated(response),
+            output_tokens=_output_tokens(response),
+            metrics=TranscriptionMetrics([request]),
+        )
+
+    async def _iter_request(
+        self,
+        audio: Path | MemoryChunk,
+        prompt: _Prompt,
+        report: Optional[Callable[[str, int], None]] = None,
+    ) -> AsyncGenerator[TranscriptionUpdate, None]:
+        """Streaming version of :meth:`_request_transcription`."""
+        gemini = self.gemini
+
+        def _report(step: str, idx: int) -> None:
+            if report:
+                report(step, idx)
+
+        request = RequestMetrics(
+            "transcribe", audio_seconds=await asyncio.to_thread(_audio_seconds, audio)
+        )
+
+        # Step 0: Prepare audio
+        _report("uploading", 0)
+        audio_input = await self._prepare_audio_input(audio, request)
+
+        # Step 1: Stream the response, emitting segments as they close
+        _report("transcribing", 1)
+        tokens = estimate_request_tokens(audio, prompt.features)
+        for attempt in range(2):
+            parser = SegmentStreamParser()
+            last = None
+            stream = self._generate_content_stream(
+                audio_input, prompt, tokens, request=request
+            )
+            try:
+                async for last in stream:
+                    for seg in parser.feed(last.text or ""):
+                        _report("segment", parser.count)
+                        yield TranscriptionUpdate(
+                            [_segment_from_dict(seg, prompt.features)], 0, 1
+                        )
+                break
+            except Exception as exc:
+                if (
+                    attempt
+                    or parser.count
+                    or not (
+                        isinstance(audio_input, UploadedAudio)
+                        and _is_missing_file_error(exc)
+                    )
+                ):
+                    raise
+                # The registered upload was deleted or expired early; upload again
+                key = await asyncio.to_thread(gemini._upload_key, audio)
+                gemini.uploads.invalidate(gemini._upload_account, key)
+                audio_input = await self._prepare_audio_input(audio, request)
+            finally:
+                await stream.aclose()
+
+        with request.stage("parse"):
+            result = gemini._parse_response(parser.text, prompt.features)
+        gemini.metrics_collector.observe_request(request)
+        result = replace(
+            result,
+            output_tokens=_output_tokens(last),
+            metrics=TranscriptionMetrics([request]),
+        )
+        if _is_truncated(last):
+            # Hit the output limit; transcribe the rest without streaming
+            result = await self._complete_truncated(
+                audio, prompt, replace(result, truncated=True), 0
+            )
+            if len(result.segments) > parser.count:
+                _report("segment", len(result.segments))
+                yield TranscriptionUpdate(result.segments[parser.count :], 0, 1)
+
+        # Step 2: Parse the complete response
+        _report("processing", 2)
+        yield TranscriptionUpdate([], 1, 1, result)
+
+    async def iter_transcribe(
+        self,
+        audio_path: str | Path,
+        *,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+    ) -> AsyncGenerator[TranscriptionUpdate, None]:
+        """Async version of :meth:`GeminiASRPipeline.iter_transcribe`.
+
+        Yields:
+            An update per segment, then one carrying the complete result
+        """
+        async with self._speech_audio(Path(audio_path)) as (audio_path, speech):
+            updates = self._iter_transcribe(
+                audio_path,
+                progress_callback=progress_callback,
+                language=language,
+                speaker_count=speaker_count,
+                features=features,
+            )
+            try:
+                async for update in updates:
+                    yield _remap_update(update, speech)
+            finally:
+                await updates.aclose()
+
+    async def _iter_transcribe(
+        self,
+        audio_path: Path,
+        *,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+    ) -> AsyncGenerator[TranscriptionUpdate, None]:
+        """:meth:`iter_transcribe` of audio that is sent as it is."""
+        gemini = self.gemini
+
+        def _report(step: str, idx: int) -> None:
+            if progress_callback:
+                progress_callback(step, idx)
+
+        prompt = gemini._build_prompt(
+            language=language, speaker_count=speaker_count, features=features
+        )
+
+        cache_key = None
+        if gemini.cache is not None:
+            cache_key = await asyncio.to_thread(gemini._cache_key, audio_path, prompt)
+            cached = await asyncio.to_thread(gemini._cache_get, cache_key)
+            if cached is not None:
+                _report("done", 3)
+                yield TranscriptionUpdate(list(cached.segments), 1, 1, cached)
+                return
+
+        updates = self._iter_request(audio_path, prompt, _report)
+        try:
+            async for update in updates:
+                if update.result is not None:
+                    if update.result.segments and cache_key is not None:
+                        await asyncio.to_thread(
+                            gemini._cache_put, cache_key, update.result
+                        )
+                    _report("done", 3)
+                yield update
+        finally:
+            await updates.aclose()
+
+    async def transcribe(
+        self,
+        audio_path: str | Path,
+        *,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+    ) -> GeminiTranscriptionResult:
+        """Transcribe audio file using Gemini API.
+
+        Args:
+            audio_path: Path to the audio file
+            progress_callback: Optional callback(step_name, step_index) to report progress.
+                Steps: "uploading" (0), "transcribing" (1), "processing" (2), "done" (3)
+            language: Optional language hint (e.g., 'en', 'es', 'fr')
+            speaker_count: Optional speaker count hint (e.g., '1', '2', '3')
+            features: Optional subset of TRANSCRIPTION_FEATURES to request (default: all)
+
+        Returns:
+            Transcription result with segments, summary, and metadata
+        """
+        async with self._speech_audio(Path(audio_path)) as (audio_path, speech):
+            result = await self._transcribe(
+                audio_path,
+                progress_callback=progress_callback,
+                language=language,
+                speaker_count=speaker_count,
+                features=features,
+            )
+        return _remap_result(result, speech)
+
+    async def _transcribe(
+        self,
+        audio_path: Path,
+        *,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+    ) -> GeminiTranscriptionResult:
+        """:meth:`transcribe` of audio that is sent as it is."""
+        gemini = self.gemini
+
+        def _report(step: str, idx: int) -> None:
+            if progress_callback:
+                progress_callback(step, idx)
+
+        prompt = gemini._build_prompt(
+            language=language, speaker_count=speaker_count, features=features
+        )
+
+        cache_key = None
+        if gemini.cache is not None:
+            cache_key = await asyncio.to_thread(gemini._cache_key, audio_path, prompt)
+            cached = await asyncio.to_thread(gemini._cache_get, cache_key)
+            if cached is not None:
+                _report("done", 3)
+                return cached
+
+        result = await self._request_transcription(audio_path, prompt, _report)
+        if result.segments and cache_key is not None:
+            await asyncio.to_thread(gemini._cache_put, cache_key, result)
+
+        # Step 3: Done
+        _report("done", 3)
+        return result
+
+    async def _transcribe_chunk(
+        self,
+        chunk: Path | MemoryChunk,
+        planned: PlannedChunk,
+        prompt: _Prompt,
+        *,
+        max_attempts: int = MAX_CHUNK_ATTEMPTS,
+        checkpoint: Optional[ChunkCheckpoint] = None,
+    ) -> tuple[PlannedChunk, GeminiTranscriptionResult | ChunkFailure]:
+        """Transcribe a single chunk, retrying transient failures.
+
+        Returns:
+            The planned chunk with its absolute-timestamp result, or with a
+            description of why it failed
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = await self._request_transcription(chunk, prompt, hedge=True)
+                break
+            except Exception as e:
+                if attempt >= max_attempts or not is_retryable_error(e):
+                    return planned, _chunk_failure(planned, e, attempt)
+                self.gemini.metrics_collector.observe_retry("transcribe")
+                await asyncio.sleep(backoff_delay(attempt - 1))
+
+        result = _offset_result(_with_retries(result, attempt - 1), planned.start)
+        if checkpoint is not None and not result.truncated:
+            await asyncio.to_thread(checkpoint.save, planned, result_to_dict(result))
+        return planned, result
+
+    async def iter_transcribe_chunked(
+        self,
+        audio_path: str | Path,
+        *,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+        chunk_duration: float = CHUNK_DURATION_SECONDS,
+        overlap: float = CHUNK_OVERLAP_SECONDS,
+        snap_to_silence: bool = True,
+        max_attempts: int = MAX_CHUNK_ATTEMPTS,
+    ) -> AsyncGenerator[TranscriptionUpdate, None]:
+        """Async version of :meth:`GeminiASRPipeline.iter_transcribe_chunked`.
+
+        Takes the same arguments as :meth:`transcribe_chunked`.
+
+        Yields:
+            Transcription updates; segments arrive in time order and the
+            last update carries the merged result
+        """
+        async with self._speech_audio(Path(audio_path)) as (audio_path, speech):
+            updates = self._iter_transcribe_chunked(
+                audio_path,
+                progress_callback=progress_callback,
+                language=language,
+                speaker_count=speaker_count,
+                features=features,
+                chunk_duration=chunk_duration,
+                overlap=overlap,
+                snap_to_silence=snap_to_silence,
+                max_attempts=max_attempts,
+            )
+            try:
+                async for update in updates:
+                    yield _remap_update(update, speech)
+            finally:
+                await updates.aclose()
+
+    async def _iter_transcribe_chunked(
+        self,
+        audio_path: Path,
+        *,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+        chunk_duration: float = CHUNK_DURATION_SECONDS,
+        overlap: float = CHUNK_OVERLAP_SECONDS,
+        snap_to_silence: bool = True,
+        max_attempts: int = MAX_CHUNK_ATTEMPTS,
+    ) -> AsyncGenerator[TranscriptionUpdate, None]:
+        """:meth:`iter_transcribe_chunked` of audio that is sent as it is."""
+        gemini = self.gemini
+
+        def _report(step: str, idx: int) -> None:
+            if progress_callback:
+                progress_callback(step, idx)
+
+        prompt = gemini._build_prompt(
+            language=language, speaker_count=speaker_count, features=features
+        )
+        variant = f"chunked:{chunk_duration}:{overlap}:{snap_to_silence}"
+        cache_key = None
+        if gemini.cache is not None:
+            cache_key = await asyncio.to_thread(
+                gemini._cache_key, audio_path, prompt, variant
+            )
+            cached = await asyncio.to_thread(gemini._cache_get, cache_key)
+            if cached is not None:
+                _report("done", 3)
+                yield TranscriptionUpdate(list(cached.segments), 1, 1, cached)
+                return
+        checkpoint = await asyncio.to_thread(
+            gemini._open_checkpoint, audio_path, prompt, variant
+        )
+
+        # Step 0: Split audio into chunks (ffmpeg work, off the loop)
+        _report("uploading", 0)
+        temp_dir = Path(tempfile.mkdtemp(prefix="gemini_chunks_"))
+        resources = contextlib.ExitStack()
+        tasks: List[asyncio.Task] = []
+        try:
+            prepared = await asyncio.to_thread(
+                gemini._prepare_chunks,
+                audio_path,
+                temp_dir,
+                checkpoint,
+                resources,
+                chunk_duration=chunk_duration,
+                overlap=overlap,
+                snap_to_silence=snap_to_silence,
+            )
+
+            if prepared is None:
+                # No chunking needed, use regular transcription
+                result = await self._transcribe(
+                    audio_path,
+                    progress_callback=progress_callback,
+                    language=language,
+                    speaker_count=speaker_count,
+                    features=features,
+                )
+                yield TranscriptionUpdate(list(result.segments), 1, 1, result)
+                return
+            restored, pending = prepared
+            merger = _ChunkMerger(
+                [planned for planned, _ in restored]
+                + [planned for _, planned in pending]
+            )
+
+            # Step 1: Transcribe the remaining chunks; the semaphore bounds calls
+            _report("transcribing", 1)
+            tasks = [
+                asyncio.create_task(
+                    self._transcribe_chunk(
+                        chunk,
+                        planned,
+                        prompt,
+                        max_attempts=max_attempts,
+                        checkpoint=checkpoint,
+                    )
+                )
+                for chunk, planned in pending
+            ]
+
+            if restored:
+                final: List[GeminiTranscriptSegment] = []
+                for planned, result in restored:
+                    final.extend(merger.add(planned, result))
+                yield TranscriptionUpdate(final, merger.finished, merger.total)
+
+            failures: List[ChunkFailure] = []
+            for next_done in asyncio.as_completed(tasks):
+                planned, outcome = await next_done
+                if isinstance(outcome, ChunkFailure):
+                    failures.append(outcome)
+                    final = merger.add(planned, None)
+                else:
+                    final = merger.add(planned, outcome)
+                yield TranscriptionUpdate(final, merger.finished, merger.total)
+
+            # Step 2: Merge results
+            _report("processing", 2)
+            result = merger.result(failures)
+            if not failures and not result.truncated:
+                if cache_key is not None:
+                    await asyncio.to_thread(gemini._cache_put, cache_key, result)
+                if checkpoint is not None:
+                    await asyncio.to_thread(checkpoint.clear)
+
+            # Step 3: Done
+            _report("done", 3)
+            yield TranscriptionUpdate([], merger.finished, merger.total, result)
+        finally:
+            # Stop outstanding chunks if the caller stopped iterating early
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Release in-memory chunk sources and cleanup temp files
+            resources.close()
+            await asyncio.to_thread(shutil.rmtree, temp_dir, True)
+
+    async def transcribe_chunked(
+        self,
+        audio_path: str | Path,
+        *,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+        chunk_duration: float = CHUNK_DURATION_SECONDS,
+        overlap: float = CHUNK_OVERLAP_SECONDS,
+        snap_to_silence: bool = True,
+        max_attempts: int = MAX_CHUNK_ATTEMPTS,
+    ) -> GeminiTranscriptionResult:
+        """Transcribe long audio by splitting into chunks and processing concurrently.
+
+        Chunks are retried individually and resumed from the wrapped
+        pipeline's checkpoint directory, as in
+        :meth:`GeminiASRPipeline.transcribe_chunked`.
+
+        Args:
+            audio_path: Path to the audio file
+            progress_callback: Optional progress callback
+            language: Optional language hint
+            speaker_count: Optional speaker count hint
+            features: Optional subset of TRANSCRIPTION_FEATURES to request (default: all)
+            chunk_duration: Target chunk length in seconds
+            overlap: Seconds of audio shared by adjacent chunks
+            snap_to_silence: Whether to move cuts to nearby low-energy regions
+            max_attempts: Attempts per chunk before it is reported as failed
+
+        Returns:
+            Merged transcription result
+        """
+        return await _final_result(
+            self.iter_transcribe_chunked(
+                audio_path,
+                progress_callback=progress_callback,
+                language=language,
+                speaker_count=speaker_count,
+                features=features,
+                chunk_duration=chunk_duration,
+                overlap=overlap,
+                snap_to_silence=snap_to_silence,
+                max_attempts=max_attempts,
+            )
+        )
+
+    async def transcribe_with_retry(
+        self,
+        audio_path: str | Path,
+        *,
+        max_retries: int = 3,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+    ) -> GeminiTranscriptionResult:
+        """Transcribe with automatic retry on transient failures.
+
+        For long audio files (> 6 minutes), automatically uses chunked
+        concurrent processing with per-chunk retries.
+
+        Args:
+            audio_path: Path to the audio file
+            max_retries: Maximum number of attempts (per chunk for long audio)
+            progress_callback: Optional progress callback
+            language: Optional language hint (e.g., 'en', 'es', 'fr')
+            speaker_count: Optional speaker count hint (e.g., '1', '2', '3')
+            features: Optional subset of TRANSCRIPTION_FEATURES to request (default: all)
+
+        Returns:
+            Transcription result
+        """
+        async with self._speech_audio(Path(audio_path)) as (audio_path, speech):
+            result = await self._transcribe_with_retry(
+                audio_path,
+                max_retries=max_retries,
+                progress_callback=progress_callback,
+                language=language,
+                speaker_count=speaker_count,
+                features=features,
+            )
+        return _remap_result(result, speech)
+
+    async def _transcribe_with_retry(
+        self,
+        audio_path: Path,
+        *,
+        max_retries: int = 3,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+    ) -> GeminiTranscriptionResult:
+        """:meth:`transcribe_with_retry` of audio that is sent as it is."""
+        # Check if we should use chunked processing (also when the duration
+        # is unknown, see GeminiASRPipeline.transcribe_with_retry)
+        duration = await asyncio.to_thread(get_audio_duration, audio_path)
+        if duration <= 0 or duration > MIN_DURATION_FOR_CHUNKING:
+            result = await _final_result(
+                self._iter_transcribe_chunked(
+                    audio_path,
+                    progress_callback=progress_callback,
+                    language=language,
+                    speaker_count=speaker_count,
+                    features=features,
+                    max_attempts=max_retries,
+                )
+            )
+            if result.failed_chunks and not result.segments:
+                raise RuntimeError(
+                    f"Failed to transcribe any chunk: {result.failed_chunks[0].error}"
+                )
+            return result
+
+        last_error = None
+        for attempt in range(max_retries):
+            try:
+                result = await self._transcribe(
+                    audio_path,
+                    progress_callback=progress_callback,
+                    language=language,
+                    speaker_count=speaker_count,
+                    features=features,
+                )
+                return _with_retries(result, attempt)
+            except Exception as e:
+                last_error = e
+                if not is_retryable_error(e):
+                    break
+                if attempt < max_retries - 1:
+                    self.gemini.metrics_collector.observe_retry("transcribe")
+                    await asyncio.sleep(backoff_delay(attempt))
+
+        raise RuntimeError(
+            f"Failed to transcribe after {attempt + 1} attempts: {last_error}"
+        )
+
+    async def _enrich_batch(
+        self, batch: _EnrichBatch, *, max_attempts: int = MAX_CHUNK_ATTEMPTS
+    ) -> tuple[_EnrichBatch, tuple[str, RequestMetrics] | ChunkFailure]:
+        """Send one text-only enrichment request, retrying transient failures."""
+        attempt = 0
+        while True:
+            attempt += 1
+            request = RequestMetrics("enrich")
+            try:
+                response = await self._generate_content(
+                    None, batch.prompt, batch.tokens, request=request
+                )
+                self.gemini.metrics_collector.observe_request(request)
+                return batch, (response.text or "", request)
+            except Exception as e:
+                if attempt >= max_attempts or not is_retryable_error(e):
+                    return batch, _enrichment_failure(batch, e, attempt)
+                self.gemini.metrics_collector.observe_retry("enrich")
+                await asyncio.sleep(backoff_delay(attempt - 1))
+
+    async def iter_enrich(
+        self,
+        result: GeminiTranscriptionResult,
+        *,
+        features: Optional[Iterable[str]] = None,
+        language: Optional[str] = None,
+        batch_size: int = ENRICH_BATCH_SEGMENTS,
+        max_attempts: int = MAX_CHUNK_ATTEMPTS,
+    ) -> AsyncGenerator[EnrichmentUpdate, None]:
+        """Async version of :meth:`GeminiASRPipeline.iter_enrich`.
+
+        Yields:
+            An update per finished request; the last update carries the
+            enriched result and any failed batches
+        """
+        batches = _plan_enrichment(
+            result, resolve_features(features), language, batch_size
+        )
+        merger = _EnrichmentMerger(result, len(batches))
+        tasks = [
+            asyncio.create_task(self._enrich_batch(batch, max_attempts=max_attempts))
+            for batch in batches
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                batch, outcome = await next_done
+                yield merger.add(batch, outcome)
+            yield merger.last_update()
+        finally:
+            # Stop outstanding requests if the caller stopped iterating early
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def enrich(
+        self,
+        result: GeminiTranscriptionResult,
+        *,
+        features: Optional[Iterable[str]] = None,
+        language: Optional[str] = None,
+        enrichment_callback: Optional[Callable[[EnrichmentUpdate], None]] = None,
+        batch_size: int = ENRICH_BATCH_SEGMENTS,
+        max_attempts: int = MAX_CHUNK_ATTEMPTS,
+    ) -> GeminiTranscriptionResult:
+        """Async version of :meth:`GeminiASRPipeline.enrich`."""
+        updates = self.iter_enrich(
+            result,
+            features=features,
+            language=language,
+            batch_size=batch_size,
+            max_attempts=max_attempts,
+        )
+        try:
+            async for update in updates:
+                if enrichment_callback:
+                    enrichment_callback(update)
+                if update.result is not None:
+                    return update.result
+        finally:
+            await updates.aclose()
+        raise RuntimeError("Enrichment ended without a result")
+
+    async def transcribe_progressive(
+        self,
+        audio_path: str | Path,
+        *,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+        transcript_callback: Optional[
+            Callable[[GeminiTranscriptionResult], None]
+        ] = None,
+        enrichment_callback: Optional[Callable[[EnrichmentUpdate], None]] = None,
+    ) -> GeminiTranscriptionResult:
+        """Async version of :meth:`GeminiASRPipeline.transcribe_progressive`.
+
+        Callbacks are called on the event loop thread.
+        """
+        transcript = await self.transcribe_with_retry(
+            audio_path,
+            progress_callback=progress_callback,
+            language=language,
+            speaker_count=speaker_count,
+            features=(),
+        )
+        if transcript_callback:
+            transcript_callback(transcript)
+        return await self.enrich(
+            transcript,
+            features=features,
+            language=language,
+            enrichment_callback=enrichment_callback,
+        )
+
+    async def _transcribe_pack(
+        self,
+        pack: ClipPack,
+        language: Optional[str],
+        features: Optional[Iterable[str]],
+        *,
+        max_attempts: int = MAX_CHUNK_ATTEMPTS,
+    ) -> tuple[ClipPack, GeminiTranscriptionResult | ChunkFailure]:
+        """Transcribe a pack of clips in one request, retrying transient failures."""
+        prompt = self.gemini._clip_prompt(language, features, pack)
+        planned = PlannedChunk(0.0, pack.audio.duration, 0.0, pack.audio.duration)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return pack, await self._request_transcription(pack.audio, prompt)
+            except Exception as e:
+                if attempt >= max_attempts or not is_retryable_error(e):
+                    return pack, _chunk_failure(planned, e, attempt)
+                self.gemini.metrics_collector.observe_retry("transcribe")
+                await asyncio.sleep(backoff_delay(attempt - 1))
+
+    async def iter_transcribe_clips(
+        self,
+        audio_paths: Sequence[str | Path],
+        *,
+        language: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+        target_duration: float = PACK_TARGET_SECONDS,
+        gap: float = PACK_GAP_SECONDS,
+        max_attempts: int = MAX_CHUNK_ATTEMPTS,
+    ) -> AsyncGenerator[tuple[int, GeminiTranscriptionResult], None]:
+        """Async version of :meth:`GeminiASRPipeline.iter_transcribe_clips`.
+
+        Yields:
+            (position in audio_paths, clip result) in completion order
+        """
+        gemini = self.gemini
+        paths = [Path(path) for path in audio_paths]
+        features = resolve_features(features)
+        prompt = gemini._clip_prompt(language, features)
+
+        cache_keys: Dict[int, Optional[str]] = {}
+        pending = []
+        for index, path in enumerate(paths):
+            key = None
+            if gemini.cache is not None:
+                key = await asyncio.to_thread(gemini._cache_key, path, prompt, "clip")
+            cached = await asyncio.to_thread(gemini._cache_get, key)
+            if cached is not None:
+                yield index, cached
+                continue
+            cache_keys[index] = key
+            pending.append(index)
+
+        packer = ClipPacker(target_duration, gap)
+        in_flight: set[asyncio.Task] = set()
+
+        async def finish(
+            task: asyncio.Task,
+        ) -> List[tuple[int, GeminiTranscriptionResult]]:
+            pack, outcome = task.result()
+            finished = []
+            for clip, result in zip(pack.clips, split_pack_result(outcome, pack)):
+                if not result.failed_chunks:
+                    await asyncio.to_thread(
+                        gemini._cache_put, cache_keys.get(clip.index), result
+                    )
+                finished.append((clip.index, result))
+            return finished
+
+        def submit(pack: Optional[ClipPack]) -> None:
+            if pack is not None:
+                in_flight.add(
+                    asyncio.create_task(
+                        self._transcribe_pack(
+                            pack, language, features, max_attempts=max_attempts
+                        )
+                    )
+                )
+
+        try:
+            for index in pending:
+                try:
+                    samples = await asyncio.to_thread(decode_pcm, paths[index])
+                except (subprocess.CalledProcessError, OSError) as e:
+                    failure = ChunkFailure(
+                        0.0, 0.0, f"{type(e).__name__}: {e}", 1, False
+                    )
+                    yield index, GeminiTranscriptionResult(failed_chunks=[failure])
+                    continue
+                submit(packer.add(index, paths[index], samples))
+                # Decode ahead of the requests, but not without bound
+                if len(in_flight) >= 2 * self.max_concurrency:
+                    done, in_flight = await asyncio.wait(
+                        in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        for finished in await finish(task):
+                            yield finished
+            submit(packer.flush())
+            while in_flight:
+                done, in_flight = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    for finished in await finish(task):
+                        yield finished
+        finally:
+            # Stop outstanding packs if the caller stopped iterating early
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def transcribe_clips(
+        self,
+        audio_paths: Sequence[str | Path],
+        *,
+        language: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+        target_duration: float = PACK_TARGET_SECONDS,
+        gap: float = PACK_GAP_SECONDS,
+        max_attempts: int = MAX_CHUNK_ATTEMPTS,
+    ) -> List[GeminiTranscriptionResult]:
+        """Async version of :meth:`GeminiASRPipeline.transcribe_clips`.
+
+        Returns:
+            One result per clip, in the order of ``audio_paths``
+        """
+        results: Dict[int, GeminiTranscriptionResult] = {}
+        updates = self.iter_transcribe_clips(
+            audio_paths,
+            language=language,
+            features=features,
+            target_duration=target_duration,
+            gap=gap,
+            max_attempts=max_attempts,
+        )
+        try:
+            async for index, result in updates:
+                results[index] = result
+        finally:
+            await updates.aclose()
+        # Every clip is yielded once: from the cache, as a failure or from its pack
+        return [results[index] for index in range(len(audio_paths))]
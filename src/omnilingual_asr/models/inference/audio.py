@@ -0,0 +1,538 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Audio probing and splitting helpers built on ffmpeg."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import csv
+import math
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+from omnilingual_asr.models.inference.probe import AudioProbeError, probe_audio
+
+CHUNK_DURATION_SECONDS = 300  # 5 minutes per chunk
+CHUNK_OVERLAP_SECONDS = 2.0  # Audio shared by adjacent chunks around each cut
+MAX_PARALLEL_SPLITS = 4  # Concurrent ffmpeg processes for seek-based splitting
+_LIST_POLL_SECONDS = 0.05
+
+# Silence-aware chunk planning
+ENVELOPE_SAMPLE_RATE = 8000
+ENVELOPE_FRAME_SECONDS = 0.02
+SILENCE_SEARCH_SECONDS = 20.0  # How far back from a boundary to look for a pause
+SILENCE_SMOOTHING_SECONDS = 0.3
+SEEK_PREROLL_SECONDS = 0.5
+SILENCE_TOLERANCE_DB = 3.0  # Prefer later pauses within this much of the quietest
+
+# Lazy import for numpy, only needed for local signal analysis
+_np = None
+
+
+def _ensure_numpy():
+    """Ensure numpy is installed and import it."""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+
+            _np = numpy
+        except ImportError as exc:
+            raise RuntimeError(
+                "numpy is required for local audio analysis. "
+                "Install with: pip install 'omnilingual-asr[audio]'"
+            ) from exc
+    return _np
+
+
+@dataclass
+class AudioChunk:
+    """A chunk of a longer audio file."""
+
+    path: Path
+    start: float  # Offset of the chunk in the source file, in seconds
+    duration: float
+    elapsed: Optional[float] = None  # Wall time spent producing this chunk
+
+
+@dataclass
+class AudioSplit:
+    """Result of splitting an audio file, with timing information."""
+
+    chunks: List[AudioChunk] = field(default_factory=list)
+    method: str = "segment"
+    elapsed: float = 0.0  # Total wall time of the split
+
+
+def get_audio_duration(audio_path: Path) -> float:
+    """Get audio duration in seconds, or 0.0 if it can't be determined.
+
+    Headers are parsed in-process (see :func:`probe_audio`) and the result
+    is memoized, so calling this repeatedly for one file is cheap.
+    """
+    try:
+        return probe_audio(audio_path).duration
+    except (AudioProbeError, OSError):
+        return 0.0
+
+
+def _read_segment_list(list_path: Path, output_dir: Path) -> List[AudioChunk]:
+    """Read the CSV segment list written by ffmpeg's segment muxer."""
+    if not list_path.exists():
+        return []
+    chunks = []
+    with open(list_path, newline="") as f:
+        for row in csv.reader(f):
+            try:
+                start, end = float(row[1]), float(row[2])
+            except (IndexError, ValueError):
+                # Line still being written by ffmpeg
+                continue
+            chunks.append(AudioChunk(output_dir / row[0], start, end - start))
+    return chunks
+
+
+def _run_segment_muxer(
+    audio_path: Path,
+    chunk_duration: float,
+    output_dir: Path,
+    *,
+    copy: bool,
+) -> AudioSplit:
+    """Split in a single ffmpeg pass using the segment muxer.
+
+    The segment list is polled while ffmpeg runs so each chunk is stamped
+    with the time it took to become available.
+    """
+    ext = audio_path.suffix or ".wav"
+    list_path = output_dir / "segments.csv"
+    list_path.unlink(missing_ok=True)
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-v",
+        "error",
+        "-i",
+        str(audio_path),
+        "-map",
+        "0:a",
+        "-f",
+        "segment",
+        "-segment_time",
+        str(chunk_duration),
+        "-reset_timestamps",
+        "1",
+        "-segment_list",
+        str(list_path),
+        "-segment_list_type",
+        "csv",
+    ]
+    if copy:
+        cmd += ["-c", "copy"]  # Fast copy without re-encoding
+    cmd.append(str(output_dir / f"chunk_%04d{ext}"))
+
+    started = time.perf_counter()
+    last_ready = started
+    ready_at: List[float] = []
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    while proc.poll() is None:
+        time.sleep(_LIST_POLL_SECONDS)
+        done = len(_read_segment_list(list_path, output_dir))
+        while len(ready_at) < done:
+            ready_at.append(time.perf_counter())
+    _, stderr = proc.communicate()
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr)
+
+    finished = time.perf_counter()
+    chunks = _read_segment_list(list_path, output_dir)
+    for i, chunk in enumerate(chunks):
+        ready = ready_at[i] if i < len(ready_at) else finished
+        chunk.elapsed = ready - last_ready
+        last_ready = ready
+    return AudioSplit(chunks=chunks, method="segment", elapsed=finished - started)
+
+
+def _extract_chunk(
+    audio_path: Path,
+    chunk_path: Path,
+    start: float,
+    duration: float,
+) -> AudioChunk:
+    """Extract one chunk, seeking on the input before decoding."""
+    started = time.perf_counter()
+    base_cmd = [
+        "ffmpeg",
+        "-y",
+        "-v",
+        "error",
+        "-ss",
+        str(start),  # Input seeking: jump straight to the offset
+        "-t",
+        str(duration),
+        "-i",
+        str(audio_path),
+        "-map",
+        "0:a",
+    ]
+    try:
+        subprocess.run(
+            base_cmd + ["-c", "copy", str(chunk_path)],
+            capture_output=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError:
+        # Codec can't be stream-copied into this container; re-encode the chunk only
+        subprocess.run(base_cmd + [str(chunk_path)], capture_output=True, check=True)
+    return AudioChunk(chunk_path, start, duration, time.perf_counter() - started)
+
+
+def _run_seek_split(
+    audio_path: Path,
+    spans: List[tuple[float, float]],
+    output_dir: Path,
+    max_workers: int,
+) -> AudioSplit:
+    """Split by running one input-seeking ffmpeg process per span in parallel."""
+    ext = audio_path.suffix or ".wav"
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                _extract_chunk,
+                audio_path,
+                output_dir / f"chunk_{idx:04d}{ext}",
+                span_start,
+                span_duration,
+            )
+            for idx, (span_start, span_duration) in enumerate(spans)
+        ]
+        chunks = [future.result() for future in futures]
+    return AudioSplit(
+        chunks=chunks, method="seek", elapsed=time.perf_counter() - started
+    )
+
+
+def split_audio(
+    audio_path: Path,
+    chunk_duration: float = CHUNK_DURATION_SECONDS,
+    output_dir: Optional[Path] = None,
+    *,
+    method: str = "segment",
+    total_duration: Optional[float] = None,
+    max_workers: int = MAX_PARALLEL_SPLITS,
+) -> AudioSplit:
+    """Split an audio file into fixed-length chunks.
+
+    Two strategies are available:
+
+    - ``"segment"``: one ffmpeg process decodes the file once and writes every
+      chunk through the segment muxer (stream copy, re-encoding only if the
+      copy fails). Chunk offsets come from the muxer's segment list.
+    - ``"seek"``: one ffmpeg process per chunk, each seeking on the input so
+      only its own span is read, run in parallel.
+
+    Args:
+        audio_path: Path to the audio file
+        chunk_duration: Target chunk length in seconds
+        output_dir: Directory for chunk files (a temp dir if not given)
+        method: ``"segment"`` or ``"seek"``
+        total_duration: Known duration in seconds (probed if needed)
+        max_workers: Parallel ffmpeg processes for ``"seek"``
+
+    Returns:
+        Split result with per-chunk offsets and timings. Falls back to the
+        original file as a single chunk if splitting is not possible.
+    """
+    audio_path = Path(audio_path)
+    if output_dir is None:
+        output_dir = Path(tempfile.mkdtemp(prefix="audio_chunks_"))
+    unsplit = AudioSplit(
+        chunks=[AudioChunk(audio_path, 0.0, total_duration or 0.0)], method="none"
+    )
+
+    try:
+        if method == "seek":
+            if total_duration is None:
+                total_duration = get_audio_duration(audio_path)
+            if total_duration <= 0:
+                # Can't determine duration, return original file
+                return unsplit
+            spans = []
+            start = 0.0
+            while start < total_duration:
+                spans.append((start, min(chunk_duration, total_duration - start)))
+                start += chunk_duration
+            split = _run_seek_split(audio_path, spans, output_dir, max_workers)
+        elif method == "segment":
+            try:
+                split = _run_segment_muxer(
+                    audio_path, chunk_duration, output_dir, copy=True
+                )
+            except subprocess.CalledProcessError:
+                # If copy fails, do the single pass again with re-encoding
+                split = _run_segment_muxer(
+                    audio_path, chunk_duration, output_dir, copy=False
+                )
+        else:
+            raise ValueError(f"Unknown split method: {method!r}")
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return unsplit
+
+    return split if split.chunks else unsplit
+
+
+def split_audio_into_chunks(
+    audio_path: Path,
+    chunk_duration: float = CHUNK_DURATION_SECONDS,
+    output_dir: Optional[Path] = None,
+) -> List[tuple[Path, float]]:
+    """Split audio file into chunks using ffmpeg.
+
+    Returns:
+        List of (chunk_path, start_offset) tuples
+    """
+    split = split_audio(audio_path, chunk_duration, output_dir)
+    return [(chunk.path, chunk.start) for chunk in split.chunks]
+
+
+def split_audio_spans(
+    audio_path: Path,
+    spans: List[tuple[float, float]],
+    output_dir: Optional[Path] = None,
+    *,
+    max_workers: int = MAX_PARALLEL_SPLITS,
+) -> AudioSplit:
+    """Extract arbitrary, possibly overlapping, spans of an audio file.
+
+    Args:
+        audio_path: Path to the audio file
+        spans: List of (start, duration) tuples in seconds
+        output_dir: Directory for chunk files (a temp dir if not given)
+        max_workers: Parallel ffmpeg processes
+
+    Returns:
+        Split result with one chunk per span, in the order given
+    """
+    audio_path = Path(audio_path)
+    if output_dir is None:
+        output_dir = Path(tempfile.mkdtemp(prefix="audio_chunks_"))
+    return _run_seek_split(audio_path, spans, output_dir, max_workers)
+
+
+def compute_energy_envelope(
+    audio_path: Path,
+    *,
+    frame_seconds: float = ENVELOPE_FRAME_SECONDS,
+    sample_rate: int = ENVELOPE_SAMPLE_RATE,
+    start: Optional[float] = None,
+    duration: Optional[float] = None,
+) -> Any:
+    """Compute a per-frame RMS level (dBFS) of the audio's mono mixdown.
+
+    The file is decoded by ffmpeg to 16-bit PCM on a pipe and reduced block by
+    block, so memory use stays proportional to the number of frames rather
+    than the number of samples.
+
+    Args:
+        audio_path: Path to the audio file
+        frame_seconds: Frame length in seconds
+        sample_rate: Decode sample rate; energy does not need full bandwidth
+        start: Optional offset in seconds to start decoding at (input seek)
+        duration: Optional number of seconds to decode
+
+    Returns:
+        1-D float32 NumPy array with one dBFS value per frame
+    """
+    np = _ensure_numpy()
+    frame = max(1, int(round(sample_rate * frame_seconds)))
+    frame_bytes = frame * 2
+    cmd = ["ffmpeg", "-v", "error"]
+    if start is not None:
+        cmd += ["-ss", str(start)]
+    if duration is not None:
+        cmd += ["-t", str(duration)]
+    cmd += [
+        "-i",
+        str(audio_path),
+        "-map",
+        "0:a:0",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-f",
+        "s16le",
+        "-",
+    ]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    assert proc.stdout is not None
+    levels = []
+    pending = b""
+    while True:
+        block = proc.stdout.read(frame_bytes * 4096)
+        if not block:
+            break
+        data = pending + block
+        usable = len(data) - len(data) % frame_bytes
+        pending = data[usable:]
+        samples = np.frombuffer(data, dtype="<i2", count=usable // 2)
+        samples = samples.astype(np.float32).reshape(-1, frame)
+        levels.append(np.sqrt(np.mean(samples * samples, axis=1)))
+    if len(pending) >= 2:
+        tail = np.frombuffer(pending, dtype="<i2", count=len(pending) // 2)
+        tail = tail.astype(np.float32)
+        levels.append(np.sqrt(np.mean(tail * tail, keepdims=True)))
+    _, stderr = proc.communicate()
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr)
+
+    rms = np.concatenate(levels) if levels else np.zeros(0, dtype=np.float32)
+    return (20.0 * np.log10(np.maximum(rms / 32768.0, 1e-6))).astype(np.float32)
+
+
+@dataclass(frozen=True)
+class PlannedChunk:
+    """A chunk chosen by :func:`plan_chunks`.
+
+    ``start``/``end`` is the audio actually sent to the model, including the
+    overlap with neighbouring chunks. ``own_start``/``own_end`` is the span
+    between the cut points on either side; segments whose midpoint falls in it
+    are kept from this chunk when results are merged.
+    """
+
+    start: float
+    end: float
+    own_start: float
+    own_end: float
+
+
+def _quietest_point(envelope: Any, frame_seconds: float) -> Optional[float]:
+    """Return the offset of the quietest stretch of an envelope, if any.
+
+    Among stretches within ``SILENCE_TOLERANCE_DB`` of the minimum, the latest
+    is chosen so chunks stay close to their target length.
+    """
+    np = _ensure_numpy()
+    if len(envelope) < 1:
+        return None
+    # Smooth so a single quiet frame inside a word doesn't win over a real pause
+    width = max(1, int(SILENCE_SMOOTHING_SECONDS / frame_seconds))
+    if width > 1 and len(envelope) > width:
+        padded = np.pad(envelope, (width // 2, width - 1 - width // 2), mode="edge")
+        envelope = np.convolve(padded, np.ones(width) / width, mode="valid")
+    quiet = np.flatnonzero(envelope <= envelope.min() + SILENCE_TOLERANCE_DB)
+    return (int(quiet[-1]) + 0.5) * frame_seconds
+
+
+def plan_chunks(
+    total_duration: float,
+    chunk_duration: float = CHUNK_DURATION_SECONDS,
+    *,
+    overlap: float = 0.0,
+    find_cut: Optional[Callable[[float, float], Optional[float]]] = None,
+    search_window: float = SILENCE_SEARCH_SECONDS,
+) -> List[PlannedChunk]:
+    """Plan chunk boundaries, snapping cuts to nearby quiet regions.
+
+    Each cut is placed by ``find_cut`` within the ``search_window`` seconds
+    before the nominal boundary, so chunks never exceed ``chunk_duration``
+    (plus overlap). Without ``find_cut`` the cuts fall on the fixed grid.
+
+    Args:
+        total_duration: Audio duration in seconds
+        chunk_duration: Target chunk length in seconds
+        overlap: Seconds of audio shared by adjacent chunks, split evenly
+            around each cut
+        find_cut: Optional callable(window_start, window_end) returning the
+            time of a pause in that window, or None
+        search_window: How far before the nominal boundary to look for a pause
+
+    Returns:
+        Planned chunks in time order
+    """
+    search_window = min(search_window, chunk_duration / 2)
+    cuts = [0.0]
+    while total_duration - cuts[-1] > chunk_duration:
+        target = cuts[-1] + chunk_duration
+        cut = find_cut(target - search_window, target) if find_cut else None
+        if cut is None or not target - search_window <= cut <= target:
+            cut = target
+        cuts.append(cut)
+    cuts.append(total_duration)
+
+    half = overlap / 2
+    planned = []
+    for i in range(len(cuts) - 1):
+        first, last = i == 0, i == len(cuts) - 2
+        planned.append(
+            PlannedChunk(
+                start=cuts[i] if first else max(0.0, cuts[i] - half),
+                end=cuts[i + 1] if last else min(total_duration, cuts[i + 1] + half),
+                own_start=cuts[i],
+                own_end=cuts[i + 1] if not last else math.inf,
+            )
+        )
+    return planned
+
+
+def plan_audio_chunks(
+    audio_path: Path,
+    chunk_duration: float = CHUNK_DURATION_SECONDS,
+    *,
+    overlap: float = 0.0,
+    snap_to_silence: bool = True,
+    total_duration: Optional[float] = None,
+) -> List[PlannedChunk]:
+    """Plan silence-aware chunks for an audio file.
+
+    Only the search windows around each boundary are decoded (with input
+    seeking), so planning cost does not grow with the length of the speech
+    between cuts. Falls back to fixed boundaries if the audio can't be
+    analysed locally (no ffmpeg or NumPy), and to an empty plan if the
+    duration is unknown.
+
+    Args:
+        audio_path: Path to the audio file
+        chunk_duration: Target chunk length in seconds
+        overlap: Seconds of audio shared by adjacent chunks
+        snap_to_silence: Whether to move cuts to nearby pauses
+        total_duration: Known duration in seconds (probed if needed)
+
+    Returns:
+        Planned chunks in time order, or an empty list
+    """
+    if total_duration is None:
+        total_duration = get_audio_duration(audio_path)
+    if total_duration <= 0:
+        return []
+
+    def find_cut(window_start: float, window_end: float) -> Optional[float]:
+        # Decode a little early: decoders emit priming silence right after a seek
+        preroll = min(SEEK_PREROLL_SECONDS, window_start)
+        try:
+            envelope = compute_energy_envelope(
+                audio_path,
+                start=window_start - preroll,
+                duration=window_end - window_start + preroll,
+            )
+        except (RuntimeError, subprocess.CalledProcessError, FileNotFoundError):
+            return None
+        envelope = envelope[int(round(preroll / ENVELOPE_FRAME_SECONDS)) :]
+        offset = _quietest_point(envelope, ENVELOPE_FRAME_SECONDS)
+        return round(window_start + offset, 3) if offset is not None else None
+
+    return plan_chunks(
+        total_duration,
+        chunk_duration,
+        overlap=overlap,
+        find_cut=find_cut if snap_to_silence else None,
+    )
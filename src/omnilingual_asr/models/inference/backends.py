@@ -0,0 +1,1050 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Transcription backends: the Gemini API, or a local fake for load testing."""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import concurrent.futures
+import datetime
+import hashlib
+import itertools
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Sequence
+
+from omnilingual_asr.models.inference.metrics import (
+    MetricsCollector,
+    get_metrics_collector,
+)
+from omnilingual_asr.models.inference.probe import probe_bytes
+from omnilingual_asr.models.inference.rate_limit import get_rate_limiter
+
+# Lazy import for google.genai to avoid import errors when not installed
+_genai = None
+_types = None
+
+
+def _ensure_genai():
+    """Ensure google-genai is installed and import it."""
+    global _genai, _types
+    if _genai is None:
+        try:
+            from google import genai
+            from google.genai import types
+
+            _genai = genai
+            _types = types
+        except ImportError as exc:
+            raise RuntimeError(
+                "google-genai is required for Gemini API integration. "
+                "Install with: pip install 'omnilingual-asr[gemini]'"
+            ) from exc
+    return _genai, _types
+
+
+class TranscriptionBackend(abc.ABC):
+    """Sends the requests a pipeline builds and returns the responses.
+
+    Requests are the keyword arguments of google-genai's
+    ``models.generate_content``, and responses and uploaded files are
+    google-genai objects, so the pipeline is the same whichever backend
+    answers. :class:`GeminiBackend` calls the Gemini API;
+    :class:`FakeBackend` answers locally.
+    """
+
+    # Uploads made through one account can't be referenced from another
+    account: str
+
+    @abc.abstractmethod
+    def generate_content(self, **request: Any) -> Any:
+        """Send a request and return the complete response."""
+
+    @abc.abstractmethod
+    def generate_content_stream(self, **request: Any) -> Iterator[Any]:
+        """Send a request and iterate over response pieces as they arrive."""
+
+    @abc.abstractmethod
+    def upload(self, **upload_args: Any) -> Any:
+        """Upload a file for requests to reference, returning the file."""
+
+    @abc.abstractmethod
+    async def agenerate_content(self, **request: Any) -> Any:
+        """Async version of :meth:`generate_content`."""
+
+    @abc.abstractmethod
+    async def agenerate_content_stream(self, **request: Any) -> AsyncIterator[Any]:
+        """Async version of :meth:`generate_content_stream`; await it, then iterate."""
+
+    @abc.abstractmethod
+    async def aupload(self, **upload_args: Any) -> Any:
+        """Async version of :meth:`upload`."""
+
+    def warmup(self, model: str, connections: int = 1) -> None:
+        """Prepare to answer requests for ``model`` without first-request delays.
+
+        Backends with nothing to prepare do nothing.
+        """
+
+    async def awarmup(self, model: str, connections: int = 1) -> None:
+        """Async version of :meth:`warmup`; warms what the async methods use."""
+
+
+# ---------------------------------------------------------------------------
+# Shared Gemini clients
+# ---------------------------------------------------------------------------
+
+# Idle connections stay open this long, so chunk requests sent minutes
+# apart, and the first request after warm-up, skip the TLS handshake
+CLIENT_KEEPALIVE_SECONDS = 300.0
+
+
+class GeminiClientPool:
+    """google-genai clients shared by every pipeline in the process.
+
+    There is one client per API key, so pipelines created per job or per
+    request reuse its open connections instead of each paying for client
+    construction and TLS handshakes. Each client keeps up to
+    ``connections`` idle connections alive for ``keepalive_seconds``. The
+    number of requests in flight is bounded by the rate limiter rather than
+    by the pool, so a request never times out waiting for a connection.
+    """
+
+    def __init__(
+        self,
+        connections: int = 64,
+        *,
+        keepalive_seconds: float = CLIENT_KEEPALIVE_SECONDS,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            connections: Idle connections kept alive per client, in each of
+                the sync and async connection pools
+            keepalive_seconds: How long an idle connection is kept
+        """
+        self.connections = connections
+        self.keepalive_seconds = keepalive_seconds
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def client(self, api_key: str) -> Any:
+        """Return the client for ``api_key``, constructing it on first use."""
+        genai, types = _ensure_genai()
+        import httpx  # Installed with google-genai
+
+        with self._lock:
+            client = self._clients.get(api_key)
+            if client is None:
+                limits = httpx.Limits(
+                    max_connections=None,
+                    max_keepalive_connections=self.connections,
+                    keepalive_expiry=self.keepalive_seconds,
+                )
+                client = genai.Client(
+                    api_key=api_key,
+                    http_options=types.HttpOptions(
+                        client_args={"limits": limits},
+                        async_client_args={"limits": limits},
+                    ),
+                )
+                self._clients[api_key] = client
+            return client
+
+    def warmup(self, api_key: str, model: str, connections: int = 1) -> None:
+        """Construct the key's client and open connections before they are needed.
+
+        Sends ``connections`` concurrent metadata requests for ``model``, which
+        use no generation quota, so that many connections are open when
+        transcription starts. Errors are ignored; the requests that follow
+        report them.
+
+        Args:
+            api_key: Gemini API key
+            model: Model the pipeline will call
+            connections: Connections to open, e.g. the chunk concurrency
+        """
+        client = self.client(api_key)
+
+        def touch(_: int) -> None:
+            try:
+                client.models.get(model=model)
+            except Exception:
+                pass
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=connections) as executor:
+            list(executor.map(touch, range(connections)))
+
+    async def awarmup(self, api_key: str, model: str, connections: int = 1) -> None:
+        """Async version of :meth:`warmup` for the async connection pool.
+
+        Connections belong to the running event loop, so call this from the
+        loop that will send the requests.
+        """
+        client = await asyncio.to_thread(self.client, api_key)
+
+        async def touch() -> None:
+            try:
+                await client.aio.models.get(model=model)
+            except Exception:
+                pass
+
+        await asyncio.gather(*(touch() for _ in range(connections)))
+
+
+_default_pool: Optional[GeminiClientPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_client_pool() -> GeminiClientPool:
+    """Return the client pool shared by every pipeline in this process.
+
+    Each client keeps as many idle connections as the shared rate limiter
+    allows requests in flight (``GEMINI_MAX_CONCURRENCY``).
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = GeminiClientPool(get_rate_limiter().max_concurrency)
+        return _default_pool
+
+
+class GeminiBackend(TranscriptionBackend):
+    """Backend calling the Gemini API through a google-genai client."""
+
+    def __init__(
+        self, api_key: str, client_pool: Optional[GeminiClientPool] = None
+    ) -> None:
+        """Initialize the backend.
+
+        Args:
+            api_key: Gemini API key
+            client_pool: Pool to take the key's client from. Defaults to the
+                pool shared by all pipelines in the process.
+        """
+        self.client_pool = client_pool or get_client_pool()
+        self.client = self.client_pool.client(api_key)
+        self._api_key = api_key
+        # Uploads are only visible to the key that created them
+        self.account = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+    def generate_content(self, **request: Any) -> Any:
+        return self.client.models.generate_content(**request)
+
+    def generate_content_stream(self, **request: Any) -> Iterator[Any]:
+        return self.client.models.generate_content_stream(**request)
+
+    def upload(self, **upload_args: Any) -> Any:
+        return self.client.files.upload(**upload_args)
+
+    async def agenerate_content(self, **request: Any) -> Any:
+        return await self.client.aio.models.generate_content(**request)
+
+    async def agenerate_content_stream(self, **request: Any) -> AsyncIterator[Any]:
+        return await self.client.aio.models.generate_content_stream(**request)
+
+    async def aupload(self, **upload_args: Any) -> Any:
+        return await self.client.aio.files.upload(**upload_args)
+
+    def warmup(self, model: str, connections: int = 1) -> None:
+        self.client_pool.warmup(self._api_key, model, connections)
+
+    async def awarmup(self, model: str, connections: int = 1) -> None:
+        await self.client_pool.awarmup(self._api_key, model, connections)
+
+
+# ---------------------------------------------------------------------------
+# Several API keys
+# ---------------------------------------------------------------------------
+
+# Consecutive 429 or 403 answers after which a key is left out; below the
+# pipeline's attempts, so a request pinned to a failing key by its upload
+# gets to upload again with another key
+KEY_EJECT_AFTER_FAILURES = 2
+# How long a key is left out; doubles with each ejection until it succeeds again
+KEY_EJECT_SECONDS = 30.0
+KEY_MAX_EJECT_SECONDS = 600.0
+_KEY_WINDOW_SECONDS = 60.0
+# Files API uploads expire after 48 hours
+_UPLOAD_TTL_SECONDS = 48 * 3600.0
+# Expired upload owners are forgotten once this many are remembered
+_PRUNE_OWNERS_AT = 1024
+_pool_ids = itertools.count(1)
+
+
+class _PooledKey:
+    """Usage and health of one key of a :class:`KeyPoolBackend`."""
+
+    def __init__(self, backend: TranscriptionBackend) -> None:
+        self.backend = backend
+        self.log: Deque[List[float]] = deque()  # [sent at, tokens] of the past minute
+        self.in_flight = 0
+        self.failures = 0  # Consecutive 429 or 403 answers
+        self.ejections = 0  # Ejections since the last success
+        self.ejected_until = 0.0
+
+    def prune(self, now: float) -> None:
+        while self.log and self.log[0][0] <= now - _KEY_WINDOW_SECONDS:
+            self.log.popleft()
+
+
+@dataclass
+class _Sent:
+    """A request or upload in flight on a key of a :class:`KeyPoolBackend`."""
+
+    key: _PooledKey
+    entry: Optional[List[float]]  # The request's entry in the key's log
+    pinned: bool  # Sent with this key because it refers to the key's upload
+
+
+def _file_uris(request: Dict[str, Any]) -> Iterator[str]:
+    """URIs of the uploaded files a generate_content request refers to."""
+    for content in request.get("contents", []):
+        for part in getattr(content, "parts", None) or []:
+            file_data = getattr(part, "file_data", None)
+            if file_data is not None and file_data.file_uri:
+                yield file_data.file_uri
+
+
+class KeyPoolBackend(TranscriptionBackend):
+    """Backend spreading requests over several API keys or projects.
+
+    Quota is granted per key, so a pool of keys scales past the throughput
+    of one. Each request goes to the key with the most quota left in the
+    past minute, measured against ``requests_per_minute`` and
+    ``tokens_per_minute`` when given and by the requests sent otherwise.
+    A request that refers to an uploaded file goes to the key that uploaded
+    it, since uploads are only visible to their key.
+
+    A key answering 429 or 403 KEY_EJECT_AFTER_FAILURES times in a row is
+    left out for KEY_EJECT_SECONDS, doubling while it keeps failing, up to
+    KEY_MAX_EJECT_SECONDS; if every key is out, the one back soonest is
+    used. Requests referring to a file uploaded with a key that is out fail
+    with 404 without being sent, so the pipeline uploads the audio again.
+    (A 403 for such a request means the upload is gone, not that the key
+    is bad, so it doesn't count towards ejection.) Requests, tokens and
+    ejections per key are reported to the metrics collector, labelled with
+    the key's account hash.
+    """
+
+    def __init__(
+        self,
+        backends: Sequence[TranscriptionBackend],
+        *,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        metrics_collector: Optional[MetricsCollector] = None,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            backends: One backend per key, e.g. GeminiBackends or fakes
+            requests_per_minute: Request quota of each key (None: unknown)
+            tokens_per_minute: Token quota of each key (None: unknown)
+            metrics_collector: Collector per-key usage is reported to.
+                Defaults to the collector shared by all pipelines.
+
+        Raises:
+            ValueError: If ``backends`` is empty or two share an account
+        """
+        accounts = [backend.account for backend in backends]
+        if not accounts:
+            raise ValueError("KeyPoolBackend needs at least one backend")
+        if len(set(accounts)) != len(accounts):
+            raise ValueError("KeyPoolBackend was given the same key twice")
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.metrics_collector = metrics_collector or get_metrics_collector()
+        self._keys = [_PooledKey(backend) for backend in backends]
+        self._owners: Dict[str, tuple[_PooledKey, float]] = (
+            {}
+        )  # File URI -> (key, expiry)
+        self._next = 0  # Where the search for a key starts, so ties rotate
+        self._lock = threading.Lock()
+        # Only this pool knows which key made an upload, so its uploads are
+        # registered under an account of their own
+        digest = hashlib.sha256(",".join(sorted(accounts)).encode("utf-8")).hexdigest()[
+            :16
+        ]
+        self.account = f"pool-{digest}-{next(_pool_ids)}"
+
+    @classmethod
+    def from_keys(
+        cls,
+        api_keys: Sequence[str],
+        *,
+        client_pool: Optional[GeminiClientPool] = None,
+        **kwargs: Any,
+    ) -> KeyPoolBackend:
+        """Create a pool of :class:`GeminiBackend`, one per API key.
+
+        Other keyword arguments are passed to the constructor.
+        """
+        return cls([GeminiBackend(key, client_pool) for key in api_keys], **kwargs)
+
+    def _load(self, key: _PooledKey) -> float:
+        """Share of the key's quota used in the past minute, or its request count."""
+        used = []
+        if self.requests_per_minute:
+            used.append(len(key.log) / self.requests_per_minute)
+        if self.tokens_per_minute:
+            used.append(sum(tokens for _, tokens in key.log) / self.tokens_per_minute)
+        return max(used) if used else float(len(key.log))
+
+    def _owner(
+        self, request: Optional[Dict[str, Any]], now: float
+    ) -> Optional[_PooledKey]:
+        """The key that uploaded the files a request refers to; call with the lock held.
+
+        Raises:
+            google.genai.errors.ClientError: 404 if that key is ejected
+        """
+        for uri in _file_uris(request or {}):
+            owner = self._owners.get(uri)
+            if owner is None:
+                continue
+            if owner[0].ejected_until > now:
+                del self._owners[uri]
+                raise _api_error(
+                    404,
+                    f"File {uri} was uploaded with a key that is ejected",
+                    "NOT_FOUND",
+                )
+            return owner[0]
+        return None
+
+    def _choose(self, now: float) -> _PooledKey:
+        """The key to send a new request with; call with the lock held."""
+        start = self._next
+        self._next = (start + 1) % len(self._keys)
+        keys = self._keys[start:] + self._keys[:start]
+        for key in keys:
+            key.prune(now)
+        healthy = [key for key in keys if key.ejected_until <= now]
+        if not healthy:
+            return min(keys, key=lambda key: key.ejected_until)
+        return min(healthy, key=lambda key: (self._load(key), key.in_flight))
+
+    def _acquire(self, request: Optional[Dict[str, Any]]) -> _Sent:
+        """Pick a key for a request, or an upload if None, and mark it in flight."""
+        with self._lock:
+            now = time.monotonic()
+            owner = self._owner(request, now)
+            key = owner or self._choose(now)
+            key.in_flight += 1
+            entry = None
+            if request is not None:
+                # Uploads don't count against the generation quota
+                entry = [now, 0.0]
+                key.log.append(entry)
+            return _Sent(key, entry, pinned=owner is not None)
+
+    def _release(
+        self, sent: _Sent, response: Any = None, exc: Optional[BaseException] = None
+    ) -> None:
+        """Record how a request ended."""
+        key = sent.key
+        usage = getattr(response, "usage_metadata", None)
+        tokens = (getattr(usage, "total_token_count", None) or 0) if usage else 0
+        code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+        ejected = False
+        with self._lock:
+            key.in_flight -= 1
+            if sent.entry is not None:
+                sent.entry[1] = float(tokens)
+            if exc is None:
+                key.failures = 0
+                key.ejections = 0
+            elif code == 429 or (code == 403 and not sent.pinned):
+                key.failures += 1
+                if key.failures >= KEY_EJECT_AFTER_FAILURES:
+                    seconds = min(
+                        KEY_EJECT_SECONDS * 2**key.ejections, KEY_MAX_EJECT_SECONDS
+                    )
+                    key.ejected_until = time.monotonic() + seconds
+                    key.ejections += 1
+                    key.failures = 0
+                    ejected = True
+        label = key.backend.account
+        if sent.entry is not None or exc is not None:
+            self.metrics_collector.observe_key_request(label, tokens, exc)
+        if ejected:
+            self.metrics_collector.observe_key_ejection(label)
+
+    def _register_upload(self, key: _PooledKey, uploaded: Any) -> None:
+        """Remember which key made an upload, so requests using it go there."""
+        uri = getattr(uploaded, "uri", None)
+        if not uri:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if len(self._owners) >= _PRUNE_OWNERS_AT:
+                self._owners = {
+                    owned: owner
+                    for owned, owner in self._owners.items()
+                    if owner[1] > now
+                }
+            self._owners[uri] = (key, now + _UPLOAD_TTL_SECONDS)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Usage and health of each key in the past minute, by account hash."""
+        with self._lock:
+            now = time.monotonic()
+            stats = []
+            for key in self._keys:
+                key.prune(now)
+                stats.append(
+                    {
+                        "key": key.backend.account,
+                        "in_flight": key.in_flight,
+                        "requests_last_minute": len(key.log),
+                        "tokens_last_minute": int(sum(tokens for _, tokens in key.log)),
+                        "consecutive_failures": key.failures,
+                        "ejected_seconds": round(max(key.ejected_until - now, 0.0), 1),
+                    }
+                )
+            return stats
+
+    def generate_content(self, **request: Any) -> Any:
+        sent = self._acquire(request)
+        try:
+            response = sent.key.backend.generate_content(**request)
+        except Exception as exc:
+            self._release(sent, exc=exc)
+            raise
+        self._release(sent, response)
+        return response
+
+    def generate_content_stream(self, **request: Any) -> Iterator[Any]:
+        def stream() -> Iterator[Any]:
+            sent = self._acquire(request)
+            last = error = None
+            try:
+                for last in sent.key.backend.generate_content_stream(**request):
+                    yield last
+            except Exception as exc:
+                error = exc
+                raise
+            finally:
+                # Usage metadata arrives with the final piece
+                self._release(sent, last, error)
+
+        return stream()
+
+    def upload(self, **upload_args: Any) -> Any:
+        sent = self._acquire(None)
+        try:
+            uploaded = sent.key.backend.upload(**upload_args)
+        except Exception as exc:
+            self._release(sent, exc=exc)
+            raise
+        self._release(sent)
+        self._register_upload(sent.key, uploaded)
+        return uploaded
+
+    async def agenerate_content(self, **request: Any) -> Any:
+        sent = self._acquire(request)
+        try:
+            response = await sent.key.backend.agenerate_content(**request)
+        except Exception as exc:
+            self._release(sent, exc=exc)
+            raise
+        self._release(sent, response)
+        return response
+
+    async def agenerate_content_stream(self, **request: Any) -> AsyncIterator[Any]:
+        sent = self._acquire(request)
+        try:
+            pieces = await sent.key.backend.agenerate_content_stream(**request)
+        except Exception as exc:
+            self._release(sent, exc=exc)
+            raise
+
+        async def stream() -> AsyncIterator[Any]:
+            last = error = None
+            try:
+                async for last in pieces:
+                    yield last
+            except Exception as exc:
+                error = exc
+                raise
+            finally:
+                self._release(sent, last, error)
+
+        return stream()
+
+    async def aupload(self, **upload_args: Any) -> Any:
+        sent = self._acquire(None)
+        try:
+            uploaded = await sent.key.backend.aupload(**upload_args)
+        except Exception as exc:
+            self._release(sent, exc=exc)
+            raise
+        self._release(sent)
+        self._register_upload(sent.key, uploaded)
+        return uploaded
+
+    def warmup(self, model: str, connections: int = 1) -> None:
+        # Requests are spread over the keys, so each needs a share of the connections
+        per_key = -(-connections // len(self._keys))
+        for key in self._keys:
+            key.backend.warmup(model, per_key)
+
+    async def awarmup(self, model: str, connections: int = 1) -> None:
+        per_key = -(-connections // len(self._keys))
+        await asyncio.gather(
+            *(key.backend.awarmup(model, per_key) for key in self._keys)
+        )
+
+
+# ---------------------------------------------------------------------------
+# Local fake
+# ---------------------------------------------------------------------------
+
+_FAKE_WORDS = (
+    "the a we they said went home river field market morning evening "
+    "water village road story again then because when after before"
+).split()
+_FAKE_LANGUAGES = [("English", "en"), ("Spanish", "es"), ("French", "fr")]
+_FAKE_TOKENS_PER_AUDIO_SECOND = 32
+_FAKE_CHARS_PER_TOKEN = 4
+_FAKE_UPLOAD_TTL = datetime.timedelta(hours=48)
+
+
+@dataclass(frozen=True)
+class FakeLatency:
+    """Simulated response time of :class:`FakeBackend`.
+
+    Each response takes ``base`` seconds plus ``per_audio_second`` for
+    every second of audio in the request, scaled by a lognormal factor
+    with mean 1 and spread ``sigma``.
+    """
+
+    base: float = 0.0
+    per_audio_second: float = 0.0
+    sigma: float = 0.0  # 0 for a fixed latency
+    first_piece: float = 0.3  # Share of the latency before the first streamed piece
+
+    def sample(self, rng: random.Random, audio_seconds: float) -> float:
+        """Draw the latency of one response."""
+        mean = self.base + self.per_audio_second * audio_seconds
+        if mean <= 0:
+            return 0.0
+        if self.sigma <= 0:
+            return mean
+        return mean * rng.lognormvariate(-self.sigma**2 / 2, self.sigma)
+
+
+def _format_timestamp(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{secs:02d}"
+
+
+def _fake_text(rng: random.Random) -> str:
+    return " ".join(rng.choice(_FAKE_WORDS) for _ in range(rng.randint(3, 9)))
+
+
+def _fake_value(name: str, schema: Dict[str, Any], rng: random.Random) -> Any:
+    """Generate a value valid for a JSON schema."""
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    kind = schema.get("type")
+    if kind == "object":
+        return {
+            key: _fake_value(key, prop, rng)
+            for key, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        if name == "languages":
+            language, code = rng.choice(_FAKE_LANGUAGES)
+            return [{"name": language, "code": code}]
+        return [_fake_value(name, schema.get("items", {}), rng)]
+    if kind == "integer":
+        return 1
+    if kind == "number":
+        return 1.0
+    if kind == "boolean":
+        return False
+    return _fake_text(rng)
+
+
+def fake_response_document(
+    schema: Dict[str, Any],
+    audio_seconds: float,
+    prompt: str = "",
+    *,
+    seed: int = 0,
+    segment_seconds: float = 4.0,
+) -> Dict[str, Any]:
+    """Build a response that is valid for ``schema``, for audio of a given length.
+
+    Transcription schemas get one segment per ``segment_seconds`` of audio
+    with consecutive timestamps; enrichment schemas get an element for
+    every segment index listed in the prompt. The same arguments always
+    give the same document.
+    """
+    rng = random.Random(f"{seed}:{audio_seconds:.3f}:{len(prompt)}")
+    document: Dict[str, Any] = {}
+    for name, prop in schema.get("properties", {}).items():
+        items = prop.get("items", {})
+        item_props = items.get("properties", {})
+        if name == "segments" and "timestamp_start" in item_props:
+            count = (
+                math.ceil(audio_seconds / segment_seconds) if audio_seconds > 0 else 0
+            )
+            segments = []
+            for k in range(count):
+                segment = _fake_value(name, items, rng)
+                segment.update(
+                    speaker=f"Speaker {k % 2 + 1}",
+                    timestamp_start=_format_timestamp(k * segment_seconds),
+                    timestamp_end=_format_timestamp(
+                        min((k + 1) * segment_seconds, audio_seconds)
+                    ),
+                )
+                segments.append(segment)
+            document[name] = segments
+        elif name == "segments" and "index" in item_props:
+            indices = [int(i) for i in re.findall(r'"index":\s*(\d+)', prompt)]
+            document[name] = [
+                {**_fake_value(name, items, rng), "index": index} for index in indices
+            ]
+        elif name == "speaker_count":
+            document[name] = 2
+        else:
+            document[name] = _fake_value(name, prop, rng)
+    return document
+
+
+@dataclass
+class _FakeReply:
+    """What the fake will answer to one request."""
+
+    latency: float
+    error: Optional[Exception]
+    text: str
+    truncated: bool
+    prompt_tokens: int
+    audio_tokens: int  # Part of prompt_tokens
+
+
+class FakeBackend(TranscriptionBackend):
+    """Local stand-in for the Gemini API, for tests, benchmarks and load tests.
+
+    Responses are schema-valid JSON sized to the audio in each request,
+    so the whole pipeline (chunking, merging, streaming, enrichment, the
+    web app) runs without network or quota. Latency, throttling (429),
+    server errors (5xx) and responses truncated at the output limit are
+    injected at configurable rates; with the same seed, the same requests
+    see the same content and the same sequence of injected failures.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: FakeLatency = FakeLatency(),
+        throttle_rate: float = 0.0,
+        server_error_rate: float = 0.0,
+        truncation_rate: float = 0.0,
+        segment_seconds: float = 4.0,
+        stream_pieces: int = 8,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the fake backend.
+
+        Args:
+            latency: Response time model
+            throttle_rate: Fraction of requests rejected with 429
+            server_error_rate: Fraction of requests failing with 500 or 503
+            truncation_rate: Fraction of responses cut off at the output limit
+            segment_seconds: Audio covered by each generated segment
+            stream_pieces: Pieces a streamed response is split into
+            seed: Seed for content and injected failures
+        """
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.server_error_rate = server_error_rate
+        self.truncation_rate = truncation_rate
+        self.segment_seconds = segment_seconds
+        self.stream_pieces = max(stream_pieces, 1)
+        self.seed = seed
+        self.account = f"fake-{seed}"
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._files: Dict[str, float] = {}  # Uploaded file URI -> audio seconds
+        self._file_ids = itertools.count(1)
+        self._stats = {
+            "requests": 0,
+            "throttled": 0,
+            "server_errors": 0,
+            "truncated": 0,
+            "uploads": 0,
+            "audio_seconds": 0.0,
+        }
+
+    @classmethod
+    def from_spec(cls, spec: str) -> FakeBackend:
+        """Create a fake from a compact spec, e.g. from an environment variable.
+
+        The spec is comma-separated ``key=value`` pairs: ``latency``,
+        ``per_second`` and ``sigma`` set :class:`FakeLatency`; ``throttle``,
+        ``server_errors``, ``truncation``, ``segment_seconds``,
+        ``stream_pieces`` and ``seed`` set the other arguments. For example
+        ``"latency=2,sigma=0.5,throttle=0.05"``.
+
+        Raises:
+            ValueError: On unknown keys or malformed values
+        """
+        latency_keys = {
+            "latency": "base",
+            "per_second": "per_audio_second",
+            "sigma": "sigma",
+        }
+        other_keys = {
+            "throttle": ("throttle_rate", float),
+            "server_errors": ("server_error_rate", float),
+            "truncation": ("truncation_rate", float),
+            "segment_seconds": ("segment_seconds", float),
+            "stream_pieces": ("stream_pieces", int),
+            "seed": ("seed", int),
+        }
+        latency: Dict[str, float] = {}
+        kwargs: Dict[str, Any] = {}
+        for item in filter(None, (part.strip() for part in spec.split(","))):
+            key, _, value = item.partition("=")
+            key = key.strip()
+            if key in latency_keys:
+                latency[latency_keys[key]] = float(value)
+            elif key in other_keys:
+                name, convert = other_keys[key]
+                kwargs[name] = convert(value)
+            else:
+                raise ValueError(
+                    f"Unknown fake backend option {key!r}; "
+                    f"choose from {sorted([*latency_keys, *other_keys])}"
+                )
+        return cls(latency=FakeLatency(**latency), **kwargs)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Counts of requests, injected failures and audio processed so far."""
+        with self._lock:
+            return dict(self._stats)
+
+    def _audio_seconds(self, data: bytes) -> float:
+        info = probe_bytes(data)
+        # Unknown formats: assume ~128 kbps compressed audio
+        return info.duration if info is not None else len(data) / 16000.0
+
+    def _read_request(self, request: Dict[str, Any]) -> tuple[float, str]:
+        """Audio seconds and prompt text of a request."""
+        seconds = 0.0
+        texts: List[str] = []
+        for content in request.get("contents", []):
+            for part in getattr(content, "parts", None) or []:
+                if getattr(part, "inline_data", None) is not None:
+                    seconds += self._audio_seconds(part.inline_data.data)
+                elif getattr(part, "file_data", None) is not None:
+                    uri = part.file_data.file_uri
+                    with self._lock:
+                        uploaded = self._files.get(uri)
+                    if uploaded is None:
+                        raise _api_error(404, f"File {uri} not found", "NOT_FOUND")
+                    seconds += uploaded
+                elif getattr(part, "text", None):
+                    texts.append(part.text)
+        return seconds, "\n".join(texts)
+
+    def _reply(self, request: Dict[str, Any]) -> _FakeReply:
+        """Decide the outcome of a request and build its response text."""
+        seconds, prompt = self._read_request(request)
+        with self._lock:
+            self._stats["requests"] += 1
+            roll = self._rng.random()
+            latency = self.latency.sample(self._rng, seconds)
+            cut = self._rng.uniform(0.3, 0.9)
+            truncated = False
+            error: Optional[Exception] = None
+            if roll < self.throttle_rate:
+                self._stats["throttled"] += 1
+                # Throttled requests are rejected before any work is done
+                latency = min(latency, 0.05)
+                error = _api_error(
+                    429, "Resource has been exhausted (fake)", "RESOURCE_EXHAUSTED"
+                )
+            elif roll < self.throttle_rate + self.server_error_rate:
+                self._stats["server_errors"] += 1
+                if self._rng.random() < 0.5:
+                    error = _api_error(
+                        503, "The model is overloaded (fake)", "UNAVAILABLE"
+                    )
+                else:
+                    error = _api_error(500, "Internal error (fake)", "INTERNAL")
+            else:
+                self._stats["audio_seconds"] += seconds
+                if self._rng.random() < self.truncation_rate:
+                    self._stats["truncated"] += 1
+                    truncated = True
+
+        text = ""
+        if error is None:
+            config = request.get("config")
+            schema = getattr(config, "response_schema", None) or {}
+            document = fake_response_document(
+                schema,
+                seconds,
+                prompt,
+                seed=self.seed,
+                segment_seconds=self.segment_seconds,
+            )
+            text = json.dumps(document, ensure_ascii=False)
+            if truncated:
+                text = text[: max(int(len(text) * cut), 1)]
+        audio_tokens = int(seconds * _FAKE_TOKENS_PER_AUDIO_SECOND)
+        prompt_tokens = audio_tokens + int(len(prompt) / _FAKE_CHARS_PER_TOKEN)
+        return _FakeReply(latency, error, text, truncated, prompt_tokens, audio_tokens)
+
+    def _pieces(self, reply: _FakeReply, count: int) -> List[Any]:
+        """Split a reply into response objects; the last one carries the metadata."""
+        _, types = _ensure_genai()
+        size = max(math.ceil(len(reply.text) / count), 1)
+        chunks = [
+            reply.text[i : i + size] for i in range(0, len(reply.text), size)
+        ] or [""]
+        output_tokens = math.ceil(len(reply.text) / _FAKE_CHARS_PER_TOKEN)
+        pieces = []
+        for i, chunk in enumerate(chunks):
+            last = i == len(chunks) - 1
+            finish = None
+            if last:
+                finish = (
+                    types.FinishReason.MAX_TOKENS
+                    if reply.truncated
+                    else types.FinishReason.STOP
+                )
+            pieces.append(
+                types.GenerateContentResponse(
+                    candidates=[
+                        types.Candidate(
+                            content=types.Content(
+                                role="model", parts=[types.Part(text=chunk)]
+                            ),
+                            finish_reason=finish,
+                        )
+                    ],
+                    usage_metadata=(
+                        types.GenerateContentResponseUsageMetadata(
+                            prompt_token_count=reply.prompt_tokens,
+                            candidates_token_count=output_tokens,
+                            total_token_count=reply.prompt_tokens + output_tokens,
+                            prompt_tokens_details=[
+                                types.ModalityTokenCount(
+                                    modality=types.MediaModality.TEXT,
+                                    token_count=reply.prompt_tokens
+                                    - reply.audio_tokens,
+                                ),
+                                types.ModalityTokenCount(
+                                    modality=types.MediaModality.AUDIO,
+                                    token_count=reply.audio_tokens,
+                                ),
+                            ],
+                        )
+                        if last
+                        else None
+                    ),
+                )
+            )
+        return pieces
+
+    def _store_upload(self, upload_args: Dict[str, Any]) -> Any:
+        """Register an upload and return its file object."""
+        _, types = _ensure_genai()
+        source = upload_args["file"]
+        if isinstance(source, (str, Path)):
+            data = Path(source).read_bytes()
+        else:
+            data = source.read()
+        config = upload_args.get("config") or {}
+        mime_type = config.get("mime_type") if isinstance(config, dict) else None
+        file_id = next(self._file_ids)
+        uri = f"fake://files/{file_id}"
+        with self._lock:
+            self._files[uri] = self._audio_seconds(data)
+            self._stats["uploads"] += 1
+        return types.File(
+            name=f"files/fake-{file_id}",
+            uri=uri,
+            mime_type=mime_type or "audio/wav",
+            expiration_time=datetime.datetime.now(datetime.timezone.utc)
+            + _FAKE_UPLOAD_TTL,
+        )
+
+    def generate_content(self, **request: Any) -> Any:
+        reply = self._reply(request)
+        time.sleep(reply.latency)
+        if reply.error is not None:
+            raise reply.error
+        return self._pieces(reply, 1)[0]
+
+    def generate_content_stream(self, **request: Any) -> Iterator[Any]:
+        reply = self._reply(request)
+        pieces = self._pieces(reply, self.stream_pieces) if reply.error is None else []
+        time.sleep(reply.latency * self.latency.first_piece)
+        if reply.error is not None:
+            raise reply.error
+        rest = reply.latency * (1 - self.latency.first_piece) / len(pieces)
+        for i, piece in enumerate(pieces):
+            if i:
+                time.sleep(rest)
+            yield piece
+
+    def upload(self, **upload_args: Any) -> Any:
+        return self._store_upload(upload_args)
+
+    async def agenerate_content(self, **request: Any) -> Any:
+        reply = self._reply(request)
+        await asyncio.sleep(reply.latency)
+        if reply.error is not None:
+            raise reply.error
+        return self._pieces(reply, 1)[0]
+
+    async def agenerate_content_stream(self, **request: Any) -> AsyncIterator[Any]:
+        reply = self._reply(request)
+        pieces = self._pieces(reply, self.stream_pieces) if reply.error is None else []
+
+        async def stream() -> AsyncIterator[Any]:
+            await asyncio.sleep(reply.latency * self.latency.first_piece)
+            if reply.error is not None:
+                raise reply.error
+            rest = reply.latency * (1 - self.latency.first_piece) / len(pieces)
+            for i, piece in enumerate(pieces):
+                if i:
+                    await asyncio.sleep(rest)
+                yield piece
+
+        return stream()
+
+    async def aupload(self, **upload_args: Any) -> Any:
+        return await asyncio.to_thread(self._store_upload, upload_args)
+
+
+def _api_error(code: int, message: str, status: str) -> Exception:
+    """Build the google-genai exception the API would raise for ``code``."""
+    from google.genai import errors
+
+    error_class = errors.ClientError if code < 500 else errors.ServerError
+    return error_class(
+        code, {"error": {"code": code, "message": message, "status": status}}
+    )
@@ -0,0 +1,246 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Content-addressed result cache for Gemini transcriptions."""
+
+from __future__ import annotations
+
+import abc
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+# Bump when the serialized result layout changes so stale entries are ignored
+CACHE_FORMAT_VERSION = 1
+
+_DIGEST_MEMO: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_DIGEST_MEMO_SIZE = 1024
+_DIGEST_LOCK = threading.Lock()
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's contents.
+
+    Digests are memoized per (path, mtime, size) so repeated calls on the
+    same unchanged file only read it once.
+
+    Args:
+        path: Path to the file
+        chunk_size: Read size in bytes
+
+    Returns:
+        Hex digest string
+    """
+    path = Path(path)
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    with _DIGEST_LOCK:
+        digest = _DIGEST_MEMO.get(memo_key)
+        if digest is not None:
+            _DIGEST_MEMO.move_to_end(memo_key)
+            return digest
+
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(block)
+    digest = hasher.hexdigest()
+
+    with _DIGEST_LOCK:
+        _DIGEST_MEMO[memo_key] = digest
+        while len(_DIGEST_MEMO) > _DIGEST_MEMO_SIZE:
+            _DIGEST_MEMO.popitem(last=False)
+    return digest
+
+
+def make_cache_key(
+    audio_digest: str,
+    *,
+    model: str,
+    prompt: str,
+    schema: Dict[str, Any],
+    variant: str = "",
+) -> str:
+    """Build a cache key from the audio digest and everything sent with it.
+
+    Args:
+        audio_digest: SHA-256 hex digest of the audio bytes
+        model: Gemini model name
+        prompt: Full prompt text (including hints)
+        schema: Response JSON schema
+        variant: Extra discriminator (e.g. chunked vs. single request)
+
+    Returns:
+        Hex digest identifying the request
+    """
+    hasher = hashlib.sha256()
+    for part in (
+        str(CACHE_FORMAT_VERSION),
+        audio_digest,
+        model,
+        prompt,
+        json.dumps(schema, sort_keys=True, separators=(",", ":")),
+        variant,
+    ):
+        hasher.update(part.encode("utf-8"))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+class TranscriptionCache(abc.ABC):
+    """Interface for transcription result caches.
+
+    Values are JSON-serializable dicts produced by the pipeline. Implementations
+    must be safe to call from multiple threads.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for key, or None on a miss."""
+
+    @abc.abstractmethod
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store value under key, evicting old entries if needed."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Remove all entries."""
+
+
+class MemoryTranscriptionCache(TranscriptionCache):
+    """In-process LRU cache bounded by entry count."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of results kept before LRU eviction
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                return None
+            self._entries.move_to_end(key)
+        return json.loads(payload)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        payload = json.dumps(value)
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteTranscriptionCache(TranscriptionCache):
+    """On-disk LRU cache stored in a single SQLite file.
+
+    Entries are evicted least-recently-used first once the total payload size
+    exceeds ``max_bytes``. Safe to share between threads and processes.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = 512 * 1024 * 1024,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database file (created if missing)
+            max_bytes: Maximum total size of stored payloads in bytes
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " payload TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS results_last_access ON results(last_access)"
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE results SET last_access = ? WHERE key = ?",
+                (time.time(), key),
+            )
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        payload = json.dumps(value)
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results (key, payload, size, last_access)"
+                    " VALUES (?, ?, ?, ?)",
+                    (key, payload, size, time.time()),
+                )
+                self._evict()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until under the size budget."""
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM results ORDER BY last_access ASC"
+        ).fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM results WHERE key = ?", stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,71 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""On-disk checkpoints of completed chunks for resumable long-file jobs."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from omnilingual_asr.models.inference.audio import PlannedChunk
+
+
+class ChunkCheckpoint:
+    """Directory holding one JSON file per completed chunk of a job.
+
+    Jobs live under ``<root>/<audio sha256>/<request key>``, so a restarted
+    job for the same audio, model, prompt and chunking settings finds the
+    chunks it already finished. Chunk files are named by their time span,
+    which means a changed chunk plan simply misses instead of restoring
+    results for the wrong audio.
+    """
+
+    def __init__(self, root: str | Path, audio_digest: str, job_key: str) -> None:
+        """Initialize the checkpoint.
+
+        Args:
+            root: Directory shared by all checkpoints
+            audio_digest: SHA-256 hex digest of the audio bytes
+            job_key: Identifier of the request settings (e.g. its cache key)
+        """
+        self.directory = Path(root) / audio_digest / job_key
+
+    def _chunk_path(self, planned: PlannedChunk) -> Path:
+        return self.directory / f"{planned.start:.3f}-{planned.end:.3f}.json"
+
+    def load(self, planned: PlannedChunk) -> Optional[Dict[str, Any]]:
+        """Return the saved result for a chunk, or None if it isn't done."""
+        try:
+            with open(self._chunk_path(planned), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, planned: PlannedChunk, value: Dict[str, Any]) -> None:
+        """Atomically persist a completed chunk's result."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            os.replace(tmp_path, self._chunk_path(planned))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def clear(self) -> None:
+        """Remove the job's checkpoint once its result is complete."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        try:
+            # Drop the per-audio directory too if no other job uses it
+            self.directory.parent.rmdir()
+        except OSError:
+            pass
@@ -0,0 +1,379 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""In-memory audio chunks cut from PCM samples without temp files."""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import subprocess
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Optional
+
+from omnilingual_asr.models.inference.probe import AudioInfo
+
+# PCM and IEEE float samples can be sliced at any frame boundary
+_SLICEABLE_WAV_TAGS = {1, 3}
+
+# Sample format non-WAV input is decoded to: 16 kHz mono s16le, which is
+# all speech recognition needs and keeps an hour of audio at ~115 MB
+DECODE_SAMPLE_RATE = 16000
+_DECODE_FMT = struct.pack(
+    "<HHIIHH", 1, 1, DECODE_SAMPLE_RATE, DECODE_SAMPLE_RATE * 2, 2, 16
+)
+
+# Audio longer than this is not decoded into memory; chunks are extracted
+# to temp files instead (~4.6 hours at the decode format)
+MAX_DECODED_BUFFER_BYTES = 512 * 1024 * 1024
+
+
+def _wav_header(fmt: bytes, data_size: int) -> bytes:
+    """Build a RIFF header for ``data_size`` bytes of samples in format ``fmt``."""
+    fmt_chunk = b"fmt " + struct.pack("<I", len(fmt)) + fmt + b"\0" * (len(fmt) & 1)
+    riff_size = 4 + len(fmt_chunk) + 8 + data_size + (data_size & 1)
+    return (
+        b"RIFF"
+        + struct.pack("<I", riff_size)
+        + b"WAVE"
+        + fmt_chunk
+        + b"data"
+        + struct.pack("<I", data_size)
+    )
+
+
+def _find_pcm_data(buf: Any) -> Optional[tuple[bytes, int, int]]:
+    """Locate the format and sample data of a sliceable WAV file.
+
+    Returns:
+        (fmt chunk body, data offset, data size), or None if the buffer
+        isn't a PCM or float WAV file
+    """
+    if len(buf) < 12 or buf[:4] not in (b"RIFF", b"RF64") or buf[8:12] != b"WAVE":
+        return None
+    fmt = None
+    ds64_data_size = None
+    pos = 12
+    while pos + 8 <= len(buf):
+        chunk_id = bytes(buf[pos : pos + 4])
+        size = struct.unpack("<I", buf[pos + 4 : pos + 8])[0]
+        body = pos + 8
+        if chunk_id == b"ds64" and body + 16 <= len(buf):
+            ds64_data_size = struct.unpack("<Q", buf[body + 8 : body + 16])[0]
+        elif chunk_id == b"fmt ":
+            fmt = bytes(buf[body : body + size])
+        elif chunk_id == b"data":
+            if size == 0xFFFFFFFF and ds64_data_size is not None:
+                size = ds64_data_size
+            if fmt is None or len(fmt) < 16:
+                return None
+            tag = struct.unpack("<H", fmt[:2])[0]
+            if tag == 0xFFFE and len(fmt) >= 26:
+                tag = struct.unpack("<H", fmt[24:26])[0]
+            if tag not in _SLICEABLE_WAV_TAGS:
+                return None
+            # Truncated or still-growing files report more than is there
+            return fmt, body, min(size, len(buf) - body)
+        pos = body + size + (size & 1)
+    return None
+
+
+def _wav_dtype(fmt: bytes) -> Optional[tuple[str, float]]:
+    """NumPy dtype and full-scale value of WAV samples, if supported."""
+    tag, _, _, _, _, bits = struct.unpack("<HHIIHH", fmt[:16])
+    if tag == 0xFFFE and len(fmt) >= 26:
+        tag = struct.unpack("<H", fmt[24:26])[0]
+    if tag == 1 and bits == 16:
+        return "<i2", 32768.0
+    if tag == 1 and bits == 32:
+        return "<i4", 2147483648.0
+    if tag == 3 and bits == 32:
+        return "<f4", 1.0
+    return None
+
+
+@dataclass
+class MemoryChunk:
+    """A span of audio held in memory as a WAV header plus a view of the samples.
+
+    The samples are a slice of the source's buffer, so creating a chunk
+    copies nothing; the bytes are only assembled when the chunk is sent.
+    """
+
+    header: bytes
+    samples: memoryview
+    start: float  # Position in the source audio, in seconds
+    duration: float
+    info: AudioInfo  # Format of the chunk's samples
+    fmt: bytes  # Body of the WAV fmt chunk
+    source: Path  # File the chunk was cut from
+    key: str  # Identifies the chunk's samples among those cut from source
+
+    mime_type = "audio/wav"
+
+    @property
+    def size(self) -> int:
+        """Size of the chunk as a WAV file, in bytes."""
+        return len(self.header) + self.samples.nbytes
+
+    def tobytes(self) -> bytes:
+        """Assemble the chunk as a WAV file."""
+        return b"".join((self.header, self.samples))
+
+    def subchunk(self, start: float, duration: float) -> MemoryChunk:
+        """Cut a chunk from this one, aligning both ends to whole sample frames.
+
+        Args:
+            start: Start of the new chunk in seconds, relative to this chunk
+            duration: Length of the new chunk in seconds; clipped to this chunk
+
+        Returns:
+            Chunk viewing the same samples
+        """
+        _, _, _, byte_rate, align, _ = struct.unpack("<HHIIHH", self.fmt[:16])
+        size = self.samples.nbytes
+        begin = min(max(int(start * byte_rate), 0) // align * align, size)
+        end = min(int((start + duration) * byte_rate) // align * align, size)
+        end = max(end, begin)
+        seconds = (end - begin) / byte_rate
+        return MemoryChunk(
+            header=_wav_header(self.fmt, end - begin),
+            samples=self.samples[begin:end],
+            start=self.start + begin / byte_rate,
+            duration=seconds,
+            info=replace(self.info, duration=seconds),
+            fmt=self.fmt,
+            source=self.source,
+            key=f"{self.key}/{begin}-{end}",
+        )
+
+
+class ChunkSource:
+    """Cuts chunks from PCM audio held in memory.
+
+    PCM WAV files are memory-mapped, so chunks are views of the page cache
+    and nothing is read until a chunk is sent. Other formats are decoded
+    once with ffmpeg into a shared buffer. Either way cutting a chunk runs
+    no subprocess and writes no file.
+
+    Chunks keep views of the buffer; call :meth:`close` (or use the source
+    as a context manager) once they have been sent.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        buffer: Any,
+        fmt: bytes,
+        data_offset: int,
+        data_size: int,
+        *,
+        kind: str,
+    ) -> None:
+        """Initialize the source.
+
+        Args:
+            path: File the samples come from
+            buffer: Object supporting the buffer protocol holding the samples
+            fmt: Body of the WAV ``fmt`` chunk describing the samples
+            data_offset: Offset of the first sample in ``buffer``
+            data_size: Number of sample bytes
+            kind: How the samples were obtained; part of every chunk key
+        """
+        _, channels, sample_rate, byte_rate, block_align, bits = struct.unpack(
+            "<HHIIHH", fmt[:16]
+        )
+        if not byte_rate or not block_align:
+            raise ValueError("WAV format has no byte rate")
+        self.path = path
+        self.fmt = fmt
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        data_size -= data_size % block_align
+        self.info = AudioInfo(
+            duration=data_size / byte_rate,
+            sample_rate=sample_rate,
+            channels=channels,
+            codec=f"pcm_{bits}",
+            bit_rate=byte_rate * 8,
+        )
+        # All samples as one chunk that every other chunk is cut from
+        self._whole = MemoryChunk(
+            header=_wav_header(fmt, data_size),
+            samples=self._view[data_offset : data_offset + data_size],
+            start=0.0,
+            duration=self.info.duration,
+            info=self.info,
+            fmt=fmt,
+            source=path,
+            key=kind,
+        )
+
+    @classmethod
+    def open_wav(cls, audio_path: str | Path) -> Optional[ChunkSource]:
+        """Memory-map a PCM WAV file.
+
+        Returns:
+            Chunk source, or None if the file isn't a PCM or float WAV file
+        """
+        with open(audio_path, "rb") as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty file
+                return None
+        layout = _find_pcm_data(mapped)
+        if layout is None:
+            mapped.close()
+            return None
+        fmt, data_offset, data_size = layout
+        try:
+            return cls(
+                Path(audio_path), mapped, fmt, data_offset, data_size, kind="wav"
+            )
+        except ValueError:
+            mapped.close()
+            return None
+
+    @classmethod
+    def decode(cls, audio_path: str | Path) -> ChunkSource:
+        """Decode audio once into 16 kHz mono PCM held in memory.
+
+        Raises:
+            subprocess.CalledProcessError: If ffmpeg fails
+        """
+        cmd = [
+            "ffmpeg",
+            "-v",
+            "error",
+            "-i",
+            str(audio_path),
+            "-vn",
+            "-ac",
+            "1",
+            "-ar",
+            str(DECODE_SAMPLE_RATE),
+            "-f",
+            "s16le",
+            "pipe:1",
+        ]
+        result = subprocess.run(cmd, capture_output=True, check=True)
+        return cls(
+            Path(audio_path),
+            result.stdout,
+            _DECODE_FMT,
+            0,
+            len(result.stdout),
+            kind="decoded16k",
+        )
+
+    @classmethod
+    def open(
+        cls, audio_path: str | Path, duration: Optional[float] = None
+    ) -> Optional[ChunkSource]:
+        """Open a chunk source for any audio file.
+
+        Args:
+            audio_path: Path to the audio file
+            duration: Known duration, used to skip decoding very long audio
+
+        Returns:
+            Chunk source, or None if the audio can't be held in memory
+            (ffmpeg missing or failing, or the audio too long to decode)
+        """
+        source = cls.open_wav(audio_path)
+        if source is not None:
+            return source
+        if (
+            duration is not None
+            and duration * DECODE_SAMPLE_RATE * 2 > MAX_DECODED_BUFFER_BYTES
+        ):
+            return None
+        try:
+            return cls.decode(audio_path)
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            return None
+
+    @property
+    def duration(self) -> float:
+        """Duration of the audio in seconds."""
+        return self.info.duration
+
+    def chunk(self, start: float, duration: float) -> MemoryChunk:
+        """Cut a chunk, aligning both ends to whole sample frames.
+
+        Args:
+            start: Start of the chunk in seconds
+            duration: Length of the chunk in seconds; clipped to the audio
+
+        Returns:
+            Chunk viewing the source's samples
+        """
+        return self._whole.subchunk(start, duration)
+
+    def close(self) -> None:
+        """Release the buffer; chunks must not be used afterwards."""
+        self._whole.samples.release()
+        self._view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            try:
+                self._buffer.close()
+            except BufferError:
+                # Chunk views are still alive; the map is freed with them
+                pass
+
+    def __enter__(self) -> ChunkSource:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def decode_pcm(audio_path: str | Path) -> bytes:
+    """Read audio as 16 kHz mono s16le samples.
+
+    WAV files already in that format are read directly; anything else is
+    decoded with ffmpeg.
+
+    Raises:
+        subprocess.CalledProcessError: If ffmpeg fails
+    """
+    source = ChunkSource.open_wav(audio_path)
+    if source is not None:
+        with source:
+            if source.fmt[:16] == _DECODE_FMT:
+                return source.chunk(0.0, source.duration).samples.tobytes()
+    with ChunkSource.decode(audio_path) as source:
+        return source.chunk(0.0, source.duration).samples.tobytes()
+
+
+def pcm_chunk(samples: bytes, source: Path, key: str) -> MemoryChunk:
+    """Wrap 16 kHz mono s16le samples as a chunk.
+
+    Args:
+        samples: Sample bytes, as returned by :func:`decode_pcm`
+        source: File the samples are attributed to, e.g. for upload keys
+        key: Identifies the samples among those attributed to ``source``
+    """
+    size = len(samples) - len(samples) % 2
+    duration = size / (DECODE_SAMPLE_RATE * 2)
+    return MemoryChunk(
+        header=_wav_header(_DECODE_FMT, size),
+        samples=memoryview(samples)[:size],
+        start=0.0,
+        duration=duration,
+        info=AudioInfo(
+            duration=duration,
+            sample_rate=DECODE_SAMPLE_RATE,
+            channels=1,
+            codec="pcm_16",
+            bit_rate=DECODE_SAMPLE_RATE * 16,
+        ),
+        fmt=_DECODE_FMT,
+        source=source,
+        key=key,
+    )
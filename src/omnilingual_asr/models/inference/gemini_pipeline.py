@@ -3,37 +3,102 @@
 from __future__ import annotations
 
 import concurrent.futures
+import contextlib
+import copy
+import difflib
+import io
 import json
+import math
 import os
 import re
 import shutil
 import subprocess
 import tempfile
-from dataclasses import dataclass, field
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, replace
 from pathlib import Path
-from typing import Any, Callable, List, Optional
-
-# Lazy import for google.genai to avoid import errors when not installed
-_genai = None
-_types = None
-
-
-def _ensure_genai():
-    """Ensure google-genai is installed and import it."""
-    global _genai, _types
-    if _genai is None:
-        try:
-            from google import genai
-            from google.genai import types
-
-            _genai = genai
-            _types = types
-        except ImportError as exc:
-            raise RuntimeError(
-                "google-genai is required for Gemini API integration. "
-                "Install with: pip install 'omnilingual-asr[gemini]'"
-            ) from exc
-    return _genai, _types
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+)
+
+# split_audio_into_chunks is re-exported for callers importing it from here
+from omnilingual_asr.models.inference.audio import (  # noqa: F401
+    CHUNK_DURATION_SECONDS,
+    CHUNK_OVERLAP_SECONDS,
+    PlannedChunk,
+    _ensure_numpy,
+    get_audio_duration,
+    plan_audio_chunks,
+    split_audio,
+    split_audio_into_chunks,
+    split_audio_spans,
+)
+from omnilingual_asr.models.inference.backends import (
+    GeminiBackend,
+    KeyPoolBackend,
+    TranscriptionBackend,
+    _ensure_genai,
+)
+from omnilingual_asr.models.inference.cache import (
+    TranscriptionCache,
+    file_sha256,
+    make_cache_key,
+)
+from omnilingual_asr.models.inference.checkpoint import ChunkCheckpoint
+from omnilingual_asr.models.inference.chunk_source import (
+    ChunkSource,
+    MemoryChunk,
+    decode_pcm,
+)
+from omnilingual_asr.models.inference.hedging import RequestHedger
+from omnilingual_asr.models.inference.metrics import (
+    MetricsCollector,
+    RequestMetrics,
+    TranscriptionMetrics,
+    get_metrics_collector,
+)
+from omnilingual_asr.models.inference.packing import (
+    PACK_GAP_SECONDS,
+    PACK_TARGET_SECONDS,
+    ClipPack,
+    ClipPacker,
+)
+from omnilingual_asr.models.inference.probe import AudioProbeError, probe_audio
+from omnilingual_asr.models.inference.rate_limit import (
+    AdaptiveRateLimiter,
+    _env_int,
+    get_rate_limiter,
+)
+from omnilingual_asr.models.inference.retry import backoff_delay, is_retryable_error
+from omnilingual_asr.models.inference.stream_json import (
+    SegmentStreamParser,
+    recover_truncated_json,
+)
+from omnilingual_asr.models.inference.transcode import (
+    TranscodedAudio,
+    TranscodeSettings,
+    needs_transcode,
+    resolve_transcode,
+    transcode_audio,
+    transcode_bytes,
+)
+from omnilingual_asr.models.inference.uploads import (
+    UploadedAudio,
+    UploadRegistry,
+    get_upload_registry,
+)
+from omnilingual_asr.models.inference.vad import SpeechMap, strip_silence
 
 
 @dataclass(frozen=True)
@@ -61,6 +126,17 @@ class GeminiTranscriptSegment:
     words: Optional[List[WordTimestamp]] = None
 
 
+@dataclass
+class ChunkFailure:
+    """A chunk of long audio that could not be transcribed."""
+
+    start: float
+    end: float
+    error: str
+    attempts: int
+    retryable: bool  # False if the API rejected the request outright
+
+
 @dataclass
 class GeminiTranscriptionResult:
     """Complete transcription result from Gemini API."""
@@ -68,6 +144,63 @@ class GeminiTranscriptionResult:
     summary: Optional[str] = None
     segments: List[GeminiTranscriptSegment] = field(default_factory=list)
     detected_languages: Optional[List[dict]] = None
+    failed_chunks: List[ChunkFailure] = field(default_factory=list)
+    truncated: bool = False  # Output limit hit; segments may end early
+    output_tokens: Optional[int] = None  # Tokens generated, as reported by the API
+    # Timings, tokens and bytes of the requests made; not serialized, so
+    # results served from the cache or a checkpoint have none
+    metrics: Optional[TranscriptionMetrics] = None
+    # Speech regions sent when silence was stripped (the timestamps above are
+    # already in the original audio's time); not serialized either
+    speech_map: Optional[SpeechMap] = None
+
+
+def result_to_dict(result: GeminiTranscriptionResult) -> Dict[str, Any]:
+    """Serialize a transcription result to a JSON-compatible dict."""
+    data = asdict(replace(result, metrics=None, speech_map=None))
+    del data["metrics"]
+    del data["speech_map"]
+    return data
+
+
+def result_from_dict(data: Dict[str, Any]) -> GeminiTranscriptionResult:
+    """Rebuild a transcription result from :func:`result_to_dict` output."""
+    segments = []
+    for seg in data.get("segments", []):
+        seg = dict(seg)
+        words = seg.pop("words", None)
+        segments.append(
+            GeminiTranscriptSegment(
+                **seg,
+                words=[WordTimestamp(**w) for w in words] if words else None,
+            )
+        )
+    return GeminiTranscriptionResult(
+        summary=data.get("summary"),
+        segments=segments,
+        detected_languages=data.get("detected_languages"),
+        failed_chunks=[ChunkFailure(**f) for f in data.get("failed_chunks", [])],
+        truncated=data.get("truncated", False),
+        output_tokens=data.get("output_tokens"),
+    )
+
+
+def _is_truncated(response: Any) -> bool:
+    """Whether a response stopped because it hit the output token limit."""
+    candidates = getattr(response, "candidates", None) or []
+    reason = getattr(candidates[0], "finish_reason", None) if candidates else None
+    return getattr(reason, "name", reason) == "MAX_TOKENS"
+
+
+def _output_tokens(response: Any) -> Optional[int]:
+    """Number of generated tokens reported in a response's usage metadata."""
+    usage = getattr(response, "usage_metadata", None)
+    return getattr(usage, "candidates_token_count", None) if usage else None
+
+
+def _is_missing_file_error(exc: Exception) -> bool:
+    """Whether an API error means a referenced upload no longer exists."""
+    return getattr(exc, "code", None) in (403, 404)
 
 
 def parse_timestamp(timestamp_str: str) -> float:
@@ -120,7 +253,7 @@ def get_mime_type(file_path: Path) -> str:
 
 # JSON Schema for structured output
 # Note: Word-level timestamps are synthesized client-side since Gemini doesn't provide them natively
-TRANSCRIPTION_SCHEMA = {
+TRANSCRIPTION_SCHEMA: Dict[str, Any] = {
     "type": "object",
     "properties": {
         "summary": {
@@ -197,117 +330,907 @@ TRANSCRIPTION_SCHEMA = {
     "required": ["summary", "detected_emotions", "speaker_count", "segments"],
 }
 
-TRANSCRIPTION_PROMPT = """
-Process the audio file and generate a detailed transcription.
+# Optional outputs; speaker, timestamps and text are always requested
+TRANSCRIPTION_FEATURES = frozenset({"languages", "translation", "emotion", "summary"})
+
+# Response fields each feature adds: (top-level, per-segment)
+_FEATURE_FIELDS = {
+    "languages": ((), ("languages",)),
+    "translation": ((), ("translation",)),
+    "emotion": (("detected_emotions",), ("emotion",)),
+    "summary": (("summary",), ()),
+}
+
+# Prompt requirements, each tagged with the feature it needs (None: always)
+_PROMPT_REQUIREMENTS = [
+    (None, "Identify distinct speakers (e.g., Speaker 1, Speaker 2, or names if context allows). Count and report the total number of speakers."),
+    (None, "Provide accurate start and end timestamps for each segment (Format: MM:SS)."),
+    (None, "IMPORTANT: Create SHORT segments - one sentence or phrase per segment (typically 2-10 seconds each). Do NOT combine multiple sentences into one segment. Split at natural phrase boundaries, pauses, and sentence endings."),
+    ("languages", 'For EACH segment, detect ALL languages used (important for code-switching). List them in the "languages" array with the primary language first. If a speaker switches between languages mid-sentence, include ALL languages they use.'),
+    ("translation", "If the segment contains any non-English content, provide an English translation in the translation field. If it's entirely in English, set translation to null."),
+    ("emotion", 'Identify the primary emotion of the speaker in EACH segment. You MUST choose exactly one of: happy, sad, angry, neutral. Also provide a list of ALL emotions detected across the entire audio in "detected_emotions".'),
+    ("summary", "Provide a brief summary of the entire audio that includes the number of speakers and the overall emotional tone."),
+    (None, "PRESERVE all punctuation, hyphens, apostrophes, and special characters exactly as spoken. Do not strip or modify punctuation."),
+]
+
+
+def resolve_features(features: Optional[Iterable[str]]) -> FrozenSet[str]:
+    """Validate a feature selection (None selects every feature)."""
+    if features is None:
+        return TRANSCRIPTION_FEATURES
+    selected = frozenset(features)
+    unknown = selected - TRANSCRIPTION_FEATURES
+    if unknown:
+        raise ValueError(
+            f"Unknown transcription features {sorted(unknown)}; "
+            f"choose from {sorted(TRANSCRIPTION_FEATURES)}"
+        )
+    return selected
+
+
+def _drop_property(schema: Dict[str, Any], name: str) -> None:
+    schema["properties"].pop(name, None)
+    if "required" in schema:
+        schema["required"] = [field for field in schema["required"] if field != name]
+
+
+def build_transcription_schema(features: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Response schema requesting only the selected features.
+
+    Args:
+        features: Subset of TRANSCRIPTION_FEATURES (None for all)
+
+    Returns:
+        JSON schema; with every feature selected, equal to TRANSCRIPTION_SCHEMA
+    """
+    selected = resolve_features(features)
+    schema = copy.deepcopy(TRANSCRIPTION_SCHEMA)
+    segment = schema["properties"]["segments"]["items"]
+    for feature, (top_level, per_segment) in _FEATURE_FIELDS.items():
+        if feature not in selected:
+            for name in top_level:
+                _drop_property(schema, name)
+            for name in per_segment:
+                _drop_property(segment, name)
+    return schema
+
+
+def build_transcription_prompt(features: Optional[Iterable[str]] = None) -> str:
+    """Transcription instructions covering only the selected features.
+
+    Args:
+        features: Subset of TRANSCRIPTION_FEATURES (None for all)
+
+    Returns:
+        Prompt text; with every feature selected, equal to TRANSCRIPTION_PROMPT
+    """
+    selected = resolve_features(features)
+    requirements = [
+        text for feature, text in _PROMPT_REQUIREMENTS
+        if feature is None or feature in selected
+    ]
+    numbered = "\n".join(f"{i}. {text}" for i, text in enumerate(requirements, 1))
+    return (
+        "\nProcess the audio file and generate a detailed transcription.\n\n"
+        f"Requirements:\n{numbered}\n\n"
+        "Be precise with timestamps - each segment should have both a start and end time. "
+        "Prefer many short segments over few long segments.\n"
+    )
+
+
+TRANSCRIPTION_PROMPT = build_transcription_prompt()
+
+
+@dataclass(frozen=True)
+class _Prompt:
+    """Everything sent with the audio: prompt text and response schema."""
+
+    text: str
+    schema: Dict[str, Any]
+    features: FrozenSet[str]
+
+
+# Audio payloads at or above this size go through the Files API
+INLINE_AUDIO_LIMIT_BYTES = 20 * 1024 * 1024
+# Transcoded payloads kept per pipeline for retries of the same request
+TRANSCODE_MEMO_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class _AudioPayload:
+    """Audio as it will be sent: transcoded bytes, or the audio itself."""
+
+    audio: Path | MemoryChunk
+    data: Optional[bytes]  # None to send the audio unchanged
+    mime_type: str
+    size: int
+
+    def read(self) -> bytes:
+        """Return the bytes to send."""
+        if self.data is not None:
+            return self.data
+        if isinstance(self.audio, MemoryChunk):
+            return self.audio.tobytes()
+        return self.audio.read_bytes()
+
+
+# Token estimates used to reserve rate-limit budget before a request is sent;
+# the reservation is corrected with the response's usage metadata afterwards
+AUDIO_TOKENS_PER_SECOND = 32
+OUTPUT_TOKENS_PER_SECOND = 8  # With every feature requested
+PROMPT_TOKENS = 1000
+
+# Part of OUTPUT_TOKENS_PER_SECOND each feature accounts for; the rest is
+# speakers, timestamps, text and JSON structure
+FEATURE_OUTPUT_TOKENS_PER_SECOND = {
+    "languages": 1.5,
+    "translation": 1.0,
+    "emotion": 0.75,
+    "summary": 0.25,
+}
+
+
+def output_tokens_per_second(features: Optional[Iterable[str]] = None) -> float:
+    """Estimated output tokens per second of audio for a feature selection."""
+    selected = resolve_features(features)
+    return OUTPUT_TOKENS_PER_SECOND - sum(
+        tokens for feature, tokens in FEATURE_OUTPUT_TOKENS_PER_SECOND.items()
+        if feature not in selected
+    )
+
+
+def output_token_savings(features: Optional[Iterable[str]]) -> float:
+    """Estimated fraction of output tokens saved versus requesting every feature."""
+    return 1.0 - output_tokens_per_second(features) / OUTPUT_TOKENS_PER_SECOND
 
-Requirements:
-1. Identify distinct speakers (e.g., Speaker 1, Speaker 2, or names if context allows). Count and report the total number of speakers.
-2. Provide accurate start and end timestamps for each segment (Format: MM:SS).
-3. IMPORTANT: Create SHORT segments - one sentence or phrase per segment (typically 2-10 seconds each). Do NOT combine multiple sentences into one segment. Split at natural phrase boundaries, pauses, and sentence endings.
-4. For EACH segment, detect ALL languages used (important for code-switching). List them in the "languages" array with the primary language first. If a speaker switches between languages mid-sentence, include ALL languages they use.
-5. If the segment contains any non-English content, provide an English translation in the translation field. If it's entirely in English, set translation to null.
-6. Identify the primary emotion of the speaker in EACH segment. You MUST choose exactly one of: happy, sad, angry, neutral. Also provide a list of ALL emotions detected across the entire audio in "detected_emotions".
-7. Provide a brief summary of the entire audio that includes the number of speakers and the overall emotional tone.
-8. PRESERVE all punctuation, hyphens, apostrophes, and special characters exactly as spoken. Do not strip or modify punctuation.
 
-Be precise with timestamps - each segment should have both a start and end time. Prefer many short segments over few long segments.
-"""
+def _estimate_audio_seconds(audio_path: Path | MemoryChunk) -> float:
+    """Cheaply estimate audio duration without spawning a process."""
+    if isinstance(audio_path, MemoryChunk):
+        return audio_path.duration
+    try:
+        return probe_audio(audio_path).duration
+    except AudioProbeError:
+        # Assume ~128 kbps compressed audio
+        return audio_path.stat().st_size / 16000.0
+
+
+def estimate_request_tokens(
+    audio_path: Path | MemoryChunk, features: Optional[Iterable[str]] = None
+) -> float:
+    """Estimate the total tokens a transcription request will consume."""
+    seconds = _estimate_audio_seconds(audio_path)
+    return PROMPT_TOKENS + seconds * (
+        AUDIO_TOKENS_PER_SECOND + output_tokens_per_second(features)
+    )
+
+
+# Follow-up requests for responses cut off by the output token limit
+MAX_TRUNCATION_DEPTH = 3  # Nested continuations/sub-splits before giving up
+MIN_SPLIT_SECONDS = 15.0  # Remainders shorter than twice this are not halved
 
 # Audio chunking constants
-CHUNK_DURATION_SECONDS = 300  # 5 minutes per chunk
+DEDUP_TIME_TOLERANCE_SECONDS = 1.0  # Max gap between boundary duplicates
+DEDUP_TEXT_SIMILARITY = 0.8  # Min text similarity ratio for boundary duplicates
 MIN_DURATION_FOR_CHUNKING = 360  # Only chunk files > 6 minutes
 MAX_PARALLEL_CHUNKS = 4  # Maximum concurrent API calls
+MAX_CHUNK_ATTEMPTS = 3  # Attempts per chunk before it is reported as failed
+
+
+def _offset_result(
+    result: GeminiTranscriptionResult, offset: float
+) -> GeminiTranscriptionResult:
+    """Return a copy of result with every segment shifted by offset seconds."""
+    return replace(
+        result,
+        segments=[
+            replace(seg, start=seg.start + offset, end=seg.end + offset)
+            for seg in result.segments
+        ],
+        metrics=result.metrics.shifted(offset) if result.metrics else None,
+    )
+
+
+def _remap_segment(
+    seg: GeminiTranscriptSegment, speech: SpeechMap
+) -> GeminiTranscriptSegment:
+    """Move a segment from silence-stripped audio to the original audio's time."""
+    words = seg.words
+    if words:
+        words = [
+            replace(w, start=speech.to_original(w.start), end=speech.to_original(w.end, end=True))
+            for w in words
+        ]
+    return replace(
+        seg,
+        start=speech.to_original(seg.start),
+        end=speech.to_original(seg.end, end=True),
+        words=words,
+    )
+
+
+def _remap_result(
+    result: GeminiTranscriptionResult, speech: Optional[SpeechMap]
+) -> GeminiTranscriptionResult:
+    """Map a result on silence-stripped audio back to the original audio's time."""
+    if speech is None:
+        return result
+    metrics = result.metrics
+    if metrics is not None:
+        metrics = replace(
+            metrics,
+            requests=[replace(r, offset=speech.to_original(r.offset)) for r in metrics.requests],
+        )
+    return replace(
+        result,
+        segments=[_remap_segment(seg, speech) for seg in result.segments],
+        failed_chunks=[
+            replace(
+                f, start=speech.to_original(f.start), end=speech.to_original(f.end, end=True)
+            )
+            for f in result.failed_chunks
+        ],
+        metrics=metrics,
+        speech_map=speech,
+    )
+
+
+def _normalize_text(text: str) -> str:
+    """Lowercase and strip punctuation for fuzzy text comparison."""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def _is_boundary_duplicate(
+    a: GeminiTranscriptSegment,
+    b: GeminiTranscriptSegment,
+    *,
+    tolerance: float = DEDUP_TIME_TOLERANCE_SECONDS,
+    similarity: float = DEDUP_TEXT_SIMILARITY,
+) -> bool:
+    """Whether two segments are the same speech transcribed by two chunks."""
+    if min(a.end, b.end) + tolerance < max(a.start, b.start):
+        return False
+    text_a, text_b = _normalize_text(a.text), _normalize_text(b.text)
+    if not text_a or not text_b:
+        return False
+    if text_a in text_b or text_b in text_a:
+        return True
+    return difflib.SequenceMatcher(None, text_a, text_b).ratio() >= similarity
+
+
+def _sum_output_tokens(results: List[GeminiTranscriptionResult]) -> Optional[int]:
+    """Total output tokens of several results, or None if none reported any."""
+    counts = [r.output_tokens for r in results if r.output_tokens is not None]
+    return sum(counts) if counts else None
+
+
+class _ChunkMerger:
+    """Incrementally merge chunk results that may finish in any order.
+
+    Results wait in a reorder buffer until every earlier chunk has finished
+    (or failed), then are merged in time order. Merged segments become final
+    once no later chunk can replace them as a boundary duplicate, i.e. once
+    they end well before the next pending chunk's audio starts.
+    """
 
+    def __init__(self, plan: List[PlannedChunk]) -> None:
+        self._plan = sorted(plan, key=lambda c: c.start)
+        self._buffer: Dict[PlannedChunk, Optional[GeminiTranscriptionResult]] = {}
+        self._next = 0
+        self._emitted = 0
+        self.results: List[GeminiTranscriptionResult] = []
+        self.segments: List[GeminiTranscriptSegment] = []
+
+    @property
+    def total(self) -> int:
+        """Number of planned chunks."""
+        return len(self._plan)
+
+    @property
+    def finished(self) -> int:
+        """Number of chunks that completed or failed so far."""
+        return self._next + len(self._buffer)
+
+    def add(
+        self,
+        planned: PlannedChunk,
+        result: Optional[GeminiTranscriptionResult],
+    ) -> List[GeminiTranscriptSegment]:
+        """Record a finished chunk (None if it failed).
 
-def get_audio_duration(audio_path: Path) -> float:
-    """Get audio duration in seconds using ffprobe."""
-    try:
-        result = subprocess.run(
-            [
-                "ffprobe",
-                "-v", "quiet",
-                "-show_entries", "format=duration",
-                "-of", "csv=p=0",
-                str(audio_path),
-            ],
-            capture_output=True,
-            text=True,
-            check=True,
+        Returns:
+            Segments that became final, in time order
+        """
+        self._buffer[planned] = result
+        while self._next < len(self._plan) and self._plan[self._next] in self._buffer:
+            planned = self._plan[self._next]
+            result = self._buffer.pop(planned)
+            if result is not None:
+                self._merge(planned, result)
+            self._next += 1
+
+        if self._next < len(self._plan):
+            horizon = self._plan[self._next].start - DEDUP_TIME_TOLERANCE_SECONDS
+        else:
+            horizon = math.inf
+        end = self._emitted
+        while end < len(self.segments) and self.segments[end].end < horizon:
+            end += 1
+        final = self.segments[self._emitted:end]
+        self._emitted = end
+        return final
+
+    def _merge(self, planned: PlannedChunk, result: GeminiTranscriptionResult) -> None:
+        self.results.append(result)
+        boundary = len(self.segments)
+        for seg in sorted(result.segments, key=lambda s: s.start):
+            midpoint = (seg.start + seg.end) / 2
+            if not planned.own_start <= midpoint < planned.own_end:
+                continue
+            # Only compare against the previous chunk's tail near this cut
+            duplicate_of = None
+            for j in range(boundary - 1, -1, -1):
+                prev = self.segments[j]
+                if prev.end + DEDUP_TIME_TOLERANCE_SECONDS < seg.start:
+                    break
+                if _is_boundary_duplicate(prev, seg):
+                    duplicate_of = j
+                    break
+            if duplicate_of is None:
+                self.segments.append(seg)
+            elif len(seg.text) > len(self.segments[duplicate_of].text):
+                self.segments[duplicate_of] = seg
+
+    def result(
+        self, failed_chunks: Optional[List[ChunkFailure]] = None
+    ) -> GeminiTranscriptionResult:
+        """Build the merged result from everything added so far."""
+        # Collect all unique languages
+        all_languages: List[dict] = []
+        seen_lang_codes = set()
+        for result in self.results:
+            if result.detected_languages:
+                for lang in result.detected_languages:
+                    code = lang.get("code", "")
+                    if code and code not in seen_lang_codes:
+                        seen_lang_codes.add(code)
+                        all_languages.append(lang)
+
+        # Combine summaries
+        summaries = [r.summary for r in self.results if r.summary]
+        combined_summary = " ".join(summaries) if summaries else None
+
+        return GeminiTranscriptionResult(
+            summary=combined_summary,
+            segments=list(self.segments),
+            detected_languages=all_languages if all_languages else None,
+            failed_chunks=sorted(failed_chunks or [], key=lambda f: f.start),
+            truncated=any(result.truncated for result in self.results),
+            output_tokens=_sum_output_tokens(self.results),
+            metrics=TranscriptionMetrics.combine(r.metrics for r in self.results),
         )
-        return float(result.stdout.strip())
-    except (subprocess.CalledProcessError, ValueError, FileNotFoundError):
-        # Fallback: assume short file if ffprobe fails
-        return 0.0
 
 
-def split_audio_into_chunks(
-    audio_path: Path,
-    chunk_duration: float = CHUNK_DURATION_SECONDS,
-    output_dir: Optional[Path] = None,
-) -> List[tuple[Path, float]]:
-    """Split audio file into chunks using ffmpeg.
-    
+def merge_chunk_results(
+    chunk_results: List[tuple[PlannedChunk, GeminiTranscriptionResult]],
+    failed_chunks: Optional[List[ChunkFailure]] = None,
+) -> GeminiTranscriptionResult:
+    """Merge per-chunk results into a single transcript.
+
+    Each chunk keeps the segments whose midpoint falls between its cut points,
+    and segments near a cut that repeat the previous chunk's last segments
+    (by time and text similarity) are dropped, keeping the longer text.
+
+    Args:
+        chunk_results: (planned chunk, result with absolute timestamps) pairs
+        failed_chunks: Chunks that could not be transcribed
+
     Returns:
-        List of (chunk_path, start_offset) tuples
+        Merged transcription result
     """
-    if output_dir is None:
-        output_dir = Path(tempfile.mkdtemp(prefix="audio_chunks_"))
-    
-    total_duration = get_audio_duration(audio_path)
-    if total_duration <= 0:
-        # Can't determine duration, return original file
-        return [(audio_path, 0.0)]
-    
-    chunks = []
-    start_time = 0.0
-    chunk_idx = 0
-    
-    # Get file extension
-    ext = audio_path.suffix or ".wav"
-    
-    while start_time < total_duration:
-        chunk_path = output_dir / f"chunk_{chunk_idx:04d}{ext}"
-        
-        # Use ffmpeg to extract chunk
-        try:
-            subprocess.run(
-                [
-                    "ffmpeg",
-                    "-y",  # Overwrite
-                    "-i", str(audio_path),
-                    "-ss", str(start_time),
-                    "-t", str(chunk_duration),
-                    "-c", "copy",  # Fast copy without re-encoding
-                    str(chunk_path),
-                ],
-                capture_output=True,
-                check=True,
+    merger = _ChunkMerger([planned for planned, _ in chunk_results])
+    for planned, result in chunk_results:
+        merger.add(planned, result)
+    return merger.result(failed_chunks)
+
+
+@dataclass
+class TranscriptionUpdate:
+    """Incremental output of a streaming transcription.
+
+    A single request counts as one chunk that completes with the last update.
+    """
+
+    segments: List[GeminiTranscriptSegment]  # Newly final segments, in time order
+    completed_chunks: int
+    total_chunks: int
+    result: Optional[GeminiTranscriptionResult] = None  # Only on the last update
+
+
+def _remap_update(update: TranscriptionUpdate, speech: Optional[SpeechMap]) -> TranscriptionUpdate:
+    """Map an update on silence-stripped audio back to the original audio's time."""
+    if speech is None:
+        return update
+    return replace(
+        update,
+        segments=[_remap_segment(seg, speech) for seg in update.segments],
+        result=_remap_result(update.result, speech) if update.result else None,
+    )
+
+
+def _final_result(
+    updates: Generator[TranscriptionUpdate, None, None]
+) -> GeminiTranscriptionResult:
+    """Consume updates until the one carrying the complete result."""
+    try:
+        for update in updates:
+            if update.result is not None:
+                return update.result
+    finally:
+        updates.close()
+    raise RuntimeError("Chunked transcription ended without a result")
+
+
+def _parse_languages(
+    seg: Dict[str, Any],
+) -> tuple[Optional[str], Optional[str], Optional[List[dict]]]:
+    """Read a segment's languages as (primary name, primary code, all languages)."""
+    # Handle new languages array format or legacy single language format
+    languages = seg.get("languages", [])
+    if languages:
+        # New format: array of language objects
+        primary_lang = languages[0] if languages else {}
+        language_name = primary_lang.get("name")
+        language_code = primary_lang.get("code")
+        # Store languages for this segment (for code-switching)
+        segment_languages = [
+            {"name": lang.get("name", ""), "code": lang.get("code", "")}
+            for lang in languages
+        ]
+    else:
+        # Legacy format: single language/language_code fields
+        language_name = seg.get("language")
+        language_code = seg.get("language_code")
+        segment_languages = None
+    return language_name, language_code, segment_languages
+
+
+def _segment_from_dict(
+    seg: Dict[str, Any], features: FrozenSet[str] = TRANSCRIPTION_FEATURES
+) -> GeminiTranscriptSegment:
+    """Convert one element of the response's ``segments`` array.
+
+    Fields of features that weren't requested are left unset.
+    """
+    start_time = parse_timestamp(seg.get("timestamp_start", "0:00"))
+    end_time = parse_timestamp(seg.get("timestamp_end", "0:00"))
+
+    # Ensure end time is after start time
+    if end_time <= start_time:
+        end_time = start_time + 1.0
+
+    language_name, language_code, segment_languages = _parse_languages(seg)
+    return GeminiTranscriptSegment(
+        start=start_time,
+        end=end_time,
+        speaker=seg.get("speaker", "Speaker 1"),
+        text=seg.get("content", ""),
+        language=language_name,
+        language_code=language_code,
+        languages=segment_languages,  # Store all languages for code-switching
+        emotion=seg.get("emotion", "neutral" if "emotion" in features else None),
+        translation=seg.get("translation"),
+        words=None,
+    )
+
+
+def _collect_languages(segments: List[GeminiTranscriptSegment]) -> Optional[List[dict]]:
+    """Every language detected across segments, in order of first appearance."""
+    all_languages = []
+    seen_lang_codes = set()
+    for segment in segments:
+        if segment.languages:
+            detected = [(lang["code"], lang["name"]) for lang in segment.languages]
+        else:
+            detected = [(segment.language_code, segment.language)]
+        for code, name in detected:
+            if code and code not in seen_lang_codes:
+                seen_lang_codes.add(code)
+                all_languages.append({
+                    "code": code,
+                    "language": name or code,
+                })
+    return all_languages if all_languages else None
+
+
+def _audio_seconds(audio: Path | MemoryChunk) -> float:
+    """Duration of audio to transcribe, or 0.0 if unknown."""
+    if isinstance(audio, MemoryChunk):
+        return audio.duration
+    return get_audio_duration(audio)
+
+
+def _continuation_plan(
+    result: GeminiTranscriptionResult, duration: float, depth: int
+) -> List[PlannedChunk]:
+    """Spans of audio still to transcribe after a truncated response.
+
+    The first follow-up resumes after the last complete segment. If a
+    follow-up truncates again, or nothing was recovered, the rest is halved
+    so each request has less speech to write out.
+    """
+    resume = result.segments[-1].end if result.segments else 0.0
+    remaining = duration - resume
+    if remaining <= DEDUP_TIME_TOLERANCE_SECONDS:
+        return []
+    if (depth == 0 and result.segments) or remaining < 2 * MIN_SPLIT_SECONDS:
+        return [PlannedChunk(resume, duration, resume, duration)]
+    mid = resume + remaining / 2
+    return [
+        PlannedChunk(resume, mid, resume, mid),
+        PlannedChunk(mid, duration, mid, duration),
+    ]
+
+
+def _join_continuations(
+    result: GeminiTranscriptionResult,
+    parts: List[tuple[PlannedChunk, GeminiTranscriptionResult]],
+) -> GeminiTranscriptionResult:
+    """Merge a truncated result with the results for the audio it missed."""
+    resume = parts[0][0].start
+    head = PlannedChunk(0.0, resume, 0.0, resume)
+    merged = merge_chunk_results([(head, result)] + parts)
+    return replace(
+        merged,
+        # The first response saw all of the audio
+        summary=result.summary or merged.summary,
+        truncated=any(part.truncated for _, part in parts),
+    )
+
+
+def _with_retries(
+    result: GeminiTranscriptionResult, retries: int
+) -> GeminiTranscriptionResult:
+    """Record in a result's metrics that it succeeded after ``retries`` failures."""
+    if retries and result.metrics is not None:
+        result.metrics.retries += retries
+    return result
+
+
+def _chunk_failure(
+    planned: PlannedChunk, exc: Exception, attempts: int
+) -> ChunkFailure:
+    """Describe a chunk that exhausted its attempts or failed permanently."""
+    return ChunkFailure(
+        start=planned.start,
+        end=planned.end,
+        error=f"{type(exc).__name__}: {exc}",
+        attempts=attempts,
+        retryable=is_retryable_error(exc),
+    )
+
+
+def split_pack_result(
+    result: GeminiTranscriptionResult | ChunkFailure, pack: ClipPack
+) -> List[GeminiTranscriptionResult]:
+    """Split the result for a pack of clips back into one result per clip.
+
+    Segments are shifted to clip-relative time and clamped to their clip,
+    so no segment spans two clips. A failed pack fails each of its clips.
+    """
+    if isinstance(result, ChunkFailure):
+        return [
+            GeminiTranscriptionResult(
+                failed_chunks=[replace(result, start=0.0, end=clip.duration)]
             )
-            chunks.append((chunk_path, start_time))
-        except subprocess.CalledProcessError:
-            # If copy fails, try with re-encoding
-            try:
-                subprocess.run(
-                    [
-                        "ffmpeg",
-                        "-y",
-                        "-i", str(audio_path),
-                        "-ss", str(start_time),
-                        "-t", str(chunk_duration),
-                        str(chunk_path),
+            for clip in pack.clips
+        ]
+    per_clip: List[List[GeminiTranscriptSegment]] = [[] for _ in pack.clips]
+    for seg in result.segments:
+        position = pack.clip_at(seg.start, seg.end)
+        clip = pack.clips[position]
+        start = min(max(seg.start - clip.offset, 0.0), clip.duration)
+        end = min(max(seg.end - clip.offset, start), clip.duration)
+        per_clip[position].append(replace(seg, start=start, end=end))
+    return [
+        GeminiTranscriptionResult(
+            segments=segments,
+            detected_languages=_collect_languages(segments),
+            truncated=result.truncated,
+        )
+        for segments in per_clip
+    ]
+
+
+# Text-only enrichment of a transcript made without some features
+ENRICH_BATCH_SEGMENTS = 40  # Segments sent per enrichment request
+ENRICH_OUTPUT_TOKENS_PER_SEGMENT = 40
+CHARS_PER_TEXT_TOKEN = 4  # Rough size of a text token, for rate limiting
+
+# What an enrichment request asks for each segment, by feature
+_ENRICH_REQUIREMENTS = {
+    "languages": 'Detect ALL languages used in the segment (important for code-switching). List them in the "languages" array with the primary language first.',
+    "translation": "If the segment contains any non-English content, provide an English translation in the translation field. If it's entirely in English, set translation to null.",
+    "emotion": "Identify the primary emotion of the speaker, judged from the wording and the surrounding segments. You MUST choose exactly one of: happy, sad, angry, neutral.",
+}
+
+
+@dataclass(frozen=True)
+class _EnrichBatch:
+    """One text-only enrichment request: a run of segments, or the summary."""
+
+    indices: range  # Positions of the segments in the transcript; empty for the summary
+    prompt: _Prompt
+    start: float
+    end: float
+
+    @property
+    def tokens(self) -> float:
+        """Estimated tokens the request will consume."""
+        return (
+            PROMPT_TOKENS
+            + len(self.prompt.text) / CHARS_PER_TEXT_TOKEN
+            + max(len(self.indices), 1) * ENRICH_OUTPUT_TOKENS_PER_SEGMENT
+        )
+
+
+@dataclass
+class EnrichmentUpdate:
+    """Fields added to a transcript by one request of an enrichment pass.
+
+    The last update carries the enriched result and any batches that failed.
+    """
+
+    segments: Dict[int, GeminiTranscriptSegment]  # Enriched segments by position
+    summary: Optional[str]
+    completed_batches: int
+    total_batches: int
+    result: Optional[GeminiTranscriptionResult] = None  # Only on the last update
+    failed_batches: List[ChunkFailure] = field(default_factory=list)
+
+
+def _transcript_json(
+    segments: List[GeminiTranscriptSegment], indices: Iterable[int]
+) -> str:
+    """Serialize segments as compact JSON for a text-only request."""
+    return json.dumps(
+        [
+            {"index": i, "speaker": segments[i].speaker, "text": segments[i].text}
+            for i in indices
+        ],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+def _language_hint(language: Optional[str]) -> str:
+    return f"\nThe audio is primarily in {language}.\n" if language else ""
+
+
+def _enrichment_prompt(
+    segments: List[GeminiTranscriptSegment],
+    indices: range,
+    features: FrozenSet[str],
+    language: Optional[str] = None,
+) -> _Prompt:
+    """Prompt and schema adding per-segment features to a run of segments."""
+    requested = [feature for feature in _ENRICH_REQUIREMENTS if feature in features]
+    numbered = "\n".join(
+        f"{i}. {_ENRICH_REQUIREMENTS[feature]}" for i, feature in enumerate(requested, 1)
+    )
+    text = (
+        "\nThe JSON below lists consecutive segments of the transcript of one audio "
+        "recording, each with its index, speaker and text.\n\n"
+        f"For EACH segment, return its index and:\n{numbered}\n\n"
+        "Do not repeat or change the transcribed text.\n"
+        f"{_language_hint(language)}\n"
+        f"Segments:\n{_transcript_json(segments, indices)}\n"
+    )
+    transcript_segment = TRANSCRIPTION_SCHEMA["properties"]["segments"]["items"]
+    properties: Dict[str, Any] = {
+        "index": {"type": "integer", "description": "Index of the segment as given"},
+    }
+    for feature in requested:
+        properties[feature] = copy.deepcopy(transcript_segment["properties"][feature])
+    schema = {
+        "type": "object",
+        "properties": {
+            "segments": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": properties,
+                    "required": ["index"] + [
+                        feature for feature in requested
+                        if feature in transcript_segment["required"]
                     ],
-                    capture_output=True,
-                    check=True,
+                },
+            },
+        },
+        "required": ["segments"],
+    }
+    return _Prompt(text, schema, frozenset(requested))
+
+
+def _summary_prompt(
+    segments: List[GeminiTranscriptSegment], language: Optional[str] = None
+) -> _Prompt:
+    """Prompt and schema summarizing a whole transcript."""
+    text = (
+        "\nThe JSON below is the transcript of one audio recording, one segment "
+        "per element.\n\n"
+        "Provide a brief summary of the entire audio that includes the number of "
+        "speakers and the overall emotional tone.\n"
+        f"{_language_hint(language)}\n"
+        f"Transcript:\n{_transcript_json(segments, range(len(segments)))}\n"
+    )
+    schema = {
+        "type": "object",
+        "properties": {"summary": TRANSCRIPTION_SCHEMA["properties"]["summary"]},
+        "required": ["summary"],
+    }
+    return _Prompt(text, schema, frozenset({"summary"}))
+
+
+def _plan_enrichment(
+    result: GeminiTranscriptionResult,
+    features: FrozenSet[str],
+    language: Optional[str] = None,
+    batch_size: int = ENRICH_BATCH_SEGMENTS,
+) -> List[_EnrichBatch]:
+    """Split the enrichment of a transcript into independent text-only requests."""
+    segments = result.segments
+    if not segments:
+        return []
+    batches = []
+    if features & _ENRICH_REQUIREMENTS.keys():
+        for first in range(0, len(segments), max(batch_size, 1)):
+            indices = range(first, min(first + max(batch_size, 1), len(segments)))
+            batches.append(
+                _EnrichBatch(
+                    indices,
+                    _enrichment_prompt(segments, indices, features, language),
+                    segments[indices[0]].start,
+                    segments[indices[-1]].end,
                 )
-                chunks.append((chunk_path, start_time))
-            except subprocess.CalledProcessError:
-                # Skip this chunk on failure
-                pass
-        
-        start_time += chunk_duration
-        chunk_idx += 1
-    
-    return chunks if chunks else [(audio_path, 0.0)]
+            )
+    if "summary" in features:
+        batches.append(
+            _EnrichBatch(
+                range(0),
+                _summary_prompt(segments, language),
+                segments[0].start,
+                segments[-1].end,
+            )
+        )
+    return batches
+
+
+def _parse_enrichment(
+    batch: _EnrichBatch,
+    response_text: str,
+    segments: List[GeminiTranscriptSegment],
+) -> tuple[Dict[int, GeminiTranscriptSegment], Optional[str]]:
+    """Apply an enrichment response to the segments it covers.
+
+    Returns:
+        (enriched segments by position, summary); segments the response
+        skipped or that a truncated response didn't reach are left out
+    """
+    try:
+        data = json.loads(response_text)
+    except json.JSONDecodeError:
+        data = recover_truncated_json(response_text)
+    if not isinstance(data, dict):
+        return {}, None
+
+    summary = data.get("summary") or None
+    features = batch.prompt.features
+    enriched: Dict[int, GeminiTranscriptSegment] = {}
+    for item in data.get("segments", []):
+        index = item.get("index") if isinstance(item, dict) else None
+        if not isinstance(index, int) or index not in batch.indices:
+            continue
+        fields: Dict[str, Any] = {}
+        if "languages" in features:
+            language, language_code, languages = _parse_languages(item)
+            fields.update(language=language, language_code=language_code, languages=languages)
+        if "translation" in features:
+            fields["translation"] = item.get("translation")
+        if "emotion" in features:
+            fields["emotion"] = item.get("emotion", "neutral")
+        enriched[index] = replace(segments[index], **fields)
+    return enriched, summary
+
+
+def _enrichment_failure(
+    batch: _EnrichBatch, exc: Exception, attempts: int
+) -> ChunkFailure:
+    """Describe an enrichment request that exhausted its attempts."""
+    return ChunkFailure(
+        start=batch.start,
+        end=batch.end,
+        error=f"{type(exc).__name__}: {exc}",
+        attempts=attempts,
+        retryable=is_retryable_error(exc),
+    )
+
+
+class _EnrichmentMerger:
+    """Apply enrichment responses that may arrive in any order."""
+
+    def __init__(self, result: GeminiTranscriptionResult, total: int) -> None:
+        self._result = result
+        self.segments = list(result.segments)
+        self.summary = result.summary
+        self.total = total
+        self.finished = 0
+        self.failures: List[ChunkFailure] = []
+        self._output_tokens: List[Optional[int]] = [result.output_tokens]
+        self._requests: List[RequestMetrics] = []
+
+    def add(
+        self, batch: _EnrichBatch, outcome: tuple[str, RequestMetrics] | ChunkFailure
+    ) -> EnrichmentUpdate:
+        """Apply one batch's response, or record its failure."""
+        self.finished += 1
+        if isinstance(outcome, ChunkFailure):
+            self.failures.append(outcome)
+            return EnrichmentUpdate({}, None, self.finished, self.total)
+        text, request = outcome
+        self._output_tokens.append(request.output_tokens)
+        self._requests.append(request)
+        enriched, summary = _parse_enrichment(batch, text, self.segments)
+        for index, segment in enriched.items():
+            self.segments[index] = segment
+        if summary:
+            self.summary = summary
+        return EnrichmentUpdate(enriched, summary, self.finished, self.total)
+
+    def last_update(self) -> EnrichmentUpdate:
+        """Final update carrying the enriched result."""
+        counts = [count for count in self._output_tokens if count is not None]
+        result = replace(
+            self._result,
+            segments=self.segments,
+            summary=self.summary,
+            detected_languages=(
+                _collect_languages(self.segments) or self._result.detected_languages
+            ),
+            output_tokens=sum(counts) if counts else None,
+            metrics=TranscriptionMetrics.combine(
+                [self._result.metrics, TranscriptionMetrics(self._requests)]
+            ),
+        )
+        return EnrichmentUpdate(
+            {}, None, self.finished, self.total, result, list(self.failures)
+        )
+
+
+def _api_keys(api_key: Optional[str | Sequence[str]]) -> List[str]:
+    """Distinct keys from one key, a comma-separated list, or a sequence."""
+    if api_key is None:
+        return []
+    parts = api_key.split(",") if isinstance(api_key, str) else api_key
+    return list(dict.fromkeys(key.strip() for key in parts if key.strip()))
+
+
+def _default_backend(api_key: Optional[str | Sequence[str]]) -> TranscriptionBackend:
+    """GeminiBackend for one key; a KeyPoolBackend for several."""
+    keys = _api_keys(api_key)
+    if not keys:
+        raise ValueError(
+            "GEMINI_API_KEY environment variable not set. "
+            "Get your API key from https://aistudio.google.com/apikey"
+        )
+    if len(keys) == 1:
+        return GeminiBackend(keys[0])
+    # Quotas of each key, for balancing; GEMINI_RPM and GEMINI_TPM limit the total
+    return KeyPoolBackend.from_keys(
+        keys,
+        requests_per_minute=_env_int("GEMINI_KEY_RPM"),
+        tokens_per_minute=_env_int("GEMINI_KEY_TPM"),
+    )
 
 
 class GeminiASRPipeline:
@@ -315,57 +1238,491 @@ class GeminiASRPipeline:
 
     def __init__(
         self,
-        api_key: Optional[str] = None,
+        api_key: Optional[str | Sequence[str]] = None,
         model: str = "gemini-3-flash-preview",
+        cache: Optional[TranscriptionCache] = None,
+        upload_registry: Optional[UploadRegistry] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        checkpoint_dir: Optional[str | Path] = None,
+        transcode: Optional[str | TranscodeSettings] = None,
+        in_memory_chunks: bool = True,
+        backend: Optional[TranscriptionBackend] = None,
+        metrics_collector: Optional[MetricsCollector] = None,
+        strip_silence: bool = False,
+        hedging: Optional[RequestHedger] = None,
     ) -> None:
         """Initialize the Gemini ASR pipeline.
 
         Args:
-            api_key: Gemini API key. If not provided, will use GEMINI_API_KEY env var.
+            api_key: Gemini API key, or several as a sequence or comma-separated
+                string to spread requests over them with a KeyPoolBackend. If
+                not provided, will use GEMINI_API_KEY env var.
             model: Gemini model to use (default: gemini-3-flash-preview)
+            cache: Optional result cache. Repeated requests for the same audio,
+                model, prompt and schema are served from it without an API call.
+            upload_registry: Registry of Files API uploads to reuse. Defaults to
+                the registry shared by all pipelines in the process.
+            rate_limiter: Limiter every API call goes through. Defaults to the
+                limiter shared by all pipelines in the process.
+            checkpoint_dir: Directory where chunked jobs persist completed
+                chunks, so an interrupted job only redoes the missing ones
+            transcode: Normalize audio before sending it: a preset name
+                ("lossless", "balanced", "compact") or TranscodeSettings.
+                Shrinks payloads so more requests fit inline. Needs ffmpeg.
+            in_memory_chunks: Cut chunks of long audio in memory instead of
+                extracting each to a temp file: PCM WAV is memory-mapped,
+                other formats are decoded once to 16 kHz mono PCM.
+            backend: Backend that answers requests. Defaults to the Gemini
+                API; pass a FakeBackend to run without network or quota.
+            metrics_collector: Collector every request is reported to. Defaults
+                to the collector shared by all pipelines in the process.
+            strip_silence: Detect speech locally and send only the speech
+                regions, with short pauses between them; timestamps are
+                mapped back to the original audio. Needs NumPy, and ffmpeg
+                for formats other than PCM WAV.
+            hedging: Send a duplicate of a chunk request that runs slower
+                than most, and use whichever answers first. Share one
+                RequestHedger between pipelines to share its budget. Hedged
+                requests are sent from threads that :meth:`close` stops.
         """
-        genai, types = _ensure_genai()
+        _, types = _ensure_genai()
 
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
-        if not self.api_key:
-            raise ValueError(
-                "GEMINI_API_KEY environment variable not set. "
-                "Get your API key from https://aistudio.google.com/apikey"
-            )
+        if backend is None:
+            backend = _default_backend(self.api_key)
 
         self.model = model
-        self.client = genai.Client(api_key=self.api_key)
+        self.backend = backend
         self._types = types
+        self.cache = cache
+        self.uploads = upload_registry or get_upload_registry()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.metrics_collector = metrics_collector or get_metrics_collector()
+        self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else None
+        self.transcode = resolve_transcode(transcode)
+        # Transcoded audio by upload key, so retries, continuations and
+        # duplicates of a request don't encode the same audio again
+        self._transcoded: OrderedDict[str, Optional[TranscodedAudio]] = OrderedDict()
+        self._transcoded_bytes = 0
+        self._transcoded_lock = threading.Lock()
+        self.in_memory_chunks = in_memory_chunks
+        if strip_silence:
+            _ensure_numpy()
+        self.strip_silence = strip_silence
+        self.hedging = hedging
+        # Hedged requests and their duplicates are sent from here, so a
+        # losing request keeps a bounded thread rather than one of its own;
+        # created with the first hedged request
+        self._attempts: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._attempts_lock = threading.Lock()
+        self._upload_account = backend.account
+
+    def warmup(self, connections: int = MAX_PARALLEL_CHUNKS) -> None:
+        """Prepare the backend so the first request is as fast as later ones.
+
+        For the Gemini API this constructs the shared client and opens
+        ``connections`` connections; the default matches the number of
+        chunks sent in parallel. Errors are left to the requests that follow.
+        """
+        self.backend.warmup(self.model, connections)
+
+    def close(self) -> None:
+        """Stop the threads hedged requests are sent from.
+
+        Duplicates still waiting for a thread are dropped; requests already
+        sent are left to finish. A later hedged request starts new threads.
+        """
+        with self._attempts_lock:
+            attempts, self._attempts = self._attempts, None
+        if attempts is not None:
+            attempts.shutdown(wait=False, cancel_futures=True)
+
+    def _attempt_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Threads hedged requests are sent from, started on first use."""
+        with self._attempts_lock:
+            if self._attempts is None:
+                self._attempts = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=2 * self.rate_limiter.max_concurrency,
+                    thread_name_prefix="gemini-attempt",
+                )
+            return self._attempts
+
+    def _cache_key(self, audio_path: Path, prompt: _Prompt, variant: str = "") -> str:
+        """Build the result cache key for an audio file and prompt."""
+        if self.transcode is not None:
+            variant = f"{variant}|transcode:{self.transcode.key}"
+        return make_cache_key(
+            file_sha256(audio_path),
+            model=self.model,
+            prompt=prompt.text,
+            schema=prompt.schema,
+            variant=variant,
+        )
+
+    def _cache_get(self, key: Optional[str]) -> Optional[GeminiTranscriptionResult]:
+        """Look up a cached result, returning None on a miss or without a cache."""
+        if self.cache is None or key is None:
+            return None
+        cached = self.cache.get(key)
+        return result_from_dict(cached) if cached is not None else None
+
+    def _cache_put(self, key: Optional[str], result: GeminiTranscriptionResult) -> None:
+        """Store a complete result in the cache if one is configured."""
+        if self.cache is not None and key is not None and not result.truncated:
+            self.cache.put(key, result_to_dict(result))
+
+    def _open_checkpoint(
+        self, audio_path: Path, prompt: _Prompt, variant: str
+    ) -> Optional[ChunkCheckpoint]:
+        """Return the checkpoint for a chunked job, if checkpointing is enabled."""
+        if self.checkpoint_dir is None:
+            return None
+        return ChunkCheckpoint(
+            self.checkpoint_dir,
+            file_sha256(audio_path),
+            self._cache_key(audio_path, prompt, variant),
+        )
+
+    def _strip_silence(self, audio_path: Path, output_path: Path) -> Optional[SpeechMap]:
+        """Write the speech of audio_path to output_path, if worthwhile."""
+        speech = strip_silence(audio_path, output_path)
+        if speech is not None:
+            self.metrics_collector.observe_silence(speech.removed_seconds)
+        return speech
 
-    def _prepare_audio_input(self, audio_path: Path) -> Any:
+    @contextlib.contextmanager
+    def _speech_audio(self, audio_path: Path) -> Iterator[tuple[Path, Optional[SpeechMap]]]:
+        """Strip silence if enabled.
+
+        Yields:
+            (audio to send, map of its times to audio_path's or None if the
+            audio is sent unchanged)
+        """
+        if not self.strip_silence:
+            yield audio_path, None
+            return
+        temp_dir = Path(tempfile.mkdtemp(prefix="gemini_speech_"))
+        try:
+            output_path = temp_dir / "speech.wav"
+            speech = self._strip_silence(audio_path, output_path)
+            yield (audio_path if speech is None else output_path), speech
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _audio_payload(self, audio: Path | MemoryChunk) -> _AudioPayload:
+        """Transcode audio in memory if configured and worthwhile."""
+        if isinstance(audio, MemoryChunk):
+            info, size = audio.info, audio.size
+        else:
+            try:
+                info = probe_audio(audio)
+            except AudioProbeError:
+                info = None
+            size = audio.stat().st_size
+
+        if self.transcode is not None and (
+            info is None or needs_transcode(info, self.transcode)
+        ):
+            transcoded = self._transcoded_audio(audio, self.transcode)
+            if transcoded is not None and len(transcoded.data) < size:
+                return _AudioPayload(
+                    audio,
+                    transcoded.data,
+                    transcoded.mime_type,
+                    len(transcoded.data),
+                )
+
+        if isinstance(audio, MemoryChunk):
+            return _AudioPayload(audio, None, audio.mime_type, size)
+        return _AudioPayload(audio, None, get_mime_type(audio), size)
+
+    def _transcoded_audio(
+        self, audio: Path | MemoryChunk, settings: TranscodeSettings
+    ) -> Optional[TranscodedAudio]:
+        """Transcode audio once, reusing the bytes while they are memoized.
+
+        Returns None if ffmpeg can't transcode the audio.
+        """
+        key = self._upload_key(audio)
+        with self._transcoded_lock:
+            if key in self._transcoded:
+                self._transcoded.move_to_end(key)
+                return self._transcoded[key]
+
+        transcoded: Optional[TranscodedAudio]
+        try:
+            if isinstance(audio, MemoryChunk):
+                transcoded = transcode_bytes(audio.tobytes(), settings)
+            else:
+                transcoded = transcode_audio(audio, settings)
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            # No usable ffmpeg for this audio; send the original
+            transcoded = None
+
+        with self._transcoded_lock:
+            if key not in self._transcoded:
+                self._transcoded[key] = transcoded
+                self._transcoded_bytes += len(transcoded.data) if transcoded else 0
+            while self._transcoded_bytes > TRANSCODE_MEMO_BYTES:
+                _, evicted = self._transcoded.popitem(last=False)
+                self._transcoded_bytes -= len(evicted.data) if evicted else 0
+        return transcoded
+
+    def _upload_key(self, audio: Path | MemoryChunk) -> str:
+        """Upload registry key for the audio as this pipeline sends it."""
+        if isinstance(audio, MemoryChunk):
+            key = f"{file_sha256(audio.source)}:{audio.key}"
+        else:
+            key = file_sha256(audio)
+        if self.transcode is not None:
+            return f"{key}:{self.transcode.key}"
+        return key
+
+    @staticmethod
+    def _upload_args(payload: _AudioPayload) -> Dict[str, Any]:
+        """Files API upload arguments, streaming in-memory audio from memory."""
+        if payload.data is None and isinstance(payload.audio, Path):
+            return dict(file=str(payload.audio))
+        return dict(
+            file=io.BytesIO(payload.read()),
+            config=dict(mime_type=payload.mime_type),
+        )
+
+    def _prepare_audio_input(
+        self, audio: Path | MemoryChunk, request: RequestMetrics
+    ) -> Any:
         """Prepare audio input for Gemini API.
 
-        Uses inline data for files < 20MB, otherwise uploads via Files API.
+        Uses inline data for payloads < 20MB, otherwise uploads via Files API.
 
         Args:
-            audio_path: Path to the audio file
+            audio: Path to the audio file, or an in-memory chunk
+            request: Metrics of the request the audio is for
 
         Returns:
             Audio input ready for Gemini API
         """
-        file_size_mb = audio_path.stat().st_size / (1024 * 1024)
-        mime_type = get_mime_type(audio_path)
-
-        if file_size_mb < 20:
-            # Use inline data for smaller files
-            with open(audio_path, "rb") as f:
-                audio_bytes = f.read()
-            return self._types.Part.from_bytes(data=audio_bytes, mime_type=mime_type)
+        with request.stage("prepare"):
+            payload = self._audio_payload(audio)
+            if payload.size < INLINE_AUDIO_LIMIT_BYTES:
+                # Use inline data for smaller payloads
+                request.inline_bytes += payload.size
+                return self._types.Part.from_bytes(
+                    data=payload.read(), mime_type=payload.mime_type
+                )
+
+        def upload() -> Any:
+            with request.stage("upload"):
+                uploaded = self.backend.upload(**self._upload_args(payload))
+            request.upload_bytes += payload.size
+            return uploaded
+
+        # Use Files API for larger payloads, reusing an earlier upload of
+        # the same audio while it is still valid
+        return self.uploads.get_or_upload(
+            self._upload_account, self._upload_key(audio), upload
+        )
+
+    def _build_request(self, audio_input: Any, prompt: _Prompt) -> Dict[str, Any]:
+        """Build generate_content keyword arguments for prepared audio.
+
+        With ``audio_input`` None, builds a text-only request.
+        """
+        types = self._types
+        if isinstance(audio_input, UploadedAudio):
+            audio_parts = [
+                types.Part(
+                    file_data=types.FileData(
+                        file_uri=audio_input.uri, mime_type=audio_input.mime_type
+                    )
+                )
+            ]
+        elif audio_input is None:
+            audio_parts = []
         else:
-            # Use Files API for larger files
-            uploaded_file = self.client.files.upload(file=str(audio_path))
-            return uploaded_file
+            audio_parts = [audio_input]
+
+        return dict(
+            model=self.model,
+            contents=[
+                types.Content(
+                    parts=[
+                        *audio_parts,
+                        types.Part(text=prompt.text),
+                    ]
+                )
+            ],
+            config=types.GenerateContentConfig(
+                response_mime_type="application/json",
+                response_schema=prompt.schema,
+            ),
+        )
+
+    def _generate_content(
+        self,
+        audio_input: Any,
+        prompt: _Prompt,
+        tokens: float = 0,
+        *,
+        request: RequestMetrics,
+        abandoned: Optional[threading.Event] = None,
+        sending: Optional[threading.Event] = None,
+    ) -> Any:
+        """Send one transcription request for prepared audio.
+
+        Every call waits for a slot from the shared rate limiter, which also
+        learns from throttling responses and actual token usage. Time spent
+        waiting and generating, and the tokens used, are added to ``request``.
+        If ``abandoned`` is set while waiting for a slot, nothing is sent or
+        counted against the limits, and None is returned. ``sending`` is set
+        once the request has its slot and is sent.
+        """
+        queued = time.perf_counter()
+        try:
+            with self.rate_limiter.slot(tokens, cancelled=abandoned) as permit:
+                sent = time.perf_counter()
+                request.add_stage("queue", sent - queued)
+                if sending is not None:
+                    sending.set()
+                response = self.backend.generate_content(
+                    **self._build_request(audio_input, prompt)
+                )
+                request.add_stage("generate", time.perf_counter() - sent)
+                permit.record_usage(response)
+        except concurrent.futures.CancelledError:
+            return None
+        except Exception as exc:
+            self.metrics_collector.observe_failure(request.kind, exc)
+            raise
+        request.record_usage(response)
+        return response
+
+    def _generate_hedged(
+        self, audio_input: Any, prompt: _Prompt, tokens: float = 0, *, request: RequestMetrics
+    ) -> Any:
+        """Send one transcription request, and a duplicate if it runs slow.
+
+        Once the request has been sent for longer than the hedger's delay,
+        and its budget allows, the same request is sent again and the first
+        successful response is used. Both are sent from the pipeline's
+        attempt threads. The other cannot be interrupted: it is dropped if
+        still waiting for a rate limiter slot, otherwise left to finish and
+        reported as a "hedge" request. The primary's error is raised if both
+        fail. The hedger learns how long the API took to answer, from when
+        the request was sent; time waiting for a slot would be spent by a
+        duplicate too. Without a hedger this is :meth:`_generate_content`.
+        """
+        hedger = self.hedging
+        delay = hedger.delay() if hedger is not None else None
+        if hedger is None or delay is None:
+            generated = request.stages.get("generate", 0.0)
+            response = self._generate_content(audio_input, prompt, tokens, request=request)
+            if hedger is not None:
+                hedger.observe(request.stages["generate"] - generated)
+            return response
+
+        abandoned = threading.Event()
+        attempts: Dict[concurrent.futures.Future, RequestMetrics] = {}
+        executor = self._attempt_executor()
+
+        def submit(
+            kind: str, sending: Optional[threading.Event] = None
+        ) -> concurrent.futures.Future:
+            attempt = RequestMetrics(kind)
+            future = executor.submit(
+                self._generate_content,
+                audio_input,
+                prompt,
+                tokens,
+                request=attempt,
+                abandoned=abandoned,
+                sending=sending,
+            )
+            attempts[future] = attempt
+            return future
+
+        def report_loser(future: concurrent.futures.Future) -> None:
+            if future.exception() is None and future.result() is not None:
+                self.metrics_collector.observe_request(replace(attempts[future], kind="hedge"))
 
-    def _parse_response(self, response_text: str) -> GeminiTranscriptionResult:
+        winner = hedge = None
+        sending = threading.Event()
+        submitted = time.perf_counter()
+        try:
+            primary = submit(request.kind, sending)
+            primary.add_done_callback(lambda _: sending.set())
+            # The delay runs from when the primary is sent
+            sending.wait()
+            sent = time.perf_counter()
+            if not concurrent.futures.wait([primary], timeout=delay).done:
+                if hedger.allow():
+                    hedged = time.perf_counter()
+                    hedge = submit("hedge")
+                else:
+                    self.metrics_collector.observe_hedge_skipped()
+            pending = set(attempts)
+            while pending and winner is None:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                winner = next(
+                    (f for f in (primary, hedge) if f in done and f.exception() is None), None
+                )
+            answered = time.perf_counter()
+        finally:
+            abandoned.set()
+
+        if winner is None:
+            if hedge is not None:
+                self.metrics_collector.observe_hedge("failed")
+            error = primary.exception()
+            assert error is not None
+            raise error
+        hedger.observe(answered - sent)
+        if hedge is not None:
+            self.metrics_collector.observe_hedge("won" if winner is hedge else "lost")
+            (hedge if winner is primary else primary).add_done_callback(report_loser)
+        if winner is hedge:
+            # The primary's queueing and its delay, before the duplicate was sent
+            request.add_stage("hedge", hedged - submitted)
+        request.add_attempt(attempts[winner])
+        return winner.result()
+
+    def _generate_content_stream(
+        self, audio_input: Any, prompt: _Prompt, tokens: float = 0, *, request: RequestMetrics
+    ) -> Iterator[Any]:
+        """Send one transcription request, yielding response pieces as they arrive.
+
+        The rate limiter slot is held until the stream is exhausted.
+        """
+        queued = time.perf_counter()
+        try:
+            with self.rate_limiter.slot(tokens) as permit:
+                sent = time.perf_counter()
+                request.add_stage("queue", sent - queued)
+                last = None
+                for last in self.backend.generate_content_stream(
+                    **self._build_request(audio_input, prompt)
+                ):
+                    if request.first_response_seconds is None:
+                        request.first_response_seconds = time.perf_counter() - sent
+                    yield last
+                request.add_stage("generate", time.perf_counter() - sent)
+                # Usage metadata and the finish reason arrive with the final piece
+                permit.record_usage(last)
+        except Exception as exc:
+            self.metrics_collector.observe_failure(request.kind, exc)
+            raise
+        request.record_usage(last)
+
+    def _parse_response(
+        self, response_text: str, features: FrozenSet[str] = TRANSCRIPTION_FEATURES
+    ) -> GeminiTranscriptionResult:
         """Parse Gemini API response into structured result.
 
         Args:
             response_text: JSON response from Gemini API
+            features: Features the request asked for
 
         Returns:
             Parsed transcription result
@@ -375,73 +1732,21 @@ class GeminiASRPipeline:
         except json.JSONDecodeError:
             # Try to extract JSON from response if it's wrapped in markdown
             json_match = re.search(r"```json\s*(.*?)\s*```", response_text, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group(1))
-            else:
+            try:
+                data = json.loads(json_match.group(1)) if json_match else None
+            except json.JSONDecodeError:
+                data = None
+            if data is None:
+                # Truncated or malformed: keep every segment that is complete
+                data = recover_truncated_json(response_text)
+            if data is None:
                 # Fallback: create empty result
                 return GeminiTranscriptionResult(
                     summary="Failed to parse transcription",
                     segments=[],
                 )
 
-        segments = []
-        all_languages = []
-        seen_lang_codes = set()
-        
-        for seg in data.get("segments", []):
-            start_time = parse_timestamp(seg.get("timestamp_start", "0:00"))
-            end_time = parse_timestamp(seg.get("timestamp_end", "0:00"))
-
-            # Ensure end time is after start time
-            if end_time <= start_time:
-                end_time = start_time + 1.0
-
-            # Handle new languages array format or legacy single language format
-            languages = seg.get("languages", [])
-            if languages:
-                # New format: array of language objects
-                primary_lang = languages[0] if languages else {}
-                language_name = primary_lang.get("name")
-                language_code = primary_lang.get("code")
-                # Store languages for this segment (for code-switching)
-                segment_languages = [
-                    {"name": lang.get("name", ""), "code": lang.get("code", "")}
-                    for lang in languages
-                ]
-                # Collect all languages for global detection
-                for lang in languages:
-                    code = lang.get("code", "")
-                    if code and code not in seen_lang_codes:
-                        seen_lang_codes.add(code)
-                        all_languages.append({
-                            "code": code,
-                            "language": lang.get("name", code),
-                        })
-            else:
-                # Legacy format: single language/language_code fields
-                language_name = seg.get("language")
-                language_code = seg.get("language_code")
-                segment_languages = None
-                if language_code and language_code not in seen_lang_codes:
-                    seen_lang_codes.add(language_code)
-                    all_languages.append({
-                        "code": language_code,
-                        "language": language_name or language_code,
-                    })
-
-            segment = GeminiTranscriptSegment(
-                start=start_time,
-                end=end_time,
-                speaker=seg.get("speaker", "Speaker 1"),
-                text=seg.get("content", ""),
-                language=language_name,
-                language_code=language_code,
-                languages=segment_languages,  # Store all languages for code-switching
-                emotion=seg.get("emotion", "neutral"),
-                translation=seg.get("translation"),
-                words=None,
-            )
-            segments.append(segment)
+        segments = [_segment_from_dict(seg, features) for seg in data.get("segments", [])]
 
         # Just use the summary text, frontend handles metadata badges
         summary = data.get("summary", "")
@@ -449,18 +1754,21 @@ class GeminiASRPipeline:
         return GeminiTranscriptionResult(
             summary=summary if summary else None,
             segments=segments,
-            detected_languages=all_languages if all_languages else None,
+            detected_languages=_collect_languages(segments),
         )
 
     def _build_prompt(
         self,
         language: Optional[str] = None,
         speaker_count: Optional[str] = None,
-    ) -> str:
-        """Build the transcription prompt with optional hints."""
-        prompt = TRANSCRIPTION_PROMPT
-
-        hints = []
+        features: Optional[Iterable[str]] = None,
+        extra_hints: Sequence[str] = (),
+    ) -> _Prompt:
+        """Build the transcription prompt and schema with optional hints."""
+        selected = resolve_features(features)
+        prompt = build_transcription_prompt(selected)
+
+        hints = list(extra_hints)
         if language:
             hints.append(f"The audio is primarily in {language}.")
         if speaker_count:
@@ -469,218 +1777,664 @@ class GeminiASRPipeline:
         if hints:
             prompt = prompt.strip() + "\n\nAdditional hints:\n" + "\n".join(f"- {h}" for h in hints)
 
-        return prompt
+        return _Prompt(prompt, build_transcription_schema(selected), selected)
 
-    def transcribe(
+    def _open_span(
         self,
-        audio_path: str | Path,
-        *,
-        progress_callback: Optional[Callable[[str, int], None]] = None,
-        language: Optional[str] = None,
-        speaker_count: Optional[str] = None,
+        audio: Path | MemoryChunk,
+        start: float,
+        duration: float,
+        resources: contextlib.ExitStack,
+    ) -> Path | MemoryChunk:
+        """Cut a span from audio, registering any cleanup on ``resources``."""
+        if isinstance(audio, MemoryChunk):
+            return audio.subchunk(start, duration)
+        source = None
+        if self.in_memory_chunks:
+            source = ChunkSource.open(audio, duration=get_audio_duration(audio) or None)
+        if source is not None:
+            resources.enter_context(source)
+            return source.chunk(start, duration)
+        temp_dir = Path(tempfile.mkdtemp(prefix="gemini_span_"))
+        resources.callback(shutil.rmtree, temp_dir, True)
+        return split_audio_spans(audio, [(start, duration)], output_dir=temp_dir).chunks[0].path
+
+    def _complete_truncated(
+        self,
+        audio: Path | MemoryChunk,
+        prompt: _Prompt,
+        result: GeminiTranscriptionResult,
+        depth: int,
     ) -> GeminiTranscriptionResult:
-        """Transcribe audio file using Gemini API.
+        """Transcribe the audio a truncated response did not cover and merge it in."""
+        duration = _audio_seconds(audio)
+        if duration <= 0:
+            # Unknown length; nothing to resume against
+            return result
+        plan = _continuation_plan(result, duration, depth)
+        if not plan:
+            return replace(result, truncated=False)
+
+        parts = []
+        with contextlib.ExitStack() as resources:
+            for planned in plan:
+                span = self._open_span(
+                    audio, planned.start, planned.end - planned.start, resources
+                )
+                part = self._request_transcription(span, prompt, depth=depth + 1)
+                parts.append((planned, _offset_result(part, planned.start)))
+        return _join_continuations(result, parts)
 
-        Args:
-            audio_path: Path to the audio file
-            progress_callback: Optional callback(step_name, step_index) to report progress.
-                Steps: "uploading" (0), "transcribing" (1), "processing" (2), "done" (3)
-            language: Optional language hint (e.g., 'en', 'es', 'fr')
-            speaker_count: Optional speaker count hint (e.g., '1', '2', '3')
+    def _request_transcription(
+        self,
+        audio: Path | MemoryChunk,
+        prompt: _Prompt,
+        report: Optional[Callable[[str, int], None]] = None,
+        *,
+        depth: int = 0,
+        hedge: bool = False,
+    ) -> GeminiTranscriptionResult:
+        """Send audio with a prompt and parse the response, bypassing the cache.
 
-        Returns:
-            Transcription result with segments, summary, and metadata
+        A response cut off by the output token limit keeps its complete
+        segments and is completed by follow-up requests for the rest.
+        ``hedge`` sends the first request through :meth:`_generate_hedged`.
         """
-        genai, types = _ensure_genai()
+        result = self._request_once(audio, prompt, report, continuation=depth > 0, hedge=hedge)
+        if result.truncated and depth < MAX_TRUNCATION_DEPTH:
+            result = self._complete_truncated(audio, prompt, result, depth)
+        return result
+
+    def _request_once(
+        self,
+        audio: Path | MemoryChunk,
+        prompt: _Prompt,
+        report: Optional[Callable[[str, int], None]] = None,
+        *,
+        continuation: bool = False,
+        hedge: bool = False,
+    ) -> GeminiTranscriptionResult:
+        """Send one request and parse the response, flagging truncation.
 
+        ``continuation`` marks requests for audio a truncated response missed,
+        so their audio is not counted twice in the metrics.
+        """
         def _report(step: str, idx: int) -> None:
-            if progress_callback:
-                progress_callback(step, idx)
+            if report:
+                report(step, idx)
 
-        audio_path = Path(audio_path)
+        request = RequestMetrics(
+            "continuation" if continuation else "transcribe",
+            audio_seconds=_audio_seconds(audio),
+        )
 
         # Step 0: Prepare audio
         _report("uploading", 0)
-        audio_input = self._prepare_audio_input(audio_path)
-
-        # Build prompt with optional hints
-        prompt = self._build_prompt(language=language, speaker_count=speaker_count)
+        audio_input = self._prepare_audio_input(audio, request)
 
         # Step 1: Call Gemini API
         _report("transcribing", 1)
 
-        response = self.client.models.generate_content(
-            model=self.model,
-            contents=[
-                types.Content(
-                    parts=[
-                        types.Part(
-                            file_data=types.FileData(file_uri=audio_input.uri)
-                        )
-                        if hasattr(audio_input, "uri")
-                        else audio_input,
-                        types.Part(text=prompt),
-                    ]
-                )
-            ],
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                response_schema=TRANSCRIPTION_SCHEMA,
-            ),
-        )
+        tokens = estimate_request_tokens(audio, prompt.features)
+        generate = self._generate_hedged if hedge else self._generate_content
+        try:
+            response = generate(audio_input, prompt, tokens, request=request)
+        except Exception as exc:
+            if not (isinstance(audio_input, UploadedAudio) and _is_missing_file_error(exc)):
+                raise
+            # The registered upload was deleted or expired early; upload again
+            self.uploads.invalidate(self._upload_account, self._upload_key(audio))
+            audio_input = self._prepare_audio_input(audio, request)
+            response = generate(audio_input, prompt, tokens, request=request)
 
         # Step 2: Parse response
         _report("processing", 2)
-        result = self._parse_response(response.text)
+        with request.stage("parse"):
+            result = self._parse_response(response.text, prompt.features)
+        self.metrics_collector.observe_request(request)
+        return replace(
+            result,
+            truncated=_is_truncated(response),
+            output_tokens=_output_tokens(response),
+            metrics=TranscriptionMetrics([request]),
+        )
 
-        # Step 3: Done
-        _report("done", 3)
+    def _iter_request(
+        self,
+        audio: Path | MemoryChunk,
+        prompt: _Prompt,
+        report: Optional[Callable[[str, int], None]] = None,
+    ) -> Iterator[TranscriptionUpdate]:
+        """Streaming version of :meth:`_request_transcription`.
+
+        Yields an update per segment as soon as the response contains it,
+        then a last update with the parsed result.
+        """
+        def _report(step: str, idx: int) -> None:
+            if report:
+                report(step, idx)
 
-        return result
+        request = RequestMetrics("transcribe", audio_seconds=_audio_seconds(audio))
 
-    def _transcribe_chunk(
+        # Step 0: Prepare audio
+        _report("uploading", 0)
+        audio_input = self._prepare_audio_input(audio, request)
+
+        # Step 1: Stream the response, emitting segments as they close
+        _report("transcribing", 1)
+
+        tokens = estimate_request_tokens(audio, prompt.features)
+        for attempt in range(2):
+            parser = SegmentStreamParser()
+            last = None
+            try:
+                for last in self._generate_content_stream(
+                    audio_input, prompt, tokens, request=request
+                ):
+                    for seg in parser.feed(last.text or ""):
+                        _report("segment", parser.count)
+                        yield TranscriptionUpdate(
+                            [_segment_from_dict(seg, prompt.features)], 0, 1
+                        )
+                break
+            except Exception as exc:
+                if attempt or parser.count or not (
+                    isinstance(audio_input, UploadedAudio) and _is_missing_file_error(exc)
+                ):
+                    raise
+                # The registered upload was deleted or expired early; upload again
+                self.uploads.invalidate(self._upload_account, self._upload_key(audio))
+                audio_input = self._prepare_audio_input(audio, request)
+
+        with request.stage("parse"):
+            result = self._parse_response(parser.text, prompt.features)
+        self.metrics_collector.observe_request(request)
+        result = replace(
+            result,
+            output_tokens=_output_tokens(last),
+            metrics=TranscriptionMetrics([request]),
+        )
+        if _is_truncated(last):
+            # Hit the output limit; transcribe the rest without streaming
+            result = self._complete_truncated(audio, prompt, replace(result, truncated=True), 0)
+            if len(result.segments) > parser.count:
+                _report("segment", len(result.segments))
+                yield TranscriptionUpdate(result.segments[parser.count:], 0, 1)
+
+        # Step 2: Parse the complete response
+        _report("processing", 2)
+        yield TranscriptionUpdate([], 1, 1, result)
+
+    def iter_transcribe(
         self,
-        chunk_path: Path,
-        start_offset: float,
+        audio_path: str | Path,
+        *,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
         language: Optional[str] = None,
         speaker_count: Optional[str] = None,
-    ) -> GeminiTranscriptionResult:
-        """Transcribe a single chunk and adjust timestamps."""
-        result = self.transcribe(
-            chunk_path,
-            language=language,
-            speaker_count=speaker_count,
-        )
-        
-        # Adjust timestamps by adding the start offset
-        adjusted_segments = []
-        for seg in result.segments:
-            adjusted_seg = GeminiTranscriptSegment(
-                start=seg.start + start_offset,
-                end=seg.end + start_offset,
-                speaker=seg.speaker,
-                text=seg.text,
-                language=seg.language,
-                language_code=seg.language_code,
-                emotion=seg.emotion,
-                translation=seg.translation,
-                words=seg.words,
-            )
-            adjusted_segments.append(adjusted_seg)
-        
-        return GeminiTranscriptionResult(
-            summary=result.summary,
-            segments=adjusted_segments,
-            detected_languages=result.detected_languages,
+        features: Optional[Iterable[str]] = None,
+    ) -> Iterator[TranscriptionUpdate]:
+        """Transcribe audio in one streamed request, yielding segments as they arrive.
+
+        The response is parsed incrementally, so each segment is available
+        as soon as the model has finished writing it rather than when the
+        whole response is complete. Besides the steps of :meth:`transcribe`,
+        ``progress_callback`` receives ("segment", n) after the n-th segment.
+
+        Args:
+            audio_path: Path to the audio file
+            progress_callback: Optional callback(step_name, step_index) to report progress
+            language: Optional language hint (e.g., 'en', 'es', 'fr')
+            speaker_count: Optional speaker count hint (e.g., '1', '2', '3')
+            features: Optional subset of TRANSCRIPTION_FEATURES to request (default: all)
+
+        Yields:
+            An update per segment, then one carrying the complete result
+        """
+        with self._speech_audio(Path(audio_path)) as (audio_path, speech):
+            for update in self._iter_transcribe(
+                audio_path,
+                progress_callback=progress_callback,
+                language=language,
+                speaker_count=speaker_count,
+                features=features,
+            ):
+                yield _remap_update(update, speech)
+
+    def _iter_transcribe(
+        self,
+        audio_path: Path,
+        *,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+    ) -> Iterator[TranscriptionUpdate]:
+        """:meth:`iter_transcribe` of audio that is sent as it is."""
+        def _report(step: str, idx: int) -> None:
+            if progress_callback:
+                progress_callback(step, idx)
+
+        prompt = self._build_prompt(
+            language=language, speaker_count=speaker_count, features=features
         )
 
-    def transcribe_chunked(
+        cache_key = self._cache_key(audio_path, prompt) if self.cache else None
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            _report("done", 3)
+            yield TranscriptionUpdate(list(cached.segments), 1, 1, cached)
+            return
+
+        for update in self._iter_request(audio_path, prompt, _report):
+            if update.result is not None:
+                if update.result.segments:
+                    self._cache_put(cache_key, update.result)
+                _report("done", 3)
+            yield update
+
+    def transcribe(
         self,
         audio_path: str | Path,
         *,
         progress_callback: Optional[Callable[[str, int], None]] = None,
         language: Optional[str] = None,
         speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
     ) -> GeminiTranscriptionResult:
-        """Transcribe long audio by splitting into chunks and processing in parallel.
-        
+        """Transcribe audio file using Gemini API.
+
         Args:
             audio_path: Path to the audio file
-            progress_callback: Optional progress callback
-            language: Optional language hint
-            speaker_count: Optional speaker count hint
-            
+            progress_callback: Optional callback(step_name, step_index) to report progress.
+                Steps: "uploading" (0), "transcribing" (1), "processing" (2), "done" (3)
+            language: Optional language hint (e.g., 'en', 'es', 'fr')
+            speaker_count: Optional speaker count hint (e.g., '1', '2', '3')
+            features: Optional subset of TRANSCRIPTION_FEATURES to request (default: all)
+
         Returns:
-            Merged transcription result
+            Transcription result with segments, summary, and metadata
         """
-        audio_path = Path(audio_path)
-        
+        with self._speech_audio(Path(audio_path)) as (audio_path, speech):
+            result = self._transcribe(
+                audio_path,
+                progress_callback=progress_callback,
+                language=language,
+                speaker_count=speaker_count,
+                features=features,
+            )
+        return _remap_result(result, speech)
+
+    def _transcribe(
+        self,
+        audio_path: Path,
+        *,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+    ) -> GeminiTranscriptionResult:
+        """:meth:`transcribe` of audio that is sent as it is."""
+        def _report(step: str, idx: int) -> None:
+            if progress_callback:
+                progress_callback(step, idx)
+
+        # Build prompt with optional hints
+        prompt = self._build_prompt(
+            language=language, speaker_count=speaker_count, features=features
+        )
+
+        cache_key = self._cache_key(audio_path, prompt) if self.cache else None
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            _report("done", 3)
+            return cached
+
+        result = self._request_transcription(audio_path, prompt, _report)
+        if result.segments:
+            self._cache_put(cache_key, result)
+
+        # Step 3: Done
+        _report("done", 3)
+
+        return result
+
+    def _transcribe_chunk(
+        self,
+        chunk: Path | MemoryChunk,
+        planned: PlannedChunk,
+        prompt: _Prompt,
+        *,
+        max_attempts: int = MAX_CHUNK_ATTEMPTS,
+        checkpoint: Optional[ChunkCheckpoint] = None,
+    ) -> GeminiTranscriptionResult | ChunkFailure:
+        """Transcribe a single chunk, retrying transient failures.
+
+        Retryable errors are retried with jittered exponential backoff; other
+        errors fail the chunk immediately. A successful result is shifted to
+        absolute timestamps and saved to the checkpoint.
+
+        Returns:
+            Chunk result, or a description of why the chunk failed
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = self._request_transcription(chunk, prompt, hedge=True)
+                break
+            except Exception as e:
+                if attempt >= max_attempts or not is_retryable_error(e):
+                    return _chunk_failure(planned, e, attempt)
+                self.metrics_collector.observe_retry("transcribe")
+                time.sleep(backoff_delay(attempt - 1))
+
+        # Adjust timestamps by adding the start offset
+        result = _offset_result(_with_retries(result, attempt - 1), planned.start)
+        if checkpoint is not None and not result.truncated:
+            checkpoint.save(planned, result_to_dict(result))
+        return result
+
+    def _restore_chunks(
+        self,
+        checkpoint: Optional[ChunkCheckpoint],
+        plan: List[PlannedChunk],
+    ) -> List[tuple[PlannedChunk, GeminiTranscriptionResult]]:
+        """Load the planned chunks an earlier run already completed."""
+        if checkpoint is None:
+            return []
+        restored = []
+        for planned in plan:
+            saved = checkpoint.load(planned)
+            if saved is not None:
+                restored.append((planned, result_from_dict(saved)))
+        return restored
+
+    def _prepare_chunks(
+        self,
+        audio_path: Path,
+        output_dir: Path,
+        checkpoint: Optional[ChunkCheckpoint],
+        resources: contextlib.ExitStack,
+        *,
+        chunk_duration: float,
+        overlap: float,
+        snap_to_silence: bool,
+    ) -> Optional[tuple[
+        List[tuple[PlannedChunk, GeminiTranscriptionResult]],
+        List[tuple[Path | MemoryChunk, PlannedChunk]],
+    ]]:
+        """Plan chunks, restore checkpointed ones and extract the rest.
+
+        With ``in_memory_chunks``, pending chunks are cut from a
+        :class:`ChunkSource` registered on ``resources``; otherwise (or if
+        the audio can't be held in memory) only chunks without a
+        checkpointed result are written to output_dir.
+
+        Returns:
+            (restored (plan, result) pairs, pending (chunk, plan) pairs),
+            or None if the audio fits in a single request
+        """
+        plan = plan_audio_chunks(
+            audio_path,
+            chunk_duration,
+            overlap=overlap,
+            snap_to_silence=snap_to_silence,
+        )
+        if len(plan) == 1:
+            return None
+
+        if plan:
+            restored = self._restore_chunks(checkpoint, plan)
+            done = {planned for planned, _ in restored}
+            pending = [planned for planned in plan if planned not in done]
+            if not pending:
+                return restored, []
+            source = None
+            if self.in_memory_chunks:
+                source = ChunkSource.open(audio_path, duration=plan[-1].end)
+            if source is not None:
+                resources.enter_context(source)
+                return restored, [
+                    (source.chunk(c.start, c.end - c.start), c) for c in pending
+                ]
+            split = split_audio_spans(
+                audio_path,
+                [(c.start, c.end - c.start) for c in pending],
+                output_dir=output_dir,
+            )
+            return restored, [
+                (chunk.path, planned) for chunk, planned in zip(split.chunks, pending)
+            ]
+
+        # Duration unknown locally; fall back to fixed single-pass cuts
+        split = split_audio(audio_path, chunk_duration, output_dir=output_dir)
+        if len(split.chunks) <= 1:
+            return None
+        chunks = [
+            (
+                chunk.path,
+                PlannedChunk(
+                    chunk.start, chunk.start + chunk.duration,
+                    chunk.start, chunk.start + chunk.duration,
+                ),
+            )
+            for chunk in split.chunks
+        ]
+        restored = self._restore_chunks(checkpoint, [planned for _, planned in chunks])
+        done = {planned for planned, _ in restored}
+        return restored, [(path, planned) for path, planned in chunks if planned not in done]
+
+    def iter_transcribe_chunked(
+        self,
+        audio_path: str | Path,
+        *,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+        chunk_duration: float = CHUNK_DURATION_SECONDS,
+        overlap: float = CHUNK_OVERLAP_SECONDS,
+        snap_to_silence: bool = True,
+        max_attempts: int = MAX_CHUNK_ATTEMPTS,
+    ) -> Generator[TranscriptionUpdate, None, None]:
+        """Transcribe long audio in chunks, yielding segments as they become final.
+
+        An update is yielded whenever a chunk finishes. Chunks that finish
+        out of order are held back until every earlier chunk is done, so
+        segments always arrive in time order. The last update carries the
+        merged result with the summary, languages and failed chunks.
+
+        Takes the same arguments as :meth:`transcribe_chunked`.
+
+        Yields:
+            Transcription updates
+        """
+        with self._speech_audio(Path(audio_path)) as (audio_path, speech):
+            for update in self._iter_transcribe_chunked(
+                audio_path,
+                progress_callback=progress_callback,
+                language=language,
+                speaker_count=speaker_count,
+                features=features,
+                chunk_duration=chunk_duration,
+                overlap=overlap,
+                snap_to_silence=snap_to_silence,
+                max_attempts=max_attempts,
+            ):
+                yield _remap_update(update, speech)
+
+    def _iter_transcribe_chunked(
+        self,
+        audio_path: Path,
+        *,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+        chunk_duration: float = CHUNK_DURATION_SECONDS,
+        overlap: float = CHUNK_OVERLAP_SECONDS,
+        snap_to_silence: bool = True,
+        max_attempts: int = MAX_CHUNK_ATTEMPTS,
+    ) -> Generator[TranscriptionUpdate, None, None]:
+        """:meth:`iter_transcribe_chunked` of audio that is sent as it is."""
         def _report(step: str, idx: int) -> None:
             if progress_callback:
                 progress_callback(step, idx)
+
+        prompt = self._build_prompt(
+            language=language, speaker_count=speaker_count, features=features
+        )
+        variant = f"chunked:{chunk_duration}:{overlap}:{snap_to_silence}"
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self._cache_key(audio_path, prompt, variant=variant)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                _report("done", 3)
+                yield TranscriptionUpdate(list(cached.segments), 1, 1, cached)
+                return
+        checkpoint = self._open_checkpoint(audio_path, prompt, variant)
         
         # Step 0: Split audio into chunks
         _report("uploading", 0)
         temp_dir = Path(tempfile.mkdtemp(prefix="gemini_chunks_"))
+        resources = contextlib.ExitStack()
+        executor = None
         
         try:
-            chunks = split_audio_into_chunks(audio_path, output_dir=temp_dir)
+            prepared = self._prepare_chunks(
+                audio_path,
+                temp_dir,
+                checkpoint,
+                resources,
+                chunk_duration=chunk_duration,
+                overlap=overlap,
+                snap_to_silence=snap_to_silence,
+            )
             
-            if len(chunks) <= 1:
+            if prepared is None:
                 # No chunking needed, use regular transcription
-                return self.transcribe(
+                result = self._transcribe(
                     audio_path,
                     progress_callback=progress_callback,
                     language=language,
                     speaker_count=speaker_count,
+                    features=features,
                 )
+                yield TranscriptionUpdate(list(result.segments), 1, 1, result)
+                return
+            restored, pending = prepared
+            merger = _ChunkMerger(
+                [planned for planned, _ in restored] + [planned for _, planned in pending]
+            )
             
-            # Step 1: Transcribe chunks in parallel
+            # Step 1: Transcribe the remaining chunks in parallel
             _report("transcribing", 1)
             
-            all_results: List[GeminiTranscriptionResult] = []
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_PARALLEL_CHUNKS)
+            futures = {
+                executor.submit(
+                    self._transcribe_chunk,
+                    chunk,
+                    planned,
+                    prompt,
+                    max_attempts=max_attempts,
+                    checkpoint=checkpoint,
+                ): planned
+                for chunk, planned in pending
+            }
+
+            if restored:
+                final: List[GeminiTranscriptSegment] = []
+                for planned, result in restored:
+                    final.extend(merger.add(planned, result))
+                yield TranscriptionUpdate(final, merger.finished, merger.total)
             
-            with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_PARALLEL_CHUNKS) as executor:
-                futures = {
-                    executor.submit(
-                        self._transcribe_chunk,
-                        chunk_path,
-                        start_offset,
-                        language,
-                        speaker_count,
-                    ): (chunk_path, start_offset)
-                    for chunk_path, start_offset in chunks
-                }
-                
-                for future in concurrent.futures.as_completed(futures):
-                    try:
-                        result = future.result()
-                        all_results.append(result)
-                    except Exception as e:
-                        # Log but continue with other chunks
-                        print(f"Chunk transcription failed: {e}")
+            failures: List[ChunkFailure] = []
+            for future in concurrent.futures.as_completed(futures):
+                outcome = future.result()
+                if isinstance(outcome, ChunkFailure):
+                    failures.append(outcome)
+                    final = merger.add(futures[future], None)
+                else:
+                    final = merger.add(futures[future], outcome)
+                yield TranscriptionUpdate(final, merger.finished, merger.total)
             
             # Step 2: Merge results
             _report("processing", 2)
-            
-            # Sort by first segment's start time
-            all_results.sort(
-                key=lambda r: r.segments[0].start if r.segments else float('inf')
-            )
-            
-            # Merge segments
-            merged_segments: List[GeminiTranscriptSegment] = []
-            for result in all_results:
-                merged_segments.extend(result.segments)
-            
-            # Collect all unique languages
-            all_languages: List[dict] = []
-            seen_lang_codes = set()
-            for result in all_results:
-                if result.detected_languages:
-                    for lang in result.detected_languages:
-                        code = lang.get("code", "")
-                        if code and code not in seen_lang_codes:
-                            seen_lang_codes.add(code)
-                            all_languages.append(lang)
-            
-            # Combine summaries
-            summaries = [r.summary for r in all_results if r.summary]
-            combined_summary = " ".join(summaries) if summaries else None
-            
+            result = merger.result(failures)
+
+            # Only cache complete results; failed chunks should be retried
+            if not failures and not result.truncated:
+                self._cache_put(cache_key, result)
+                if checkpoint is not None:
+                    checkpoint.clear()
+
             # Step 3: Done
             _report("done", 3)
-            
-            return GeminiTranscriptionResult(
-                summary=combined_summary,
-                segments=merged_segments,
-                detected_languages=all_languages if all_languages else None,
-            )
+            yield TranscriptionUpdate([], merger.finished, merger.total, result)
             
         finally:
-            # Cleanup temp files
+            # Stop queued chunks if the caller stopped iterating early
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            # Release in-memory chunk sources and cleanup temp files
+            resources.close()
             shutil.rmtree(temp_dir, ignore_errors=True)
 
+    def transcribe_chunked(
+        self,
+        audio_path: str | Path,
+        *,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+        chunk_duration: float = CHUNK_DURATION_SECONDS,
+        overlap: float = CHUNK_OVERLAP_SECONDS,
+        snap_to_silence: bool = True,
+        max_attempts: int = MAX_CHUNK_ATTEMPTS,
+    ) -> GeminiTranscriptionResult:
+        """Transcribe long audio by splitting into chunks and processing in parallel.
+
+        Chunk boundaries are moved to nearby pauses and adjacent chunks share
+        ``overlap`` seconds of audio; segments transcribed twice around a cut
+        are de-duplicated when the results are merged.
+
+        Each chunk is retried on its own. Chunks that still fail are listed
+        in the result's ``failed_chunks``. With a ``checkpoint_dir``, completed
+        chunks are persisted and a rerun only transcribes the missing ones.
+        Use :meth:`iter_transcribe_chunked` to receive segments as they finish.
+
+        Args:
+            audio_path: Path to the audio file
+            progress_callback: Optional progress callback
+            language: Optional language hint
+            speaker_count: Optional speaker count hint
+            features: Optional subset of TRANSCRIPTION_FEATURES to request (default: all)
+            chunk_duration: Target chunk length in seconds
+            overlap: Seconds of audio shared by adjacent chunks
+            snap_to_silence: Whether to move cuts to nearby low-energy regions
+            max_attempts: Attempts per chunk before it is reported as failed
+
+        Returns:
+            Merged transcription result
+        """
+        return _final_result(
+            self.iter_transcribe_chunked(
+                audio_path,
+                progress_callback=progress_callback,
+                language=language,
+                speaker_count=speaker_count,
+                features=features,
+                chunk_duration=chunk_duration,
+                overlap=overlap,
+                snap_to_silence=snap_to_silence,
+                max_attempts=max_attempts,
+            )
+        )
+
     def transcribe_with_retry(
         self,
         audio_path: str | Path,
@@ -689,53 +2443,406 @@ class GeminiASRPipeline:
         progress_callback: Optional[Callable[[str, int], None]] = None,
         language: Optional[str] = None,
         speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
     ) -> GeminiTranscriptionResult:
         """Transcribe with automatic retry on transient failures.
         
         For long audio files (> 6 minutes), automatically uses chunked
-        parallel processing for faster transcription.
+        parallel processing for faster transcription. Chunks are then
+        retried individually, and chunks that keep failing are reported in
+        the result's ``failed_chunks`` instead of failing the whole file.
 
         Args:
             audio_path: Path to the audio file
-            max_retries: Maximum number of retry attempts
+            max_retries: Maximum number of attempts (per chunk for long audio)
             progress_callback: Optional progress callback
             language: Optional language hint (e.g., 'en', 'es', 'fr')
             speaker_count: Optional speaker count hint (e.g., '1', '2', '3')
+            features: Optional subset of TRANSCRIPTION_FEATURES to request (default: all)
 
         Returns:
             Transcription result
         """
-        import time
-        
-        audio_path = Path(audio_path)
-        
-        # Check if we should use chunked processing
+        with self._speech_audio(Path(audio_path)) as (audio_path, speech):
+            result = self._transcribe_with_retry(
+                audio_path,
+                max_retries=max_retries,
+                progress_callback=progress_callback,
+                language=language,
+                speaker_count=speaker_count,
+                features=features,
+            )
+        return _remap_result(result, speech)
+
+    def _transcribe_with_retry(
+        self,
+        audio_path: Path,
+        *,
+        max_retries: int = 3,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+    ) -> GeminiTranscriptionResult:
+        """:meth:`transcribe_with_retry` of audio that is sent as it is."""
+        # Check if we should use chunked processing; if the duration is
+        # unknown, let the splitter decide instead of risking one huge request
         duration = get_audio_duration(audio_path)
-        use_chunking = duration > MIN_DURATION_FOR_CHUNKING
+        if duration <= 0 or duration > MIN_DURATION_FOR_CHUNKING:
+            result = _final_result(
+                self._iter_transcribe_chunked(
+                    audio_path,
+                    progress_callback=progress_callback,
+                    language=language,
+                    speaker_count=speaker_count,
+                    features=features,
+                    max_attempts=max_retries,
+                )
+            )
+            if result.failed_chunks and not result.segments:
+                raise RuntimeError(
+                    f"Failed to transcribe any chunk: {result.failed_chunks[0].error}"
+                )
+            return result
 
         last_error = None
         for attempt in range(max_retries):
             try:
-                if use_chunking:
-                    return self.transcribe_chunked(
-                        audio_path,
-                        progress_callback=progress_callback,
-                        language=language,
-                        speaker_count=speaker_count,
-                    )
-                else:
-                    return self.transcribe(
-                        audio_path,
-                        progress_callback=progress_callback,
-                        language=language,
-                        speaker_count=speaker_count,
-                    )
+                result = self._transcribe(
+                    audio_path,
+                    progress_callback=progress_callback,
+                    language=language,
+                    speaker_count=speaker_count,
+                    features=features,
+                )
+                return _with_retries(result, attempt)
             except Exception as e:
                 last_error = e
+                if not is_retryable_error(e):
+                    break
                 if attempt < max_retries - 1:
-                    wait_time = 2**attempt  # Exponential backoff
-                    time.sleep(wait_time)
+                    self.metrics_collector.observe_retry("transcribe")
+                    time.sleep(backoff_delay(attempt))
 
         raise RuntimeError(
-            f"Failed to transcribe after {max_retries} attempts: {last_error}"
+            f"Failed to transcribe after {attempt + 1} attempts: {last_error}"
+        )
+
+    def _enrich_batch(
+        self, batch: _EnrichBatch, *, max_attempts: int = MAX_CHUNK_ATTEMPTS
+    ) -> tuple[str, RequestMetrics] | ChunkFailure:
+        """Send one text-only enrichment request, retrying transient failures.
+
+        Returns:
+            (response text, request metrics), or a description of why it failed
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            request = RequestMetrics("enrich")
+            try:
+                response = self._generate_content(
+                    None, batch.prompt, batch.tokens, request=request
+                )
+                self.metrics_collector.observe_request(request)
+                return response.text or "", request
+            except Exception as e:
+                if attempt >= max_attempts or not is_retryable_error(e):
+                    return _enrichment_failure(batch, e, attempt)
+                self.metrics_collector.observe_retry("enrich")
+                time.sleep(backoff_delay(attempt - 1))
+
+    def iter_enrich(
+        self,
+        result: GeminiTranscriptionResult,
+        *,
+        features: Optional[Iterable[str]] = None,
+        language: Optional[str] = None,
+        batch_size: int = ENRICH_BATCH_SEGMENTS,
+        max_attempts: int = MAX_CHUNK_ATTEMPTS,
+    ) -> Iterator[EnrichmentUpdate]:
+        """Add features to a finished transcript from its text alone.
+
+        The transcript is sent in batches of ``batch_size`` segments, in
+        parallel and without the audio, which is much cheaper than
+        transcribing again. The summary, if requested, is one more request
+        over the whole transcript. Emotion is judged from the wording, so
+        it can differ from what the audio would show.
+
+        Args:
+            result: Transcript to enrich, e.g. from ``transcribe(features=[])``
+            features: Subset of TRANSCRIPTION_FEATURES to add (default: all)
+            language: Optional language hint (e.g., 'en', 'es', 'fr')
+            batch_size: Segments per request
+            max_attempts: Attempts per request before its segments are left as-is
+
+        Yields:
+            An update per finished request, as soon as it finishes; the last
+            update carries the enriched result and any failed batches
+        """
+        batches = _plan_enrichment(result, resolve_features(features), language, batch_size)
+        merger = _EnrichmentMerger(result, len(batches))
+        if not batches:
+            yield merger.last_update()
+            return
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_PARALLEL_CHUNKS)
+        try:
+            futures = {
+                executor.submit(self._enrich_batch, batch, max_attempts=max_attempts): batch
+                for batch in batches
+            }
+            for future in concurrent.futures.as_completed(futures):
+                yield merger.add(futures[future], future.result())
+            yield merger.last_update()
+        finally:
+            # Stop queued requests if the caller stopped iterating early
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def enrich(
+        self,
+        result: GeminiTranscriptionResult,
+        *,
+        features: Optional[Iterable[str]] = None,
+        language: Optional[str] = None,
+        enrichment_callback: Optional[Callable[[EnrichmentUpdate], None]] = None,
+        batch_size: int = ENRICH_BATCH_SEGMENTS,
+        max_attempts: int = MAX_CHUNK_ATTEMPTS,
+    ) -> GeminiTranscriptionResult:
+        """Add features to a finished transcript; see :meth:`iter_enrich`.
+
+        Args:
+            enrichment_callback: Optional callback receiving each update as
+                its request finishes
+
+        Returns:
+            Enriched result
+        """
+        for update in self.iter_enrich(
+            result,
+            features=features,
+            language=language,
+            batch_size=batch_size,
+            max_attempts=max_attempts,
+        ):
+            if enrichment_callback:
+                enrichment_callback(update)
+            if update.result is not None:
+                return update.result
+        raise RuntimeError("Enrichment ended without a result")
+
+    def transcribe_progressive(
+        self,
+        audio_path: str | Path,
+        *,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        language: Optional[str] = None,
+        speaker_count: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+        transcript_callback: Optional[Callable[[GeminiTranscriptionResult], None]] = None,
+        enrichment_callback: Optional[Callable[[EnrichmentUpdate], None]] = None,
+    ) -> GeminiTranscriptionResult:
+        """Transcribe in two phases: timed speaker text first, the rest after.
+
+        The audio is transcribed with a minimal schema, which responds
+        sooner, and ``transcript_callback`` receives that transcript right
+        away. The requested features are then added by a text-only
+        enrichment pass (:meth:`iter_enrich`) whose updates go to
+        ``enrichment_callback`` as they arrive.
+
+        Args:
+            audio_path: Path to the audio file
+            progress_callback: Optional progress callback for the transcription phase
+            language: Optional language hint (e.g., 'en', 'es', 'fr')
+            speaker_count: Optional speaker count hint (e.g., '1', '2', '3')
+            features: Subset of TRANSCRIPTION_FEATURES to add afterwards (default: all)
+            transcript_callback: Optional callback receiving the plain transcript
+            enrichment_callback: Optional callback receiving each enrichment update
+
+        Returns:
+            Enriched result
+        """
+        transcript = self.transcribe_with_retry(
+            audio_path,
+            progress_callback=progress_callback,
+            language=language,
+            speaker_count=speaker_count,
+            features=(),
+        )
+        if transcript_callback:
+            transcript_callback(transcript)
+        return self.enrich(
+            transcript,
+            features=features,
+            language=language,
+            enrichment_callback=enrichment_callback,
+        )
+
+    def _clip_prompt(
+        self,
+        language: Optional[str],
+        features: Optional[Iterable[str]],
+        pack: Optional[ClipPack] = None,
+    ) -> _Prompt:
+        """Prompt for packed clips, stating where the clips in ``pack`` start.
+
+        A summary would cover several clips, so none is asked for.
+        """
+        return self._build_prompt(
+            language=language,
+            features=resolve_features(features) - {"summary"},
+            extra_hints=[pack.prompt_hint()] if pack is not None else (),
+        )
+
+    def _transcribe_pack(
+        self,
+        pack: ClipPack,
+        language: Optional[str],
+        features: Optional[Iterable[str]],
+        *,
+        max_attempts: int = MAX_CHUNK_ATTEMPTS,
+    ) -> GeminiTranscriptionResult | ChunkFailure:
+        """Transcribe a pack of clips in one request, retrying transient failures."""
+        prompt = self._clip_prompt(language, features, pack)
+        planned = PlannedChunk(0.0, pack.audio.duration, 0.0, pack.audio.duration)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return self._request_transcription(pack.audio, prompt)
+            except Exception as e:
+                if attempt >= max_attempts or not is_retryable_error(e):
+                    return _chunk_failure(planned, e, attempt)
+                self.metrics_collector.observe_retry("transcribe")
+                time.sleep(backoff_delay(attempt - 1))
+
+    def _finish_pack(
+        self,
+        pack: ClipPack,
+        outcome: GeminiTranscriptionResult | ChunkFailure,
+        cache_keys: Dict[int, Optional[str]],
+    ) -> Iterator[tuple[int, GeminiTranscriptionResult]]:
+        """Split a pack's result into its clips and cache each complete one."""
+        for clip, result in zip(pack.clips, split_pack_result(outcome, pack)):
+            if not result.failed_chunks:
+                self._cache_put(cache_keys.get(clip.index), result)
+            yield clip.index, result
+
+    def iter_transcribe_clips(
+        self,
+        audio_paths: Sequence[str | Path],
+        *,
+        language: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+        target_duration: float = PACK_TARGET_SECONDS,
+        gap: float = PACK_GAP_SECONDS,
+        max_attempts: int = MAX_CHUNK_ATTEMPTS,
+    ) -> Iterator[tuple[int, GeminiTranscriptionResult]]:
+        """Transcribe many short clips, packing several into each request.
+
+        Clips are decoded to 16 kHz mono and joined, separated by silence,
+        into packs of up to ``target_duration`` seconds; each pack is one
+        request, so per-request overhead and quota are shared by all its
+        clips. The model is told where each clip starts, and the returned
+        segments are split back to their clips using the known offsets.
+        Segments are clamped to their clip, so none spans two clips.
+
+        Clip results have no summary, since a request covers several
+        clips. With a cache, each clip is cached on its own and clips seen
+        before are not sent again.
+
+        Args:
+            audio_paths: Paths to the clips
+            language: Optional language hint (e.g., 'en', 'es', 'fr')
+            features: Optional subset of TRANSCRIPTION_FEATURES to request
+                (default: all; "summary" is ignored)
+            target_duration: Maximum length of packed audio in seconds
+            gap: Minimum silence between clips in seconds
+            max_attempts: Attempts per pack before its clips are reported as failed
+
+        Yields:
+            (position in audio_paths, clip result) in completion order.
+            Failed clips have no segments and a ``failed_chunks`` entry.
+        """
+        paths = [Path(path) for path in audio_paths]
+        features = resolve_features(features)
+        prompt = self._clip_prompt(language, features)
+
+        cache_keys: Dict[int, Optional[str]] = {}
+        pending = []
+        for index, path in enumerate(paths):
+            key = self._cache_key(path, prompt, variant="clip") if self.cache else None
+            cached = self._cache_get(key)
+            if cached is not None:
+                yield index, cached
+                continue
+            cache_keys[index] = key
+            pending.append(index)
+
+        packer = ClipPacker(target_duration, gap)
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_PARALLEL_CHUNKS)
+        in_flight: Dict[concurrent.futures.Future, ClipPack] = {}
+
+        def submit(pack: Optional[ClipPack]) -> None:
+            if pack is not None:
+                future = executor.submit(
+                    self._transcribe_pack,
+                    pack,
+                    language,
+                    features,
+                    max_attempts=max_attempts,
+                )
+                in_flight[future] = pack
+
+        try:
+            for index in pending:
+                try:
+                    samples = decode_pcm(paths[index])
+                except (subprocess.CalledProcessError, OSError) as e:
+                    failure = ChunkFailure(0.0, 0.0, f"{type(e).__name__}: {e}", 1, False)
+                    yield index, GeminiTranscriptionResult(failed_chunks=[failure])
+                    continue
+                submit(packer.add(index, paths[index], samples))
+                # Decode ahead of the requests, but not without bound
+                if len(in_flight) >= 2 * MAX_PARALLEL_CHUNKS:
+                    done, _ = concurrent.futures.wait(
+                        in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        yield from self._finish_pack(
+                            in_flight.pop(future), future.result(), cache_keys
+                        )
+            submit(packer.flush())
+            for future in concurrent.futures.as_completed(list(in_flight)):
+                yield from self._finish_pack(in_flight.pop(future), future.result(), cache_keys)
+        finally:
+            # Stop queued packs if the caller stopped iterating early
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def transcribe_clips(
+        self,
+        audio_paths: Sequence[str | Path],
+        *,
+        language: Optional[str] = None,
+        features: Optional[Iterable[str]] = None,
+        target_duration: float = PACK_TARGET_SECONDS,
+        gap: float = PACK_GAP_SECONDS,
+        max_attempts: int = MAX_CHUNK_ATTEMPTS,
+    ) -> List[GeminiTranscriptionResult]:
+        """Transcribe many short clips in packed requests; see :meth:`iter_transcribe_clips`.
+
+        Returns:
+            One result per clip, in the order of ``audio_paths``
+        """
+        results = dict(
+            self.iter_transcribe_clips(
+                audio_paths,
+                language=language,
+                features=features,
+                target_duration=target_duration,
+                gap=gap,
+                max_attempts=max_attempts,
+            )
         )
+        # Every clip is yielded once: from the cache, as a failure or from its pack
+        return [results[index] for index in range(len(audio_paths))]
@@ -0,0 +1,118 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Hedged requests: a duplicate for a request that runs slower than most."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+# A request still running after this percentile of past latencies is hedged
+DEFAULT_HEDGE_PERCENTILE = 95.0
+# At most this share of requests get a duplicate
+DEFAULT_HEDGE_BUDGET = 0.05
+# Latencies needed before the percentile is trusted
+MIN_HEDGE_SAMPLES = 20
+# Latencies the percentile is taken over, most recent first
+HEDGE_HISTORY = 200
+
+
+def _percentile(values: Deque[float], percentile: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * percentile / 100), len(ordered) - 1)]
+
+
+class RequestHedger:
+    """Decides when a slow request gets a duplicate, and keeps count.
+
+    Latencies of past requests are kept: the time from sending a request
+    until its response, since a duplicate would wait for the rate limiter
+    too; a request a duplicate answered for counts until then. A request
+    sent longer ago than their ``percentile``-th percentile is hedged: a
+    duplicate is sent and whichever answers first is used. Duplicates are
+    capped at ``budget`` of the requests seen, so the extra spend is at
+    most that share. Until ``min_samples`` latencies have been seen,
+    nothing is hedged. Shared by the requests of every job that uses it,
+    and safe to use from several threads.
+    """
+
+    def __init__(
+        self,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        budget: float = DEFAULT_HEDGE_BUDGET,
+        *,
+        min_samples: int = MIN_HEDGE_SAMPLES,
+        history: int = HEDGE_HISTORY,
+    ) -> None:
+        """Initialize the hedger.
+
+        Args:
+            percentile: Latency percentile after which a request is hedged
+            budget: Largest share of requests that may get a duplicate
+            min_samples: Latencies to observe before hedging anything
+            history: Number of recent latencies the percentile is taken over
+
+        Raises:
+            ValueError: If ``percentile`` is not in (0, 100), ``budget`` not
+                in [0, 1] or ``min_samples`` below 1
+        """
+        if not 0 < percentile < 100:
+            raise ValueError(
+                f"Hedge percentile must be between 0 and 100, got {percentile}"
+            )
+        if not 0 <= budget <= 1:
+            raise ValueError(f"Hedge budget must be between 0 and 1, got {budget}")
+        if min_samples < 1:
+            raise ValueError(
+                f"Hedging needs at least one latency sample, got {min_samples}"
+            )
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self._latencies: Deque[float] = deque(maxlen=history)
+        self._requests = 0
+        self._hedges = 0
+        self._lock = threading.Lock()
+
+    def delay(self) -> Optional[float]:
+        """Start a request: seconds after which it should be hedged.
+
+        Counts the request towards the budget. None while there are fewer
+        than ``min_samples`` latencies to go by.
+        """
+        with self._lock:
+            self._requests += 1
+            if len(self._latencies) < self.min_samples:
+                return None
+            return _percentile(self._latencies, self.percentile)
+
+    def allow(self) -> bool:
+        """Whether the budget allows one more duplicate, and take it if so."""
+        with self._lock:
+            if self._hedges + 1 > self.budget * self._requests:
+                return False
+            self._hedges += 1
+            return True
+
+    def observe(self, seconds: float) -> None:
+        """Record how long the API took to answer a request, from when it was sent."""
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Requests seen, duplicates sent and the current hedging delay."""
+        with self._lock:
+            delay = None
+            if len(self._latencies) >= self.min_samples:
+                delay = _percentile(self._latencies, self.percentile)
+            return {
+                "requests": self._requests,
+                "hedges": self._hedges,
+                "budget": self.budget,
+                "delay_seconds": delay,
+            }
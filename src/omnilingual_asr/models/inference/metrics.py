@@ -0,0 +1,467 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Per-request timings, token usage and cost, with a Prometheus exposition."""
+
+from __future__ import annotations
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+@dataclass(frozen=True)
+class TokenPricing:
+    """Prices used for cost estimates, in USD per million tokens."""
+
+    text_input: float = 0.50
+    audio_input: float = 1.00
+    output: float = 3.00  # Also charged for thinking tokens
+
+    @classmethod
+    def from_env(cls) -> TokenPricing:
+        """Read prices from ``GEMINI_PRICE_TEXT_INPUT``, ``GEMINI_PRICE_AUDIO_INPUT``
+        and ``GEMINI_PRICE_OUTPUT``, keeping the defaults for unset ones."""
+        default = cls()
+        return cls(
+            text_input=_env_float("GEMINI_PRICE_TEXT_INPUT", default.text_input),
+            audio_input=_env_float("GEMINI_PRICE_AUDIO_INPUT", default.audio_input),
+            output=_env_float("GEMINI_PRICE_OUTPUT", default.output),
+        )
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+@dataclass
+class RequestMetrics:
+    """What one API request cost in time, tokens and bytes."""
+
+    kind: str  # "transcribe", "continuation", "enrich" or "hedge" (a losing duplicate)
+    offset: float = 0.0  # Start of the audio sent, in seconds into the recording
+    audio_seconds: float = 0.0
+    # Seconds per stage: "prepare" (reading or transcoding the audio),
+    # "upload" (Files API), "queue" (waiting for a rate limiter slot),
+    # "generate" (request sent to last response byte), "parse", and "hedge"
+    # (waiting before a duplicate that answered first was sent)
+    stages: Dict[str, float] = field(default_factory=dict)
+    first_response_seconds: Optional[float] = None  # Streams: until the first piece
+    input_tokens: Optional[int] = None
+    audio_tokens: Optional[int] = None  # Part of input_tokens
+    output_tokens: Optional[int] = None
+    thinking_tokens: Optional[int] = None
+    upload_bytes: int = 0  # Sent through the Files API
+    inline_bytes: int = 0  # Sent inline with the request
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Add the time spent in the ``with`` block to a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - start)
+
+    def add_stage(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @property
+    def seconds(self) -> float:
+        """Time spent on the request across all stages."""
+        return sum(self.stages.values())
+
+    def record_usage(self, response: Any) -> None:
+        """Read token counts from a response's usage metadata."""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return
+        self.input_tokens = getattr(usage, "prompt_token_count", None)
+        self.output_tokens = getattr(usage, "candidates_token_count", None)
+        self.thinking_tokens = getattr(usage, "thoughts_token_count", None)
+        for detail in getattr(usage, "prompt_tokens_details", None) or []:
+            modality = getattr(detail.modality, "name", detail.modality)
+            if modality == "AUDIO":
+                self.audio_tokens = (self.audio_tokens or 0) + (detail.token_count or 0)
+
+    def add_attempt(self, attempt: RequestMetrics) -> None:
+        """Take the queueing, generation and usage of a send made on this request's behalf."""
+        for name, seconds in attempt.stages.items():
+            self.add_stage(name, seconds)
+        self.first_response_seconds = attempt.first_response_seconds
+        self.input_tokens = attempt.input_tokens
+        self.audio_tokens = attempt.audio_tokens
+        self.output_tokens = attempt.output_tokens
+        self.thinking_tokens = attempt.thinking_tokens
+
+    def estimated_cost(self, pricing: TokenPricing = TokenPricing()) -> float:
+        """Estimated price of the request in USD."""
+        audio = self.audio_tokens or 0
+        text = max((self.input_tokens or 0) - audio, 0)
+        output = (self.output_tokens or 0) + (self.thinking_tokens or 0)
+        return (
+            audio * pricing.audio_input
+            + text * pricing.text_input
+            + output * pricing.output
+        ) / 1e6
+
+
+def _sum_optional(values: Iterable[Optional[int]]) -> Optional[int]:
+    counts = [value for value in values if value is not None]
+    return sum(counts) if counts else None
+
+
+@dataclass
+class TranscriptionMetrics:
+    """Requests made for one transcription result, e.g. one per chunk.
+
+    Results served from the cache or a checkpoint made no requests and
+    have no metrics.
+    """
+
+    requests: List[RequestMetrics] = field(default_factory=list)
+    retries: int = 0  # Requests repeated after a transient failure
+
+    @classmethod
+    def combine(
+        cls, parts: Iterable[Optional[TranscriptionMetrics]]
+    ) -> Optional[TranscriptionMetrics]:
+        """Metrics of a result merged from parts, or None if no part had any."""
+        present = [part for part in parts if part is not None]
+        if not present:
+            return None
+        return cls(
+            requests=[request for part in present for request in part.requests],
+            retries=sum(part.retries for part in present),
+        )
+
+    def shifted(self, offset: float) -> TranscriptionMetrics:
+        """Copy with request offsets moved by ``offset`` seconds."""
+        return replace(
+            self,
+            requests=[replace(r, offset=r.offset + offset) for r in self.requests],
+        )
+
+    @property
+    def audio_seconds(self) -> float:
+        """Audio transcribed, not counting audio resent after truncation."""
+        return sum(r.audio_seconds for r in self.requests if r.kind == "transcribe")
+
+    @property
+    def input_tokens(self) -> Optional[int]:
+        return _sum_optional(r.input_tokens for r in self.requests)
+
+    @property
+    def output_tokens(self) -> Optional[int]:
+        return _sum_optional(r.output_tokens for r in self.requests)
+
+    @property
+    def upload_bytes(self) -> int:
+        return sum(r.upload_bytes for r in self.requests)
+
+    def stage_seconds(self) -> Dict[str, float]:
+        """Total time per stage across requests (concurrent requests overlap)."""
+        totals: Dict[str, float] = {}
+        for request in self.requests:
+            for stage, seconds in request.stages.items():
+                totals[stage] = totals.get(stage, 0.0) + seconds
+        return totals
+
+    def estimated_cost(self, pricing: TokenPricing = TokenPricing()) -> float:
+        """Estimated price of all requests in USD."""
+        return sum(r.estimated_cost(pricing) for r in self.requests)
+
+    def cost_per_audio_minute(
+        self, pricing: TokenPricing = TokenPricing()
+    ) -> Optional[float]:
+        """Estimated USD per minute of audio transcribed, or None without audio."""
+        minutes = self.audio_seconds / 60
+        return self.estimated_cost(pricing) / minutes if minutes else None
+
+
+# ---------------------------------------------------------------------------
+# Prometheus exposition
+# ---------------------------------------------------------------------------
+
+_Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: _Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _outcome(exc: Optional[BaseException]) -> str:
+    """Outcome label of a request: ok, the error code, or the exception type."""
+    if exc is None:
+        return "ok"
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    return str(code) if code else type(exc).__name__
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def lines(self, name: str, labels: _Labels) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            bucket_labels = _format_labels(labels, ("le", _format_value(bound)))
+            lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(self.sum)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class MetricsCollector:
+    """Aggregates request metrics from every pipeline that reports to it.
+
+    Pipelines call the ``observe_*`` methods as requests finish; the
+    totals are exposed in the Prometheus text format by :meth:`render`.
+    Safe to use from several threads.
+    """
+
+    _HELP = {
+        "requests_total": (
+            "counter",
+            "API requests by kind and outcome (ok or error code).",
+        ),
+        "retries_total": ("counter", "Requests repeated after a transient failure."),
+        "request_seconds": ("histogram", "Time per successful request, all stages."),
+        "stage_seconds": ("histogram", "Time per request stage."),
+        "first_response_seconds": (
+            "histogram",
+            "Wait for the first piece of a streamed response.",
+        ),
+        "tokens_total": ("counter", "Tokens reported in usage metadata, by type."),
+        "sent_bytes_total": (
+            "counter",
+            "Audio bytes sent, by method (inline or upload).",
+        ),
+        "audio_seconds_total": (
+            "counter",
+            "Audio transcribed, excluding resent spans.",
+        ),
+        "silence_removed_seconds_total": (
+            "counter",
+            "Audio stripped as silence before sending.",
+        ),
+        "estimated_cost_usd_total": ("counter", "Estimated spend in USD."),
+        "cost_per_audio_minute_usd": (
+            "gauge",
+            "Estimated USD per minute of audio transcribed.",
+        ),
+        "job_seconds": ("histogram", "Wall time per transcription job."),
+        "hedges_total": ("counter", "Duplicates sent for slow requests, by outcome."),
+        "hedges_skipped_total": (
+            "counter",
+            "Slow requests not hedged to stay within budget.",
+        ),
+        "key_requests_total": ("counter", "API requests per key, by outcome."),
+        "key_tokens_total": ("counter", "Tokens used per key."),
+        "key_ejections_total": (
+            "counter",
+            "Times a key was left out after repeated 429 or 403.",
+        ),
+    }
+
+    def __init__(
+        self,
+        pricing: Optional[TokenPricing] = None,
+        *,
+        prefix: str = "gemini_asr",
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        """Initialize the collector.
+
+        Args:
+            pricing: Prices for cost estimates (default: from the environment)
+            prefix: Prefix of every exported metric name
+            buckets: Upper bounds of the latency histogram buckets, in seconds
+        """
+        self.pricing = pricing or TokenPricing.from_env()
+        self.prefix = prefix
+        self._buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[_Labels, float]] = {}
+        self._histograms: Dict[str, Dict[_Labels, _Histogram]] = {}
+
+    def _inc(self, name: str, labels: _Labels, amount: float = 1.0) -> None:
+        series = self._counters.setdefault(name, {})
+        series[labels] = series.get(labels, 0.0) + amount
+
+    def _observe(self, name: str, labels: _Labels, value: float) -> None:
+        series = self._histograms.setdefault(name, {})
+        if labels not in series:
+            series[labels] = _Histogram(self._buckets)
+        series[labels].observe(value)
+
+    def observe_request(self, request: RequestMetrics) -> None:
+        """Record a request that completed."""
+        kind = (("kind", request.kind),)
+        with self._lock:
+            self._inc("requests_total", kind + (("outcome", "ok"),))
+            self._observe("request_seconds", kind, request.seconds)
+            for stage, seconds in request.stages.items():
+                self._observe("stage_seconds", (("stage", stage),), seconds)
+            if request.first_response_seconds is not None:
+                self._observe(
+                    "first_response_seconds", kind, request.first_response_seconds
+                )
+            audio = request.audio_tokens or 0
+            for token_type, count in (
+                ("audio_input", audio),
+                ("text_input", max((request.input_tokens or 0) - audio, 0)),
+                ("output", request.output_tokens or 0),
+                ("thinking", request.thinking_tokens or 0),
+            ):
+                self._inc("tokens_total", (("type", token_type),), count)
+            self._inc("sent_bytes_total", (("method", "inline"),), request.inline_bytes)
+            self._inc("sent_bytes_total", (("method", "upload"),), request.upload_bytes)
+            if request.kind == "transcribe":
+                self._inc("audio_seconds_total", (), request.audio_seconds)
+            self._inc(
+                "estimated_cost_usd_total", (), request.estimated_cost(self.pricing)
+            )
+
+    def observe_failure(self, kind: str, exc: BaseException) -> None:
+        """Record a request that raised."""
+        with self._lock:
+            self._inc("requests_total", (("kind", kind), ("outcome", _outcome(exc))))
+
+    def observe_retry(self, kind: str) -> None:
+        """Record that a failed request is about to be repeated."""
+        with self._lock:
+            self._inc("retries_total", (("kind", kind),))
+
+    def observe_silence(self, seconds: float) -> None:
+        """Record audio that was stripped as silence instead of being sent."""
+        with self._lock:
+            self._inc("silence_removed_seconds_total", (), seconds)
+
+    def observe_hedge(self, outcome: str) -> None:
+        """Record a duplicate sent for a slow request.
+
+        Args:
+            outcome: "won" if it answered first, "lost" if the original
+                did, or "failed"
+        """
+        with self._lock:
+            self._inc("hedges_total", (("outcome", outcome),))
+
+    def observe_hedge_skipped(self) -> None:
+        """Record a slow request left alone because the hedge budget was spent."""
+        with self._lock:
+            self._inc("hedges_skipped_total", ())
+
+    def observe_key_request(
+        self, key: str, tokens: int = 0, exc: Optional[BaseException] = None
+    ) -> None:
+        """Record a request sent with one API key of a pool.
+
+        Args:
+            key: Label identifying the key, never the key itself
+            tokens: Tokens the response reported
+            exc: Error the request raised, if any
+        """
+        with self._lock:
+            self._inc("key_requests_total", (("key", key), ("outcome", _outcome(exc))))
+            if tokens:
+                self._inc("key_tokens_total", (("key", key),), tokens)
+
+    def observe_key_ejection(self, key: str) -> None:
+        """Record that a key was left out of its pool for a while."""
+        with self._lock:
+            self._inc("key_ejections_total", (("key", key),))
+
+    def observe_job(self, seconds: float) -> None:
+        """Record the wall time of a whole transcription."""
+        with self._lock:
+            self._observe("job_seconds", (), seconds)
+
+    def render(self, extra_gauges: Optional[Dict[str, float]] = None) -> str:
+        """Render every metric in the Prometheus text exposition format.
+
+        Args:
+            extra_gauges: Additional gauges to export, by name without prefix
+        """
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {
+                name: {labels: (h.counts[:], h.sum) for labels, h in series.items()}
+                for name, series in self._histograms.items()
+            }
+        audio_minutes = counters.get("audio_seconds_total", {}).get((), 0.0) / 60
+        if audio_minutes:
+            cost = counters.get("estimated_cost_usd_total", {}).get((), 0.0)
+            counters["cost_per_audio_minute_usd"] = {(): cost / audio_minutes}
+
+        lines = []
+        for name, (kind, text) in self._HELP.items():
+            full = f"{self.prefix}_{name}"
+            if kind == "histogram":
+                series = histograms.get(name)
+                if not series:
+                    continue
+                lines += [f"# HELP {full} {text}", f"# TYPE {full} histogram"]
+                for labels, (counts, total) in sorted(series.items()):
+                    histogram = _Histogram(self._buckets)
+                    histogram.counts, histogram.sum = counts, total
+                    lines += histogram.lines(full, labels)
+            else:
+                values = counters.get(name)
+                if not values:
+                    continue
+                lines += [f"# HELP {full} {text}", f"# TYPE {full} {kind}"]
+                for labels, value in sorted(values.items()):
+                    lines.append(
+                        f"{full}{_format_labels(labels)} {_format_value(value)}"
+                    )
+        for name, value in sorted((extra_gauges or {}).items()):
+            full = f"{self.prefix}_{name}"
+            lines += [f"# TYPE {full} gauge", f"{full} {_format_value(value)}"]
+        return "\n".join(lines) + "\n"
+
+
+_default_collector: Optional[MetricsCollector] = None
+_default_lock = threading.Lock()
+
+
+def get_metrics_collector() -> MetricsCollector:
+    """Return the collector shared by every pipeline in this process."""
+    global _default_collector
+    with _default_lock:
+        if _default_collector is None:
+            _default_collector = MetricsCollector()
+        return _default_collector
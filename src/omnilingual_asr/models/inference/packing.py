@@ -0,0 +1,136 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Packing of many short clips into one request-sized stretch of audio."""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from omnilingual_asr.models.inference.chunk_source import (
+    DECODE_SAMPLE_RATE,
+    MemoryChunk,
+    pcm_chunk,
+)
+
+# Packed audio stays below MIN_DURATION_FOR_CHUNKING, so a pack is always
+# sent as a single request
+PACK_TARGET_SECONDS = 300.0
+PACK_GAP_SECONDS = 1.0  # Minimum silence between clips
+
+_BYTES_PER_SECOND = DECODE_SAMPLE_RATE * 2
+
+
+def _format_offset(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{secs:02d}"
+
+
+@dataclass(frozen=True)
+class PackedClip:
+    """Where a clip sits in a pack."""
+
+    index: int  # Position of the clip in the caller's list
+    path: Path
+    offset: float  # Start in the packed audio, in seconds
+    duration: float
+
+
+@dataclass
+class ClipPack:
+    """Several clips joined with silence, to be sent as one request."""
+
+    clips: List[PackedClip]
+    audio: MemoryChunk
+
+    def __post_init__(self) -> None:
+        # Each clip owns the audio up to the middle of the silence around it
+        self._bounds = [
+            (a.offset + a.duration + b.offset) / 2
+            for a, b in zip(self.clips, self.clips[1:])
+        ]
+
+    def clip_at(self, start: float, end: float) -> int:
+        """Position in :attr:`clips` of the clip a segment belongs to.
+
+        A segment that strays across a clip boundary is given to the clip
+        it overlaps most.
+        """
+        first = bisect.bisect_right(self._bounds, start)
+        last = bisect.bisect_left(self._bounds, end)
+        if first >= last:
+            return first
+        edges = [start] + self._bounds[first:last] + [end]
+        overlaps = [b - a for a, b in zip(edges, edges[1:])]
+        return first + overlaps.index(max(overlaps))
+
+    def prompt_hint(self) -> str:
+        """Tell the model where each clip starts so no segment crosses one."""
+        starts = ", ".join(_format_offset(clip.offset) for clip in self.clips)
+        return (
+            f"The audio joins {len(self.clips)} separate recordings, separated by "
+            f"silence. They start at: {starts}. Every segment must lie within a "
+            "single recording; start a new segment at each recording's start."
+        )
+
+
+class ClipPacker:
+    """Joins decoded clips into packs no longer than a target duration.
+
+    Clips are separated by at least ``gap`` seconds of silence and start
+    on whole seconds, so boundaries can be stated exactly in the MM:SS
+    timestamps the model uses. A clip longer than the target gets a pack
+    of its own.
+    """
+
+    def __init__(
+        self,
+        target_duration: float = PACK_TARGET_SECONDS,
+        gap: float = PACK_GAP_SECONDS,
+    ) -> None:
+        self.target_duration = target_duration
+        self.gap = gap
+        self._clips: List[PackedClip] = []
+        self._samples = bytearray()
+
+    def add(self, index: int, path: Path, samples: bytes) -> Optional[ClipPack]:
+        """Add a clip's 16 kHz mono s16le samples.
+
+        Returns:
+            The previous pack if this clip didn't fit in it, otherwise None
+        """
+        samples = samples[: len(samples) - len(samples) % 2]
+        duration = len(samples) / _BYTES_PER_SECOND
+        offset = 0.0
+        if self._clips:
+            offset = float(math.ceil(len(self._samples) / _BYTES_PER_SECOND + self.gap))
+        full = None
+        if self._clips and offset + duration > self.target_duration:
+            full = self.flush()
+            offset = 0.0
+        # Pad to the clip's offset; the padding is the silence separator
+        self._samples.extend(
+            bytes(int(offset * _BYTES_PER_SECOND) - len(self._samples))
+        )
+        self._samples.extend(samples)
+        self._clips.append(PackedClip(index, path, offset, duration))
+        return full
+
+    def flush(self) -> Optional[ClipPack]:
+        """Finish the current pack, or return None if it is empty."""
+        if not self._clips:
+            return None
+        clips, samples = self._clips, bytes(self._samples)
+        self._clips, self._samples = [], bytearray()
+        # Uploads of the pack are looked up by its first clip's file and this
+        # key, so the key covers the audio of every clip
+        key = "pack:" + hashlib.sha256(samples).hexdigest()[:16]
+        return ClipPack(clips, pcm_chunk(samples, clips[0].path, key))
@@ -0,0 +1,490 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""In-process audio header probing with an ffprobe fallback."""
+
+from __future__ import annotations
+
+import io
+import json
+import struct
+import subprocess
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+
+_PROBE_MEMO: "OrderedDict[Tuple[str, int, int], AudioInfo]" = OrderedDict()
+_PROBE_MEMO_SIZE = 4096
+_PROBE_LOCK = threading.Lock()
+
+# How far into an MP3 to look for the first frame (after any ID3v2 tag)
+_MP3_SYNC_SEARCH_BYTES = 64 * 1024
+# Bytes read from the end of an Ogg file to find the last page
+_OGG_TAIL_BYTES = 64 * 1024
+
+
+class AudioProbeError(RuntimeError):
+    """Raised when an audio file's properties cannot be determined."""
+
+
+@dataclass(frozen=True)
+class AudioInfo:
+    """Basic properties of an audio file."""
+
+    duration: float  # Seconds
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    codec: Optional[str] = None
+    bit_rate: Optional[int] = None  # Bits per second
+    source: str = "header"  # "header" or "ffprobe"
+
+
+def _with_bit_rate(info: AudioInfo, file_size: int) -> AudioInfo:
+    """Fill in the average bit rate from the file size if it is unknown."""
+    if info.bit_rate or info.duration <= 0:
+        return info
+    return AudioInfo(
+        duration=info.duration,
+        sample_rate=info.sample_rate,
+        channels=info.channels,
+        codec=info.codec,
+        bit_rate=int(file_size * 8 / info.duration),
+        source=info.source,
+    )
+
+
+# -- WAV ------------------------------------------------------------------
+
+_WAV_CODECS = {1: "pcm", 3: "pcm_float", 6: "alaw", 7: "mulaw"}
+
+
+def _probe_wav(f: BinaryIO, file_size: int) -> Optional[AudioInfo]:
+    header = f.read(12)
+    if (
+        len(header) < 12
+        or header[:4] not in (b"RIFF", b"RF64")
+        or header[8:12] != b"WAVE"
+    ):
+        return None
+    fmt = None
+    data_size = None
+    ds64_data_size = None
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            break
+        chunk_id, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+        body_start = f.tell()
+        if chunk_id == b"ds64":
+            ds64_data_size = struct.unpack("<Q", f.read(16)[8:16])[0]
+        elif chunk_id == b"fmt ":
+            fmt = f.read(min(size, 40))
+        elif chunk_id == b"data":
+            data_size = size
+            if size == 0xFFFFFFFF and ds64_data_size is not None:
+                data_size = ds64_data_size
+            # Truncated or still-growing files report more than is there
+            data_size = min(data_size, file_size - body_start)
+            break
+        f.seek(body_start + size + (size & 1))
+    if fmt is None or len(fmt) < 16 or data_size is None:
+        return None
+
+    tag, channels, sample_rate, byte_rate, _, bits = struct.unpack("<HHIIHH", fmt[:16])
+    if tag == 0xFFFE and len(fmt) >= 26:
+        # WAVE_FORMAT_EXTENSIBLE: the real format is the sub-format GUID's prefix
+        tag = struct.unpack("<H", fmt[24:26])[0]
+    if not byte_rate:
+        return None
+    codec = _WAV_CODECS.get(tag, f"wav_0x{tag:04x}")
+    if codec.startswith("pcm"):
+        codec = f"{codec}_{bits}"
+    return AudioInfo(
+        duration=data_size / byte_rate,
+        sample_rate=sample_rate,
+        channels=channels,
+        codec=codec,
+        bit_rate=byte_rate * 8,
+    )
+
+
+# -- FLAC -----------------------------------------------------------------
+
+
+def _parse_streaminfo(block: bytes) -> Optional[AudioInfo]:
+    """Parse a FLAC STREAMINFO metadata block body."""
+    if len(block) < 18:
+        return None
+    packed = int.from_bytes(block[10:18], "big")
+    sample_rate = packed >> 44
+    channels = ((packed >> 41) & 0x7) + 1
+    total_samples = packed & 0xFFFFFFFFF
+    if not sample_rate or not total_samples:
+        return None
+    return AudioInfo(
+        duration=total_samples / sample_rate,
+        sample_rate=sample_rate,
+        channels=channels,
+        codec="flac",
+    )
+
+
+def _probe_flac(f: BinaryIO, file_size: int) -> Optional[AudioInfo]:
+    # Some encoders prepend an ID3v2 tag to FLAC files
+    f.seek(_id3v2_size(f.read(10)))
+    if f.read(4) != b"fLaC":
+        return None
+    block_header = f.read(4)
+    if len(block_header) < 4 or block_header[0] & 0x7F != 0:
+        return None
+    size = int.from_bytes(block_header[1:4], "big")
+    info = _parse_streaminfo(f.read(size))
+    return _with_bit_rate(info, file_size) if info else None
+
+
+# -- Ogg (Vorbis, Opus, FLAC) ---------------------------------------------
+
+
+def _probe_ogg(f: BinaryIO, file_size: int) -> Optional[AudioInfo]:
+    page = f.read(27)
+    if len(page) < 27 or page[:4] != b"OggS":
+        return None
+    segment_count = page[26]
+    packet_size = sum(f.read(segment_count))
+    packet = f.read(packet_size)
+
+    pre_skip = 0
+    if packet.startswith(b"\x01vorbis") and len(packet) >= 16:
+        codec = "vorbis"
+        channels = packet[11]
+        sample_rate = struct.unpack("<I", packet[12:16])[0]
+        granule_rate = sample_rate
+    elif packet.startswith(b"OpusHead") and len(packet) >= 16:
+        codec = "opus"
+        channels = packet[9]
+        pre_skip = struct.unpack("<H", packet[10:12])[0]
+        sample_rate = struct.unpack("<I", packet[12:16])[0] or 48000
+        granule_rate = 48000  # Opus granule positions always count 48 kHz samples
+    elif packet.startswith(b"\x7fFLAC") and len(packet) >= 13 + 4 + 18:
+        # Mapping header, "fLaC", metadata block header, then STREAMINFO
+        codec = "flac"
+        packed = int.from_bytes(packet[27:35], "big")
+        sample_rate = packed >> 44
+        channels = ((packed >> 41) & 0x7) + 1
+        granule_rate = sample_rate
+    else:
+        return None
+
+    # The last page's granule position is the stream's total sample count
+    f.seek(max(0, file_size - _OGG_TAIL_BYTES))
+    tail = f.read()
+    last = tail.rfind(b"OggS")
+    if last < 0 or last + 14 > len(tail):
+        return None
+    granule = struct.unpack("<q", tail[last + 6 : last + 14])[0]
+    if granule <= 0 or not granule_rate:
+        return None
+    info = AudioInfo(
+        duration=max(0, granule - pre_skip) / granule_rate,
+        sample_rate=sample_rate,
+        channels=channels,
+        codec=codec,
+    )
+    return _with_bit_rate(info, file_size)
+
+
+# -- MP3 ------------------------------------------------------------------
+
+# Bit rates in kbps indexed by [MPEG-1?][layer][index]
+_MP3_BITRATES = {
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+# Sample rates indexed by version bits (3: MPEG-1, 2: MPEG-2, 0: MPEG-2.5)
+_MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    0: [11025, 12000, 8000],
+}
+
+
+def _id3v2_size(header: bytes) -> int:
+    """Total size of an ID3v2 tag given its 10-byte header (0 if absent)."""
+    if len(header) < 10 or header[:3] != b"ID3":
+        return 0
+    size = 0
+    for byte in header[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if header[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _probe_mp3(f: BinaryIO, file_size: int) -> Optional[AudioInfo]:
+    audio_start = _id3v2_size(f.read(10))
+    f.seek(audio_start)
+    data = f.read(_MP3_SYNC_SEARCH_BYTES)
+
+    for i in range(len(data) - 4):
+        if data[i] != 0xFF or data[i + 1] & 0xE0 != 0xE0:
+            continue
+        header = int.from_bytes(data[i : i + 4], "big")
+        version = (header >> 19) & 0x3
+        layer_bits = (header >> 17) & 0x3
+        bitrate_idx = (header >> 12) & 0xF
+        rate_idx = (header >> 10) & 0x3
+        if version == 1 or layer_bits == 0 or bitrate_idx in (0, 15) or rate_idx == 3:
+            continue
+        mpeg1 = version == 3
+        layer = 4 - layer_bits
+        bitrate = _MP3_BITRATES[(mpeg1, layer)][bitrate_idx] * 1000
+        sample_rate = _MP3_SAMPLE_RATES[version][rate_idx]
+        channels = 1 if (header >> 6) & 0x3 == 3 else 2
+        padding = (header >> 9) & 0x1
+        if layer == 1:
+            samples_per_frame = 384
+            frame_length = (12 * bitrate // sample_rate + padding) * 4
+        else:
+            samples_per_frame = 1152 if layer == 2 or mpeg1 else 576
+            frame_length = samples_per_frame // 8 * bitrate // sample_rate + padding
+        # Random bytes often look like a sync word; require a matching next frame
+        next_header = data[i + frame_length : i + frame_length + 4]
+        if len(next_header) == 4 and (
+            next_header[0] != 0xFF or (next_header[1] & 0xFE) != (data[i + 1] & 0xFE)
+        ):
+            continue
+        frame = data[i:]
+
+        # VBR files carry a frame count in a Xing/Info or VBRI header
+        frames = None
+        side_info = (
+            (32 if channels == 2 else 17) if mpeg1 else (17 if channels == 2 else 9)
+        )
+        xing = frame[4 + side_info : 4 + side_info + 16]
+        if xing[:4] in (b"Xing", b"Info") and struct.unpack(">I", xing[4:8])[0] & 0x1:
+            frames = struct.unpack(">I", xing[8:12])[0]
+        elif frame[36:40] == b"VBRI" and len(frame) >= 54:
+            frames = struct.unpack(">I", frame[50:54])[0]
+
+        if frames:
+            duration = frames * samples_per_frame / sample_rate
+            bit_rate = None
+        else:
+            audio_bytes = file_size - (audio_start + i)
+            f.seek(file_size - 128)
+            if f.read(3) == b"TAG":
+                audio_bytes -= 128
+            duration = audio_bytes * 8 / bitrate
+            bit_rate = bitrate
+        info = AudioInfo(
+            duration=duration,
+            sample_rate=sample_rate,
+            channels=channels,
+            codec=f"mp{layer}",
+            bit_rate=bit_rate,
+        )
+        return _with_bit_rate(info, file_size)
+    return None
+
+
+# -- MP4 / M4A ------------------------------------------------------------
+
+_MP4_CONTAINERS = {b"moov", b"trak", b"mdia", b"minf", b"stbl"}
+
+
+def _iter_boxes(f: BinaryIO, start: int, end: int):
+    """Yield (type, body_start, body_end) for the boxes in [start, end)."""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack(">I4s", header)
+        body_start = pos + 8
+        if size == 1:
+            size = struct.unpack(">Q", f.read(8))[0]
+            body_start += 8
+        elif size == 0:
+            size = end - pos
+        if size < body_start - pos:
+            return
+        yield box_type, body_start, min(pos + size, end)
+        pos += size
+
+
+def _probe_mp4(f: BinaryIO, file_size: int) -> Optional[AudioInfo]:
+    header = f.read(8)
+    if len(header) < 8 or header[4:8] != b"ftyp":
+        return None
+
+    found: Dict[str, Any] = {}
+
+    def walk(start: int, end: int) -> None:
+        for box_type, body_start, body_end in _iter_boxes(f, start, end):
+            if box_type in _MP4_CONTAINERS:
+                walk(body_start, body_end)
+                if box_type == b"trak":
+                    if found.get("handler") == b"soun" and "audio" not in found:
+                        found["audio"] = dict(found)
+                    found.pop("handler", None)
+            elif box_type == b"hdlr":
+                # The media handler comes first; QuickTime adds a data handler
+                f.seek(body_start + 8)
+                found.setdefault("handler", f.read(4))
+            elif box_type == b"mdhd":
+                f.seek(body_start)
+                body = f.read(32)
+                if body[0] == 1:
+                    timescale, duration = struct.unpack(">IQ", body[20:32])
+                else:
+                    timescale, duration = struct.unpack(">II", body[12:20])
+                found["timescale"], found["duration"] = timescale, duration
+            elif box_type == b"stsd":
+                f.seek(body_start + 8)
+                entry = f.read(36)
+                if len(entry) >= 36:
+                    found["codec"] = entry[4:8].decode("latin-1").strip()
+                    found["channels"] = struct.unpack(">H", entry[24:26])[0]
+                    found["sample_rate"] = struct.unpack(">I", entry[32:36])[0] >> 16
+
+    walk(0, file_size)
+    audio = found.get("audio")
+    if not audio or not audio.get("timescale"):
+        return None
+    info = AudioInfo(
+        duration=audio["duration"] / audio["timescale"],
+        sample_rate=audio.get("sample_rate") or audio["timescale"],
+        channels=audio.get("channels"),
+        codec=audio.get("codec"),
+    )
+    return _with_bit_rate(info, file_size)
+
+
+# -------------------------------------------------------------------------
+
+_HEADER_PROBES = (_probe_wav, _probe_flac, _probe_ogg, _probe_mp4, _probe_mp3)
+
+
+def _probe_header(path: Path, file_size: int) -> Optional[AudioInfo]:
+    """Parse the container header, trying the extension's format first."""
+    preferred = {
+        ".wav": _probe_wav,
+        ".flac": _probe_flac,
+        ".ogg": _probe_ogg,
+        ".opus": _probe_ogg,
+        ".mp3": _probe_mp3,
+        ".m4a": _probe_mp4,
+        ".mp4": _probe_mp4,
+    }.get(path.suffix.lower())
+    probes = ([preferred] if preferred else []) + [
+        p for p in _HEADER_PROBES if p is not preferred
+    ]
+    with open(path, "rb") as f:
+        return _run_probes(f, file_size, probes)
+
+
+def _run_probes(f: BinaryIO, file_size: int, probes) -> Optional[AudioInfo]:
+    """Return the first header probe's result that has a duration."""
+    for probe in probes:
+        f.seek(0)
+        try:
+            info = probe(f, file_size)
+        except (struct.error, ValueError, IndexError, OSError):
+            info = None
+        if info is not None and info.duration > 0:
+            return info
+    return None
+
+
+def probe_bytes(data: bytes) -> Optional[AudioInfo]:
+    """Parse the header of a complete audio file held in memory.
+
+    Returns:
+        Audio properties, or None if no supported header matches
+    """
+    return _run_probes(io.BytesIO(data), len(data), _HEADER_PROBES)
+
+
+def _probe_ffprobe(path: Path) -> AudioInfo:
+    """Probe with ffprobe, for formats the header parsers don't handle."""
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe",
+                "-v",
+                "quiet",
+                "-select_streams",
+                "a:0",
+                "-show_entries",
+                "format=duration,bit_rate:stream=codec_name,sample_rate,channels",
+                "-of",
+                "json",
+                str(path),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        data = json.loads(result.stdout)
+        fmt = data.get("format", {})
+        stream = (data.get("streams") or [{}])[0]
+        return AudioInfo(
+            duration=float(fmt["duration"]),
+            sample_rate=(
+                int(stream["sample_rate"]) if stream.get("sample_rate") else None
+            ),
+            channels=stream.get("channels"),
+            codec=stream.get("codec_name"),
+            bit_rate=int(fmt["bit_rate"]) if fmt.get("bit_rate") else None,
+            source="ffprobe",
+        )
+    except (
+        subprocess.CalledProcessError,
+        FileNotFoundError,
+        KeyError,
+        ValueError,
+    ) as exc:
+        raise AudioProbeError(f"Could not probe audio file {path}: {exc}") from exc
+
+
+def probe_audio(path: str | Path) -> AudioInfo:
+    """Return duration, sample rate, channels, codec and bit rate of a file.
+
+    WAV, FLAC, Ogg (Vorbis/Opus/FLAC), MP3 and MP4/M4A headers are parsed
+    in-process; other files are probed with ffprobe. Results are memoized
+    per (path, mtime, size), so each file is only probed once.
+
+    Args:
+        path: Path to the audio file
+
+    Returns:
+        Audio properties
+
+    Raises:
+        AudioProbeError: If the file can't be parsed and ffprobe fails
+    """
+    path = Path(path)
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    with _PROBE_LOCK:
+        info = _PROBE_MEMO.get(memo_key)
+        if info is not None:
+            _PROBE_MEMO.move_to_end(memo_key)
+            return info
+
+    info = _probe_header(path, stat.st_size) or _probe_ffprobe(path)
+
+    with _PROBE_LOCK:
+        _PROBE_MEMO[memo_key] = info
+        while len(_PROBE_MEMO) > _PROBE_MEMO_SIZE:
+            _PROBE_MEMO.popitem(last=False)
+    return info
@@ -0,0 +1,293 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Process-wide adaptive rate limiting for Gemini API calls."""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional
+
+# Wait granularity while blocked on the concurrency limit
+_POLL_SECONDS = 0.05
+_WINDOW_SECONDS = 60.0
+# Cool-down applied after a throttling response without a retry hint
+DEFAULT_THROTTLE_COOLDOWN_SECONDS = 2.0
+# Concurrency is cut at most once per this interval, so a burst of 429s from
+# requests that were already in flight counts as one congestion signal
+_DECREASE_INTERVAL_SECONDS = 1.0
+
+
+def is_throttle_error(exc: BaseException) -> bool:
+    """Whether an API error signals rate limiting or overload (429/503)."""
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    if code in (429, 503):
+        return True
+    message = str(exc)
+    return "RESOURCE_EXHAUSTED" in message or "UNAVAILABLE" in message
+
+
+class RatePermit:
+    """A reserved request slot returned by :class:`AdaptiveRateLimiter`."""
+
+    def __init__(self, entry: List[float]) -> None:
+        self._entry = entry  # [timestamp, tokens] in the limiter's token log
+
+    def record_usage(self, response: Any) -> None:
+        """Replace the token estimate with the response's actual usage."""
+        usage = getattr(response, "usage_metadata", None)
+        total = getattr(usage, "total_token_count", None) if usage else None
+        if total:
+            self._entry[1] = float(total)
+
+
+class AdaptiveRateLimiter:
+    """Request/token budgets plus AIMD concurrency control.
+
+    Requests wait until the sliding one-minute request and token budgets have
+    room and fewer than the current concurrency limit are in flight. The
+    limit grows by roughly one slot per limit's worth of successful requests
+    (additive increase) and is halved when the API answers 429/503
+    (multiplicative decrease), which also pauses new requests briefly.
+
+    Usable from threads (:meth:`slot`) and from asyncio (:meth:`aslot`).
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        *,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        throttle_cooldown: float = DEFAULT_THROTTLE_COOLDOWN_SECONDS,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request budget per sliding minute (None: unlimited)
+            tokens_per_minute: Token budget per sliding minute (None: unlimited)
+            initial_concurrency: Starting number of concurrent requests
+            min_concurrency: Lower bound for the adaptive concurrency limit
+            max_concurrency: Upper bound for the adaptive concurrency limit
+            throttle_cooldown: Seconds to pause new requests after a 429/503
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.throttle_cooldown = throttle_cooldown
+
+        self._limit = float(
+            min(max(initial_concurrency, min_concurrency), max_concurrency)
+        )
+        self._in_flight = 0
+        self._waiting = 0
+        self._requests: Deque[float] = deque()
+        self._tokens: Deque[List[float]] = deque()
+        self._cooldown_until = 0.0
+        self._last_decrease = 0.0
+        self._throttled_total = 0
+        self._completed_total = 0
+        self._cond = threading.Condition()
+
+    @property
+    def concurrency_limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return int(self._limit)
+
+    def _prune(self, now: float) -> None:
+        horizon = now - _WINDOW_SECONDS
+        while self._requests and self._requests[0] <= horizon:
+            self._requests.popleft()
+        while self._tokens and self._tokens[0][0] <= horizon:
+            self._tokens.popleft()
+
+    def _try_acquire(self, tokens: float) -> tuple[float, Optional[RatePermit]]:
+        """Reserve a slot if possible; otherwise return how long to wait.
+
+        Must be called with the condition lock held.
+        """
+        now = time.monotonic()
+        self._prune(now)
+        if now < self._cooldown_until:
+            return self._cooldown_until - now, None
+        if self._in_flight >= int(self._limit):
+            return _POLL_SECONDS, None
+        if self.requests_per_minute and len(self._requests) >= self.requests_per_minute:
+            return self._requests[0] + _WINDOW_SECONDS - now, None
+        if self.tokens_per_minute and self._tokens:
+            used = sum(entry[1] for entry in self._tokens)
+            if used + tokens > self.tokens_per_minute:
+                return self._tokens[0][0] + _WINDOW_SECONDS - now, None
+
+        self._in_flight += 1
+        self._requests.append(now)
+        entry = [now, float(tokens)]
+        self._tokens.append(entry)
+        return 0.0, RatePermit(entry)
+
+    def acquire(
+        self, tokens: float = 0, *, cancelled: Optional[threading.Event] = None
+    ) -> RatePermit:
+        """Block until a request may be sent and reserve it.
+
+        Args:
+            tokens: Estimated tokens the request will consume
+            cancelled: Stop waiting once this is set, e.g. when another
+                request already answered for this one
+
+        Returns:
+            Permit to pass to :meth:`release`
+
+        Raises:
+            concurrent.futures.CancelledError: If ``cancelled`` was set
+                before a slot was free; nothing is reserved
+        """
+        with self._cond:
+            self._waiting += 1
+            try:
+                while True:
+                    if cancelled is not None and cancelled.is_set():
+                        raise concurrent.futures.CancelledError()
+                    wait, permit = self._try_acquire(tokens)
+                    if permit is not None:
+                        return permit
+                    if cancelled is not None:
+                        # Setting the event doesn't wake this thread
+                        wait = min(wait, _POLL_SECONDS)
+                    self._cond.wait(timeout=wait)
+            finally:
+                self._waiting -= 1
+
+    async def acquire_async(self, tokens: float = 0) -> RatePermit:
+        """Async version of :meth:`acquire` that never blocks the event loop."""
+        with self._cond:
+            self._waiting += 1
+        try:
+            while True:
+                with self._cond:
+                    wait, permit = self._try_acquire(tokens)
+                if permit is not None:
+                    return permit
+                await asyncio.sleep(min(wait, _POLL_SECONDS * 5))
+        finally:
+            with self._cond:
+                self._waiting -= 1
+
+    def release(
+        self,
+        permit: RatePermit,
+        *,
+        throttled: bool = False,
+        succeeded: bool = True,
+    ) -> None:
+        """Return a slot and adapt the concurrency limit to the outcome.
+
+        Args:
+            permit: Permit returned by :meth:`acquire`
+            throttled: Whether the API answered 429/503
+            succeeded: Whether the request completed successfully
+        """
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            now = time.monotonic()
+            if throttled:
+                self._throttled_total += 1
+                self._cooldown_until = max(
+                    self._cooldown_until, now + self.throttle_cooldown
+                )
+                if now - self._last_decrease >= _DECREASE_INTERVAL_SECONDS:
+                    self._limit = max(float(self.min_concurrency), self._limit / 2)
+                    self._last_decrease = now
+            elif succeeded:
+                self._completed_total += 1
+                self._limit = min(
+                    float(self.max_concurrency), self._limit + 1.0 / self._limit
+                )
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(
+        self, tokens: float = 0, *, cancelled: Optional[threading.Event] = None
+    ) -> Iterator[RatePermit]:
+        """Context manager that acquires and releases a request slot.
+
+        Raises:
+            concurrent.futures.CancelledError: If ``cancelled`` was set
+                before a slot was free
+        """
+        permit = self.acquire(tokens, cancelled=cancelled)
+        try:
+            yield permit
+        except BaseException as exc:
+            self.release(permit, throttled=is_throttle_error(exc), succeeded=False)
+            raise
+        else:
+            self.release(permit)
+
+    @asynccontextmanager
+    async def aslot(self, tokens: float = 0) -> AsyncIterator[RatePermit]:
+        """Async context manager that acquires and releases a request slot."""
+        permit = await self.acquire_async(tokens)
+        try:
+            yield permit
+        except BaseException as exc:
+            self.release(permit, throttled=is_throttle_error(exc), succeeded=False)
+            raise
+        else:
+            self.release(permit)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of the configured budgets, adaptive limit and queue."""
+        with self._cond:
+            now = time.monotonic()
+            self._prune(now)
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "concurrency_limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "queue_depth": self._waiting,
+                "requests_last_minute": len(self._requests),
+                "tokens_last_minute": int(sum(entry[1] for entry in self._tokens)),
+                "cooldown_seconds": max(0.0, self._cooldown_until - now),
+                "completed_total": self._completed_total,
+                "throttled_total": self._throttled_total,
+            }
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+_default_limiter: Optional[AdaptiveRateLimiter] = None
+_default_lock = threading.Lock()
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """Return the limiter shared by every pipeline in this process.
+
+    Budgets are read from ``GEMINI_RPM``, ``GEMINI_TPM`` and
+    ``GEMINI_MAX_CONCURRENCY`` the first time this is called.
+    """
+    global _default_limiter
+    with _default_lock:
+        if _default_limiter is None:
+            _default_limiter = AdaptiveRateLimiter(
+                requests_per_minute=_env_int("GEMINI_RPM"),
+                tokens_per_minute=_env_int("GEMINI_TPM"),
+                max_concurrency=_env_int("GEMINI_MAX_CONCURRENCY") or 64,
+            )
+        return _default_limiter
@@ -0,0 +1,48 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Failure classification and backoff for Gemini API calls."""
+
+from __future__ import annotations
+
+import random
+import socket
+
+from omnilingual_asr.models.inference.rate_limit import is_throttle_error
+
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_CAP_SECONDS = 30.0
+
+# HTTP status codes worth retrying: timeouts, throttling and server errors
+_RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """Whether a failed request may succeed if sent again.
+
+    Throttling, server errors, timeouts and connection failures are
+    retryable. Client errors such as invalid arguments, bad credentials or
+    missing files are not, and neither are local programming errors.
+    """
+    if is_throttle_error(exc):
+        return True
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    if isinstance(code, int):
+        return code in _RETRYABLE_CODES
+    if isinstance(exc, (TimeoutError, ConnectionError, socket.timeout)):
+        return True
+    # httpx transport errors (timeouts, connection resets) don't carry a code
+    return type(exc).__module__.startswith("httpx")
+
+
+def backoff_delay(
+    attempt: int,
+    *,
+    base: float = BACKOFF_BASE_SECONDS,
+    cap: float = BACKOFF_CAP_SECONDS,
+) -> float:
+    """Exponential backoff with full jitter for the given 0-based attempt."""
+    return random.uniform(0.0, min(cap, base * 2**attempt))
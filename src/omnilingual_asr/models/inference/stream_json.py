@@ -0,0 +1,147 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Incremental extraction of array elements from a streamed JSON response."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+# A complete top-level string field, e.g. the summary that precedes segments
+_STRING_FIELD = r'"{key}"\s*:\s*("(?:[^"\\]|\\.)*")'
+
+
+class SegmentStreamParser:
+    """Picks complete elements out of a top-level JSON array while it streams.
+
+    Text is fed in arbitrary pieces as the response arrives. Each object in
+    the top-level ``array_key`` array is decoded as soon as its closing
+    brace has been seen, long before the whole document is valid JSON.
+    Anything before the first ``{`` (such as a markdown code fence) is
+    ignored. The full text is kept for a final parse of the other fields.
+    """
+
+    def __init__(self, array_key: str = "segments") -> None:
+        """Initialize the parser.
+
+        Args:
+            array_key: Key of the top-level array whose elements to emit
+        """
+        self.array_key = array_key
+        self._parts: List[str] = []
+        self._buffer = ""  # Text from the start of the current element
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._string_start = -1
+        self._last_key: Optional[str] = None
+        self._in_array = False
+        self._element_start = -1
+        self.count = 0  # Elements emitted so far
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return "".join(self._parts)
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """Consume more response text.
+
+        Args:
+            text: Next piece of the response
+
+        Returns:
+            Elements of the array completed by this piece, in order
+        """
+        if not text:
+            return []
+        self._parts.append(text)
+        offset = len(self._buffer)
+        self._buffer += text
+        buf = self._buffer
+        stack = self._stack
+        elements: List[Dict[str, Any]] = []
+
+        for i in range(offset, len(buf)):
+            ch = buf[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    if len(stack) == 1 and self._string_start >= 0:
+                        # Keys and string values of the top-level object
+                        self._last_key = buf[self._string_start : i]
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i + 1
+            elif ch in "{[":
+                if not stack and ch == "[":
+                    # Text before the document, e.g. "```json ["
+                    continue
+                stack.append(ch)
+                if len(stack) == 2 and ch == "[" and self._last_key == self.array_key:
+                    self._in_array = True
+                elif len(stack) == 3 and self._in_array and ch == "{":
+                    self._element_start = i
+            elif ch in "}]" and stack:
+                stack.pop()
+                if len(stack) == 2 and self._element_start >= 0:
+                    try:
+                        element = json.loads(buf[self._element_start : i + 1])
+                    except ValueError:
+                        element = None
+                    if isinstance(element, dict):
+                        elements.append(element)
+                        self.count += 1
+                    self._element_start = -1
+                elif len(stack) == 1:
+                    self._in_array = False
+
+        # Keep only the text an unfinished element may still need
+        keep = self._element_start if self._element_start >= 0 else len(buf)
+        if self._in_string and self._string_start >= 0:
+            keep = min(keep, self._string_start)
+        if keep:
+            self._buffer = buf[keep:]
+            if self._element_start >= 0:
+                self._element_start -= keep
+            if self._string_start >= 0:
+                self._string_start -= keep
+        return elements
+
+
+def recover_truncated_json(
+    text: str, array_key: str = "segments", string_keys: tuple = ("summary",)
+) -> Optional[Dict[str, Any]]:
+    """Salvage what a truncated or malformed JSON response completed.
+
+    Args:
+        text: Response text that failed to parse as a whole
+        array_key: Key of the array whose complete elements to keep
+        string_keys: Top-level string fields to keep if they are complete
+
+    Returns:
+        Dict with the complete array elements and string fields, or None if
+        nothing could be recovered
+    """
+    parser = SegmentStreamParser(array_key)
+    recovered: Dict[str, Any] = {array_key: parser.feed(text)}
+    for key in string_keys:
+        match = re.search(_STRING_FIELD.format(key=re.escape(key)), text)
+        if match:
+            try:
+                recovered[key] = json.loads(match.group(1))
+            except ValueError:
+                pass
+    if not recovered[array_key] and len(recovered) == 1:
+        return None
+    return recovered
@@ -0,0 +1,135 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Process-wide registry of Files API uploads keyed by content hash."""
+
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Files API uploads are kept for 48 hours; assume that if no expiry is reported
+DEFAULT_UPLOAD_TTL_SECONDS = 48 * 3600
+# Re-upload this long before expiry so a URI never lapses mid-request
+UPLOAD_EXPIRY_MARGIN_SECONDS = 15 * 60
+
+
+@dataclass(frozen=True)
+class UploadedAudio:
+    """A Files API upload that can be referenced by URI."""
+
+    uri: str
+    mime_type: Optional[str]
+    name: Optional[str]
+    expires_at: float  # Unix timestamp
+
+    def is_valid(self, now: Optional[float] = None) -> bool:
+        """Whether the upload can still be referenced safely."""
+        now = time.time() if now is None else now
+        return now < self.expires_at - UPLOAD_EXPIRY_MARGIN_SECONDS
+
+
+def _to_uploaded_audio(uploaded_file: Any) -> UploadedAudio:
+    """Convert a google-genai ``File`` into an :class:`UploadedAudio`."""
+    expiration = getattr(uploaded_file, "expiration_time", None)
+    if expiration is not None and hasattr(expiration, "timestamp"):
+        expires_at = expiration.timestamp()
+    else:
+        expires_at = time.time() + DEFAULT_UPLOAD_TTL_SECONDS
+    return UploadedAudio(
+        uri=uploaded_file.uri,
+        mime_type=getattr(uploaded_file, "mime_type", None),
+        name=getattr(uploaded_file, "name", None),
+        expires_at=expires_at,
+    )
+
+
+class UploadRegistry:
+    """Thread-safe map from (account, content hash) to a live upload.
+
+    Concurrent requests for the same content wait for a single upload
+    instead of each uploading their own copy.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[str, str], UploadedAudio] = {}
+        # Held by every thread uploading or waiting for a key, and dropped
+        # with the last of them, so a new caller never gets a second lock
+        self._inflight: weakref.WeakValueDictionary[Tuple[str, str], threading.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, account: str, digest: str) -> Optional[UploadedAudio]:
+        """Return a still-valid upload for the content, if any."""
+        with self._lock:
+            entry = self._entries.get((account, digest))
+            if entry is not None and not entry.is_valid():
+                del self._entries[(account, digest)]
+                entry = None
+        return entry
+
+    def get_or_upload(
+        self,
+        account: str,
+        digest: str,
+        upload: Callable[[], Any],
+    ) -> UploadedAudio:
+        """Return a valid upload for the content, uploading it if needed.
+
+        Args:
+            account: Identifier of the API key/project owning the upload
+            digest: SHA-256 hex digest of the uploaded bytes
+            upload: Callable performing the upload and returning a ``File``
+
+        Returns:
+            Registered upload
+        """
+        entry = self.get(account, digest)
+        if entry is not None:
+            return entry
+
+        key = (account, digest)
+        with self._lock:
+            key_lock = self._inflight.get(key)
+            if key_lock is None:
+                key_lock = self._inflight[key] = threading.Lock()
+        with key_lock:
+            # Another thread may have finished the upload while we waited
+            entry = self.get(account, digest)
+            if entry is None:
+                entry = _to_uploaded_audio(upload())
+                with self._lock:
+                    self._entries[key] = entry
+        return entry
+
+    def register(self, account: str, digest: str, uploaded_file: Any) -> UploadedAudio:
+        """Record a completed upload (e.g. one made with the async client)."""
+        entry = _to_uploaded_audio(uploaded_file)
+        with self._lock:
+            self._entries[(account, digest)] = entry
+        return entry
+
+    def invalidate(self, account: str, digest: str) -> None:
+        """Forget an upload, e.g. after the API reports it missing."""
+        with self._lock:
+            self._entries.pop((account, digest), None)
+
+    def clear(self) -> None:
+        """Forget all uploads."""
+        with self._lock:
+            self._entries.clear()
+
+
+_default_registry = UploadRegistry()
+
+
+def get_upload_registry() -> UploadRegistry:
+    """Return the registry shared by every pipeline in this process."""
+    return _default_registry
@@ -0,0 +1,333 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Local voice activity detection that strips silence before audio is sent."""
+
+from __future__ import annotations
+
+import bisect
+import struct
+import subprocess
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from omnilingual_asr.models.inference.audio import ENVELOPE_FRAME_SECONDS, _ensure_numpy
+from omnilingual_asr.models.inference.chunk_source import (
+    DECODE_SAMPLE_RATE,
+    ChunkSource,
+    _wav_dtype,
+    _wav_header,
+)
+
+# Frames of samples analysed per NumPy block
+_BLOCK_FRAMES = 8192
+# Spectra are computed at about this rate; speech needs no more bandwidth
+ANALYSIS_SAMPLE_RATE = 8000
+FLUX_BANDS = 16  # Log-spaced bands the spectrum is reduced to
+# Spectra this far apart are compared: phonemes change at this scale,
+# steady noise (fans, hum, hiss) doesn't
+FLUX_SPAN_SECONDS = 0.1
+SMOOTHING_SECONDS = 0.1
+
+# Speech detection over the whole recording
+FLOOR_PERCENTILE = 10  # Level taken as the background noise
+PEAK_PERCENTILE = 99  # Level taken as loud speech
+SPEECH_THRESHOLD = 0.3  # Where speech starts, from floor (0) to peak (1) in dB
+MAX_SPEECH_RANGE_DB = 45.0  # Anything this far below the peak is not speech
+MIN_CONTRAST_DB = 10.0  # Below this, speech and silence can't be told apart
+# Loud regions whose spectrum changes less than this on average are steady
+# noise; white and fan noise stay below 0.1, speech is around 0.2-0.3
+MIN_SPEECH_FLUX = 0.13
+MIN_GAP_SECONDS = 1.0  # Shorter pauses are kept
+MIN_SPEECH_SECONDS = 0.2  # Shorter bursts are clicks and bumps
+SPEECH_PADDING_SECONDS = 0.25  # Audio kept either side of each speech region
+MIN_REMOVED_FRACTION = 0.05  # Audio with less silence is sent unchanged
+
+# Largest data chunk a RIFF header can describe
+_MAX_WAV_DATA_BYTES = 0xFFFFFFFF - 36
+
+
+@dataclass(frozen=True)
+class SpeechMap:
+    """Speech regions kept by :func:`strip_silence`.
+
+    The stripped audio is the regions back to back, so a time in it maps to
+    the region whose cumulative offset precedes it.
+    """
+
+    regions: Tuple[Tuple[float, float], ...]  # (start, end) in the original audio
+    duration: float  # Of the original audio
+
+    @cached_property
+    def _offsets(self) -> List[float]:
+        offsets = []
+        total = 0.0
+        for start, end in self.regions:
+            offsets.append(total)
+            total += end - start
+        return offsets
+
+    @property
+    def speech_seconds(self) -> float:
+        """Duration of the stripped audio."""
+        return sum(end - start for start, end in self.regions)
+
+    @property
+    def removed_seconds(self) -> float:
+        """Audio dropped as silence or noise."""
+        return max(self.duration - self.speech_seconds, 0.0)
+
+    def to_original(self, seconds: float, *, end: bool = False) -> float:
+        """Map a time in the stripped audio to the original audio.
+
+        Args:
+            seconds: Time in the stripped audio
+            end: Whether the time ends a span; a time exactly between two
+                regions then maps to the end of the earlier one
+
+        Returns:
+            Time in the original audio
+        """
+        if not self.regions:
+            return seconds
+        search = bisect.bisect_left if end else bisect.bisect_right
+        index = max(search(self._offsets, seconds) - 1, 0)
+        start, _ = self.regions[index]
+        return round(min(start + seconds - self._offsets[index], self.duration), 3)
+
+
+def _speech_source(audio_path: Path, work_path: Path) -> Optional[ChunkSource]:
+    """Open audio as PCM samples NumPy can read, decoding it if needed.
+
+    Non-WAV input is decoded with ffmpeg to 16 kHz mono PCM at ``work_path``.
+
+    Returns:
+        Chunk source, or None if the audio can't be decoded
+    """
+    source = ChunkSource.open_wav(audio_path)
+    if source is not None:
+        if _wav_dtype(source.fmt) is not None:
+            return source
+        source.close()
+    cmd = [
+        "ffmpeg",
+        "-v",
+        "error",
+        "-y",
+        "-i",
+        str(audio_path),
+        "-vn",
+        "-ac",
+        "1",
+        "-ar",
+        str(DECODE_SAMPLE_RATE),
+        "-c:a",
+        "pcm_s16le",
+        str(work_path),
+    ]
+    try:
+        subprocess.run(cmd, capture_output=True, check=True)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+    return ChunkSource.open_wav(work_path)
+
+
+def _frame_features(source: ChunkSource, frame_seconds: float) -> tuple[Any, Any]:
+    """Per-frame level and spectral flux of a source's mono mixdown.
+
+    Returns:
+        (level in dBFS, flux from 0 for an unchanged spectrum to 1 for a
+        completely different one), one value per frame
+    """
+    np = _ensure_numpy()
+    layout = _wav_dtype(source.fmt)
+    assert layout is not None
+    dtype, full_scale = layout
+    channels = source.info.channels or 1
+    sample_rate = source.info.sample_rate or DECODE_SAMPLE_RATE
+    frame = max(1, int(round(sample_rate * frame_seconds)))
+    # Average groups of samples down to about the analysis rate
+    step = max(1, sample_rate // ANALYSIS_SAMPLE_RATE)
+    width = frame // step
+    bins = width // 2 + 1
+    edges = np.unique(np.geomspace(1, bins, FLUX_BANDS + 1).astype(int) - 1)[:-1]
+    window = np.hanning(width).astype(np.float32)
+
+    samples = np.frombuffer(source.chunk(0.0, source.duration).samples, dtype=dtype)
+    block = _BLOCK_FRAMES * frame * channels
+    levels, bands = [], []
+    for begin in range(0, len(samples), block):
+        x = samples[begin : begin + block].astype(np.float32) / full_scale
+        x = x[: len(x) - len(x) % channels].reshape(-1, channels).mean(axis=1)
+        frames = x[: len(x) - len(x) % frame].reshape(-1, frame)
+        if not len(frames):
+            continue
+        levels.append(np.sqrt(np.mean(frames * frames, axis=1)))
+        reduced = (
+            frames[:, : width * step].reshape(len(frames), width, step).mean(axis=2)
+        )
+        spectra = np.abs(np.fft.rfft(reduced * window, axis=1)).astype(np.float32)
+        bands.append(np.add.reduceat(spectra, edges, axis=1))
+    del samples
+    if not levels:
+        empty = np.zeros(0, dtype=np.float32)
+        return empty, empty
+    rms = np.concatenate(levels)
+    level = (20.0 * np.log10(np.maximum(rms, 1e-6))).astype(np.float32)
+
+    # Compare band energies averaged over a span with those one span earlier
+    span = max(1, int(round(FLUX_SPAN_SECONDS / frame_seconds)))
+    energy = np.concatenate(bands)
+    smoothed = energy.copy()
+    for lag in range(1, span):
+        smoothed[lag:] += energy[:-lag]
+    del energy
+    totals = smoothed.sum(axis=1, keepdims=True)
+    shape = np.divide(smoothed, totals, out=np.zeros_like(smoothed), where=totals > 0)
+    flux = np.zeros(len(level), dtype=np.float32)
+    flux[span:] = 0.5 * np.abs(shape[span:] - shape[:-span]).sum(axis=1)
+    return level, flux
+
+
+def _smooth(values: Any, width: int) -> Any:
+    """Moving average over ``width`` frames, keeping the length."""
+    np = _ensure_numpy()
+    if width <= 1 or len(values) <= width:
+        return values
+    padded = np.pad(values, (width // 2, width - 1 - width // 2), mode="edge")
+    return np.convolve(padded, np.ones(width, dtype=np.float32) / width, mode="valid")
+
+
+def detect_speech(
+    level: Any, flux: Any, *, frame_seconds: float = ENVELOPE_FRAME_SECONDS
+) -> Optional[List[Tuple[float, float]]]:
+    """Find the speech in a recording from its per-frame level and flux.
+
+    Frames well above the background level are candidate speech. Pauses
+    shorter than ``MIN_GAP_SECONDS`` are bridged, bursts shorter than
+    ``MIN_SPEECH_SECONDS`` dropped, and loud regions whose spectrum barely
+    changes are dropped as steady noise. The rest are padded by
+    ``SPEECH_PADDING_SECONDS``.
+
+    Args:
+        level: Per-frame level in dBFS
+        flux: Per-frame spectral flux
+        frame_seconds: Frame length in seconds
+
+    Returns:
+        (start, end) of each speech region in seconds, or None if the audio
+        has too little contrast to tell speech from silence
+    """
+    np = _ensure_numpy()
+    if len(level) == 0:
+        return None
+    smoothing = max(1, int(round(SMOOTHING_SECONDS / frame_seconds)))
+    level = _smooth(level, smoothing)
+    floor, peak = np.percentile(level, [FLOOR_PERCENTILE, PEAK_PERCENTILE])
+    if peak - floor < MIN_CONTRAST_DB:
+        return None
+    threshold = max(
+        floor + SPEECH_THRESHOLD * (peak - floor), peak - MAX_SPEECH_RANGE_DB
+    )
+    active = level > threshold
+
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], active.astype(np.int8), [0]))))
+    starts, ends = edges[0::2], edges[1::2]
+    if not len(starts):
+        return []
+    # Bridge short pauses, then drop short bursts
+    keep = np.concatenate(
+        ([True], starts[1:] - ends[:-1] >= MIN_GAP_SECONDS / frame_seconds)
+    )
+    starts, ends = starts[keep], np.concatenate((ends[:-1][keep[1:]], ends[-1:]))
+    long_enough = ends - starts >= MIN_SPEECH_SECONDS / frame_seconds
+    starts, ends = starts[long_enough], ends[long_enough]
+
+    if len(starts):
+        sums = np.concatenate(([0.0], np.cumsum(flux, dtype=np.float64)))
+        changing = (sums[ends] - sums[starts]) / (ends - starts) >= MIN_SPEECH_FLUX
+        starts, ends = starts[changing], ends[changing]
+
+    duration = len(level) * frame_seconds
+    regions: List[Tuple[float, float]] = []
+    for start, end in zip(starts * frame_seconds, ends * frame_seconds):
+        start = max(float(start) - SPEECH_PADDING_SECONDS, 0.0)
+        end = min(float(end) + SPEECH_PADDING_SECONDS, duration)
+        if regions and start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+    return regions
+
+
+def strip_silence(
+    audio_path: str | Path,
+    output_path: str | Path,
+    *,
+    min_removed_fraction: float = MIN_REMOVED_FRACTION,
+) -> Optional[SpeechMap]:
+    """Write the speech of a recording, without its silences, to a WAV file.
+
+    PCM WAV input is read through a memory map and its samples are copied
+    unchanged; other formats are first decoded with ffmpeg to 16 kHz mono
+    PCM next to ``output_path``. Speech regions are separated by their
+    padding, so the output keeps a short pause between them.
+
+    Args:
+        audio_path: Path to the audio file
+        output_path: Where to write the stripped audio
+        min_removed_fraction: Fraction of the audio that must be silence
+            for stripping to be worthwhile
+
+    Returns:
+        The regions kept, or None if nothing was written: no speech found,
+        too little silence, too little contrast, or audio that can't be
+        decoded. The original audio should then be sent unchanged
+    """
+    audio_path, output_path = Path(audio_path), Path(output_path)
+    work_path = output_path.with_name(f"{output_path.stem}.decoded.wav")
+    try:
+        source = _speech_source(audio_path, work_path)
+        if source is None:
+            return None
+        with source:
+            level, flux = _frame_features(source, ENVELOPE_FRAME_SECONDS)
+            regions = detect_speech(level, flux)
+            if regions is None:
+                return None
+            _, _, sample_rate, _, align, _ = struct.unpack("<HHIIHH", source.fmt[:16])
+            whole = source.chunk(0.0, source.duration)
+            frame_count = whole.samples.nbytes // align
+            spans = []
+            for start, end in regions:
+                first = min(int(round(start * sample_rate)), frame_count)
+                last = min(int(round(end * sample_rate)), frame_count)
+                if last > first:
+                    spans.append((first, last))
+            if not spans:
+                return None
+            kept = sum(last - first for first, last in spans) * align
+            if kept > _MAX_WAV_DATA_BYTES:
+                return None
+            speech = SpeechMap(
+                regions=tuple(
+                    (first / sample_rate, last / sample_rate) for first, last in spans
+                ),
+                duration=source.duration,
+            )
+            if speech.removed_seconds < min_removed_fraction * source.duration:
+                return None
+            with open(output_path, "wb") as f:
+                f.write(_wav_header(source.fmt, kept))
+                for first, last in spans:
+                    f.write(whole.samples[first * align : last * align])
+                if kept & 1:
+                    f.write(b"\0")
+            return speech
+    finally:
+        work_path.unlink(missing_ok=True)
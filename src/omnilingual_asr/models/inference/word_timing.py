@@ -0,0 +1,379 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Word timestamps estimated locally from segment timings and audio energy."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import itertools
+import math
+import re
+import subprocess
+import unicodedata
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+
+from omnilingual_asr.models.inference.audio import (
+    ENVELOPE_FRAME_SECONDS,
+    MAX_PARALLEL_SPLITS,
+    _ensure_numpy,
+    compute_energy_envelope,
+    get_audio_duration,
+)
+from omnilingual_asr.models.inference.chunk_source import ChunkSource, _wav_dtype
+from omnilingual_asr.models.inference.gemini_pipeline import (
+    GeminiTranscriptionResult,
+    GeminiTranscriptSegment,
+    WordTimestamp,
+)
+
+# Compressed audio is decoded in spans of this length by parallel ffmpeg
+# processes; a multiple of the frame length so the envelopes line up
+ENVELOPE_SPAN_SECONDS = 1800.0
+# Frames of a memory-mapped WAV file reduced per NumPy block
+_WAV_BLOCK_FRAMES = 8192
+
+# Speech detection within a segment
+MIN_PAUSE_SECONDS = 0.12  # Shorter dips are closures inside or between words
+FLOOR_PERCENTILE = 10  # Level taken as the segment's background noise
+PEAK_PERCENTILE = 95  # Level taken as the segment's loud speech
+SPEECH_THRESHOLD = 0.3  # Where speech starts, from floor (0) to peak (1) in dB
+MIN_CONTRAST_DB = 6.0  # Below this, speech and pauses can't be told apart
+# Pauses are this much more likely to fall after words ending a clause, so
+# those boundaries attract pauses from this many times farther away
+CLAUSE_PAUSE_BIAS = 2.0
+_CLAUSE_END = tuple(",.;:!?\u2026\u3001\u3002\uff0c\uff01\uff1f")
+# Scripts written without spaces between words (Thai, Lao, Tibetan, Myanmar,
+# Khmer, Japanese kana and CJK ideographs), whose text is timed per character
+_UNSPACED_SCRIPT = re.compile(
+    "[\u0e00-\u0eff\u0f00-\u0fff\u1000-\u109f\u1780-\u17ff"
+    "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]"
+)
+
+
+def _wav_envelope(audio_path: Path, frame_seconds: float) -> Optional[Any]:
+    """Per-frame RMS level (dBFS) of a PCM WAV file, read through a memory map.
+
+    Returns:
+        Envelope, or None if the file isn't a WAV file NumPy can read
+    """
+    np = _ensure_numpy()
+    source = ChunkSource.open_wav(audio_path)
+    if source is None:
+        return None
+    with source:
+        layout = _wav_dtype(source.fmt)
+        if layout is None:
+            return None
+        dtype, full_scale = layout
+        sample_rate = source.info.sample_rate
+        if not sample_rate:
+            return None
+        channels = source.info.channels or 1
+        frame = max(1, int(round(sample_rate * frame_seconds)))
+        samples = np.frombuffer(source.chunk(0.0, source.duration).samples, dtype=dtype)
+        block = _WAV_BLOCK_FRAMES * frame * channels
+        levels = []
+        for begin in range(0, len(samples), block):
+            x = samples[begin : begin + block].astype(np.float32)
+            x = x[: len(x) - len(x) % channels].reshape(-1, channels).mean(axis=1)
+            whole = len(x) - len(x) % frame
+            if whole:
+                frames = x[:whole].reshape(-1, frame)
+                levels.append(np.sqrt(np.mean(frames * frames, axis=1)))
+            if whole < len(x):
+                tail = x[whole:]
+                levels.append(np.sqrt(np.mean(tail * tail, keepdims=True)))
+        del samples
+    rms = np.concatenate(levels) if levels else np.zeros(0, dtype=np.float32)
+    return (20.0 * np.log10(np.maximum(rms / full_scale, 1e-6))).astype(np.float32)
+
+
+def load_envelope(
+    audio_path: str | Path, *, frame_seconds: float = ENVELOPE_FRAME_SECONDS
+) -> Optional[Any]:
+    """Compute the energy envelope of a whole recording for word timing.
+
+    PCM WAV files are reduced in place through a memory map. Other formats
+    are decoded with ffmpeg, with long recordings split into spans decoded
+    in parallel.
+
+    Args:
+        audio_path: Path to the audio file
+        frame_seconds: Frame length in seconds
+
+    Returns:
+        1-D float32 array with one dBFS value per frame, or None if the
+        audio can't be decoded
+    """
+    audio_path = Path(audio_path)
+    envelope = _wav_envelope(audio_path, frame_seconds)
+    if envelope is not None:
+        return envelope
+
+    duration = get_audio_duration(audio_path)
+    try:
+        if duration <= ENVELOPE_SPAN_SECONDS:
+            return compute_energy_envelope(audio_path, frame_seconds=frame_seconds)
+        starts = [
+            i * ENVELOPE_SPAN_SECONDS
+            for i in range(int(duration // ENVELOPE_SPAN_SECONDS) + 1)
+        ]
+        np = _ensure_numpy()
+        with concurrent.futures.ThreadPoolExecutor(MAX_PARALLEL_SPLITS) as executor:
+            parts = executor.map(
+                lambda start: compute_energy_envelope(
+                    audio_path,
+                    frame_seconds=frame_seconds,
+                    start=start,
+                    duration=ENVELOPE_SPAN_SECONDS,
+                ),
+                starts,
+            )
+            return np.concatenate(list(parts))
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
+
+def _split_words(text: str) -> List[str]:
+    """Split segment text into the units that are timed.
+
+    Words are separated by whitespace. A token in a script written without
+    spaces can be a whole sentence, so it is split into characters; marks
+    and punctuation stay with the character before them, and runs of other
+    scripts (e.g. a Latin word in Chinese text) stay together.
+    """
+    words: List[str] = []
+    for token in text.split():
+        if not _UNSPACED_SCRIPT.search(token):
+            words.append(token)
+            continue
+        current = ""
+        has_base = after_unspaced = False
+        for ch in token:
+            base = ch.isalnum() and not unicodedata.category(ch).startswith("M")
+            unspaced = base and _UNSPACED_SCRIPT.match(ch) is not None
+            if base and (unspaced or after_unspaced) and has_base:
+                words.append(current)
+                current, has_base = "", False
+            current += ch
+            if base:
+                has_base, after_unspaced = True, unspaced
+        words.append(current)
+    return words
+
+
+def _word_weight(word: str) -> int:
+    """Expected relative duration of a word: its length without punctuation."""
+    return max(sum(ch.isalnum() for ch in word), 1)
+
+
+def _speech_runs(levels: Any, frame_seconds: float) -> Optional[tuple[Any, Any]]:
+    """Find stretches of speech in a segment's envelope.
+
+    Dips shorter than MIN_PAUSE_SECONDS count as speech.
+
+    Returns:
+        (start frames, end frames) of the speech runs, or None if the
+        segment has too little contrast to tell speech from pauses
+    """
+    np = _ensure_numpy()
+    floor, peak = np.percentile(levels, [FLOOR_PERCENTILE, PEAK_PERCENTILE])
+    if peak - floor < MIN_CONTRAST_DB:
+        return None
+    speech = levels > floor + SPEECH_THRESHOLD * (peak - floor)
+    edges = np.flatnonzero(
+        np.diff(np.concatenate(([False], speech, [False])).astype(np.int8))
+    )
+    starts, ends = edges[0::2], edges[1::2]
+    if not len(starts):
+        return None
+    # Merge runs separated by gaps too short to be pauses
+    pause = starts[1:] - ends[:-1] >= max(1, round(MIN_PAUSE_SECONDS / frame_seconds))
+    return starts[np.r_[True, pause]], ends[np.r_[pause, True]]
+
+
+def _snap_to_pauses(
+    bounds: Any, pauses: Any, tolerance: float, clause_ends: Any
+) -> Any:
+    """Move word boundaries onto the nearest pause within ``tolerance``.
+
+    Args:
+        bounds: Word boundaries, including the first start and last end
+        pauses: Positions of pauses, on the same scale as ``bounds``
+        tolerance: How far a boundary may move
+        clause_ends: Per inner boundary, whether the word before it ends
+            with punctuation; such boundaries are preferred
+
+    Returns:
+        Adjusted boundaries, still non-decreasing
+    """
+    np = _ensure_numpy()
+    inner = bounds[1:-1]
+    if not len(inner) or not len(pauses):
+        return bounds
+    scale = np.where(clause_ends, 1.0 / CLAUSE_PAUSE_BIAS, 1.0)
+    right = np.clip(np.searchsorted(inner, pauses), 0, len(inner) - 1)
+    left = np.clip(right - 1, 0, len(inner) - 1)
+    # Pick the left or right neighbour, whichever is closer once weighted
+    left_distance = np.abs(inner[left] - pauses) * scale[left]
+    right_distance = np.abs(inner[right] - pauses) * scale[right]
+    nearest = np.where(left_distance <= right_distance, left, right)
+    distance = np.minimum(left_distance, right_distance)
+    close = distance <= tolerance
+    # Each boundary takes its closest pause
+    order = np.lexsort((distance[close], nearest[close]))
+    chosen, first = np.unique(nearest[close][order], return_index=True)
+    snapped = bounds.copy()
+    snapped[1:-1][chosen] = pauses[close][order][first]
+    return np.maximum.accumulate(snapped)
+
+
+class WordTimer:
+    """Estimates word timestamps within the segments of one recording.
+
+    Gemini returns timestamps per segment only. Each segment's span is
+    divided among its words in proportion to their length; with the audio's
+    energy envelope, only the frames that contain speech are divided, word
+    boundaries move onto nearby pauses, and silence at either end of the
+    segment is left out of the first and last words.
+    """
+
+    def __init__(
+        self,
+        envelope: Optional[Any] = None,
+        frame_seconds: float = ENVELOPE_FRAME_SECONDS,
+    ) -> None:
+        """Initialize the timer.
+
+        Args:
+            envelope: Energy envelope of the recording in dBFS per frame, as
+                returned by :func:`load_envelope`. Without it, words are
+                timed from their length alone.
+            frame_seconds: Frame length of the envelope
+        """
+        self.envelope = envelope
+        self.frame_seconds = frame_seconds
+
+    @classmethod
+    def for_audio(cls, audio_path: str | Path) -> WordTimer:
+        """Timer for a recording.
+
+        Falls back to length weighting if the audio can't be decoded or
+        NumPy isn't installed.
+        """
+        try:
+            return cls(load_envelope(audio_path))
+        except RuntimeError:
+            return cls()
+
+    def words(self, text: str, start: float, end: float) -> List[WordTimestamp]:
+        """Time the words of one segment.
+
+        Args:
+            text: Segment text; words are separated by whitespace, and
+                text in scripts written without spaces is timed per character
+            start: Segment start in seconds
+            end: Segment end in seconds
+
+        Returns:
+            One timestamp per word, in order; empty if the text has no words
+            or the segment has no duration
+        """
+        tokens = _split_words(text)
+        if not tokens or end <= start:
+            return []
+        weights = [_word_weight(token) for token in tokens]
+        total = sum(weights)
+        fractions = [0.0] + [count / total for count in itertools.accumulate(weights)]
+
+        spans: Optional[tuple[Any, Any]] = None
+        if self.envelope is not None:
+            first = max(int(start / self.frame_seconds), 0)
+            last = min(math.ceil(end / self.frame_seconds), len(self.envelope))
+            if last - first >= len(tokens):
+                runs = _speech_runs(self.envelope[first:last], self.frame_seconds)
+                if runs is not None:
+                    spans = self._speech_times(runs, tokens, fractions, first)
+        if spans is None:
+            times = [start + fraction * (end - start) for fraction in fractions]
+            spans = times[:-1], times[1:]
+        starts, ends = spans
+
+        words = []
+        for token, word_start, word_end in zip(tokens, starts, ends):
+            word_start = min(max(float(word_start), start), end)
+            word_end = min(max(float(word_end), word_start), end)
+            words.append(WordTimestamp(token, round(word_start, 3), round(word_end, 3)))
+        return words
+
+    def _speech_times(
+        self,
+        runs: tuple[Any, Any],
+        tokens: Sequence[str],
+        fractions: Sequence[float],
+        offset: int,
+    ) -> tuple[Any, Any]:
+        """Spread words over the speech runs of a segment.
+
+        Positions are measured in frames of speech, so pauses take no
+        share; a word whose share ends at a pause ends where the pause
+        starts, and the next word starts where it ends.
+        """
+        np = _ensure_numpy()
+        run_starts, run_ends = runs
+        lengths = run_ends - run_starts
+        cumulative = np.concatenate(([0], np.cumsum(lengths)))
+        total = cumulative[-1]
+        clause_ends = np.array(
+            [token.endswith(_CLAUSE_END) for token in tokens[:-1]], dtype=bool
+        )
+        bounds = _snap_to_pauses(
+            np.asarray(fractions) * total,
+            cumulative[1:-1].astype(np.float64),
+            total / len(tokens),
+            clause_ends,
+        )
+        last_run = len(lengths) - 1
+        start_run = np.clip(
+            np.searchsorted(cumulative, bounds[:-1], side="right") - 1, 0, last_run
+        )
+        end_run = np.clip(
+            np.searchsorted(cumulative, bounds[1:], side="left") - 1, 0, last_run
+        )
+        starts = run_starts[start_run] + bounds[:-1] - cumulative[start_run]
+        ends = run_starts[end_run] + bounds[1:] - cumulative[end_run]
+        return (offset + starts) * self.frame_seconds, (
+            offset + ends
+        ) * self.frame_seconds
+
+    def segments(
+        self, segments: Sequence[GeminiTranscriptSegment]
+    ) -> List[GeminiTranscriptSegment]:
+        """Copies of segments with their word timestamps filled in."""
+        return [
+            replace(seg, words=self.words(seg.text, seg.start, seg.end))
+            for seg in segments
+        ]
+
+
+def add_word_timestamps(
+    result: GeminiTranscriptionResult, audio_path: str | Path
+) -> GeminiTranscriptionResult:
+    """Fill in word timestamps for every segment of a transcription.
+
+    Args:
+        result: Transcription of the audio
+        audio_path: Path to the transcribed audio file
+
+    Returns:
+        Copy of the result whose segments have ``words`` set
+    """
+    return replace(
+        result, segments=WordTimer.for_audio(audio_path).segments(result.segments)
+    )
@@ -0,0 +1,126 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Run the benchmark suite: ``python -m tests.benchmarks``.
+
+Exits with status 1 if a benchmark is slower than the baseline by more
+than the tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from .cases import BENCHMARKS
+from .harness import (
+    DEFAULT_TOLERANCE,
+    Measurement,
+    RunResults,
+    compare,
+    format_comparison,
+    run_benchmarks,
+)
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.benchmarks", description=__doc__
+    )
+    parser.add_argument(
+        "-k",
+        dest="pattern",
+        default="",
+        help="Only run benchmarks whose name contains this",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=None,
+        help="Timed calls per benchmark (default: per benchmark)",
+    )
+    parser.add_argument(
+        "--output", type=Path, help="Write results as JSON to this file"
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help="Baseline results to compare with",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed slowdown before a benchmark counts as a regression (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store the results as the new baseline",
+    )
+    args = parser.parse_args(argv)
+
+    benchmarks = [bench for bench in BENCHMARKS if args.pattern in bench.name]
+    if not benchmarks:
+        parser.error(f"no benchmark matches {args.pattern!r}")
+
+    def report(name: str, measurement: Optional[Measurement]) -> None:
+        if measurement is None:
+            print(f"{name}: skipped", file=sys.stderr)
+        else:
+            print(f"{name}: {measurement.best * 1000:.2f}ms", file=sys.stderr)
+
+    results = run_benchmarks(benchmarks, repeat=args.repeat, report=report)
+    if args.output:
+        results.save(args.output)
+
+    if args.update_baseline:
+        if args.baseline.exists() and args.pattern:
+            # Keep the baseline of benchmarks that weren't run; comparisons
+            # use times relative to each run's own calibration
+            previous = RunResults.load(args.baseline)
+            for name, measurement in previous.benchmarks.items():
+                results.benchmarks.setdefault(name, measurement)
+        results.skipped.clear()
+        results.save(args.baseline)
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not args.baseline.exists():
+        print(
+            f"No baseline at {args.baseline}; run with --update-baseline",
+            file=sys.stderr,
+        )
+        return 0
+    overrides = {
+        bench.name: bench.tolerance
+        for bench in benchmarks
+        if bench.tolerance is not None
+    }
+    comparisons = compare(
+        results, RunResults.load(args.baseline), args.tolerance, overrides
+    )
+    if args.pattern:
+        comparisons = [c for c in comparisons if args.pattern in c.name]
+    print(format_comparison(comparisons, results))
+    regressions = [c.name for c in comparisons if c.status == "regression"]
+    if regressions:
+        print(
+            f"\n{len(regressions)} benchmark(s) regressed beyond their tolerance: "
+            f"{', '.join(regressions)}",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
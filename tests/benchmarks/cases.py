@@ -0,0 +1,345 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Benchmarks of the parse, split, merge, speech detection, word timing and
+serialization hot paths.
+
+Inputs are synthetic or the sample audio bundled with the repository, and
+responses come from no backend at all, so the suite runs offline on CPU.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, List
+
+from omnilingual_asr.diarization import DiarizedTranscriptSegment, segment_to_dict
+from omnilingual_asr.diarization.pipeline import WordTimestamp
+from omnilingual_asr.models.inference import FakeBackend, GeminiASRPipeline
+from omnilingual_asr.models.inference.audio import (
+    CHUNK_DURATION_SECONDS,
+    CHUNK_OVERLAP_SECONDS,
+    ENVELOPE_FRAME_SECONDS,
+    PlannedChunk,
+    split_audio_into_chunks,
+)
+from omnilingual_asr.models.inference.chunk_source import (
+    _DECODE_FMT,
+    DECODE_SAMPLE_RATE,
+    ChunkSource,
+)
+from omnilingual_asr.models.inference.gemini_pipeline import (
+    GeminiTranscriptionResult,
+    GeminiTranscriptSegment,
+    merge_chunk_results,
+    parse_timestamp,
+)
+from omnilingual_asr.models.inference.vad import _frame_features, detect_speech
+from omnilingual_asr.models.inference.word_timing import WordTimer, load_envelope
+
+from .harness import Benchmark
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SAMPLE_AUDIO = {
+    "gettysburg": (REPO_ROOT / "gettysburg.wav", 5.0),  # (path, chunk seconds)
+    "lisu": (REPO_ROOT / "Samuel Speaking Lisu.mp3", 30.0),
+}
+
+_WORDS = (
+    "the people government nation liberty dedicated brave men living dead "
+    "struggled here world note remember what they did unfinished work"
+).split()
+_EMOTIONS = ["happy", "sad", "angry", "neutral"]
+_SEGMENT_SECONDS = 3.0
+# Timings that include ffmpeg processes vary more between runs
+_SUBPROCESS_TOLERANCE = 1.0
+
+
+def _timestamp(seconds: float) -> str:
+    hours, rest = divmod(int(seconds), 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
+
+def _text(rng: random.Random, index: int) -> str:
+    return f"{index} " + " ".join(rng.choice(_WORDS) for _ in range(12))
+
+
+def synthetic_response(segment_count: int, seed: int = 0) -> str:
+    """A transcription response with every feature, as the model returns it."""
+    rng = random.Random(seed)
+    segments = []
+    for i in range(segment_count):
+        start = i * _SEGMENT_SECONDS
+        segments.append(
+            {
+                "speaker": f"Speaker {i % 3 + 1}",
+                "timestamp_start": _timestamp(start),
+                "timestamp_end": _timestamp(start + _SEGMENT_SECONDS),
+                "content": _text(rng, i),
+                "languages": [{"name": "English", "code": "en"}],
+                "translation": "",
+                "emotion": rng.choice(_EMOTIONS),
+            }
+        )
+    return json.dumps(
+        {"summary": "A speech.", "speaker_count": 3, "segments": segments},
+        ensure_ascii=False,
+    )
+
+
+def synthetic_chunk_results(
+    hours: float, seed: int = 0
+) -> List[tuple[PlannedChunk, GeminiTranscriptionResult]]:
+    """Chunk results of a long recording, as transcribe_chunked merges them.
+
+    Adjacent chunks share CHUNK_OVERLAP_SECONDS of audio, and segments in
+    the overlap are transcribed by both chunks, so the merge has boundary
+    duplicates to resolve.
+    """
+    rng = random.Random(seed)
+    total = hours * 3600
+    texts = [_text(rng, i) for i in range(int(total / _SEGMENT_SECONDS) + 1)]
+    chunk_results = []
+    cut = 0.0
+    while cut < total:
+        own_end = min(cut + CHUNK_DURATION_SECONDS, total)
+        planned = PlannedChunk(
+            start=max(cut - CHUNK_OVERLAP_SECONDS, 0.0),
+            end=min(own_end + CHUNK_OVERLAP_SECONDS, total),
+            own_start=cut,
+            own_end=own_end,
+        )
+        first = int(planned.start // _SEGMENT_SECONDS)
+        last = int(planned.end // _SEGMENT_SECONDS)
+        segments = [
+            GeminiTranscriptSegment(
+                start=i * _SEGMENT_SECONDS,
+                end=(i + 1) * _SEGMENT_SECONDS,
+                speaker=f"Speaker {i % 3 + 1}",
+                text=texts[i],
+                emotion=rng.choice(_EMOTIONS),
+            )
+            for i in range(first, min(last + 1, len(texts)))
+        ]
+        chunk_results.append(
+            (planned, GeminiTranscriptionResult(summary="Part.", segments=segments))
+        )
+        cut = own_end
+    return chunk_results
+
+
+def synthetic_diarized_segments(
+    count: int, seed: int = 0
+) -> List[DiarizedTranscriptSegment]:
+    """Segments as the web app serializes them, with word timestamps."""
+    rng = random.Random(seed)
+    segments = []
+    for i in range(count):
+        start = i * _SEGMENT_SECONDS
+        words = _text(rng, i).split()
+        step = _SEGMENT_SECONDS / len(words)
+        segments.append(
+            DiarizedTranscriptSegment(
+                start=start,
+                end=start + _SEGMENT_SECONDS,
+                speaker=f"Speaker {i % 3 + 1}",
+                text=" ".join(words),
+                words=[
+                    WordTimestamp(word, start + k * step, start + (k + 1) * step)
+                    for k, word in enumerate(words)
+                ],
+                language="English",
+                language_code="en",
+                languages=[{"name": "English", "code": "en"}],
+                emotion=rng.choice(_EMOTIONS),
+            )
+        )
+    return segments
+
+
+def _parse_response(segment_count: int) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        pipeline = GeminiASRPipeline(backend=FakeBackend())
+        text = synthetic_response(segment_count)
+        return lambda: pipeline._parse_response(text)
+
+    return setup
+
+
+def _parse_timestamps(count: int) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        # Mix of the formats the model returns
+        stamps = [
+            _timestamp(i * 1.7) if i % 4 else f"{i * 0.37:.2f}" for i in range(count)
+        ]
+        return lambda: [parse_timestamp(s) for s in stamps]
+
+    return setup
+
+
+def _split_audio(name: str) -> Callable[[], Callable[[], Any]]:
+    path, chunk_seconds = SAMPLE_AUDIO[name]
+
+    def setup() -> Callable[[], Any]:
+        def split() -> None:
+            output_dir = Path(tempfile.mkdtemp(prefix="bench_split_"))
+            try:
+                split_audio_into_chunks(path, chunk_seconds, output_dir)
+            finally:
+                shutil.rmtree(output_dir, ignore_errors=True)
+
+        return split
+
+    return setup
+
+
+def _cut_in_memory(name: str) -> Callable[[], Callable[[], Any]]:
+    path, chunk_seconds = SAMPLE_AUDIO[name]
+
+    def setup() -> Callable[[], Any]:
+        def cut() -> None:
+            source = ChunkSource.open(path)
+            if source is None:
+                raise RuntimeError(f"{path.name} can't be decoded into memory")
+            with source:
+                start = 0.0
+                while start < source.duration:
+                    source.chunk(start, chunk_seconds).tobytes()
+                    start += chunk_seconds
+
+        return cut
+
+    return setup
+
+
+def _merge_chunks(hours: float, *, reverse: bool) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        chunk_results = synthetic_chunk_results(hours)
+        if reverse:
+            # Chunks finishing last-first, the reorder buffer's worst case
+            chunk_results = chunk_results[::-1]
+        return lambda: merge_chunk_results(chunk_results)
+
+    return setup
+
+
+def synthetic_envelope(seconds: float, seed: int = 0) -> Any:
+    """Energy envelope of speech: words of 0.1-0.6 s with pauses between."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    frames = int(seconds / ENVELOPE_FRAME_SECONDS)
+    envelope = rng.normal(-65.0, 3.0, frames).astype(np.float32)
+    position = 0
+    while position < frames:
+        length = int(rng.uniform(5, 30))
+        envelope[position : position + length] += 45.0
+        position += length + int(rng.choice([2, 4, 10, 25]))
+    return envelope
+
+
+def _time_words(hours: float) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        timer = WordTimer(synthetic_envelope(hours * 3600))
+        segments = merge_chunk_results(synthetic_chunk_results(hours)).segments
+        return lambda: timer.segments(segments)
+
+    return setup
+
+
+def _load_envelope(name: str) -> Callable[[], Callable[[], Any]]:
+    path, _ = SAMPLE_AUDIO[name]
+
+    def setup() -> Callable[[], Any]:
+        return lambda: load_envelope(path)
+
+    return setup
+
+
+def _detect_speech(minutes: float) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        import numpy as np
+
+        # Noise shaped by a speech envelope, as 16 kHz PCM held in memory
+        frame = int(DECODE_SAMPLE_RATE * ENVELOPE_FRAME_SECONDS)
+        gain = 10 ** (synthetic_envelope(minutes * 60) / 20) * 32767
+        noise = np.random.default_rng(0).normal(0.0, 1.0, (len(gain), frame))
+        samples = (noise * gain[:, None]).clip(-32767, 32767).astype("<i2").tobytes()
+        source = ChunkSource(
+            Path("synthetic.wav"),
+            samples,
+            _DECODE_FMT,
+            0,
+            len(samples),
+            kind="synthetic",
+        )
+
+        def detect() -> None:
+            level, flux = _frame_features(source, ENVELOPE_FRAME_SECONDS)
+            detect_speech(level, flux)
+
+        return detect
+
+    return setup
+
+
+def _serialize_segments(count: int) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        segments = synthetic_diarized_segments(count)
+        return lambda: json.dumps([segment_to_dict(seg) for seg in segments])
+
+    return setup
+
+
+BENCHMARKS: List[Benchmark] = [
+    *(
+        Benchmark(
+            f"parse_response[{n}]", _parse_response(n), repeat=3 if n > 10_000 else 7
+        )
+        for n in (1_000, 10_000, 50_000)
+    ),
+    Benchmark("parse_timestamp[100000]", _parse_timestamps(100_000)),
+    *(
+        Benchmark(
+            f"split_audio_into_chunks[{name}]",
+            _split_audio(name),
+            requires=("ffmpeg",),
+            tolerance=_SUBPROCESS_TOLERANCE,
+        )
+        for name in SAMPLE_AUDIO
+    ),
+    *(
+        Benchmark(
+            f"chunk_source_cut[{name}]",
+            _cut_in_memory(name),
+            # PCM WAV is memory-mapped; other formats are decoded with ffmpeg
+            requires=() if path.suffix == ".wav" else ("ffmpeg",),
+            tolerance=None if path.suffix == ".wav" else _SUBPROCESS_TOLERANCE,
+        )
+        for name, (path, _) in SAMPLE_AUDIO.items()
+    ),
+    Benchmark("merge_chunk_results[10h]", _merge_chunks(10, reverse=False)),
+    Benchmark("merge_chunk_results[10h,reversed]", _merge_chunks(10, reverse=True)),
+    Benchmark("segment_to_dict[10000]", _serialize_segments(10_000)),
+    Benchmark("detect_speech[10min]", _detect_speech(10)),
+    Benchmark("word_timing[1h]", _time_words(1), repeat=5),
+    *(
+        Benchmark(
+            f"load_envelope[{name}]",
+            _load_envelope(name),
+            requires=() if path.suffix == ".wav" else ("ffmpeg",),
+            tolerance=None if path.suffix == ".wav" else _SUBPROCESS_TOLERANCE,
+        )
+        for name, (path, _) in SAMPLE_AUDIO.items()
+    ),
+]
@@ -0,0 +1,238 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Timing, result files and baseline comparison for the benchmark suite."""
+
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import shutil
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+RESULTS_VERSION = 1
+DEFAULT_TOLERANCE = 0.5  # Allowed slowdown relative to the baseline
+
+# Fixed pure-Python workload timed with every run. Results are stored
+# relative to it, so a baseline recorded on one machine stays meaningful
+# on a faster or slower one.
+_CALIBRATION_REPEAT = 15
+
+
+def _calibration_workload() -> int:
+    total = 0
+    for i in range(200_000):
+        total += len(str(i)) * (i % 7)
+    return total
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A hot path to time.
+
+    ``setup`` builds the inputs and returns the function to time, so input
+    generation is not measured.
+    """
+
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+    repeat: int = 7
+    requires: tuple = ()  # Executables that must be on PATH, e.g. ("ffmpeg",)
+    # Allowed slowdown if above the suite's, e.g. for noisy subprocess timings
+    tolerance: Optional[float] = None
+
+    def missing_requirements(self) -> List[str]:
+        return [tool for tool in self.requires if shutil.which(tool) is None]
+
+
+@dataclass
+class Measurement:
+    """Timings of one benchmark, in seconds."""
+
+    best: float
+    median: float
+    repeat: int
+    relative: float  # best / calibration best
+
+
+@dataclass
+class RunResults:
+    """Everything one run of the suite measured."""
+
+    calibration: float
+    benchmarks: Dict[str, Measurement] = field(default_factory=dict)
+    skipped: Dict[str, str] = field(default_factory=dict)  # Name -> reason
+    python: str = field(default_factory=platform.python_version)
+    machine: str = field(default_factory=platform.platform)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": RESULTS_VERSION,
+            "python": self.python,
+            "machine": self.machine,
+            "calibration": self.calibration,
+            "benchmarks": {
+                name: asdict(m) for name, m in sorted(self.benchmarks.items())
+            },
+            "skipped": dict(sorted(self.skipped.items())),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> RunResults:
+        if data.get("version") != RESULTS_VERSION:
+            raise ValueError(f"Unsupported results version: {data.get('version')!r}")
+        return cls(
+            calibration=data["calibration"],
+            benchmarks={
+                name: Measurement(**m) for name, m in data["benchmarks"].items()
+            },
+            skipped=data.get("skipped", {}),
+            python=data.get("python", ""),
+            machine=data.get("machine", ""),
+        )
+
+    def save(self, path: Path) -> None:
+        path.write_text(json.dumps(self.to_dict(), indent=2) + "\n", encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> RunResults:
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+def time_function(fn: Callable[[], Any], repeat: int) -> List[float]:
+    """Call ``fn`` ``repeat`` times after one warm-up call, returning each duration.
+
+    The garbage collector is paused while timing, as in :mod:`timeit`, so
+    collections triggered by earlier allocations don't add noise.
+    """
+    fn()
+    times = []
+    enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    finally:
+        if enabled:
+            gc.enable()
+    return times
+
+
+def calibrate(repeat: int = _CALIBRATION_REPEAT) -> float:
+    """Best time of the calibration workload on this machine."""
+    return min(time_function(_calibration_workload, repeat))
+
+
+def run_benchmarks(
+    benchmarks: List[Benchmark],
+    *,
+    repeat: Optional[int] = None,
+    report: Optional[Callable[[str, Optional[Measurement]], None]] = None,
+) -> RunResults:
+    """Time every benchmark.
+
+    Args:
+        benchmarks: Benchmarks to run, in order
+        repeat: Timed calls per benchmark, overriding each benchmark's own
+        report: Called with each benchmark's name and measurement (None if
+            skipped) as soon as it has run
+
+    Returns:
+        Results of the run
+    """
+    calibration = calibrate()
+    results = RunResults(calibration=calibration)
+    for bench in benchmarks:
+        missing = bench.missing_requirements()
+        if missing:
+            results.skipped[bench.name] = f"missing {', '.join(missing)}"
+            if report is not None:
+                report(bench.name, None)
+            continue
+        times = time_function(bench.setup(), repeat or bench.repeat)
+        best = min(times)
+        measurement = Measurement(
+            best=best,
+            median=statistics.median(times),
+            repeat=len(times),
+            relative=best,  # Divided by the calibration once the run ends
+        )
+        results.benchmarks[bench.name] = measurement
+        if report is not None:
+            report(bench.name, measurement)
+    # Calibrating again after the suite evens out clock speed changes
+    results.calibration = min(calibration, calibrate())
+    for measurement in results.benchmarks.values():
+        measurement.relative = measurement.best / results.calibration
+    return results
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """How one benchmark compares with the baseline."""
+
+    name: str
+    status: str  # "ok", "regression", "improvement", "new", "skipped" or "missing"
+    change: Optional[float] = None  # Relative time change, e.g. 0.25 for 25% slower
+
+
+def compare(
+    current: RunResults,
+    baseline: RunResults,
+    tolerance: float = DEFAULT_TOLERANCE,
+    overrides: Optional[Dict[str, float]] = None,
+) -> List[Comparison]:
+    """Compare calibrated timings against a baseline.
+
+    A benchmark regresses when its time relative to the calibration workload
+    grew by more than ``tolerance``, or by more than its entry in
+    ``overrides`` if that is larger. Benchmarks skipped in this run are
+    reported but never fail the comparison.
+    """
+    overrides = overrides or {}
+    comparisons = []
+    for name in sorted(
+        set(current.benchmarks) | set(baseline.benchmarks) | set(current.skipped)
+    ):
+        measured = current.benchmarks.get(name)
+        expected = baseline.benchmarks.get(name)
+        if measured is None:
+            status = "skipped" if name in current.skipped else "missing"
+            comparisons.append(Comparison(name, status))
+        elif expected is None:
+            comparisons.append(Comparison(name, "new"))
+        else:
+            change = measured.relative / expected.relative - 1
+            allowed = max(tolerance, overrides.get(name, tolerance))
+            if change > allowed:
+                status = "regression"
+            elif change < -allowed:
+                status = "improvement"
+            else:
+                status = "ok"
+            comparisons.append(Comparison(name, status, change))
+    return comparisons
+
+
+def format_comparison(comparisons: List[Comparison], current: RunResults) -> str:
+    """Render a comparison as a table, one benchmark per line."""
+    width = max((len(c.name) for c in comparisons), default=10)
+    lines = [f"{'benchmark':<{width}}  {'best':>10}  {'change':>8}  status"]
+    for c in comparisons:
+        measured = current.benchmarks.get(c.name)
+        best = f"{measured.best * 1000:.2f}ms" if measured else "-"
+        change = f"{c.change:+.0%}" if c.change is not None else "-"
+        status = c.status.upper() if c.status == "regression" else c.status
+        lines.append(f"{c.name:<{width}}  {best:>10}  {change:>8}  {status}")
+    return "\n".join(lines)
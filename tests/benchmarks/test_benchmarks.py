@@ -0,0 +1,71 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Checks that every benchmark runs and that the baseline covers the suite.
+
+Timings are only compared by ``python -m tests.benchmarks``; here each
+benchmark runs once so a broken hot path or benchmark fails fast.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from .__main__ import DEFAULT_BASELINE
+from .cases import BENCHMARKS, synthetic_chunk_results, synthetic_response
+from .harness import Measurement, RunResults, compare
+
+
+@pytest.mark.parametrize("bench", BENCHMARKS, ids=lambda bench: bench.name)
+def test_benchmark_runs(bench) -> None:
+    missing = bench.missing_requirements()
+    if missing:
+        pytest.skip(f"missing {', '.join(missing)}")
+    bench.setup()()
+
+
+def test_baseline_covers_suite() -> None:
+    baseline = RunResults.load(DEFAULT_BASELINE)
+    assert sorted(baseline.benchmarks) == sorted(bench.name for bench in BENCHMARKS)
+
+
+def test_synthetic_inputs_exercise_the_code_paths() -> None:
+    from omnilingual_asr.models.inference import FakeBackend, GeminiASRPipeline
+    from omnilingual_asr.models.inference.gemini_pipeline import merge_chunk_results
+
+    result = GeminiASRPipeline(backend=FakeBackend())._parse_response(
+        synthetic_response(1500)
+    )
+    assert len(result.segments) == 1500
+    assert result.segments[-1].start == 4497.0  # HH:MM:SS timestamps past the hour
+
+    chunk_results = synthetic_chunk_results(1)
+    merged = merge_chunk_results(chunk_results)
+    # Overlapping chunks transcribe some segments twice; each is kept once
+    assert sum(len(r.segments) for _, r in chunk_results) > len(merged.segments) == 1200
+    assert merge_chunk_results(chunk_results[::-1]).segments == merged.segments
+
+
+def test_compare_flags_calibrated_slowdowns() -> None:
+    def run(calibration: float, **times: float) -> RunResults:
+        return RunResults(
+            calibration,
+            {name: Measurement(t, t, 1, t / calibration) for name, t in times.items()},
+        )
+
+    baseline = run(1.0, steady=1.0, slower=1.0, faster=1.0, dropped=1.0)
+    # Twice as slow a machine: absolute times double without any regression
+    current = run(2.0, steady=2.2, slower=3.0, faster=1.0, added=1.0)
+    current.skipped["dropped"] = "missing ffmpeg"
+
+    statuses = {c.name: c.status for c in compare(current, baseline, tolerance=0.3)}
+    assert statuses == {
+        "steady": "ok",
+        "slower": "regression",
+        "faster": "improvement",
+        "dropped": "skipped",
+        "added": "new",
+    }
@@ -4,13 +4,19 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
+from typing import TYPE_CHECKING
+
 import pytest
-import torch
+
+if TYPE_CHECKING:
+    import torch
 
 
 @pytest.fixture
-def device() -> torch.device:
+def device() -> "torch.device":
     """Only loading with CUDA as this takes 20+ minutes on CPU."""
+    # Imported here so suites that don't need torch run without it installed
+    torch = pytest.importorskip("torch")
     if torch.cuda.is_available():
         return torch.device("cuda")
     pytest.skip("CUDA not available")
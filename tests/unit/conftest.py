@@ -0,0 +1,35 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import wave
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+
+@pytest.fixture
+def write_wav(tmp_path: Path) -> Callable[..., Path]:
+    """Factory writing a silent 16-bit PCM WAV file into ``tmp_path``."""
+
+    def write(
+        seconds: float,
+        *,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        name: str = "audio.wav",
+    ) -> Path:
+        path = tmp_path / name
+        with wave.open(str(path), "wb") as f:
+            f.setnchannels(channels)
+            f.setsampwidth(2)
+            f.setframerate(sample_rate)
+            f.writeframes(b"\0\0" * channels * int(seconds * sample_rate))
+        return path
+
+    return write
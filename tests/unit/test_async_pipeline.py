@@ -0,0 +1,75 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""The asyncio pipeline against the fake backend."""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+
+import pytest
+
+from omnilingual_asr.models.inference import (
+    AsyncGeminiASRPipeline,
+    FakeBackend,
+    GeminiASRPipeline,
+    UploadRegistry,
+    async_pipeline,
+    gemini_pipeline,
+)
+
+
+def test_async_round_trip(write_wav) -> None:
+    path = write_wav(37.0)
+    pipeline = GeminiASRPipeline(backend=FakeBackend())
+    expected = pipeline.transcribe_with_retry(path)
+    result = asyncio.run(
+        AsyncGeminiASRPipeline(pipeline=pipeline).transcribe_with_retry(path)
+    )
+    assert [segment.text for segment in result.segments] == [
+        segment.text for segment in expected.segments
+    ]
+
+
+def test_concurrent_requests_share_one_upload(
+    write_wav, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for module in (gemini_pipeline, async_pipeline):
+        monkeypatch.setattr(module, "INLINE_AUDIO_LIMIT_BYTES", 0)
+    path = write_wav(10.0)
+    backend = FakeBackend()
+    pipeline = AsyncGeminiASRPipeline(
+        pipeline=GeminiASRPipeline(backend=backend, upload_registry=UploadRegistry())
+    )
+    upload = backend.aupload
+    calls = 0
+
+    async def flaky_upload(**upload_args):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("upload failed")
+        return await upload(**upload_args)
+
+    monkeypatch.setattr(backend, "aupload", flaky_upload)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(pipeline.transcribe_with_retry(path))
+    # The lock goes away with its last user, failed or not; the traceback
+    # of the failure refers to it until collected
+    gc.collect()
+    assert len(pipeline._upload_locks) == 0
+
+    async def run() -> list:
+        return await asyncio.gather(
+            *(pipeline.transcribe_with_retry(path) for _ in range(4))
+        )
+
+    assert all(result.segments for result in asyncio.run(run()))
+    assert calls == 2
+    assert backend.stats["uploads"] == 1
+    assert len(pipeline._upload_locks) == 0
@@ -0,0 +1,186 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Spreading requests over a pool of keys."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from omnilingual_asr.models.inference import (
+    FakeBackend,
+    GeminiASRPipeline,
+    KeyPoolBackend,
+    MetricsCollector,
+    UploadRegistry,
+    gemini_pipeline,
+)
+from omnilingual_asr.models.inference.backends import (
+    KEY_EJECT_SECONDS,
+    _ensure_genai,
+)
+
+
+def _pool(*fakes: FakeBackend, **kwargs: Any) -> KeyPoolBackend:
+    return KeyPoolBackend(fakes, metrics_collector=MetricsCollector(), **kwargs)
+
+
+def _request(part: Any) -> Dict[str, Any]:
+    _, types = _ensure_genai()
+    return dict(
+        model="gemini-2.5-flash",
+        contents=[
+            types.Content(role="user", parts=[part, types.Part(text="Transcribe.")])
+        ],
+    )
+
+
+def _audio_request(path: Path) -> Dict[str, Any]:
+    _, types = _ensure_genai()
+    return _request(
+        types.Part.from_bytes(data=path.read_bytes(), mime_type="audio/wav")
+    )
+
+
+def _file_request(uploaded: Any) -> Dict[str, Any]:
+    _, types = _ensure_genai()
+    return _request(types.Part.from_uri(file_uri=uploaded.uri, mime_type="audio/wav"))
+
+
+def _requests(*fakes: FakeBackend) -> List[int]:
+    return [fake.stats["requests"] for fake in fakes]
+
+
+def test_requests_go_to_the_least_loaded_key(write_wav) -> None:
+    first, second = FakeBackend(seed=1), FakeBackend(seed=2)
+    pool = _pool(first, second, tokens_per_minute=100_000)
+    pool.generate_content(**_audio_request(write_wav(600.0, name="long.wav")))
+    assert _requests(first, second) == [1, 0]
+    # The long request used far more of its key's tokens than these
+    short = _audio_request(write_wav(1.0, name="short.wav"))
+    for _ in range(3):
+        pool.generate_content(**short)
+    assert _requests(first, second) == [1, 3]
+    assert [key["requests_last_minute"] for key in pool.stats()] == [1, 3]
+
+
+def test_equally_loaded_keys_take_turns(write_wav) -> None:
+    fakes = [FakeBackend(seed=seed) for seed in range(3)]
+    pool = _pool(*fakes)
+    request = _audio_request(write_wav(1.0))
+    for _ in range(6):
+        pool.generate_content(**request)
+    assert _requests(*fakes) == [2, 2, 2]
+
+
+def test_requests_for_an_upload_stay_with_its_key(write_wav) -> None:
+    first, second = FakeBackend(seed=1), FakeBackend(seed=2)
+    pool = _pool(first, second)
+    uploaded = pool.upload(file=str(write_wav(5.0)))
+    owner, other = (first, second) if first.stats["uploads"] else (second, first)
+    request = _file_request(uploaded)
+    for _ in range(4):
+        pool.generate_content(**request)
+    # The other key can't see the file, so none of these went there
+    assert owner.stats["requests"] == 4
+    assert other.stats["requests"] == 0
+
+
+def test_throttled_key_is_ejected_and_backs_off(write_wav) -> None:
+    throttled, healthy = FakeBackend(throttle_rate=1.0, seed=1), FakeBackend(seed=2)
+    pool = _pool(throttled, healthy)
+    request = _audio_request(write_wav(1.0))
+    failures = 0
+    for _ in range(8):
+        try:
+            pool.generate_content(**request)
+        except Exception as exc:
+            assert getattr(exc, "code", None) == 429
+            failures += 1
+    # Two 429s in a row eject the key, then the other one takes everything
+    assert failures == 2
+    assert _requests(throttled, healthy) == [2, 6]
+    ejected = pool.stats()[0]["ejected_seconds"]
+    assert ejected == pytest.approx(KEY_EJECT_SECONDS, abs=1.0)
+
+    # Once back, another two 429s eject it for twice as long
+    pool._keys[0].ejected_until = 0.0
+    pool._next = 0
+    for _ in range(4):
+        try:
+            pool.generate_content(**request)
+        except Exception:
+            failures += 1
+    assert failures == 4
+    ejected = pool.stats()[0]["ejected_seconds"]
+    assert ejected == pytest.approx(2 * KEY_EJECT_SECONDS, abs=1.0)
+
+
+def test_every_key_ejected_uses_the_one_back_soonest(write_wav) -> None:
+    first, second = FakeBackend(seed=1), FakeBackend(seed=2)
+    pool = _pool(first, second)
+    now = time.monotonic()
+    pool._keys[0].ejected_until = now + 60.0
+    pool._keys[1].ejected_until = now + 30.0
+    pool.generate_content(**_audio_request(write_wav(1.0)))
+    assert _requests(first, second) == [0, 1]
+
+
+def test_upload_on_ejected_key_is_reported_missing(write_wav) -> None:
+    first, second = FakeBackend(seed=1), FakeBackend(seed=2)
+    pool = _pool(first, second)
+    uploaded = pool.upload(file=str(write_wav(5.0)))
+    owner = 0 if first.stats["uploads"] else 1
+    pool._keys[owner].ejected_until = time.monotonic() + 60.0
+    with pytest.raises(Exception) as raised:
+        pool.generate_content(**_file_request(uploaded))
+    assert getattr(raised.value, "code", None) == 404
+    assert _requests(first, second) == [0, 0]
+
+
+def test_pipeline_uploads_again_when_the_owner_is_ejected(
+    write_wav, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(gemini_pipeline, "INLINE_AUDIO_LIMIT_BYTES", 0)
+    path = write_wav(10.0)
+    fakes = [FakeBackend(seed=1), FakeBackend(seed=2)]
+    pool = _pool(*fakes)
+    pipeline = GeminiASRPipeline(backend=pool, upload_registry=UploadRegistry())
+    pipeline.transcribe_with_retry(path)
+    owner = 0 if fakes[0].stats["uploads"] else 1
+    pool._keys[owner].ejected_until = time.monotonic() + 60.0
+
+    result = pipeline.transcribe_with_retry(path)
+    assert result.segments
+    # The audio was uploaded again with the other key, and sent there
+    other = fakes[1 - owner]
+    assert other.stats["uploads"] == 1
+    assert other.stats["requests"] == 1
+    assert fakes[owner].stats["requests"] == 1
+
+
+def test_usage_per_key_is_exported(write_wav) -> None:
+    throttled, healthy = FakeBackend(throttle_rate=1.0, seed=1), FakeBackend(seed=2)
+    pool = _pool(throttled, healthy)
+    request = _audio_request(write_wav(1.0))
+    for _ in range(5):
+        try:
+            pool.generate_content(**request)
+        except Exception:
+            pass
+    lines = pool.metrics_collector.render().splitlines()
+    assert 'gemini_asr_key_requests_total{key="fake-1",outcome="429"} 2' in lines
+    assert 'gemini_asr_key_requests_total{key="fake-2",outcome="ok"} 3' in lines
+    assert 'gemini_asr_key_ejections_total{key="fake-1"} 1' in lines
+    [tokens] = [
+        line for line in lines if line.startswith("gemini_asr_key_tokens_total{")
+    ]
+    assert tokens.startswith('gemini_asr_key_tokens_total{key="fake-2"} ')
+    assert int(tokens.split()[-1]) > 0
@@ -0,0 +1,137 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Result cache keys, eviction and persistence."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from omnilingual_asr.models.inference import (
+    FakeBackend,
+    GeminiASRPipeline,
+    MemoryTranscriptionCache,
+    SQLiteTranscriptionCache,
+)
+from omnilingual_asr.models.inference.cache import file_sha256, make_cache_key
+from omnilingual_asr.models.inference.gemini_pipeline import _Prompt
+
+KEY_ARGS: Dict[str, Any] = {
+    "model": "gemini-2.5-flash",
+    "prompt": "Transcribe this audio.",
+    "schema": {"type": "object", "properties": {"summary": {"type": "string"}}},
+}
+
+
+def _value(size: int) -> dict:
+    return {"summary": "x" * size, "segments": []}
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"model": "gemini-2.5-pro"},
+        {"prompt": "Transcribe this audio in French."},
+        {"schema": {"type": "object"}},
+        {"variant": "chunked"},
+    ],
+    ids=lambda change: next(iter(change)),
+)
+def test_key_depends_on_request(change: dict) -> None:
+    assert make_cache_key("ab" * 32, **KEY_ARGS) != make_cache_key(
+        "ab" * 32, **{**KEY_ARGS, **change}
+    )
+
+
+def test_key_ignores_schema_key_order() -> None:
+    schema = KEY_ARGS["schema"]
+    reordered = dict(reversed(list(schema.items())))
+    assert make_cache_key("ab" * 32, **KEY_ARGS) == make_cache_key(
+        "ab" * 32, **{**KEY_ARGS, "schema": reordered}
+    )
+
+
+def test_pipeline_key_depends_on_audio_and_transcode(write_wav) -> None:
+    path = write_wav(1.0)
+    prompt = _Prompt("Transcribe this audio.", {}, frozenset())
+    plain = GeminiASRPipeline(backend=FakeBackend())
+    key = plain._cache_key(path, prompt)
+    assert plain._cache_key(path, prompt) == key
+    for transcode in ("lossless", "compact"):
+        pipeline = GeminiASRPipeline(backend=FakeBackend(), transcode=transcode)
+        assert pipeline._cache_key(path, prompt) != key
+    assert plain._cache_key(write_wav(2.0, name="other.wav"), prompt) != key
+
+
+def test_file_digest_follows_content_changes(tmp_path: Path) -> None:
+    path = tmp_path / "audio.bin"
+    path.write_bytes(b"first")
+    first = file_sha256(path)
+    assert file_sha256(path) == first
+    path.write_bytes(b"second, longer")
+    assert file_sha256(path) != first
+
+
+def test_memory_cache_evicts_least_recently_used() -> None:
+    cache = MemoryTranscriptionCache(max_entries=2)
+    cache.put("a", _value(1))
+    cache.put("b", _value(1))
+    assert cache.get("a") is not None  # "b" is now the oldest
+    cache.put("c", _value(1))
+    assert cache.get("b") is None
+    assert cache.get("a") == _value(1)
+    assert cache.get("c") == _value(1)
+
+
+def test_sqlite_cache_evicts_by_size(tmp_path: Path) -> None:
+    cache = SQLiteTranscriptionCache(tmp_path / "cache.db", max_bytes=2500)
+    for key in ("a", "b"):
+        cache.put(key, _value(1000))
+    assert cache.get("a") is not None  # "b" is now the oldest
+    cache.put("c", _value(1000))
+    assert cache.get("b") is None
+    assert cache.get("a") == _value(1000)
+    assert cache.get("c") == _value(1000)
+    cache.put("huge", _value(5000))  # Larger than the whole cache: not stored
+    assert cache.get("huge") is None
+    assert cache.get("a") is not None
+    cache.close()
+
+
+def test_sqlite_cache_persists(tmp_path: Path) -> None:
+    path = tmp_path / "cache" / "results.db"
+    cache = SQLiteTranscriptionCache(path)
+    cache.put("key", _value(10))
+    cache.close()
+
+    reopened = SQLiteTranscriptionCache(path)
+    assert reopened.get("key") == _value(10)
+    journal_mode = reopened._conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert journal_mode == "wal"
+    reopened.clear()
+    assert reopened.get("key") is None
+    reopened.close()
+
+
+def test_pipeline_serves_repeat_from_cache(write_wav, tmp_path: Path) -> None:
+    path = write_wav(10.0)
+    backend = FakeBackend()
+    cache = SQLiteTranscriptionCache(tmp_path / "cache.db")
+    pipeline = GeminiASRPipeline(backend=backend, cache=cache)
+    first = pipeline.transcribe_with_retry(path)
+    second = pipeline.transcribe_with_retry(path)
+    assert backend.stats["requests"] == 1
+    assert [segment.text for segment in second.segments] == [
+        segment.text for segment in first.segments
+    ]
+    # Rewriting the file with other content misses the cache
+    path.write_bytes(write_wav(12.0, name="longer.wav").read_bytes())
+    pipeline.transcribe_with_retry(path)
+    assert backend.stats["requests"] == 2
+    cache.close()
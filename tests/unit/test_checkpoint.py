@@ -0,0 +1,42 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Per-chunk checkpoints of long-file jobs."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from omnilingual_asr.models.inference.audio import PlannedChunk
+from omnilingual_asr.models.inference.checkpoint import ChunkCheckpoint
+
+
+def test_checkpoint_round_trip(tmp_path: Path) -> None:
+    chunk = PlannedChunk(start=0.0, end=32.0, own_start=0.0, own_end=30.0)
+    checkpoint = ChunkCheckpoint(tmp_path, "ab" * 32, "job")
+    assert checkpoint.load(chunk) is None
+    checkpoint.save(chunk, {"segments": [{"text": "hello"}]})
+
+    reopened = ChunkCheckpoint(tmp_path, "ab" * 32, "job")
+    assert reopened.load(chunk) == {"segments": [{"text": "hello"}]}
+    # Another chunk plan or job settings miss instead of restoring stale spans
+    moved = PlannedChunk(start=0.0, end=31.0, own_start=0.0, own_end=29.0)
+    assert reopened.load(moved) is None
+    assert ChunkCheckpoint(tmp_path, "ab" * 32, "other job").load(chunk) is None
+    assert not list(reopened.directory.glob("*.tmp"))
+
+
+def test_clear_removes_job_and_empty_audio_directory(tmp_path: Path) -> None:
+    chunk = PlannedChunk(start=0.0, end=32.0, own_start=0.0, own_end=30.0)
+    first = ChunkCheckpoint(tmp_path, "ab" * 32, "first")
+    second = ChunkCheckpoint(tmp_path, "ab" * 32, "second")
+    first.save(chunk, {})
+    second.save(chunk, {})
+    first.clear()
+    assert not first.directory.exists()
+    assert second.load(chunk) == {}
+    second.clear()
+    assert list(tmp_path.iterdir()) == []
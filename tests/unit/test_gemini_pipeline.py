@@ -0,0 +1,194 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Chunk merging and end-to-end transcription against the fake backend."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from omnilingual_asr.models.inference import (
+    AdaptiveRateLimiter,
+    FakeBackend,
+    GeminiASRPipeline,
+    GeminiTranscriptionResult,
+    GeminiTranscriptSegment,
+    gemini_pipeline,
+)
+from omnilingual_asr.models.inference.audio import PlannedChunk
+from omnilingual_asr.models.inference.backends import _api_error
+from omnilingual_asr.models.inference.gemini_pipeline import merge_chunk_results
+
+
+class _RejectFirst(FakeBackend):
+    """Fake backend that refuses the first request as invalid."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.rejected = False
+
+    def _check(self) -> None:
+        with self._lock:
+            first, self.rejected = not self.rejected, True
+        if first:
+            raise _api_error(
+                400, "Request contains an invalid argument (fake)", "INVALID_ARGUMENT"
+            )
+
+    def generate_content(self, **request: Any) -> Any:
+        self._check()
+        return super().generate_content(**request)
+
+    def generate_content_stream(self, **request: Any) -> Any:
+        self._check()
+        return super().generate_content_stream(**request)
+
+
+def _result(*segments: tuple[float, float, str]) -> GeminiTranscriptionResult:
+    return GeminiTranscriptionResult(
+        segments=[
+            GeminiTranscriptSegment(start, end, "Speaker 1", text)
+            for start, end, text in segments
+        ]
+    )
+
+
+def _merged_texts(second: GeminiTranscriptionResult) -> list[str]:
+    first = _result(
+        (0.0, 10.0, "four score and seven years ago"),
+        (10.0, 20.0, "our fathers brought forth"),
+        (27.0, 31.5, "that this nation"),
+    )
+    merged = merge_chunk_results(
+        [
+            (PlannedChunk(start=0.0, end=32.0, own_start=0.0, own_end=30.0), first),
+            (PlannedChunk(start=28.0, end=60.0, own_start=30.0, own_end=60.0), second),
+        ]
+    )
+    return [segment.text for segment in merged.segments]
+
+
+def test_merge_drops_segments_outside_own_span() -> None:
+    # Midpoint 29.25 belongs to the first chunk
+    second = _result((27.5, 31.0, "that this nation"), (31.5, 40.0, "under god"))
+    assert _merged_texts(second) == [
+        "four score and seven years ago",
+        "our fathers brought forth",
+        "that this nation",
+        "under god",
+    ]
+
+
+def test_merge_keeps_longer_boundary_duplicate() -> None:
+    # Midpoint 30.5 belongs to the second chunk, which heard more of the phrase
+    second = _result(
+        (29.5, 31.5, "That this nation, under God,"), (31.5, 40.0, "shall have")
+    )
+    assert _merged_texts(second) == [
+        "four score and seven years ago",
+        "our fathers brought forth",
+        "That this nation, under God,",
+        "shall have",
+    ]
+
+
+def test_merge_keeps_distinct_text_near_cut() -> None:
+    second = _result((30.0, 33.0, "shall not perish from the earth"))
+    assert _merged_texts(second)[-2:] == [
+        "that this nation",
+        "shall not perish from the earth",
+    ]
+
+
+def test_round_trip(write_wav) -> None:
+    backend = FakeBackend()
+    result = GeminiASRPipeline(backend=backend).transcribe_with_retry(write_wav(37.0))
+    assert [(segment.start, segment.end) for segment in result.segments[:2]] == [
+        (0.0, 4.0),
+        (4.0, 8.0),
+    ]
+    assert result.segments[-1].end == pytest.approx(37.0)
+    assert not result.truncated
+    assert result.metrics is not None
+    assert [request.kind for request in result.metrics.requests] == ["transcribe"]
+    assert backend.stats["requests"] == 1
+
+
+def test_truncated_response_is_continued(write_wav) -> None:
+    backend = FakeBackend(truncation_rate=1.0, seed=1)
+    result = GeminiASRPipeline(backend=backend).transcribe_with_retry(write_wav(37.0))
+    assert result.metrics is not None
+    kinds = [request.kind for request in result.metrics.requests]
+    assert kinds[0] == "transcribe"
+    assert kinds[1:] and set(kinds[1:]) == {"continuation"}
+    starts = [segment.start for segment in result.segments]
+    assert starts == sorted(starts)
+    assert len(set(starts)) == len(starts)
+    assert result.segments[-1].end >= 32.0
+    assert not result.truncated
+
+
+def test_chunked_round_trip(write_wav) -> None:
+    result = GeminiASRPipeline(backend=FakeBackend()).transcribe_chunked(
+        write_wav(100.0), chunk_duration=30.0, overlap=2.0, snap_to_silence=False
+    )
+    assert result.failed_chunks == []
+    assert result.metrics is not None
+    assert len(result.metrics.requests) == 4
+    starts = [segment.start for segment in result.segments]
+    assert starts == sorted(starts)
+    assert result.segments[-1].end == pytest.approx(100.0, abs=1.0)
+
+
+def test_failed_chunk_is_reported_and_resumed(write_wav, tmp_path: Path) -> None:
+    path = write_wav(100.0)
+    checkpoint_dir = tmp_path / "checkpoints"
+    options: dict[str, Any] = dict(
+        chunk_duration=30.0, overlap=2.0, snap_to_silence=False
+    )
+    pipeline = GeminiASRPipeline(backend=_RejectFirst(), checkpoint_dir=checkpoint_dir)
+    partial = pipeline.transcribe_chunked(path, **options)
+    assert len(partial.failed_chunks) == 1
+    failure = partial.failed_chunks[0]
+    assert (failure.attempts, failure.retryable) == (1, False)
+    assert "INVALID_ARGUMENT" in failure.error
+    # The other chunks are merged around the gap; only the overlap with its
+    # neighbours may hold segments
+    assert partial.segments
+    assert not any(
+        failure.start + 2.0 < (segment.start + segment.end) / 2 < failure.end - 2.0
+        for segment in partial.segments
+    )
+
+    backend = FakeBackend()
+    pipeline = GeminiASRPipeline(backend=backend, checkpoint_dir=checkpoint_dir)
+    resumed = pipeline.transcribe_chunked(path, **options)
+    assert backend.stats["requests"] == 1
+    assert resumed.failed_chunks == []
+    assert resumed.segments[-1].end == pytest.approx(100.0, abs=1.0)
+    assert len(resumed.segments) > len(partial.segments)
+    # Complete jobs drop their checkpoint
+    assert not any(checkpoint_dir.rglob("*.json"))
+
+
+def test_server_errors_are_retried_per_chunk(
+    write_wav, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(gemini_pipeline, "backoff_delay", lambda attempt: 0.0)
+    backend = FakeBackend(server_error_rate=0.3, seed=2)
+    # 503s from the fake would pause the shared limiter for other tests
+    limiter = AdaptiveRateLimiter(throttle_cooldown=0.0)
+    pipeline = GeminiASRPipeline(backend=backend, rate_limiter=limiter)
+    result = pipeline.transcribe_chunked(
+        write_wav(100.0), chunk_duration=30.0, overlap=2.0, snap_to_silence=False
+    )
+    assert backend.stats["server_errors"] > 0
+    assert result.failed_chunks == []
+    assert result.metrics is not None
+    assert result.metrics.retries == backend.stats["server_errors"]
@@ -0,0 +1,115 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Duplicates of slow requests and what they cost."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from omnilingual_asr.models.inference import (
+    AdaptiveRateLimiter,
+    AsyncGeminiASRPipeline,
+    FakeBackend,
+    FakeLatency,
+    GeminiASRPipeline,
+    RequestHedger,
+)
+from omnilingual_asr.models.inference.metrics import RequestMetrics
+
+
+def _hedger(latency: float) -> RequestHedger:
+    """Hedger that duplicates every request running longer than ``latency``."""
+    hedger = RequestHedger(budget=1.0, min_samples=1)
+    hedger.observe(latency)
+    return hedger
+
+
+def _send(pipeline: GeminiASRPipeline, path: Path, *, use_async: bool) -> Any:
+    """Send one hedged request for ``path``, the way chunks are sent."""
+    prompt = pipeline._build_prompt()
+    request = RequestMetrics("transcribe")
+    if not use_async:
+        audio_input = pipeline._prepare_audio_input(path, request)
+        return pipeline._generate_hedged(audio_input, prompt, request=request)
+
+    async def send() -> Any:
+        async_pipeline = AsyncGeminiASRPipeline(pipeline=pipeline)
+        audio_input = await async_pipeline._prepare_audio_input(path, request)
+        return await async_pipeline._generate_hedged(
+            audio_input, prompt, request=request
+        )
+
+    return asyncio.run(send())
+
+
+def test_queued_duplicate_is_dropped_without_using_quota(write_wav) -> None:
+    backend = FakeBackend(latency=FakeLatency(base=0.3))
+    # The duplicate waits for the next minute's request, which never comes
+    limiter = AdaptiveRateLimiter(requests_per_minute=1)
+    hedger = _hedger(0.05)
+    pipeline = GeminiASRPipeline(backend=backend, rate_limiter=limiter, hedging=hedger)
+    prompt = pipeline._build_prompt()
+    request = RequestMetrics("transcribe")
+    audio_input = pipeline._prepare_audio_input(write_wav(5.0), request)
+    response = pipeline._generate_hedged(audio_input, prompt, request=request)
+    assert response.text
+    assert hedger.stats()["hedges"] == 1
+    assert backend.stats["requests"] == 1
+    stats = limiter.stats()
+    assert stats["requests_last_minute"] == 1
+    assert stats["completed_total"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_attempt_threads_only_run_for_hedged_requests(write_wav) -> None:
+    path = write_wav(5.0)
+    plain = GeminiASRPipeline(backend=FakeBackend())
+    plain.transcribe_chunked(path, chunk_duration=2.0, overlap=0.0)
+    assert plain._attempts is None
+
+    pipeline = GeminiASRPipeline(backend=FakeBackend(), hedging=_hedger(1.0))
+    pipeline.transcribe_chunked(path, chunk_duration=2.0, overlap=0.0)
+    attempts = pipeline._attempts
+    assert attempts is not None
+    pipeline.close()
+    assert pipeline._attempts is None
+    with pytest.raises(RuntimeError):
+        attempts.submit(print)
+    # Closing only stops the threads; the next hedged request starts new ones
+    assert pipeline.transcribe_chunked(path, chunk_duration=2.0, overlap=0.0).segments
+    assert pipeline._attempts is not None
+    pipeline.close()
+
+
+@pytest.mark.parametrize("use_async", [False, True], ids=["sync", "async"])
+@pytest.mark.parametrize("hedging", [False, True], ids=["learning", "hedging"])
+def test_hedging_ignores_time_waiting_for_a_slot(
+    write_wav, use_async: bool, hedging: bool
+) -> None:
+    path = write_wav(5.0)
+    limiter = AdaptiveRateLimiter(initial_concurrency=1, max_concurrency=1)
+    # Until enough latencies are known, requests are timed but not hedged
+    hedger = _hedger(0.2) if hedging else RequestHedger()
+    pipeline = GeminiASRPipeline(
+        backend=FakeBackend(latency=FakeLatency(base=0.1)),
+        rate_limiter=limiter,
+        hedging=hedger,
+    )
+    # The request queues for 0.3 s, longer than the hedging delay
+    held = limiter.acquire()
+    threading.Timer(0.3, limiter.release, [held]).start()
+    assert _send(pipeline, path, use_async=use_async).text
+    # It was only hedged if it ran 0.2 s after it was sent, and its
+    # latency counts from then
+    assert hedger.stats()["hedges"] == 0
+    assert 0.1 <= hedger._latencies[-1] < 0.25
+    pipeline.close()
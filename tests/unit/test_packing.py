@@ -0,0 +1,128 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Packing of short clips into shared requests and splitting the results."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from omnilingual_asr.models.inference import (
+    FakeBackend,
+    GeminiASRPipeline,
+    GeminiTranscriptionResult,
+    GeminiTranscriptSegment,
+)
+from omnilingual_asr.models.inference.gemini_pipeline import (
+    ChunkFailure,
+    split_pack_result,
+)
+from omnilingual_asr.models.inference.packing import ClipPack, ClipPacker
+
+SECOND = 16000 * 2  # Bytes of 16 kHz mono s16le audio
+
+
+def _pack(durations: list[float], target: float = 300.0) -> ClipPack:
+    packer = ClipPacker(target_duration=target)
+    for index, duration in enumerate(durations):
+        samples = bytes(int(duration * SECOND))
+        assert packer.add(index, Path(f"clip{index}.wav"), samples) is None
+    pack = packer.flush()
+    assert pack is not None
+    return pack
+
+
+def _segment(start: float, end: float, text: str = "text") -> GeminiTranscriptSegment:
+    return GeminiTranscriptSegment(start, end, "Speaker 1", text)
+
+
+def test_clips_start_on_whole_seconds_after_a_gap() -> None:
+    pack = _pack([2.5, 3.0, 1.2])
+    assert [clip.offset for clip in pack.clips] == [0.0, 4.0, 8.0]
+    assert pack.audio.duration == pytest.approx(9.2)
+    assert "00:00, 00:04, 00:08" in pack.prompt_hint()
+
+
+def test_full_pack_is_returned_when_the_next_clip_does_not_fit() -> None:
+    packer = ClipPacker(target_duration=10.0)
+    assert packer.add(0, Path("a.wav"), bytes(6 * SECOND)) is None
+    full = packer.add(1, Path("b.wav"), bytes(6 * SECOND))
+    assert full is not None
+    assert [clip.index for clip in full.clips] == [0]
+    rest = packer.flush()
+    assert rest is not None
+    assert [(clip.index, clip.offset) for clip in rest.clips] == [(1, 0.0)]
+    assert packer.flush() is None
+
+
+def test_pack_key_covers_every_clip() -> None:
+    def key(second_clip: bytes) -> str:
+        packer = ClipPacker()
+        packer.add(0, Path("a.wav"), bytes(2 * SECOND))
+        packer.add(1, Path("b.wav"), second_clip)
+        pack = packer.flush()
+        assert pack is not None
+        return pack.audio.key
+
+    assert key(bytes(2 * SECOND)) == key(bytes(2 * SECOND))
+    assert key(bytes(2 * SECOND)) != key(b"\x01\x00" * SECOND)
+
+
+def test_clip_at_assigns_segments_to_one_clip() -> None:
+    pack = _pack([2.5, 3.0, 1.2])  # Clips at 0-2.5, 4-7 and 8-9.2
+    assert pack.clip_at(0.0, 2.0) == 0
+    assert pack.clip_at(4.5, 6.5) == 1
+    assert pack.clip_at(8.0, 9.0) == 2
+    # Straddling segments go to the clip they overlap most
+    assert pack.clip_at(2.0, 4.5) == 0
+    assert pack.clip_at(3.0, 6.0) == 1
+
+
+def test_split_pack_result_keeps_segments_inside_their_clip() -> None:
+    pack = _pack([2.5, 3.0, 1.2])
+    result = GeminiTranscriptionResult(
+        segments=[
+            _segment(0.0, 3.0, "first overruns"),
+            _segment(3.8, 6.0, "second starts early"),
+            _segment(6.0, 7.5, "second"),
+            _segment(8.0, 10.0, "third overruns the pack"),
+        ]
+    )
+    per_clip = split_pack_result(result, pack)
+    assert [
+        [(segment.start, segment.end) for segment in clip.segments] for clip in per_clip
+    ] == [[(0.0, 2.5)], [(0.0, 2.0), (2.0, 3.0)], [(0.0, 1.2)]]
+    for clip, clip_result in zip(pack.clips, per_clip):
+        for segment in clip_result.segments:
+            assert 0.0 <= segment.start <= segment.end <= clip.duration
+
+
+def test_split_pack_failure_fails_every_clip() -> None:
+    pack = _pack([2.5, 3.0])
+    failure = ChunkFailure(0.0, 7.0, "ServerError: 500", attempts=3, retryable=True)
+    per_clip = split_pack_result(failure, pack)
+    assert [
+        (clip_result.failed_chunks[0].start, clip_result.failed_chunks[0].end)
+        for clip_result in per_clip
+    ] == [(0.0, 2.5), (0.0, 3.0)]
+
+
+def test_transcribe_clips_round_trip(write_wav) -> None:
+    paths = [
+        write_wav(duration, name=f"clip{index}.wav")
+        for index, duration in enumerate([6.0, 9.0, 5.0, 7.0])
+    ]
+    backend = FakeBackend()
+    results = GeminiASRPipeline(backend=backend).transcribe_clips(
+        paths, target_duration=20.0
+    )
+    assert backend.stats["requests"] == 2
+    assert len(results) == len(paths)
+    for result, duration in zip(results, [6.0, 9.0, 5.0, 7.0]):
+        assert result.segments
+        assert all(0.0 <= s.start <= s.end <= duration for s in result.segments)
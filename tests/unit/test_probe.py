@@ -0,0 +1,79 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Header probing of known audio formats without ffprobe."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from omnilingual_asr.models.inference import probe_audio, probe_bytes
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _flac_header(
+    sample_rate: int, channels: int, bits: int, total_samples: int
+) -> bytes:
+    packed = (
+        (sample_rate << 44)
+        | ((channels - 1) << 41)
+        | ((bits - 1) << 36)
+        | total_samples
+    )
+    streaminfo = (
+        (4096).to_bytes(2, "big") * 2
+        + bytes(6)  # Min/max frame size unknown
+        + packed.to_bytes(8, "big")
+        + bytes(16)  # MD5
+    )
+    # Last-metadata-block flag set, block type 0 (STREAMINFO)
+    return b"fLaC" + bytes([0x80]) + len(streaminfo).to_bytes(3, "big") + streaminfo
+
+
+@pytest.mark.parametrize("sample_rate,channels", [(16000, 1), (44100, 2)])
+def test_wav_header(write_wav, sample_rate: int, channels: int) -> None:
+    path = write_wav(2.5, sample_rate=sample_rate, channels=channels)
+    info = probe_audio(path)
+    assert info.duration == pytest.approx(2.5)
+    assert info.sample_rate == sample_rate
+    assert info.channels == channels
+    assert info.codec == "pcm_16"
+    assert info.bit_rate == sample_rate * channels * 16
+    assert info.source == "header"
+
+
+def test_repo_sample_wav() -> None:
+    info = probe_audio(REPO_ROOT / "gettysburg.wav")
+    assert info.sample_rate == 22050
+    assert info.channels == 1
+    assert info.duration == pytest.approx(17.577, abs=0.001)
+
+
+def test_flac_streaminfo(tmp_path: Path) -> None:
+    path = tmp_path / "audio.flac"
+    path.write_bytes(_flac_header(48000, 2, 24, 48000 * 3))
+    info = probe_audio(path)
+    assert (info.duration, info.sample_rate, info.channels) == (3.0, 48000, 2)
+    assert info.codec == "flac"
+    assert info.source == "header"
+
+
+def test_probe_bytes(write_wav) -> None:
+    wav = probe_bytes(write_wav(1.0).read_bytes())
+    flac = probe_bytes(_flac_header(16000, 1, 16, 8000))
+    assert wav is not None and wav.duration == pytest.approx(1.0)
+    assert flac is not None and flac.duration == 0.5
+    assert probe_bytes(b"not an audio file" * 8) is None
+
+
+def test_truncated_wav_reports_what_is_there(write_wav) -> None:
+    path = write_wav(2.0)
+    data = path.read_bytes()
+    path.write_bytes(data[: len(data) - 16000 * 2])  # Drop the last second
+    assert probe_audio(path).duration == pytest.approx(1.0)
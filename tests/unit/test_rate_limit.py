@@ -0,0 +1,106 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""AIMD concurrency control of the adaptive rate limiter."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+
+import pytest
+
+from omnilingual_asr.models.inference import AdaptiveRateLimiter
+from omnilingual_asr.models.inference.backends import _api_error
+from omnilingual_asr.models.inference.rate_limit import is_throttle_error
+
+
+def _limiter(initial_concurrency: int = 8, **kwargs) -> AdaptiveRateLimiter:
+    return AdaptiveRateLimiter(
+        initial_concurrency=initial_concurrency, throttle_cooldown=0.0, **kwargs
+    )
+
+
+def test_throttle_halves_limit() -> None:
+    limiter = _limiter()
+    limiter.release(limiter.acquire(), throttled=True, succeeded=False)
+    assert limiter.concurrency_limit == 4
+    assert limiter.stats()["throttled_total"] == 1
+
+
+def test_burst_of_throttles_halves_once() -> None:
+    limiter = _limiter()
+    permits = [limiter.acquire() for _ in range(4)]
+    for permit in permits:
+        limiter.release(permit, throttled=True, succeeded=False)
+    assert limiter.concurrency_limit == 4
+    assert limiter.stats()["throttled_total"] == 4
+
+
+def test_limit_stays_at_minimum() -> None:
+    limiter = _limiter(initial_concurrency=1, min_concurrency=1)
+    limiter.release(limiter.acquire(), throttled=True, succeeded=False)
+    assert limiter.concurrency_limit == 1
+
+
+def test_successes_grow_limit_additively() -> None:
+    limiter = _limiter(initial_concurrency=4, max_concurrency=5)
+    # Each success adds 1/limit, so a slot takes slightly more than a limit's worth
+    for _ in range(4):
+        limiter.release(limiter.acquire())
+    assert limiter.concurrency_limit == 4
+    limiter.release(limiter.acquire())
+    assert limiter.concurrency_limit == 5
+    for _ in range(20):
+        limiter.release(limiter.acquire())
+    assert limiter.concurrency_limit == 5
+
+
+def test_slot_classifies_errors() -> None:
+    limiter = _limiter()
+    with pytest.raises(Exception):
+        with limiter.slot():
+            raise _api_error(500, "Internal error", "INTERNAL")
+    assert limiter.concurrency_limit == 8
+    with pytest.raises(Exception):
+        with limiter.slot():
+            raise _api_error(429, "Quota exceeded", "RESOURCE_EXHAUSTED")
+    assert limiter.concurrency_limit == 4
+    assert limiter.stats()["in_flight"] == 0
+
+
+def test_cancelled_waiter_reserves_nothing() -> None:
+    limiter = _limiter(initial_concurrency=1, max_concurrency=1)
+    held = limiter.acquire(100)
+    cancelled = threading.Event()
+    with concurrent.futures.ThreadPoolExecutor(1) as executor:
+        waiter = executor.submit(limiter.acquire, 100, cancelled=cancelled)
+        with pytest.raises(concurrent.futures.TimeoutError):
+            waiter.result(timeout=0.1)
+        cancelled.set()
+        with pytest.raises(concurrent.futures.CancelledError):
+            waiter.result(timeout=1.0)
+    limiter.release(held)
+    stats = limiter.stats()
+    assert stats["in_flight"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["requests_last_minute"] == 1
+    assert stats["tokens_last_minute"] == 100
+    assert stats["completed_total"] == 1
+
+
+@pytest.mark.parametrize(
+    "exc,expected",
+    [
+        (_api_error(429, "Quota exceeded", "RESOURCE_EXHAUSTED"), True),
+        (_api_error(503, "Overloaded", "UNAVAILABLE"), True),
+        (RuntimeError("503 UNAVAILABLE"), True),
+        (_api_error(400, "Bad request", "INVALID_ARGUMENT"), False),
+        (ValueError("bad JSON"), False),
+    ],
+)
+def test_is_throttle_error(exc: BaseException, expected: bool) -> None:
+    assert is_throttle_error(exc) is expected
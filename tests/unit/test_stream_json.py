@@ -0,0 +1,70 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Incremental parsing of streamed and truncated JSON responses."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from omnilingual_asr.models.inference.stream_json import (
+    SegmentStreamParser,
+    recover_truncated_json,
+)
+
+SEGMENTS = [
+    {"start": "00:00", "end": "00:04", "text": 'He said "{hello}", then left'},
+    {
+        "start": "00:04",
+        "end": "00:08",
+        "text": "back\\slash ] and [",
+        "words": [{"w": "a"}],
+    },
+    {"start": "00:08", "end": "00:12", "text": "last"},
+]
+DOCUMENT = (
+    "```json\n"
+    + json.dumps({"summary": "A {tricky} one", "segments": SEGMENTS})
+    + "\n```"
+)
+
+
+@pytest.mark.parametrize("piece_size", [1, 7, len(DOCUMENT)])
+def test_parser_emits_each_element_once(piece_size: int) -> None:
+    parser = SegmentStreamParser()
+    emitted = []
+    for i in range(0, len(DOCUMENT), piece_size):
+        emitted += parser.feed(DOCUMENT[i : i + piece_size])
+    assert emitted == SEGMENTS
+    assert parser.count == len(SEGMENTS)
+    assert parser.text == DOCUMENT
+
+
+def test_parser_emits_element_when_it_closes() -> None:
+    first = json.dumps(SEGMENTS[0])
+    parser = SegmentStreamParser()
+    assert parser.feed('{"segments": [' + first[:-1]) == []
+    assert parser.feed(first[-1:]) == [SEGMENTS[0]]
+
+
+def test_parser_ignores_other_arrays() -> None:
+    parser = SegmentStreamParser()
+    text = json.dumps({"languages": [{"code": "en"}], "segments": SEGMENTS[:1]})
+    assert parser.feed(text) == SEGMENTS[:1]
+
+
+def test_recover_truncated_json() -> None:
+    text = json.dumps({"summary": "A {tricky} one", "segments": SEGMENTS})
+    cut = text.index('"last"')
+    recovered = recover_truncated_json(text[:cut])
+    assert recovered == {"segments": SEGMENTS[:2], "summary": "A {tricky} one"}
+
+
+def test_recover_truncated_json_without_anything_complete() -> None:
+    assert recover_truncated_json('{"summary": "cut off') is None
+    assert recover_truncated_json('{"segments": [{"start": "00:00"') is None
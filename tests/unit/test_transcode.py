@@ -0,0 +1,120 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Transcoding decisions, presets and ffmpeg output."""
+
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from omnilingual_asr.models.inference import (
+    AdaptiveRateLimiter,
+    FakeBackend,
+    GeminiASRPipeline,
+    gemini_pipeline,
+    probe_bytes,
+)
+from omnilingual_asr.models.inference.probe import AudioInfo
+from omnilingual_asr.models.inference.transcode import (
+    TRANSCODE_PRESETS,
+    TranscodeSettings,
+    needs_transcode,
+    resolve_transcode,
+    transcode_audio,
+    transcode_bytes,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SAMPLE = REPO_ROOT / "gettysburg.wav"  # 22.05 kHz mono 16-bit PCM
+
+requires_ffmpeg = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None, reason="ffmpeg not installed"
+)
+
+
+@pytest.mark.parametrize(
+    "info,expected",
+    [
+        (AudioInfo(10.0, 16000, 1, "pcm_16"), True),  # Uncompressed
+        (AudioInfo(10.0, 48000, 1, "opus"), True),  # Higher sample rate
+        (AudioInfo(10.0, 16000, 2, "mp3"), True),  # Stereo
+        (AudioInfo(10.0, 16000, 1, "mp3"), False),  # Already small
+        (AudioInfo(10.0, 8000, 1, "aac"), False),
+        (AudioInfo(10.0, None, None, None), True),  # Unknown codec
+    ],
+)
+def test_needs_transcode(info: AudioInfo, expected: bool) -> None:
+    assert needs_transcode(info, TRANSCODE_PRESETS["balanced"]) is expected
+
+
+def test_resolve_transcode() -> None:
+    assert resolve_transcode(None) is None
+    assert resolve_transcode("lossless") == TranscodeSettings(codec="flac")
+    custom = TranscodeSettings(codec="opus", sample_rate=24000)
+    assert resolve_transcode(custom) is custom
+    with pytest.raises(ValueError, match="Unknown transcode preset"):
+        resolve_transcode("tiny")
+    with pytest.raises(ValueError, match="Unsupported transcode codec"):
+        TranscodeSettings(codec="mp3")
+
+
+def test_presets_have_distinct_keys() -> None:
+    keys = {settings.key for settings in TRANSCODE_PRESETS.values()}
+    assert len(keys) == len(TRANSCODE_PRESETS)
+    assert TRANSCODE_PRESETS["lossless"].mime_type == "audio/flac"
+    assert TRANSCODE_PRESETS["compact"].mime_type == "audio/ogg"
+
+
+@requires_ffmpeg
+@pytest.mark.parametrize("preset", sorted(TRANSCODE_PRESETS))
+def test_transcoded_audio_keeps_its_duration(preset: str) -> None:
+    settings = TRANSCODE_PRESETS[preset]
+    for transcoded in (
+        transcode_audio(SAMPLE, settings),
+        transcode_bytes(SAMPLE.read_bytes(), settings),
+    ):
+        assert transcoded.mime_type == settings.mime_type
+        assert len(transcoded.data) < SAMPLE.stat().st_size
+        # The header must carry the length for probing and token estimates
+        info = probe_bytes(transcoded.data)
+        assert info is not None
+        assert info.duration == pytest.approx(17.58, abs=0.05)
+        assert info.channels == 1
+        assert info.codec == settings.codec
+
+
+@requires_ffmpeg
+def test_retries_reuse_the_transcoded_audio(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    sources: List[Path] = []
+    transcode = gemini_pipeline.transcode_audio
+
+    def counting_transcode(audio_path: Path, settings: TranscodeSettings):
+        sources.append(audio_path)
+        return transcode(audio_path, settings)
+
+    monkeypatch.setattr(gemini_pipeline, "transcode_audio", counting_transcode)
+    monkeypatch.setattr(gemini_pipeline, "backoff_delay", lambda attempt: 0.0)
+    path = tmp_path / "sample.wav"
+    shutil.copy(SAMPLE, path)
+    backend = FakeBackend(server_error_rate=0.6, seed=3)
+    pipeline = GeminiASRPipeline(
+        backend=backend,
+        transcode="lossless",
+        # 503s from the fake would pause the shared limiter for other tests
+        rate_limiter=AdaptiveRateLimiter(throttle_cooldown=0.0),
+    )
+    result = pipeline.transcribe_with_retry(path, max_retries=10)
+    assert result.segments
+    assert backend.stats["requests"] > 1
+    assert sources == [path]
+    # The fake read the duration from the FLAC header instead of guessing
+    assert backend.stats["audio_seconds"] == pytest.approx(17.58, abs=0.05)
@@ -0,0 +1,118 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Reuse of Files API uploads across requests."""
+
+from __future__ import annotations
+
+import datetime
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+
+from omnilingual_asr.models.inference import (
+    FakeBackend,
+    GeminiASRPipeline,
+    UploadRegistry,
+    gemini_pipeline,
+)
+from omnilingual_asr.models.inference.uploads import UPLOAD_EXPIRY_MARGIN_SECONDS
+
+
+class _Uploader:
+    """Counts uploads and returns files expiring ``ttl`` seconds later."""
+
+    def __init__(self, ttl: float = 3600.0, delay: float = 0.0) -> None:
+        self.ttl = ttl
+        self.delay = delay
+        self.uris: List[str] = []
+        self._lock = threading.Lock()
+
+    def __call__(self) -> Any:
+        time.sleep(self.delay)
+        with self._lock:
+            uri = f"fake://files/{len(self.uris) + 1}"
+            self.uris.append(uri)
+        expires = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
+            seconds=self.ttl
+        )
+        return SimpleNamespace(uri=uri, mime_type="audio/wav", expiration_time=expires)
+
+
+def test_valid_upload_is_reused() -> None:
+    registry = UploadRegistry()
+    upload = _Uploader()
+    first = registry.get_or_upload("account", "digest", upload)
+    assert registry.get_or_upload("account", "digest", upload) == first
+    assert upload.uris == [first.uri]
+    # Uploads belong to the account that made them
+    registry.get_or_upload("other account", "digest", upload)
+    assert len(upload.uris) == 2
+
+
+def test_upload_near_expiry_is_replaced() -> None:
+    registry = UploadRegistry()
+    upload = _Uploader(ttl=UPLOAD_EXPIRY_MARGIN_SECONDS - 60)
+    first = registry.get_or_upload("account", "digest", upload)
+    assert registry.get("account", "digest") is None
+    second = registry.get_or_upload("account", "digest", upload)
+    assert second.uri != first.uri
+    assert len(upload.uris) == 2
+
+
+def test_concurrent_requests_share_one_upload() -> None:
+    registry = UploadRegistry()
+    upload = _Uploader(delay=0.1)
+    start = threading.Barrier(8)
+    uris: List[str] = []
+
+    def request() -> None:
+        start.wait()
+        uris.append(registry.get_or_upload("account", "digest", upload).uri)
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(upload.uris) == 1
+    assert uris == upload.uris * 8
+
+
+def test_failed_upload_is_retried_by_waiters() -> None:
+    registry = UploadRegistry()
+    upload = _Uploader()
+
+    def failing() -> Any:
+        raise RuntimeError("upload failed")
+
+    with pytest.raises(RuntimeError):
+        registry.get_or_upload("account", "digest", failing)
+    assert registry.get_or_upload("account", "digest", upload).uri == upload.uris[0]
+
+
+def test_pipeline_reuses_upload_and_replaces_missing_file(
+    write_wav, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(gemini_pipeline, "INLINE_AUDIO_LIMIT_BYTES", 0)
+    path = write_wav(10.0)
+    backend = FakeBackend()
+    pipeline = GeminiASRPipeline(backend=backend, upload_registry=UploadRegistry())
+    pipeline.transcribe_with_retry(path)
+    pipeline.transcribe_with_retry(path)
+    assert backend.stats["uploads"] == 1
+    assert backend.stats["requests"] == 2
+
+    # The API lost the file: the request is refused with a 404 before it is
+    # counted, and the audio is uploaded again for the retry
+    backend._files.clear()
+    result = pipeline.transcribe_with_retry(path)
+    assert result.segments
+    assert backend.stats["uploads"] == 2
+    assert backend.stats["requests"] == 3
@@ -0,0 +1,96 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Silence stripping and mapping times back to the original audio."""
+
+from __future__ import annotations
+
+import wave
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from omnilingual_asr.models.inference import (
+    FakeBackend,
+    GeminiASRPipeline,
+    SpeechMap,
+    strip_silence,
+)
+from omnilingual_asr.models.inference.probe import probe_audio
+
+SAMPLE_RATE = 16000
+
+
+def _write(path: Path, samples: Any) -> Path:
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes((samples * 32767).astype("<i2").tobytes())
+    return path
+
+
+def _recording(path: Path, *, changing: bool) -> Path:
+    """10 s of faint noise with a loud sound from 2 to 5 s.
+
+    The sound switches pitch every 100 ms like speech if ``changing``, and
+    is a steady hum otherwise.
+    """
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(0)
+    t = np.arange(10 * SAMPLE_RATE) / SAMPLE_RATE
+    samples = rng.normal(0.0, 1e-4, len(t))
+    sound = slice(2 * SAMPLE_RATE, 5 * SAMPLE_RATE)
+    if changing:
+        pitches = rng.choice([200, 400, 800, 1600, 3000], 30)
+        frequency = np.repeat(pitches, SAMPLE_RATE // 10)
+    else:
+        frequency = np.full(3 * SAMPLE_RATE, 440)
+    samples[sound] += 0.3 * np.sin(2 * np.pi * frequency * t[sound])
+    return _write(path, samples)
+
+
+def test_speech_map_to_original() -> None:
+    speech = SpeechMap(regions=((1.0, 2.0), (5.0, 7.0)), duration=10.0)
+    assert speech.speech_seconds == 3.0
+    assert speech.removed_seconds == 7.0
+    assert speech.to_original(0.0) == 1.0
+    assert speech.to_original(0.5) == 1.5
+    assert speech.to_original(2.5) == 6.5
+    # The boundary starts the second region, or ends the first
+    assert speech.to_original(1.0) == 5.0
+    assert speech.to_original(1.0, end=True) == 2.0
+    # Times past the stripped audio stay inside the original
+    assert speech.to_original(9.0) == 10.0
+    assert SpeechMap(regions=(), duration=10.0).to_original(4.2) == 4.2
+
+
+def test_strip_silence_keeps_the_speech(tmp_path: Path) -> None:
+    audio = _recording(tmp_path / "speech.wav", changing=True)
+    output = tmp_path / "stripped.wav"
+    speech = strip_silence(audio, output)
+    assert speech is not None
+    [(start, end)] = speech.regions
+    assert 1.5 <= start <= 2.0 and 5.0 <= end <= 5.5
+    assert probe_audio(output).duration == pytest.approx(speech.speech_seconds)
+
+
+def test_strip_silence_without_speech_writes_nothing(tmp_path: Path) -> None:
+    # The hum is loud but steady, so no region counts as speech
+    audio = _recording(tmp_path / "hum.wav", changing=False)
+    output = tmp_path / "stripped.wav"
+    assert strip_silence(audio, output) is None
+    assert not output.exists()
+
+
+def test_pipeline_sends_original_audio_without_speech(tmp_path: Path) -> None:
+    audio = _recording(tmp_path / "hum.wav", changing=False)
+    backend = FakeBackend()
+    pipeline = GeminiASRPipeline(backend=backend, strip_silence=True)
+    result = pipeline.transcribe_with_retry(audio)
+    assert result.speech_map is None
+    assert backend.stats["audio_seconds"] == pytest.approx(10.0)
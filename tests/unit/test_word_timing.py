@@ -0,0 +1,74 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Local word timestamps from segment spans and the energy envelope."""
+
+from __future__ import annotations
+
+import unicodedata
+
+import pytest
+
+from omnilingual_asr.models.inference.word_timing import WordTimer, _split_words
+
+
+def _spans(words) -> list[tuple[str, float, float]]:
+    return [(word.word, word.start, word.end) for word in words]
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("four score, and seven", ["four", "score,", "and", "seven"]),
+        ("你好，世界。", ["你", "好，", "世", "界。"]),
+        ("我用Python写代码", ["我", "用", "Python", "写", "代", "码"]),
+        ("「こんにちは」", ["「こ", "ん", "に", "ち", "は」"]),
+        ("Tokyo 東京 2024年", ["Tokyo", "東", "京", "2024", "年"]),
+    ],
+)
+def test_split_words(text: str, expected: list[str]) -> None:
+    assert _split_words(text) == expected
+
+
+@pytest.mark.parametrize("text", ["สวัสดีครับ", "မင်္ဂလာပါ", "ជំរាបសួរ"])
+def test_unspaced_scripts_split_into_characters_with_their_marks(text: str) -> None:
+    words = _split_words(text)
+    assert len(words) > 1
+    assert "".join(words) == text
+    assert not any(unicodedata.category(word[0]).startswith("M") for word in words)
+
+
+def test_words_are_weighted_by_length() -> None:
+    words = WordTimer().words("a bbb", 1.0, 5.0)
+    assert _spans(words) == [("a", 1.0, 2.0), ("bbb", 2.0, 5.0)]
+
+
+def test_unspaced_segment_is_spread_over_its_characters() -> None:
+    words = WordTimer().words("你好，世界。", 0.0, 4.0)
+    assert _spans(words) == [
+        ("你", 0.0, 1.0),
+        ("好，", 1.0, 2.0),
+        ("世", 2.0, 3.0),
+        ("界。", 3.0, 4.0),
+    ]
+
+
+def test_empty_text_or_span_has_no_words() -> None:
+    assert WordTimer().words("  ", 0.0, 1.0) == []
+    assert WordTimer().words("hello", 1.0, 1.0) == []
+
+
+@pytest.mark.parametrize("text", ["hello there", "hi there", "你好"])
+def test_words_follow_speech_in_the_envelope(text: str) -> None:
+    np = pytest.importorskip("numpy")
+    frame = 0.02
+    envelope = np.full(150, -60.0, dtype=np.float32)
+    envelope[25:75] = -10.0  # Speech from 0.5 to 1.5 s
+    envelope[100:130] = -10.0  # and from 2.0 to 2.6 s
+    words = WordTimer(envelope, frame).words(text, 0.0, 3.0)
+    # Silence around the words is left out, and the boundary moves into
+    # the pause even when the words' lengths suggest another split
+    assert [(word.start, word.end) for word in words] == [(0.5, 1.5), (2.0, 2.6)]
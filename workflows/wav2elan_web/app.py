@@ -1,17 +1,20 @@
 from __future__ import annotations
 
 import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import asdict
 from datetime import datetime, timezone
 import json
 import os
 import sys
+import time
 import uuid
 import zipfile
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator
 
 from fastapi import Body, FastAPI, File, Form, HTTPException, UploadFile
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from sse_starlette.sse import EventSourceResponse
 
@@ -22,7 +25,17 @@ sys.path.insert(0, str(_SRC_DIR))
 # Import Gemini pipeline (the only supported pipeline now)
 from omnilingual_asr.diarization import (
     GeminiDiarizedTranscriptionPipeline,
+    DiarizedTranscription,
     DiarizedTranscriptSegment,
+    segment_to_dict,
+)
+from omnilingual_asr.models.inference import (
+    FakeBackend,
+    KeyPoolBackend,
+    RequestHedger,
+    SQLiteTranscriptionCache,
+    get_metrics_collector,
+    get_rate_limiter,
 )
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -31,7 +44,27 @@ UPLOAD_DIR = BASE_DIR / "uploads"
 
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
-app = FastAPI(title="OmniScribe")
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Warm up the pipeline at startup so the first request runs at steady-state speed.
+
+    At shutdown the threads it sends hedged requests from are stopped.
+    """
+    try:
+        # Importing google-genai and constructing the client block, so run off the loop
+        pipeline = await asyncio.to_thread(_get_pipeline)
+    except RuntimeError:
+        pipeline = None  # No API key configured; requests report it
+    if pipeline is not None:
+        # Opens connections on this loop, which serves the requests
+        await pipeline.awarmup()
+    yield
+    if pipeline is not None:
+        pipeline.close()
+
+
+app = FastAPI(title="OmniScribe", lifespan=_lifespan)
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 app.mount("/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")
 
@@ -44,13 +77,37 @@ def _get_pipeline() -> GeminiDiarizedTranscriptionPipeline:
     """Get the Gemini transcription pipeline (singleton)."""
     global _pipeline
     if _pipeline is None:
+        # GEMINI_BACKEND=fake[:<spec>] answers locally, e.g. for load tests;
+        # see FakeBackend.from_spec for the spec format
+        backend_name, _, backend_spec = os.getenv("GEMINI_BACKEND", "").partition(":")
+        backend = FakeBackend.from_spec(backend_spec) if backend_name == "fake" else None
         api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
+        if not api_key and backend is None:
             raise RuntimeError(
                 "GEMINI_API_KEY environment variable not set. "
                 "Get your API key from https://aistudio.google.com/apikey"
             )
-        _pipeline = GeminiDiarizedTranscriptionPipeline(api_key=api_key)
+        # Optional on-disk result cache so re-uploaded audio skips the API call
+        cache_path = os.getenv("GEMINI_CACHE_PATH")
+        cache = SQLiteTranscriptionCache(cache_path) if cache_path else None
+        # GEMINI_HEDGE_PERCENTILE=95 duplicates chunk requests slower than
+        # 95% of recent ones, at most GEMINI_HEDGE_BUDGET (a share) of them
+        hedge_percentile = os.getenv("GEMINI_HEDGE_PERCENTILE")
+        hedging = None
+        if hedge_percentile:
+            hedging = RequestHedger(
+                float(hedge_percentile), float(os.getenv("GEMINI_HEDGE_BUDGET", "0.05"))
+            )
+        # Optional checkpoints so an interrupted long-file job resumes its chunks
+        _pipeline = GeminiDiarizedTranscriptionPipeline(
+            api_key=api_key,
+            cache=cache,
+            checkpoint_dir=os.getenv("GEMINI_CHECKPOINT_DIR"),
+            transcode=os.getenv("GEMINI_TRANSCODE") or None,
+            backend=backend,
+            strip_silence=os.getenv("GEMINI_STRIP_SILENCE", "").lower() in ("1", "true", "yes"),
+            hedging=hedging,
+        )
     return _pipeline
 
 
@@ -108,50 +165,73 @@ def _save_upload(file: UploadFile, dest_dir: Path) -> tuple[Path, str]:
     return output_path, file.filename
 
 
-def _run_transcription(audio_path: Path) -> dict[str, Any]:
+# Segment fields filled in by the enrichment pass of progressive transcription
+_ENRICHED_FIELDS = ("language", "language_code", "languages", "emotion", "translation")
+# How far an edited segment's start may have moved and still take its enrichment
+_ENRICH_MATCH_SECONDS = 0.5
+
+
+def _enrichment_patch(index: int, seg: DiarizedTranscriptSegment) -> dict[str, Any]:
+    """Describe the fields enrichment added to a segment."""
+    segment_dict = segment_to_dict(seg)
+    patch = {key: segment_dict[key] for key in _ENRICHED_FIELDS if key in segment_dict}
+    patch["index"] = index
+    patch["start"] = seg.start
+    return patch
+
+
+def _apply_enrichment_patch(segments: list[dict[str, Any]], patch: dict[str, Any]) -> None:
+    """Merge enriched fields into a stored segment.
+
+    The transcript may have been edited while enrichment ran, so a segment
+    that is no longer at its original index is found by its start time.
+    """
+    index = patch["index"]
+    target = segments[index] if index < len(segments) else None
+    if target is None or abs(target["start"] - patch["start"]) > _ENRICH_MATCH_SECONDS:
+        candidates = [
+            seg for seg in segments
+            if abs(seg["start"] - patch["start"]) <= _ENRICH_MATCH_SECONDS
+        ]
+        if not candidates:
+            return
+        target = min(candidates, key=lambda seg: abs(seg["start"] - patch["start"]))
+    for key in _ENRICHED_FIELDS:
+        if key in patch:
+            target[key] = patch[key]
+
+
+def _transcription_metadata(transcription: DiarizedTranscription) -> dict[str, Any]:
+    """Gemini metadata of one transcription, leaving out empty fields."""
+    metadata: dict[str, Any] = {}
+    if transcription.summary:
+        metadata["summary"] = transcription.summary
+    if transcription.detected_languages:
+        metadata["detected_languages"] = transcription.detected_languages
+    if transcription.failed_chunks:
+        metadata["failed_chunks"] = [asdict(f) for f in transcription.failed_chunks]
+    if transcription.speech_map:
+        metadata["silence_removed_seconds"] = round(
+            transcription.speech_map.removed_seconds, 3
+        )
+    return metadata
+
+
+async def _run_transcription(audio_path: Path) -> dict[str, Any]:
     """Run transcription and return result with segments and metadata."""
     pipeline = _get_pipeline()
-    segments = pipeline.transcribe(
+    started = time.perf_counter()
+    transcription = await pipeline.atranscribe_result(
         str(audio_path),
         word_timestamps=True,
     )
-
-    # Build segment list with all available fields
-    segment_list = []
-    for seg in segments:
-        segment_dict: dict[str, Any] = {
-            "start": seg.start,
-            "end": seg.end,
-            "speaker": seg.speaker,
-            "text": seg.text,
-            "words": [
-                {"word": w.word, "start": w.start, "end": w.end}
-                for w in (seg.words or [])
-            ],
-        }
-        # Add Gemini-specific fields if available
-        if hasattr(seg, "language") and seg.language:
-            segment_dict["language"] = seg.language
-        if hasattr(seg, "language_code") and seg.language_code:
-            segment_dict["language_code"] = seg.language_code
-        if hasattr(seg, "languages") and seg.languages:
-            segment_dict["languages"] = seg.languages
-        if hasattr(seg, "emotion") and seg.emotion:
-            segment_dict["emotion"] = seg.emotion
-        if hasattr(seg, "translation") and seg.translation:
-            segment_dict["translation"] = seg.translation
-        segment_list.append(segment_dict)
+    get_metrics_collector().observe_job(time.perf_counter() - started)
 
     # Build result with optional summary and detected languages
-    result: dict[str, Any] = {"segments": segment_list}
-
-    # Add Gemini metadata
-    if pipeline.summary:
-        result["summary"] = pipeline.summary
-    if pipeline.detected_languages:
-        result["detected_languages"] = pipeline.detected_languages
-
-    return result
+    return {
+        "segments": [segment_to_dict(seg) for seg in transcription.segments],
+        **_transcription_metadata(transcription),
+    }
 
 
 @app.post("/api/transcribe")
@@ -162,7 +242,7 @@ async def transcribe(file: UploadFile = File(...)) -> JSONResponse:
     if output_path.suffix.lower() == ".zip":
         raise HTTPException(status_code=400, detail="Use batch endpoint for zip uploads.")
 
-    result = _run_transcription(output_path)
+    result = await _run_transcription(output_path)
     entry = _store_history(
         {
             "audio_url": f"/uploads/{output_path.name}",
@@ -178,8 +258,14 @@ async def transcribe_stream(
     file: UploadFile = File(...),
     language: str | None = Form(None),
     speaker_count: str | None = Form(None),
+    progressive: bool = Form(False),
 ) -> EventSourceResponse:
-    """Streaming endpoint that reports progress via SSE."""
+    """Streaming endpoint that reports progress via SSE.
+
+    With ``progressive``, the plain transcript is stored and sent first;
+    translation, emotion, languages and summary are then added from its
+    text and sent as ``enrichment`` events that patch the history entry.
+    """
     UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
     output_path, display_name = _save_upload(file, UPLOAD_DIR)
     if output_path.suffix.lower() == ".zip":
@@ -187,86 +273,92 @@ async def transcribe_stream(
 
     async def event_generator():
         loop = asyncio.get_event_loop()
-        progress_queue: asyncio.Queue[tuple[str, int]] = asyncio.Queue()
+        event_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
 
         def progress_callback(step: str, idx: int) -> None:
-            loop.call_soon_threadsafe(progress_queue.put_nowait, (step, idx))
-
-        async def run_transcription():
-            pipeline = _get_pipeline()
-            return await loop.run_in_executor(
-                None,
-                lambda: pipeline.transcribe(
-                    str(output_path),
-                    word_timestamps=True,
-                    progress_callback=progress_callback,
-                    language=language,
-                    speaker_count=speaker_count,
-                ),
+            loop.call_soon_threadsafe(
+                event_queue.put_nowait,
+                {
+                    "event": "progress",
+                    "data": json.dumps({"step": step, "index": idx, "file_name": display_name}),
+                },
             )
 
+        pipeline = _get_pipeline()
+        # This request's own results; other requests share the pipeline
+        transcription = DiarizedTranscription()
+
+        async def run_transcription() -> None:
+            started = time.perf_counter()
+            async for batch in pipeline.atranscribe_iter(
+                str(output_path),
+                word_timestamps=True,
+                progress_callback=progress_callback,
+                language=language,
+                speaker_count=speaker_count,
+                features=[] if progressive else None,
+                transcription=transcription,
+            ):
+                # Long audio: show the transcript so far while later chunks run
+                event_queue.put_nowait(
+                    {
+                        "event": "partial",
+                        "data": json.dumps(
+                            {
+                                "file_name": display_name,
+                                "segments": [segment_to_dict(seg) for seg in batch],
+                            }
+                        ),
+                    }
+                )
+            get_metrics_collector().observe_job(time.perf_counter() - started)
+
         task = asyncio.create_task(run_transcription())
 
         while not task.done():
             try:
-                step, idx = await asyncio.wait_for(progress_queue.get(), timeout=0.1)
-                yield {
-                    "event": "progress",
-                    "data": json.dumps({"step": step, "index": idx, "file_name": display_name}),
-                }
+                yield await asyncio.wait_for(event_queue.get(), timeout=0.1)
             except asyncio.TimeoutError:
                 continue
 
-        while not progress_queue.empty():
-            step, idx = await progress_queue.get()
-            yield {
-                "event": "progress",
-                "data": json.dumps({"step": step, "index": idx, "file_name": display_name}),
-            }
-
-        segments = await task
-        pipeline = _get_pipeline()
+        while not event_queue.empty():
+            yield await event_queue.get()
 
-        # Build segment list with all available fields
-        segment_list = []
-        for seg in segments:
-            segment_dict: dict[str, Any] = {
-                "start": seg.start,
-                "end": seg.end,
-                "speaker": seg.speaker,
-                "text": seg.text,
-                "words": [
-                    {"word": w.word, "start": w.start, "end": w.end}
-                    for w in (seg.words or [])
-                ],
-            }
-            # Add Gemini-specific fields if available
-            if hasattr(seg, "language") and seg.language:
-                segment_dict["language"] = seg.language
-            if hasattr(seg, "language_code") and seg.language_code:
-                segment_dict["language_code"] = seg.language_code
-            if hasattr(seg, "languages") and seg.languages:
-                segment_dict["languages"] = seg.languages
-            if hasattr(seg, "emotion") and seg.emotion:
-                segment_dict["emotion"] = seg.emotion
-            if hasattr(seg, "translation") and seg.translation:
-                segment_dict["translation"] = seg.translation
-            segment_list.append(segment_dict)
+        await task
+        segments = list(transcription.segments)
 
         entry_data: dict[str, Any] = {
             "audio_url": f"/uploads/{output_path.name}",
             "file_name": display_name,
-            "segments": segment_list,
+            "segments": [segment_to_dict(seg) for seg in segments],
+            **_transcription_metadata(transcription),
         }
 
-        # Add Gemini metadata
-        if pipeline.summary:
-            entry_data["summary"] = pipeline.summary
-        if pipeline.detected_languages:
-            entry_data["detected_languages"] = pipeline.detected_languages
-
+        enrich = progressive and bool(segments)
         entry = _store_history(entry_data)
-        yield {"event": "result", "data": json.dumps(entry)}
+        yield {"event": "result", "data": json.dumps({**entry, "enriching": enrich})}
+        if not enrich:
+            return
+
+        # Fill in the remaining fields, patching the stored entry as they arrive
+        async for enriched in pipeline.aenrich_iter(
+            segments, language=language, transcription=transcription
+        ):
+            patches = [_enrichment_patch(i, seg) for i, seg in enriched.items()]
+            for patch in patches:
+                _apply_enrichment_patch(entry["segments"], patch)
+            yield {
+                "event": "enrichment",
+                "data": json.dumps({"id": entry["id"], "segments": patches}),
+            }
+
+        metadata: dict[str, Any] = {}
+        if transcription.summary:
+            metadata["summary"] = transcription.summary
+        if transcription.detected_languages:
+            metadata["detected_languages"] = transcription.detected_languages
+        entry.update(metadata)
+        yield {"event": "enriched", "data": json.dumps({"id": entry["id"], **metadata})}
 
     return EventSourceResponse(event_generator())
 
@@ -326,61 +418,30 @@ async def transcribe_batch_stream(
             def cb(step: str, idx: int) -> None:
                 progress_callback(step, idx, i, file_count, file_name)
 
-            segments = await loop.run_in_executor(
-                None,
-                lambda p=pipeline, ap=str(audio_path): p.transcribe(
-                    ap,
-                    word_timestamps=True,
-                    progress_callback=cb,
-                    language=language,
-                    speaker_count=speaker_count,
-                ),
+            started = time.perf_counter()
+            transcription = await pipeline.atranscribe_result(
+                str(audio_path),
+                word_timestamps=True,
+                progress_callback=cb,
+                language=language,
+                speaker_count=speaker_count,
             )
+            get_metrics_collector().observe_job(time.perf_counter() - started)
 
-            # Build segment list with all available fields
-            segment_list = []
-            for seg in segments:
-                segment_dict: dict[str, Any] = {
-                    "start": seg.start,
-                    "end": seg.end,
-                    "speaker": seg.speaker,
-                    "text": seg.text,
-                    "words": [
-                        {"word": w.word, "start": w.start, "end": w.end}
-                        for w in (seg.words or [])
-                    ],
+            return _store_history(
+                {
+                    "file_name": display_name,
+                    "audio_url": f"/uploads/{batch_id}/{audio_path.name}",
+                    "segments": [segment_to_dict(seg) for seg in transcription.segments],
+                    **_transcription_metadata(transcription),
                 }
-                # Add Gemini-specific fields if available
-                if hasattr(seg, "language") and seg.language:
-                    segment_dict["language"] = seg.language
-                if hasattr(seg, "language_code") and seg.language_code:
-                    segment_dict["language_code"] = seg.language_code
-                if hasattr(seg, "languages") and seg.languages:
-                    segment_dict["languages"] = seg.languages
-                if hasattr(seg, "emotion") and seg.emotion:
-                    segment_dict["emotion"] = seg.emotion
-                if hasattr(seg, "translation") and seg.translation:
-                    segment_dict["translation"] = seg.translation
-                segment_list.append(segment_dict)
-
-            entry_data: dict[str, Any] = {
-                "file_name": display_name,
-                "audio_url": f"/uploads/{batch_id}/{audio_path.name}",
-                "segments": segment_list,
-            }
-
-            # Add Gemini metadata
-            if pipeline.summary:
-                entry_data["summary"] = pipeline.summary
-            if pipeline.detected_languages:
-                entry_data["detected_languages"] = pipeline.detected_languages
-
-            return _store_history(entry_data)
+            )
 
         async def run_transcription() -> list[dict[str, Any]]:
             file_count = len(audio_files)
             
-            # Process files in parallel (up to 4 concurrent)
+            # Process files in parallel (up to 4 concurrent); actual API
+            # concurrency is governed by the shared rate limiter
             max_concurrent = min(4, file_count)
             semaphore = asyncio.Semaphore(max_concurrent)
             
@@ -417,6 +478,46 @@ async def transcribe_batch_stream(
     return EventSourceResponse(event_generator())
 
 
+@app.get("/api/rate-limit")
+async def rate_limit_stats() -> JSONResponse:
+    """Current Gemini rate-limit budgets, adaptive concurrency and queue depth."""
+    return JSONResponse(get_rate_limiter().stats())
+
+
+def _key_stats() -> list[dict[str, Any]]:
+    """Per-key usage when GEMINI_API_KEY lists several keys."""
+    backend = _pipeline.gemini.backend if _pipeline is not None else None
+    return backend.stats() if isinstance(backend, KeyPoolBackend) else []
+
+
+@app.get("/api/keys")
+async def key_stats() -> JSONResponse:
+    """Requests, tokens and health of each API key, identified by its hash."""
+    return JSONResponse(_key_stats())
+
+
+@app.get("/metrics")
+async def metrics() -> PlainTextResponse:
+    """Prometheus metrics: request latency per stage, tokens, bytes sent and cost.
+
+    Cost estimates use the GEMINI_PRICE_* environment variables (USD per
+    million tokens); the current rate limiter state, and how many API
+    keys aren't ejected when several are configured, are exported as gauges.
+    """
+    gauges = {
+        f"rate_limit_{name}": value
+        for name, value in get_rate_limiter().stats().items()
+        if isinstance(value, (int, float))
+    }
+    keys = _key_stats()
+    if keys:
+        gauges["keys_available"] = sum(1 for key in keys if not key["ejected_seconds"])
+    return PlainTextResponse(
+        get_metrics_collector().render(gauges),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 @app.get("/api/history")
 async def list_history() -> JSONResponse:
     items = [
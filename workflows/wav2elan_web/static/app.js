@@ -83,6 +83,7 @@ const modalCancel = document.getElementById("modal-cancel");
 const modalConfirm = document.getElementById("modal-confirm");
 const languageSelect = document.getElementById("language-select");
 const speakerCountSelect = document.getElementById("speaker-count");
+const progressiveSelect = document.getElementById("progressive-mode");
 
 // Steps for pipeline (uploading, transcribing, processing, done)
 const GEMINI_STEPS = ["uploading", "transcribing", "processing", "done"];
@@ -343,6 +344,7 @@ function showUploadModal() {
   // Reset form values
   languageSelect.value = "";
   speakerCountSelect.value = "";
+  progressiveSelect.value = "";
   uploadModal.classList.remove("hidden");
 }
 
@@ -355,6 +357,7 @@ function getUploadOptions() {
   return {
     language: languageSelect.value || null,
     speakerCount: speakerCountSelect.value || null,
+    progressive: progressiveSelect.value === "progressive",
   };
 }
 
@@ -2089,6 +2092,10 @@ async function uploadFiles(files, options = {}) {
   if (options.speakerCount) {
     formData.append("speaker_count", options.speakerCount);
   }
+  if (options.progressive && files.length === 1) {
+    // Show the transcript first; details are patched in as they arrive
+    formData.append("progressive", "true");
+  }
 
   try {
     const endpoint = shouldUseBatch(files)
@@ -2104,6 +2111,10 @@ async function uploadFiles(files, options = {}) {
     const decoder = new TextDecoder();
     let buffer = "";
     let resultData = null;
+    // Progressive results are shown before the stream ends
+    let resultShown = false;
+    // Segments streamed so far for single-file uploads
+    let partialSegments = [];
     // Persist across read() chunks so split event:/data: lines still pair up
     let eventType = null;
 
@@ -2127,7 +2138,10 @@ async function uploadFiles(files, options = {}) {
           if (eventType && eventData) {
             try {
               const parsed = JSON.parse(eventData);
-              if (eventType === "progress") {
+              if (eventType === "progress" && parsed.step === "segment") {
+                // Streamed responses report how many segments have arrived
+                progressMeta.textContent = `${parsed.file_name || "Audio"}: ${parsed.index} segment${parsed.index === 1 ? "" : "s"} received`;
+              } else if (eventType === "progress") {
                 const stepIdx = getStepIndex(parsed.step);
                 if (stepIdx >= 0 && stepIdx < STEP_COUNT) {
                   updateProgress(stepIdx, {
@@ -2136,8 +2150,26 @@ async function uploadFiles(files, options = {}) {
                     count: parsed.file_count || 1,
                   });
                 }
+              } else if (eventType === "partial") {
+                partialSegments = partialSegments.concat(parsed.segments || []);
+                renderTranscript({
+                  file_name: parsed.file_name,
+                  segments: partialSegments,
+                });
               } else if (eventType === "result") {
                 resultData = parsed;
+                if (parsed.enriching) {
+                  // Let the user start on the transcript while details arrive
+                  updateProgress(STEP_COUNT);
+                  hideProgress();
+                  historyItems = historyItems.filter((h) => !h.loading);
+                  await showSingleResult(parsed, pendingAudioBlobs);
+                  resultShown = true;
+                }
+              } else if (eventType === "enrichment") {
+                applyEnrichment(parsed.id, parsed.segments || []);
+              } else if (eventType === "enriched") {
+                applyEnrichmentMetadata(parsed);
               } else if (eventType === "error") {
                 throw new Error(parsed.message || "Transcription failed.");
               }
@@ -2160,7 +2192,9 @@ async function uploadFiles(files, options = {}) {
     // Always clean up loading placeholders
     historyItems = historyItems.filter((h) => !h.loading);
 
-    if (resultData) {
+    if (resultShown) {
+      renderHistoryList();
+    } else if (resultData) {
       if (resultData.results) {
         resultData.results.forEach((item) => {
           historyCache.set(item.id, item);
@@ -2176,15 +2210,7 @@ async function uploadFiles(files, options = {}) {
           await selectHistory(resultData.results[0].id);
         }
       } else {
-        historyCache.set(resultData.id, resultData);
-        // Transfer blob URL from pending to permanent cache
-        const blobUrl = pendingAudioBlobs.get(resultData.file_name);
-        if (blobUrl) {
-          audioBlobCache.set(resultData.id, blobUrl);
-        }
-        historyItems = [resultData, ...historyItems];
-        renderHistoryList();
-        await selectHistory(resultData.id);
+        await showSingleResult(resultData, pendingAudioBlobs);
       }
     } else {
       // No result received — show error and clean up
@@ -2203,6 +2229,68 @@ async function uploadFiles(files, options = {}) {
   }
 }
 
+async function showSingleResult(resultData, pendingAudioBlobs) {
+  historyCache.set(resultData.id, resultData);
+  // Transfer blob URL from pending to permanent cache
+  const blobUrl = pendingAudioBlobs.get(resultData.file_name);
+  if (blobUrl) {
+    audioBlobCache.set(resultData.id, blobUrl);
+  }
+  historyItems = [resultData, ...historyItems];
+  renderHistoryList();
+  await selectHistory(resultData.id);
+}
+
+// Fields the enrichment pass of progressive transcription fills in
+const ENRICHED_FIELDS = ["language", "language_code", "languages", "emotion", "translation"];
+// How far an edited segment's start may have moved and still take its enrichment
+const ENRICH_MATCH_SECONDS = 0.5;
+
+function findEnrichedSegment(segments, patch) {
+  // The user may have edited the transcript meanwhile; fall back to start time
+  const atIndex = segments[patch.index];
+  if (atIndex && Math.abs(atIndex.start - patch.start) <= ENRICH_MATCH_SECONDS) {
+    return atIndex;
+  }
+  let best = null;
+  segments.forEach((seg) => {
+    const distance = Math.abs(seg.start - patch.start);
+    if (distance <= ENRICH_MATCH_SECONDS && (!best || distance < Math.abs(best.start - patch.start))) {
+      best = seg;
+    }
+  });
+  return best;
+}
+
+function refreshEnrichedTranscript(id) {
+  // Don't re-render under an open inline editor; the next render shows the data
+  if (id === activeId && activeData && !editState) {
+    renderTranscript(activeData);
+  }
+}
+
+function applyEnrichment(id, patches) {
+  const entry = historyCache.get(id);
+  if (!entry?.segments) return;
+  patches.forEach((patch) => {
+    const segment = findEnrichedSegment(entry.segments, patch);
+    if (!segment) return;
+    ENRICHED_FIELDS.forEach((key) => {
+      if (key in patch) segment[key] = patch[key];
+    });
+  });
+  refreshEnrichedTranscript(id);
+}
+
+function applyEnrichmentMetadata(data) {
+  const entry = historyCache.get(data.id);
+  if (!entry) return;
+  if (data.summary) entry.summary = data.summary;
+  if (data.detected_languages) entry.detected_languages = data.detected_languages;
+  delete entry.enriching;
+  refreshEnrichedTranscript(data.id);
+}
+
 // Citation toggle and copy
 const citeBtn = document.getElementById("cite-btn");
 const citeBox = document.getElementById("cite-box");